@@ -0,0 +1,2 @@
+-- Serialized quantile sketch per flushed window, so windows can be merged into rollups
+ALTER TABLE hook_metrics ADD COLUMN sketch TEXT;
@@ -0,0 +1,6 @@
+"""Micro-benchmarks for DexAI hot paths.
+
+Not collected by pytest (files are named ``bench_*.py``). Run individually:
+
+    python -m tests.benchmarks.bench_db_connections
+"""
@@ -0,0 +1,112 @@
+"""Benchmark: activity feed page latency by scroll depth, OFFSET + COUNT per page vs keyset cursors.
+
+Fills a temporary dashboard database with N events (default 1M) through
+init_db(), so the feed indexes and event rollups are in place, then times
+one page of 50 at increasing depths. The offset variant reproduces the
+previous /api/activity: get_events with LIMIT/OFFSET ordered by timestamp
+plus count_events with the same filters on every page. The keyset variant
+seeks to the cursor position and reuses the total carried in the cursor.
+Both run against the same database and indexes, so the difference is the
+pagination itself. Also reports the first-page total (count_events, read
+from a covering index) and the NDJSON export throughput.
+
+Usage:
+    python -m tests.benchmarks.bench_activity_pagination [--events 1000000] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from tools.dashboard.backend import database, seed
+
+
+PAGE = 50
+DEPTHS = (0, 1_000, 10_000, 100_000)
+FILTERS = {"all events": {}, "event_type=task": {"event_type": "task"}}
+
+
+def populate(events: int) -> dict:
+    start = (datetime.now() - timedelta(days=90)).isoformat()
+    conn = database.get_db_connection()
+    conn.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < ? - 1)
+        INSERT INTO dashboard_events (event_type, timestamp, channel, summary, details, severity)
+        SELECT CASE i % 4 WHEN 0 THEN 'task' WHEN 1 THEN 'message'
+                          WHEN 2 THEN 'tool_use' ELSE 'system' END,
+               strftime('%Y-%m-%dT%H:%M:%f', ?, '+' || (i * ?) || ' seconds'),
+               CASE i % 5 WHEN 0 THEN NULL WHEN 1 THEN 'telegram'
+                          WHEN 2 THEN 'discord' ELSE 'slack' END,
+               'event ' || i,
+               json_object('n', i, 'note', 'benchmark event payload'),
+               CASE WHEN i % 50 = 0 THEN 'error' ELSE 'info' END
+        FROM n
+    """,
+        (events, start, 90 * 86400 / events),
+    )
+    conn.commit()
+    conn.close()
+    return {"success": True, "message": "", "events": events, "metrics": 0}
+
+
+def offset_page(depth: int, filters: dict, count: bool = True) -> None:
+    database.get_events(limit=PAGE + 1, offset=depth, **filters)
+    if count:
+        database.count_events(**filters)
+
+
+def keyset_page(position: tuple[str, int] | None, filters: dict) -> None:
+    database.get_events(limit=PAGE + 1, before=position, **filters)
+
+
+def timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database.DB_PATH = Path(tempfile.mkdtemp()) / "dashboard.db"
+    seed.seed_database = lambda force=False: populate(args.events)
+    start = time.perf_counter()
+    database.init_db()
+    print(f"{args.events:,} events (load + indexes + rollups {time.perf_counter() - start:.1f} s), "
+          f"page size {PAGE}")
+
+    for label, filters in FILTERS.items():
+        print(f"\n{label:16s} {'depth':>8s} {'offset+count':>14s} {'offset':>10s} {'keyset':>10s}")
+        for depth in DEPTHS:
+            position = None
+            if depth:
+                (last,) = database.get_events(limit=1, offset=depth - 1, **filters)
+                position = (last["timestamp"], last["id"])
+            legacy = timed(lambda d=depth, f=filters: offset_page(d, f), args.repeat)
+            offset = timed(lambda d=depth, f=filters: offset_page(d, f, count=False), args.repeat)
+            keyset = timed(lambda p=position, f=filters: keyset_page(p, f), args.repeat)
+            print(f"{'':16s} {depth:8,d} {legacy:12.2f}ms {offset:8.2f}ms {keyset:8.2f}ms")
+
+        total = timed(lambda f=filters: database.count_events(**f), args.repeat)
+        print(f"{'first-page total':16s} {'':>8s} {total:12.2f}ms  (count_events, once per scroll)")
+
+    start = time.perf_counter()
+    exported = sum(len(json.dumps(event, default=str)) + 1 for event in database.iter_events())
+    elapsed = time.perf_counter() - start
+    print(f"\nNDJSON export: {args.events:,} events, {exported / 1e6:.0f} MB "
+          f"in {elapsed:.1f} s ({args.events / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
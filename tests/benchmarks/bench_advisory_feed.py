@@ -0,0 +1,93 @@
+"""Benchmark: auditing a dependency list, per-package OSV queries vs the bulk advisory engine.
+
+Runs against OSVFixtureServer, a local stand-in for api.osv.dev serving
+synthetic advisories with a fixed per-request latency. The per-package
+variant reproduces the previous is_package_vulnerable loop: one cache
+lookup, one /v1/query request and one cache write per package. The bulk
+variant is check_packages_vulnerable (one SELECT, one querybatch request,
+one write); the dump variant answers from an ingested OSV dump offline.
+
+Usage:
+    python -m tests.benchmarks.bench_advisory_feed [--packages 300] [--latency-ms 20]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from tests.fixtures.osv_server import OSVFixtureServer, make_vuln
+from tools.security import advisory_feed
+
+
+def build_fixture(packages: int, rng: random.Random) -> tuple[list[tuple[str, str]], list[dict]]:
+    """A dependency list and advisories affecting ~10% of its pinned versions."""
+    pins = [(f"package-{n}", f"1.{rng.randrange(10)}.0") for n in range(packages)]
+    vulns = [
+        make_vuln(f"PYSEC-2026-{n}", name, [version])
+        for n, (name, version) in enumerate(pins) if rng.random() < 0.1
+    ]
+    return pins, vulns
+
+
+def per_package(pins: list[tuple[str, str]]) -> dict:
+    results = {}
+    for name, version in pins:
+        cached = advisory_feed.check_advisory_cache(name, version)
+        if cached is None:
+            cached = advisory_feed.query_osv(name, version)
+            advisory_feed.update_advisory_cache(name, version, cached)
+        results[(name, version)] = cached
+    return results
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    pins, vulns = build_fixture(args.packages, random.Random(0))
+    workdir = Path(tempfile.mkdtemp())
+    dump = workdir / "dump"
+    dump.mkdir()
+    for vuln in vulns:
+        (dump / f"{vuln['id']}.json").write_text(json.dumps(vuln))
+
+    with OSVFixtureServer(vulns, latency=args.latency_ms / 1000) as server:
+        for attr, url in server.urls().items():
+            setattr(advisory_feed, attr, url)
+
+        rows = []
+        advisory_feed.DB_PATH = workdir / "per-package.db"
+        rows.append(("per-package, cold", *timed(per_package, pins)))
+        rows.append(("per-package, cached", *timed(per_package, pins)))
+
+        advisory_feed.DB_PATH = workdir / "bulk.db"
+        rows.append(("bulk, cold", *timed(advisory_feed.check_packages_vulnerable, pins)))
+        rows.append(("bulk, cached", *timed(advisory_feed.check_packages_vulnerable, pins)))
+
+        advisory_feed.DB_PATH = workdir / "dump.db"
+        ingest, _ = timed(advisory_feed.ingest_osv_dump, dump)
+        rows.append(("dump, offline", *timed(advisory_feed.check_packages_vulnerable, pins, True)))
+
+    print(f"{len(pins)} packages, {len(vulns)} advisories, "
+          f"simulated OSV latency {args.latency_ms:.0f} ms/request (dump ingest {ingest * 1000:.0f} ms)")
+    for label, elapsed, results in rows:
+        flagged = sum(
+            1 for r in results.values()
+            if (r["vulnerable"] if isinstance(r, dict) else r)
+        )
+        print(f"{label:20s} {elapsed * 1000:9.1f} ms  ({flagged} vulnerable)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark: peak RSS while processing a large video attachment.
+
+Generates a ~500 MB MJPEG video with FFmpeg, then runs it through
+MediaProcessor.process_attachment in a fresh process per mode and reports
+that process's peak RSS (FFmpeg's own memory is not included):
+
+- buffered: stub adapter with only download_attachment() (whole file as
+  bytes, the previous adapter API)
+- streaming: stub adapter with iter_attachment() yielding 64 KiB chunks
+
+Vision and transcription are stubbed.
+
+Usage:
+    python -m tests.benchmarks.bench_attachment_stream [--mb 500]
+"""
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from tools.channels.models import Attachment
+from tools.channels.router import DOWNLOAD_CHUNK_BYTES
+
+
+VIDEO_PATH = Path("/tmp/dexai_bench_large.mp4")
+
+
+class BufferedAdapter:
+    def __init__(self, path: Path):
+        self.path = path
+
+    async def download_attachment(self, attachment):
+        return self.path.read_bytes()
+
+
+class StreamingAdapter(BufferedAdapter):
+    async def iter_attachment(self, attachment):
+        with open(self.path, "rb") as f:
+            while chunk := f.read(DOWNLOAD_CHUNK_BYTES):
+                yield chunk
+                await asyncio.sleep(0)
+
+
+def encode(path: Path, seconds: float) -> None:
+    # MJPEG encodes quickly, so large files are cheap to produce
+    subprocess.run(
+        ["ffmpeg", "-v", "error",
+         "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size=1280x720:rate=30",
+         "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+         "-shortest", "-c:v", "mjpeg", "-q:v", "2", "-c:a", "aac",
+         str(path), "-y"],
+        check=True,
+    )
+
+
+def make_video(path: Path, megabytes: int) -> None:
+    target = megabytes * 1024 * 1024
+    if path.exists() and abs(path.stat().st_size - target) < target * 0.1:
+        return
+    encode(path, 2)  # Calibrate bytes per second
+    encode(path, round(2 * target / path.stat().st_size))
+
+
+def run_mode(mode: str, path: Path) -> None:
+    """Process the video once and print peak RSS (runs in a child process)."""
+    from tools.channels import audio_processor
+    from tools.channels.audio_processor import TranscriptionResult
+    from tools.channels.media_processor import MediaProcessor
+    from tools.channels.video_processor import get_video_processor
+
+    class StubTranscriber:
+        async def transcribe(self, audio_bytes, filename, mime_type):
+            return TranscriptionResult(success=True, text="...", cost_usd=0.0)
+
+    config = {
+        "processing": {
+            "max_file_size_mb": 2048,
+            "worker_pool": {"workers": 0},
+            "cache": {"enabled": False},
+            "video": {"max_file_size_mb": 2048, "max_duration_seconds": 3600},
+        },
+    }
+    processor = MediaProcessor(config=config)
+    video = get_video_processor()
+    video.config = config
+    media = video._get_media_processor()
+    adapter = (StreamingAdapter if mode == "streaming" else BufferedAdapter)(path)
+    attachment = Attachment(id="big", type="video", filename="big.mp4",
+                            mime_type="video/mp4", size_bytes=path.stat().st_size)
+
+    with (
+        patch.object(audio_processor, "get_audio_processor", return_value=StubTranscriber()),
+        patch.object(media, "_call_vision_api", AsyncMock(return_value=("frame", 0.0))),
+    ):
+        start = time.perf_counter()
+        result = asyncio.run(processor.process_attachment(attachment, "telegram", adapter))
+        elapsed = time.perf_counter() - start
+    processor.cleanup()
+    video.cleanup()
+
+    assert result.processed, result.processing_error
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:9s}: peak RSS {peak_mb:7.1f} MB | {elapsed * 1000:7.0f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=500)
+    parser.add_argument("--mode", choices=("buffered", "streaming"))
+    parser.add_argument("--video", type=Path, default=VIDEO_PATH)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.video)
+        return
+
+    make_video(args.video, args.mb)
+    print(f"video: {args.video.stat().st_size / 1024 / 1024:.0f} MB")
+    for mode in ("buffered", "streaming"):
+        subprocess.run(
+            [sys.executable, "-m", "tests.benchmarks.bench_attachment_stream",
+             "--mode", mode, "--video", str(args.video)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Benchmark: sandbox startup and per-command latency, cold containers vs the warm pool.
+
+Runs against FakeDockerClient, which needs no Docker daemon: "containers"
+are host directories, each exec is a local bash process, and the Docker API
+costs being compared (container create, exec setup, pause/unpause) are
+simulated with fixed delays. The cold variant reproduces the previous
+path: create the container on a session's first Bash call and exec_run
+every command; the pooled variant hands out pre-started sandboxes and runs
+commands through the persistent exec shell.
+
+Usage:
+    python -m tests.benchmarks.bench_container_pool [--sessions 5] [--commands 20]
+        [--create-ms 500] [--exec-ms 30]
+"""
+
+import argparse
+import contextlib
+import shutil
+import socket
+import statistics
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from tools.security.container_executor import ContainerExecutor, ContainerPool
+
+
+class FakeContainer:
+    def __init__(self, client: "FakeDockerClient", name: str, labels: dict):
+        self.client = client
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.labels = labels or {}
+        self.status = "running"
+        self.dir = Path(tempfile.mkdtemp(prefix="fake-container-"))
+        self.processes: list[subprocess.Popen] = []
+
+    def pause(self):
+        time.sleep(self.client.pause_latency)
+        self.status = "paused"
+
+    def unpause(self):
+        time.sleep(self.client.pause_latency)
+        self.status = "running"
+
+    def reload(self):
+        time.sleep(self.client.exec_latency)
+
+    def exec_run(self, cmd, workdir=None, demux=False):
+        time.sleep(self.client.exec_latency)
+        self.client.exec_runs += 1
+        done = subprocess.run(cmd, cwd=self.dir, capture_output=True)
+        return SimpleNamespace(exit_code=done.returncode, output=(done.stdout, done.stderr))
+
+    def remove(self, force=False):
+        self.status = "removed"
+        for process in self.processes:
+            process.kill()
+        self.client.live.pop(self.name, None)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class FakeContainers:
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+
+    def run(self, name, labels=None, **options):
+        time.sleep(self.client.create_latency)
+        container = FakeContainer(self.client, name, labels)
+        self.client.live[name] = container
+        self.client.created += 1
+        return container
+
+    def get(self, name):
+        if name not in self.client.live:
+            raise KeyError(name)
+        return self.client.live[name]
+
+    def list(self, all=False, filters=None):
+        key, _, value = (filters or {}).get("label", "").partition("=")
+        return [
+            c for c in list(self.client.live.values())
+            if not key or (key in c.labels and (not value or c.labels[key] == value))
+        ]
+
+
+class FakeAPI:
+    """exec_create/exec_start(socket=True) backed by a local bash process."""
+
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+        self.execs: dict[str, tuple] = {}
+
+    def _container(self, container_id):
+        return next(c for c in self.client.live.values() if c.id == container_id)
+
+    def exec_create(self, container_id, cmd, **kwargs):
+        time.sleep(self.client.exec_latency)
+        exec_id = uuid.uuid4().hex
+        self.execs[exec_id] = (self._container(container_id), cmd)
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, socket=False):
+        time.sleep(self.client.exec_latency)
+        self.client.exec_shells += 1
+        container, cmd = self.execs.pop(exec_id)
+        ours, theirs = _socketpair()
+        process = subprocess.Popen(
+            cmd, cwd=container.dir, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        container.processes.append(process)
+        send_lock = threading.Lock()
+
+        def pump_in():
+            while data := theirs.recv(65536):
+                process.stdin.write(data)
+                process.stdin.flush()
+            process.kill()
+
+        def pump_out(pipe, stream):
+            while data := pipe.read1(65536):
+                with send_lock:
+                    theirs.sendall(struct.pack(">BxxxL", stream, len(data)) + data)
+
+        for target, args in ((pump_in, ()), (pump_out, (process.stdout, 1)),
+                             (pump_out, (process.stderr, 2))):
+            threading.Thread(target=_quietly(target), args=args, daemon=True).start()
+        return ours
+
+
+def _socketpair():
+    # exec_start's ``socket`` argument (docker-py's name) shadows the module
+    return socket.socketpair()
+
+
+def _quietly(target):
+    def run(*args):
+        with contextlib.suppress(OSError, ValueError):  # Peer closed
+            target(*args)
+    return run
+
+
+class FakeDockerClient:
+    """Stand-in for docker.DockerClient with simulated API latencies (seconds)."""
+
+    def __init__(self, create_latency=0.0, exec_latency=0.0, pause_latency=0.0):
+        self.create_latency = create_latency
+        self.exec_latency = exec_latency
+        self.pause_latency = pause_latency
+        self.live: dict[str, FakeContainer] = {}
+        self.containers = FakeContainers(self)
+        self.api = FakeAPI(self)
+        self.created = 0
+        self.exec_runs = 0
+        self.exec_shells = 0
+
+
+def run_sessions(make_executor, release, sessions: int, commands: int) -> tuple[list, list]:
+    first, rest = [], []
+    for n in range(sessions):
+        start = time.perf_counter()
+        executor = make_executor(f"session-{n}")
+        executor.start()
+        result = executor.execute("echo first")
+        assert result["stdout"].strip() == "first", result
+        first.append(time.perf_counter() - start)
+        for i in range(commands):
+            start = time.perf_counter()
+            result = executor.execute(f"echo {i}")
+            rest.append(time.perf_counter() - start)
+            assert result["stdout"] == f"{i}\n", result
+        release(executor)
+    return first, rest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--create-ms", type=float, default=500)
+    parser.add_argument("--exec-ms", type=float, default=30)
+    args = parser.parse_args()
+
+    latency = {"create_latency": args.create_ms / 1000, "exec_latency": args.exec_ms / 1000,
+               "pause_latency": 0.01}
+    workspace = Path(tempfile.mkdtemp())
+
+    cold_client = FakeDockerClient(**latency)
+    cold = run_sessions(
+        lambda sid: ContainerExecutor(sid, workspace, client=cold_client, persistent_shell=False),
+        lambda executor: executor.stop(),
+        args.sessions, args.commands,
+    )
+
+    pool = ContainerPool(workspace, size=2, client=FakeDockerClient(**latency))
+    pool.fill()
+    pooled = run_sessions(
+        pool.acquire,
+        lambda executor: (pool.release(executor.session_id), time.sleep(args.create_ms / 1000 * 1.5)),
+        args.sessions, args.commands,
+    )
+    pool.shutdown()
+    shutil.rmtree(workspace, ignore_errors=True)
+
+    print(f"{args.sessions} sessions x {args.commands + 1} commands "
+          f"(simulated create {args.create_ms:.0f} ms, exec {args.exec_ms:.0f} ms)")
+    for label, (first, rest) in (("cold + exec_run", cold), ("pool + shell", pooled)):
+        print(f"{label:16s} first command {statistics.mean(first) * 1000:7.1f} ms  "
+              f"next commands p50 {statistics.median(rest) * 1000:6.1f} ms  "
+              f"max {max(rest) * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
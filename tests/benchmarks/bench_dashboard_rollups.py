@@ -0,0 +1,180 @@
+"""Benchmark: dashboard chart and quick-stats queries, raw-row scans vs rollup buckets.
+
+Fills a temporary dashboard database with N raw metric rows (and N/20
+events) spread over the last 90 days, builds the rollups the way init_db()
+does for existing data, then times what the dashboard endpoints run:
+
+- /metrics/timeseries for 24h, 7d, 30d and 90d with the default metrics
+  (tasks, messages, cost). The raw variant reproduces the previous
+  aggregate_metrics: one strftime GROUP BY over dashboard_metrics per
+  metric. The rollup variant is one aggregate_metrics_many() call.
+- /metrics/summary: the previous get_quick_stats (six scans of today's
+  events and metrics) vs the day-bucket reads.
+- record_metric(): raw insert only vs raw insert + bucket upserts.
+
+Raw retention is disabled so both variants see the same rows.
+
+Usage:
+    python -m tests.benchmarks.bench_dashboard_rollups [--rows 10000000] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from tools.dashboard.backend import database, seed
+
+
+METRICS = (
+    "task_count", "message_count", "api_cost_usd", "error_count",
+    "response_time_ms", "tokens_input", "tokens_output",
+)
+DAYS = 90
+PERIODS = {"24h": ("1h", timedelta(hours=24)), "7d": ("1d", timedelta(days=7)),
+           "30d": ("1d", timedelta(days=30)), "90d": ("1d", timedelta(days=DAYS))}
+CHART_METRICS = ["task_count", "message_count", "api_cost_usd"]
+
+
+def populate(rows: int) -> dict:
+    """Raw rows, evenly spaced up to now (oldest first)."""
+    start = (datetime.now() - timedelta(days=DAYS)).isoformat()
+    step = DAYS * 86400 / rows
+    conn = database.get_db_connection()
+    conn.execute(
+        f"""
+        WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < ? - 1)
+        INSERT INTO dashboard_metrics (metric_name, metric_value, timestamp)
+        SELECT CASE i % 7 {" ".join(f"WHEN {k} THEN '{m}'" for k, m in enumerate(METRICS))} END,
+               (abs(random()) % 500000) / 100.0,
+               strftime('%Y-%m-%dT%H:%M:%f', ?, '+' || (i * ?) || ' seconds')
+        FROM n
+    """,
+        (rows, start, step),
+    )
+    events = rows // 20
+    conn.execute(
+        """
+        WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < ? - 1)
+        INSERT INTO dashboard_events (event_type, timestamp, channel, summary, severity)
+        SELECT CASE i % 4 WHEN 0 THEN 'task' WHEN 1 THEN 'message'
+                          WHEN 2 THEN 'tool_use' ELSE 'system' END,
+               strftime('%Y-%m-%dT%H:%M:%f', ?, '+' || (i * ?) || ' seconds'),
+               CASE i % 5 WHEN 0 THEN NULL WHEN 1 THEN 'telegram'
+                          WHEN 2 THEN 'discord' ELSE 'slack' END,
+               'event ' || i,
+               CASE WHEN i % 50 = 0 THEN 'error' ELSE 'info' END
+        FROM n
+    """,
+        (events, start, step * 20),
+    )
+    conn.commit()
+    conn.close()
+    return {"success": True, "message": "", "events": events, "metrics": rows}
+
+
+def raw_timeseries(start: datetime, end: datetime, interval: str) -> dict:
+    date_format = {"1h": "%Y-%m-%d %H:00:00", "1d": "%Y-%m-%d 00:00:00"}[interval]
+    conn = database.get_db_connection()
+    series = {}
+    for metric in CHART_METRICS:
+        rows = conn.execute(
+            f"""
+            SELECT strftime('{date_format}', timestamp) as period, SUM(metric_value) as value
+            FROM dashboard_metrics
+            WHERE metric_name = ? AND timestamp >= ? AND timestamp <= ?
+            GROUP BY period ORDER BY period
+        """,
+            (metric, start.isoformat(), end.isoformat()),
+        ).fetchall()
+        series[metric] = [{"timestamp": r["period"], "value": r["value"]} for r in rows]
+    conn.close()
+    return series
+
+
+def raw_quick_stats() -> dict:
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    conn = database.get_db_connection()
+
+    def one(sql: str) -> float:
+        return conn.execute(sql, (today,)).fetchone()[0] or 0
+
+    stats = {
+        "tasks": one("SELECT COUNT(*) FROM dashboard_events "
+                     "WHERE event_type = 'task' AND timestamp >= ?"),
+        "messages": one("SELECT COUNT(*) FROM dashboard_events "
+                        "WHERE event_type = 'message' AND timestamp >= ?"),
+        "errors": one("SELECT COUNT(*) FROM dashboard_events "
+                      "WHERE severity = 'error' AND timestamp >= ?"),
+        "cost": one("SELECT SUM(metric_value) FROM dashboard_metrics "
+                    "WHERE metric_name = 'api_cost_usd' AND timestamp >= ?"),
+        "channels": one("SELECT COUNT(DISTINCT channel) FROM dashboard_events "
+                        "WHERE channel IS NOT NULL AND timestamp >= ?"),
+        "response": one("SELECT AVG(metric_value) FROM dashboard_metrics "
+                        "WHERE metric_name = 'response_time_ms' AND timestamp >= ?"),
+    }
+    conn.close()
+    return stats
+
+
+def raw_record_metric(name: str, value: float) -> None:
+    conn = database.get_db_connection()
+    conn.execute(
+        "INSERT INTO dashboard_metrics (metric_name, metric_value, timestamp, labels) "
+        "VALUES (?, ?, ?, NULL)",
+        (name, value, datetime.now().isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--writes", type=int, default=2000)
+    args = parser.parse_args()
+
+    database.DB_PATH = Path(tempfile.mkdtemp()) / "dashboard.db"
+    database.RAW_METRIC_RETENTION_DAYS = DAYS + 1
+    database.RETENTION_INTERVAL_SECONDS = float("inf")
+    seed.seed_database = lambda force=False: populate(args.rows)
+
+    start = time.perf_counter()
+    database.init_db()  # creates tables, "seeds" and rebuilds the rollups
+    print(f"{args.rows:,} metric rows, {args.rows // 20:,} events "
+          f"(load + rollup rebuild {time.perf_counter() - start:.1f} s)")
+
+    now = datetime.now()
+    print(f"{'endpoint':24s} {'raw rows':>10s} {'rollups':>10s}")
+    for period, (interval, span) in PERIODS.items():
+        begin = now - span
+        raw = timed(lambda b=begin, i=interval: raw_timeseries(b, now, i), args.repeat)
+        rollup = timed(lambda b=begin, i=interval: database.aggregate_metrics_many(
+            CHART_METRICS, "sum", b, now, i), args.repeat)
+        print(f"{'timeseries ' + period:24s} {raw:8.1f}ms {rollup:8.2f}ms")
+
+    raw = timed(raw_quick_stats, args.repeat)
+    rollup = timed(database.get_quick_stats, args.repeat)
+    print(f"{'summary (quick stats)':24s} {raw:8.1f}ms {rollup:8.2f}ms")
+
+    raw = timed(lambda: [raw_record_metric("response_time_ms", 120.0)
+                         for _ in range(args.writes)], 1) / args.writes
+    rollup = timed(lambda: [database.record_metric("response_time_ms", 120.0)
+                            for _ in range(args.writes)], 1) / args.writes
+    print(f"{'record_metric (per call)':24s} {raw:8.3f}ms {rollup:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
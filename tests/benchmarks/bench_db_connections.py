@@ -0,0 +1,99 @@
+"""Benchmark: per-call sqlite3.connect + DDL vs the shared connection registry.
+
+Runs a representative mix of tool calls (audit writes, permission checks,
+rate-limit checks, task reads/writes) against temporary databases, first
+with the legacy "connect, run schema DDL, close" helper patched in, then with
+the registry-backed ``get_connection()`` helpers.
+
+Usage:
+    python -m tests.benchmarks.bench_db_connections [--ops 2000]
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from tools import db_connections
+from tools.dashboard.backend import database as dashboard_db
+from tools.security import audit, permissions, ratelimit
+from tools.tasks import manager
+
+
+MODULES = {
+    "audit": audit,
+    "permissions": permissions,
+    "ratelimit": ratelimit,
+    "manager": manager,
+}
+
+
+def _legacy_factory(module):
+    """Recreate the pre-registry helper: fresh connection + DDL on every call."""
+
+    def legacy_get_connection():
+        module.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(module.DB_PATH))
+        conn.row_factory = sqlite3.Row
+        module._init_schema(conn)
+        return conn
+
+    return legacy_get_connection
+
+
+def _run_mix(ops: int) -> float:
+    task = manager.create_task(user_id="bench", raw_input="benchmark task")
+    task_id = task["data"]["task_id"]
+    start = time.perf_counter()
+    for i in range(ops):
+        kind = i % 4
+        if kind == 0:
+            audit.log_event("command", "bench:op", user_id="bench", status="success")
+        elif kind == 1:
+            permissions.check_permission("bench", "chat:send")
+        elif kind == 2:
+            ratelimit.check_rate_limit("user", "bench", tokens=1)
+        else:
+            manager.get_task(task_id)
+    return time.perf_counter() - start
+
+
+def _bench(ops: int, legacy: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        for name, module in MODULES.items():
+            stack.enter_context(patch.object(module, "DB_PATH", Path(tmp) / f"{name}.db"))
+        stack.enter_context(patch("tools.tasks.DB_PATH", Path(tmp) / "manager.db"))
+        # The dashboard mirror of audit events and the rate limiter's YAML
+        # parsing are not database work; keep them out of the measurement.
+        stack.enter_context(patch.object(dashboard_db, "log_audit", lambda **_: None))
+        config = ratelimit.load_config()
+        stack.enter_context(patch.object(ratelimit, "load_config", lambda: config))
+        if legacy:
+            for module in MODULES.values():
+                stack.enter_context(
+                    patch.object(module, "get_connection", _legacy_factory(module))
+                )
+        db_connections.close_all()
+        db_connections.reset_stats()
+        elapsed = _run_mix(ops)
+        db_connections.close_all()
+    return ops / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    before = _bench(args.ops, legacy=True)
+    after = _bench(args.ops, legacy=False)
+    print(f"legacy connect-per-call : {before:10.0f} ops/sec")
+    print(f"connection registry     : {after:10.0f} ops/sec")
+    print(f"speedup                 : {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: flow checks on the notification path.
+
+Records a burst of activity for a set of users, then times detect_flow()
+the way notify.should_suppress() and the mobile scheduler call it (once per
+notification), plus record_activity() throughput.
+
+Usage:
+    python -m tests.benchmarks.bench_flow_detector [--users 50] [--checks 20000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from tools.automation import flow_detector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--checks", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    users = [f"user{i}" for i in range(args.users)]
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        patch.object(flow_detector, "DB_PATH", Path(tmp) / "scheduler.db"),
+        patch.object(flow_detector, "CONFIG_PATH", Path(tmp) / "missing.yaml"),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.records):
+            flow_detector.record_activity(rng.choice(users), rng.uniform(2, 120))
+        flush = getattr(flow_detector, "flush_pending", None)
+        if flush:
+            flush()
+        elapsed = time.perf_counter() - start
+        print(f"record_activity : {args.records / elapsed:10.0f} ops/sec")
+
+        start = time.perf_counter()
+        for _ in range(args.checks):
+            flow_detector.detect_flow(rng.choice(users))
+        elapsed = time.perf_counter() - start
+        print(f"detect_flow     : {args.checks / elapsed:10.0f} ops/sec")
+
+        reset = getattr(flow_detector, "reset_state", None)
+        if reset:
+            reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: hook timing metrics with unbounded lists vs quantile sketches.
+
+Records hook durations for a few hooks (as a long-running gateway does on
+every tool call), then reads the dashboard summary. The list-based variant
+reproduces the previous HookMetrics: every duration appended forever and
+sorted on each read.
+
+Usage:
+    python -m tests.benchmarks.bench_hook_metrics [--calls 200000] [--reads 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from tools.agent.hooks import HookMetrics
+
+
+HOOKS = ("pre_tool_use", "post_tool_use", "stop", "bash_security")
+
+
+def list_summary(timings: dict[str, list[float]]) -> dict:
+    """Percentiles the way the list-based HookMetrics computed them."""
+    result = {}
+    for name, times in timings.items():
+        ordered = sorted(times)
+        result[name] = {
+            "avg_ms": statistics.mean(times),
+            **{f"p{p}_ms": ordered[int((len(ordered) - 1) * p / 100)] for p in (50, 95, 99)},
+        }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--reads", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    durations = [(HOOKS[i % len(HOOKS)], rng.lognormvariate(0, 1)) for i in range(args.calls)]
+
+    timings: dict[str, list[float]] = {}
+    start = time.perf_counter()
+    for name, duration in durations:
+        timings.setdefault(name, []).append(duration)
+    list_record = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        expected = list_summary(timings)
+    list_read = (time.perf_counter() - start) / args.reads
+    list_bytes = sum(sys.getsizeof(t) + 24 * len(t) for t in timings.values())
+
+    metrics = object.__new__(HookMetrics)
+    metrics._initialize()
+    metrics.slow_threshold_ms = float("inf")
+    start = time.perf_counter()
+    for name, duration in durations:
+        metrics.record(name, duration)
+    sketch_record = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        summary = metrics.summary()
+    sketch_read = (time.perf_counter() - start) / args.reads
+    sketch_bytes = sum(
+        sys.getsizeof(stats.sketch.buckets) + 64 * len(stats.sketch.buckets)
+        for stats in metrics.stats.values()
+    )
+
+    error = max(
+        abs(summary["hooks"][name][key] - expected[name][key]) / expected[name][key]
+        for name in HOOKS
+        for key in ("p50_ms", "p95_ms", "p99_ms")
+    )
+    print(f"{args.calls} hook calls across {len(HOOKS)} hooks")
+    print(f"lists    record {list_record / args.calls * 1e6:6.2f} us/call  "
+          f"summary {list_read * 1000:8.2f} ms  memory ~{list_bytes / 1024:8.0f} KiB")
+    print(f"sketches record {sketch_record / args.calls * 1e6:6.2f} us/call  "
+          f"summary {sketch_read * 1000:8.2f} ms  memory ~{sketch_bytes / 1024:8.0f} KiB")
+    print(f"max percentile relative error: {error:.4f}")
+
+
+if __name__ == "__main__":
+    main()
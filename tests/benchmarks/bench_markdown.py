@@ -0,0 +1,123 @@
+"""Benchmark: markdown conversion, splitting and streamed re-rendering.
+
+Builds a ~50 KB model-style response (headings, lists, inline formatting,
+fenced code) and reports:
+
+- convert+split: converting for each channel and splitting to its limit
+- streaming: rendering the growing text after every delta, either by
+  converting the whole accumulated text each time or with MarkdownStream
+- pagination: splitting the growing text per delta from scratch vs
+  resuming after the sealed pages (as StreamRenderer does)
+- blocks: parse_response_blocks on the growing text per delta vs
+  ResponseBlockParser.feed()
+
+Usage:
+    python -m tests.benchmarks.bench_markdown [--kb 50] [--delta 40]
+"""
+
+import argparse
+import time
+
+from tools.channels.content.markdown import MarkdownConverter, MarkdownStream
+from tools.channels.content.splitter import ContentSplitter
+from tools.channels.media_processor import ResponseBlockParser, parse_response_blocks
+
+
+CHANNELS = ("telegram", "discord", "slack")
+
+
+def build_response(kb: int) -> str:
+    section = (
+        "## Step {i}\n\n"
+        "Run the **migration** for `table_{i}` and check *every* row; see "
+        "[the guide](https://docs.example.com/step/{i}) for ~~old~~ details.\n"
+        "- keep snake_case_names intact\n"
+        "- escape <html> & entities\n\n"
+        "```python\n"
+        + "".join(f"value_{{i}}_{n} = compute({n}) ** 2  # <{n}>\n" for n in range(8))
+        + "```\n\n"
+    )
+    parts, size, i = [], 0, 0
+    while size < kb * 1024:
+        part = section.format(i=i)
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "".join(parts)
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb", type=int, default=50)
+    parser.add_argument("--delta", type=int, default=40, help="Characters per streamed delta")
+    args = parser.parse_args()
+
+    text = build_response(args.kb)
+    deltas = [text[i:i + args.delta] for i in range(0, len(text), args.delta)]
+    converter = MarkdownConverter()
+    splitter = ContentSplitter()
+    print(f"response: {len(text) / 1024:.1f} KB, {len(deltas)} deltas")
+
+    for channel in CHANNELS:
+        elapsed = timed(lambda c=channel: splitter.split_text(converter.convert(text, c), c))
+        print(f"convert+split {channel:8s}: {elapsed * 1000:8.2f} ms")
+
+    def full_rerender():
+        accumulated = ""
+        for delta in deltas:
+            accumulated += delta
+            converter.convert(accumulated, "telegram")
+
+    def incremental():
+        stream = MarkdownStream("telegram")
+        for delta in deltas:
+            stream.append(delta)
+            stream.render()
+
+    print(f"streaming full re-render : {timed(full_rerender, 1) * 1000:8.1f} ms")
+    print(f"streaming MarkdownStream : {timed(incremental, 1) * 1000:8.1f} ms")
+
+    def paginate_scratch():
+        accumulated = ""
+        for delta in deltas:
+            accumulated += delta
+            splitter.split_text(accumulated, "discord")
+
+    def paginate_resume():
+        accumulated, start, reopen = "", 0, ""
+        for delta in deltas:
+            accumulated += delta
+            chunks = splitter.split_chunks(accumulated, "discord", start=start, reopen=reopen)
+            for chunk in chunks[:-1]:
+                start, reopen = chunk.end, chunk.reopen
+
+    print(f"pagination from scratch  : {timed(paginate_scratch, 1) * 1000:8.1f} ms")
+    print(f"pagination resumed       : {timed(paginate_resume, 1) * 1000:8.1f} ms")
+
+    def blocks_reparse():
+        accumulated = ""
+        for delta in deltas:
+            accumulated += delta
+            parse_response_blocks(accumulated)
+
+    def blocks_incremental():
+        parser = ResponseBlockParser()
+        for delta in deltas:
+            parser.feed(delta)
+        parser.close()
+
+    print(f"blocks full reparse      : {timed(blocks_reparse, 1) * 1000:8.1f} ms")
+    print(f"blocks incremental       : {timed(blocks_incremental, 1) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
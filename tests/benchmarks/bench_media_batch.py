@@ -0,0 +1,92 @@
+"""Benchmark: end-to-end latency of MediaProcessor.process_attachments_batch().
+
+Processes a message with three mixed attachments (image, voice note, text
+document) against stubbed backends with fixed latencies: download, Claude
+Vision and Whisper transcription. Reports the mean batch latency.
+
+Usage:
+    python -m tests.benchmarks.bench_media_batch [--runs 5] [--download-ms 200]
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import patch
+
+from tools.channels import audio_processor
+from tools.channels.media_processor import MediaProcessor
+from tools.channels.models import Attachment
+
+
+class StubAdapter:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def download_attachment(self, attachment):
+        await asyncio.sleep(self.latency)
+        return b"x" * 1024
+
+
+class StubTranscriber:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def transcribe(self, audio_bytes, filename, mime_type):
+        await asyncio.sleep(self.latency)
+        return audio_processor.TranscriptionResult(
+            success=True, text="hello", duration_seconds=12.0, cost_usd=0.0012
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--download-ms", type=float, default=200.0)
+    parser.add_argument("--vision-ms", type=float, default=800.0)
+    parser.add_argument("--transcribe-ms", type=float, default=600.0)
+    args = parser.parse_args()
+
+    attachments = [
+        Attachment(id="img", type="image", filename="photo.jpg",
+                   mime_type="image/jpeg", size_bytes=200_000),
+        Attachment(id="voice", type="audio", filename="voice.ogg",
+                   mime_type="audio/ogg", size_bytes=48_000),
+        Attachment(id="doc", type="document", filename="notes.txt",
+                   mime_type="text/plain", size_bytes=1024),
+    ]
+    processor = MediaProcessor(
+        config={"processing": {"max_processing_cost_usd": 0.20, "cache": {"enabled": False}}}
+    )
+
+    async def vision(image_data):
+        await asyncio.sleep(args.vision_ms / 1000)
+        return "a photo", 0.006
+
+    async def prepare(image_bytes):
+        return {"type": "image"}
+
+    adapter = StubAdapter(args.download_ms / 1000)
+    transcriber = StubTranscriber(args.transcribe_ms / 1000)
+
+    with (
+        patch.object(processor, "_call_vision_api", side_effect=vision),
+        patch.object(processor, "_prepare_image_for_vision", side_effect=prepare),
+        patch.object(audio_processor, "get_audio_processor", return_value=transcriber),
+    ):
+        elapsed = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            results = asyncio.run(
+                processor.process_attachments_batch(attachments, "telegram", adapter)
+            )
+            elapsed.append(time.perf_counter() - start)
+            assert all(m.processed for m in results), [m.processing_error for m in results]
+
+    mean_ms = sum(elapsed) / len(elapsed) * 1000
+    print(f"3 mixed attachments: {mean_ms:8.1f} ms/batch "
+          f"(order: {', '.join(m.attachment.id for m in results)})")
+    processor.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: repeat forwards with and without the media result cache.
+
+Replays a stream of image/voice/document attachments in which a share of
+the files are re-sent (as forwards with new file ids, or the same file id
+again) against stubbed download, Vision and Whisper backends with fixed
+latencies. Reports mean latency per attachment and total API spend.
+
+Usage:
+    python -m tests.benchmarks.bench_media_cache [--messages 60] [--repeat 0.5]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from unittest.mock import AsyncMock, patch
+
+from tools.channels import audio_processor
+from tools.channels.media_processor import MediaProcessor
+from tools.channels.models import Attachment
+
+
+KINDS = (
+    ("image", "photo.jpg", "image/jpeg"),
+    ("audio", "voice.ogg", "audio/ogg"),
+    ("document", "notes.txt", "text/plain"),
+)
+
+
+class StubAdapter:
+    def __init__(self, latency: float, contents: dict[str, bytes]):
+        self.latency = latency
+        self.contents = contents
+        self.downloads = 0
+
+    async def download_attachment(self, attachment):
+        await asyncio.sleep(self.latency)
+        self.downloads += 1
+        return self.contents[attachment.id]
+
+
+class StubTranscriber:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def transcribe(self, audio_bytes, filename, mime_type):
+        await asyncio.sleep(self.latency)
+        return audio_processor.TranscriptionResult(
+            success=True, text="hello", duration_seconds=12.0, cost_usd=0.0012
+        )
+
+
+def build_stream(messages: int, repeat: float, seed: int = 7):
+    """Attachments plus the bytes behind each file id."""
+    rng = random.Random(seed)
+    attachments, contents, seen = [], {}, []
+    for i in range(messages):
+        if seen and rng.random() < repeat:
+            original = rng.choice(seen)
+            if rng.random() < 0.5:
+                attachments.append(original)  # Same platform file again
+                continue
+            file_id = f"fwd-{i}"  # Forward: new id, same bytes
+            contents[file_id] = contents[original.id]
+            kind, filename, mime = original.type, original.filename, original.mime_type
+        else:
+            file_id = f"file-{i}"
+            contents[file_id] = f"content {i} ".encode() * 100
+            kind, filename, mime = KINDS[i % len(KINDS)]
+        attachment = Attachment(id=file_id, type=kind, filename=filename,
+                                mime_type=mime, size_bytes=len(contents[file_id]))
+        attachments.append(attachment)
+        if file_id.startswith("file-"):
+            seen.append(attachment)
+    return attachments, contents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=60)
+    parser.add_argument("--repeat", type=float, default=0.5)
+    parser.add_argument("--download-ms", type=float, default=200.0)
+    parser.add_argument("--vision-ms", type=float, default=800.0)
+    parser.add_argument("--transcribe-ms", type=float, default=600.0)
+    args = parser.parse_args()
+
+    attachments, contents = build_stream(args.messages, args.repeat)
+
+    async def vision(image_data):
+        await asyncio.sleep(args.vision_ms / 1000)
+        return "a photo", 0.006
+
+    async def prepare(image_bytes):
+        return {"type": "image"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, cache in (("no cache", {"enabled": False}), ("cache", {"directory": tmp})):
+            processor = MediaProcessor(config={
+                "processing": {"worker_pool": {"workers": 0}, "cache": cache},
+            })
+            processor.cache.record_lookup = AsyncMock()
+            adapter = StubAdapter(args.download_ms / 1000, contents)
+
+            async def run(processor, adapter):
+                spent = 0.0
+                start = time.perf_counter()
+                for attachment in attachments:
+                    media = await processor.process_attachment(attachment, "telegram", adapter)
+                    assert media.processed, media.processing_error
+                    spent += media.processing_cost_usd
+                return time.perf_counter() - start, spent
+
+            with (
+                patch.object(processor, "_call_vision_api", side_effect=vision),
+                patch.object(processor, "_prepare_image_for_vision", side_effect=prepare),
+                patch.object(audio_processor, "get_audio_processor",
+                             return_value=StubTranscriber(args.transcribe_ms / 1000)),
+            ):
+                elapsed, spent = asyncio.run(run(processor, adapter))
+            processor.cleanup()
+
+            print(
+                f"{name:8s}: {elapsed / len(attachments) * 1000:6.1f} ms/attachment | "
+                f"downloads {adapter.downloads:3d} | spend ${spent:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
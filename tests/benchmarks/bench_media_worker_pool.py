@@ -0,0 +1,118 @@
+"""Benchmark: event-loop responsiveness while a large PDF is ingested.
+
+Builds a text-heavy PDF (200 pages by default) and extracts it through
+MediaProcessor._extract_pdf while a ticker task measures how late the event
+loop wakes it (what every channel adapter would feel). Compares parsing on
+the event loop (the previous behaviour) with the media worker pool.
+
+Usage:
+    python -m tests.benchmarks.bench_media_worker_pool [--pages 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from tools.channels.media.worker_pool import extract_pdf_text
+from tools.channels.media_processor import MediaProcessor
+
+
+TICK_SECONDS = 0.005
+
+
+def build_pdf(pages: int, lines_per_page: int = 60) -> bytes:
+    """Minimal multi-page PDF with Helvetica text on every page."""
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = len(objects) + 1 + 2 * pages  # reserved after page objects
+    page_ids = []
+    for p in range(pages):
+        text = b"BT /F1 9 Tf 40 800 Td 11 TL " + b" ".join(
+            b"(Page %d line %d: the quick brown fox jumps over the lazy dog) '" % (p + 1, i)
+            for i in range(lines_per_page)
+        ) + b" ET"
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font, content)
+        ))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    assert add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)) == pages_id
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(out)
+
+
+async def measure(extract, pdf: bytes, pages: int) -> dict:
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        while not stop.is_set():
+            expected = time.perf_counter() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    text, page_count = await extract(pdf, pages)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    assert page_count == pages and f"Page {pages} line" in text
+    lags.sort()
+    return {
+        "elapsed_s": elapsed,
+        "max_lag_ms": lags[-1] * 1000,
+        "p99_lag_ms": lags[int(len(lags) * 0.99) - 1] * 1000,
+        "median_lag_ms": statistics.median(lags) * 1000,
+        "ticks": len(lags),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    pdf = build_pdf(args.pages)
+    print(f"PDF: {args.pages} pages, {len(pdf) / 1024:.0f} KiB")
+
+    async def on_loop(data, max_pages):
+        return extract_pdf_text(data, max_pages)
+
+    processor = MediaProcessor(config={"processing": {"worker_pool": {"workers": 2}}})
+    processor.workers.start()
+    try:
+        for name, extract in (("event loop", on_loop), ("worker pool", processor._extract_pdf)):
+            r = asyncio.run(measure(extract, pdf, args.pages))
+            print(
+                f"{name:11s}: extract {r['elapsed_s'] * 1000:7.0f} ms | loop lag max "
+                f"{r['max_lag_ms']:7.1f} ms, p99 {r['p99_lag_ms']:6.1f} ms, "
+                f"median {r['median_lag_ms']:5.2f} ms | ticks {r['ticks']}"
+            )
+    finally:
+        processor.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: one mobile notification queue cycle over 50k queued notifications.
+
+Seeds users with one Web Push subscription each and a generous hourly
+limit, stubs the push sender with a fixed simulated network latency, and
+times a single process_queue() run that drains the whole queue.
+
+Usage:
+    python -m tests.benchmarks.bench_notification_queue [--notifications 50000] [--users 500]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import tools.mobile
+from tools.mobile.queue import notification_queue
+
+
+def _seed(users: int, notifications: int) -> None:
+    now = datetime.now().isoformat()
+    conn = tools.mobile.get_connection()
+    conn.executemany(
+        "INSERT INTO push_subscriptions (id, user_id, endpoint, p256dh_key, auth_key) "
+        "VALUES (?, ?, ?, 'p256dh', 'auth')",
+        [(f"sub{u}", f"user{u}", f"https://push.example/{u}") for u in range(users)],
+    )
+    conn.executemany(
+        "INSERT INTO notification_preferences "
+        "(user_id, quiet_hours_start, quiet_hours_end, max_notifications_per_hour) "
+        "VALUES (?, '', '', ?)",
+        [(f"user{u}", notifications) for u in range(users)],
+    )
+    conn.executemany(
+        "INSERT INTO notification_queue (id, user_id, category, priority, title, data, "
+        "status, created_at) VALUES (?, ?, 'task_reminder', ?, ?, '{}', 'pending', ?)",
+        [
+            (f"notif_{uuid.uuid4().hex[:12]}", f"user{i % users}", 1 + i % 7, f"N{i}", now)
+            for i in range(notifications)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notifications", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    async def fake_send(**kwargs):
+        await asyncio.sleep(args.latency_ms / 1000)
+        return {"success": True, "delivery_id": None}
+
+    async def not_in_flow(user_id):
+        return {"in_flow": False, "expected_end": None}
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        patch.object(tools.mobile, "DB_PATH", Path(tmp) / "mobile.db"),
+        patch("tools.mobile.push.delivery.send_push", side_effect=fake_send),
+        patch("tools.mobile.queue.scheduler._check_flow_state", side_effect=not_in_flow),
+    ):
+        _seed(args.users, args.notifications)
+        print(f"queued: {args.notifications} notifications for {args.users} users")
+
+        start = time.perf_counter()
+        results = asyncio.run(notification_queue.process_queue(limit=args.notifications))
+        elapsed = time.perf_counter() - start
+
+    print(f"processed {results['processed']}, sent {results['sent']}, "
+          f"suppressed {results['suppressed']}, errors {results['errors']}")
+    print(f"cycle: {elapsed:8.2f} s  ({results['processed'] / elapsed:8.0f} notifications/sec)")
+    for stage, ms in results.get("timings_ms", {}).items():
+        print(f"  {stage:<12}: {ms:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
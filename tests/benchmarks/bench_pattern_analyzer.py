@@ -0,0 +1,110 @@
+"""Benchmark: pattern analysis over a year of synthetic events.
+
+Generates a year of activity and task events for one user, then times
+analyze_patterns() for a cold run (rollups built from the window) and for
+warm runs after a handful of new events (incremental sync only).
+
+Usage:
+    python -m tests.benchmarks.bench_pattern_analyzer [--per-day 80] [--runs 5]
+"""
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from tools.learning import pattern_analyzer
+
+
+ACTIVITY_TYPES = ["message", "command", "session_start", "voice_note", "email_check"]
+TASK_EVENTS = ["postponed", "postponed", "completed", "started"]
+
+
+def _seed(db_path: Path, per_day: int, days: int = 365) -> int:
+    rng = random.Random(42)
+    now = datetime.now()
+    activity_rows = []
+    task_rows = []
+    for day in range(days):
+        base = now - timedelta(days=day)
+        for _ in range(per_day):
+            ts = base.replace(hour=rng.choice([8, 9, 10, 14, 15, 20]), minute=rng.randint(0, 59))
+            activity_rows.append(
+                (
+                    uuid.uuid4().hex[:12],
+                    "bench",
+                    rng.choice(ACTIVITY_TYPES),
+                    ts.isoformat(),
+                    ts.hour,
+                    ts.weekday(),
+                    None,
+                )
+            )
+        for _ in range(per_day // 4):
+            ts = base.replace(hour=rng.choice([9, 11, 15]), minute=rng.randint(0, 59))
+            task_id = f"task{rng.randint(0, 300)}"
+            task_rows.append(
+                (
+                    uuid.uuid4().hex[:12],
+                    "bench",
+                    task_id,
+                    f"Task {task_id}",
+                    rng.choice(TASK_EVENTS),
+                    ts.isoformat(),
+                    None,
+                )
+            )
+
+    conn = pattern_analyzer.get_connection()
+    conn.executemany("INSERT INTO activity_events VALUES (?, ?, ?, ?, ?, ?, ?)", activity_rows)
+    conn.executemany("INSERT INTO task_events VALUES (?, ?, ?, ?, ?, ?, ?)", task_rows)
+    conn.commit()
+    conn.close()
+    return len(activity_rows) + len(task_rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-day", type=int, default=80)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--since", default="365d")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "learning.db"
+        with (
+            patch.object(pattern_analyzer, "DB_PATH", db_path),
+            patch.object(pattern_analyzer, "CONFIG_PATH", Path(tmp) / "missing.yaml"),
+        ):
+            total = _seed(db_path, args.per_day)
+            print(f"events: {total}")
+
+            start = time.perf_counter()
+            pattern_analyzer.analyze_patterns("bench", since=args.since)
+            print(f"cold analyze        : {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+            timings = []
+            for _ in range(args.runs):
+                for _ in range(20):
+                    pattern_analyzer.record_activity("bench", "message")
+                start = time.perf_counter()
+                pattern_analyzer.analyze_patterns("bench", since=args.since)
+                timings.append(time.perf_counter() - start)
+            print(f"warm analyze (mean) : {sum(timings) / len(timings) * 1000:9.1f} ms")
+
+            conn = sqlite3.connect(db_path)
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM task_events "
+                "WHERE user_id = 'bench' AND event_time >= '2000-01-01'"
+            ).fetchall()
+            conn.close()
+            print(f"window scan plan    : {plan[-1][-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: permission decisions per second.
+
+Checks permissions for a set of users, first for "chat:send" alone (the
+check every inbound message makes) and then for a mix with tool
+permissions and denials (every denial is still audited), each first with the previous per-call implementation (role JOIN, json.loads and
+fnmatch over every permission, an audit write per check) and then with
+check_permission's compiled matchers, decision cache and sampled audit.
+
+Usage:
+    python -m tests.benchmarks.bench_permissions [--checks 5000] [--users 20]
+"""
+
+import argparse
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from tools import db_connections
+from tools.dashboard.backend import database as dashboard_db
+from tools.security import audit, permissions
+
+
+ROLES = ("user", "power_user", "admin", "owner")
+MIXES = {
+    "chat:send": ("chat:send",),
+    "mixed": ("chat:send", "chat:send", "chat:send", "memory:write", "tools:execute", "admin:users"),
+}
+
+
+def legacy_check_permission(user_id: str, permission: str) -> dict:
+    """check_permission as it was before the decision cache."""
+    conn = permissions.get_connection()
+    rows = conn.execute(
+        """
+        SELECT r.permissions FROM user_roles ur JOIN roles r ON ur.role_name = r.name
+        WHERE ur.user_id = ? AND (ur.expires_at IS NULL OR ur.expires_at > datetime('now'))
+        ORDER BY r.priority DESC
+        """,
+        (user_id,),
+    ).fetchall()
+    conn.close()
+    user_permissions = set()
+    for row in rows:
+        user_permissions.update(permissions.json.loads(row["permissions"]))
+    user_permissions = list(user_permissions)
+    allowed = any(permissions.permission_matches(up, permission) for up in user_permissions)
+    elevated = any(permissions.permission_matches(ea, permission) for ea in permissions.ELEVATED_ACTIONS)
+    audit.log_event(
+        event_type="permission", action="check", user_id=user_id, resource=permission,
+        status="success" if allowed else "failure",
+    )
+    return {"allowed": allowed, "requires_elevation": elevated and allowed}
+
+
+def _bench(check, required: tuple[str, ...], checks: int, users: int) -> float:
+    start = time.perf_counter()
+    for i in range(checks):
+        check(f"bench-{i % users}", required[i % len(required)])
+    return checks / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        stack.enter_context(patch.object(permissions, "DB_PATH", Path(tmp) / "permissions.db"))
+        stack.enter_context(patch.object(audit, "DB_PATH", Path(tmp) / "audit.db"))
+        stack.enter_context(patch.object(dashboard_db, "log_audit", lambda **_: None))
+        for n in range(args.users):
+            permissions.grant_role(f"bench-{n}", ROLES[n % len(ROLES)])
+
+        # Both implementations must agree before timing them
+        for n in range(args.users):
+            for perm in MIXES["mixed"]:
+                assert (
+                    legacy_check_permission(f"bench-{n}", perm)["allowed"]
+                    == permissions.check_permission(f"bench-{n}", perm)["allowed"]
+                )
+
+        for mix, required in MIXES.items():
+            before = _bench(legacy_check_permission, required, args.checks, args.users)
+            after = _bench(permissions.check_permission, required, args.checks, args.users)
+            print(f"{mix:9s} per-call JOIN + fnmatch + audit : {before:10.0f} decisions/sec")
+            print(f"{mix:9s} compiled matchers + cache       : {after:10.0f} decisions/sec")
+            print(f"{mix:9s} speedup                         : {after / before:10.2f}x")
+        permissions.flush_permission_audit()
+        db_connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
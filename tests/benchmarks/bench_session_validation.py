@@ -0,0 +1,86 @@
+"""Benchmark: dashboard request latency under concurrent clients, per-call SQLite vs the session cache.
+
+Simulates the dashboard auth middleware: each of N clients sends requests
+back to back on one event loop, and every request calls validate_session()
+synchronously (as the middleware does) before a trivial handler. Reports
+p50/p99 request latency including time queued behind other requests. The
+uncached variant reproduces the previous validate_session: hash, SELECT
+by token hash and an UPDATE + commit of last_activity per call.
+
+Usage:
+    python -m tests.benchmarks.bench_session_validation [--clients 300] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from tools.security import session
+
+
+def uncached_validate(token: str, channel=None, device_id=None, update_activity=True) -> dict:
+    conn = session.get_connection()
+    row = conn.execute(
+        "SELECT * FROM sessions WHERE token_hash = ?", (session.hash_token(token),)
+    ).fetchone()
+    if not row or not row["is_active"]:
+        conn.close()
+        return {"success": True, "valid": False}
+    if update_activity:
+        conn.execute(
+            "UPDATE sessions SET last_activity = ? WHERE id = ?",
+            (datetime.now().isoformat(), row["id"]),
+        )
+        conn.commit()
+    conn.close()
+    return {"success": True, "valid": True, "user_id": row["user_id"]}
+
+
+async def run_clients(validate, tokens: list[str], requests: int) -> list[float]:
+    latencies: list[float] = []
+
+    async def client(token: str) -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            result = validate(token, update_activity=True)
+            assert result["valid"], result
+            await asyncio.sleep(0)  # the route handler
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(token) for token in tokens))
+    return latencies
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    session.DB_PATH = Path(tempfile.mkdtemp()) / "sessions.db"
+    # One user per client (create_session keeps at most 5 sessions per user)
+    tokens = [session.create_session(f"user-{n}", channel="dashboard")["token"]
+              for n in range(args.clients)]
+
+    print(f"{args.clients} clients x {args.requests} requests")
+    for label, validate in (("per-call SQLite", uncached_validate),
+                            ("session cache", session.validate_session)):
+        start = time.perf_counter()
+        latencies = asyncio.run(run_clients(validate, tokens, args.requests))
+        elapsed = time.perf_counter() - start
+        print(f"{label:16s} p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms  "
+              f"{len(latencies) / elapsed:9.0f} req/s")
+    print(f"activity rows written back at exit: {session.flush_session_activity()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: progressive message edits for a streamed response.
+
+Replays a token stream against a fake adapter with fixed edit latency and
+compares the previous inline approach (await each edit inside the token
+loop, every 500ms) with StreamRenderer. Reports time until the first text
+is visible, edits per response, and total time until the final edit lands.
+
+Usage:
+    python -m tests.benchmarks.bench_stream_renderer [--tokens 400] [--latency-ms 150]
+"""
+
+import argparse
+import asyncio
+import time
+
+from tools.channels.handlers.stream_renderer import TYPING_CURSOR, StreamRenderer
+
+
+class FakeAdapter:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.edits = 0
+        self.first_visible: float | None = None
+
+    async def edit(self, handle, content):
+        await asyncio.sleep(self.latency)
+        self.edits += 1
+        if self.first_visible is None:
+            self.first_visible = time.perf_counter()
+        return {"success": True}
+
+    async def send(self, content):
+        await asyncio.sleep(self.latency)
+        return object()
+
+
+async def token_stream(tokens: int, gap: float):
+    for i in range(tokens):
+        await asyncio.sleep(gap)
+        yield f"token{i} "
+
+
+async def run_inline(tokens: int, gap: float, latency: float) -> dict:
+    adapter = FakeAdapter(latency)
+    start = time.perf_counter()
+    text = ""
+    last_update = asyncio.get_running_loop().time()
+    async for delta in token_stream(tokens, gap):
+        text += delta
+        now = asyncio.get_running_loop().time()
+        if (now - last_update) * 1000 >= 500:
+            await adapter.edit(None, text[:1997] + TYPING_CURSOR)
+            last_update = now
+    await adapter.edit(None, text[:2000])
+    return _result(adapter, start)
+
+
+async def run_renderer(tokens: int, gap: float, latency: float) -> dict:
+    adapter = FakeAdapter(latency)
+    start = time.perf_counter()
+    renderer = StreamRenderer("discord", handle=None, edit=adapter.edit, send=adapter.send)
+    renderer.start()
+    async for delta in token_stream(tokens, gap):
+        renderer.push(delta)
+    stats = await renderer.finish()
+    result = _result(adapter, start)
+    result["messages"] = stats["messages"]
+    return result
+
+
+def _result(adapter: FakeAdapter, start: float) -> dict:
+    return {
+        "ttfv_ms": (adapter.first_visible - start) * 1000,
+        "edits": adapter.edits,
+        "total_ms": (time.perf_counter() - start) * 1000,
+        "messages": 1,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=400)
+    parser.add_argument("--gap-ms", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    gap = args.gap_ms / 1000
+    latency = args.latency_ms / 1000
+    for name, runner in (("inline", run_inline), ("renderer", run_renderer)):
+        r = asyncio.run(runner(args.tokens, gap, latency))
+        print(
+            f"{name:9s}: first visible {r['ttfv_ms']:7.1f} ms | edits {r['edits']:3d} | "
+            f"messages {r['messages']} | total {r['total_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: voice replies with and without the TTS cache.
+
+Replays a stream of spoken replies in which a share are fixed voice
+command confirmations ("Reminder cancelled.") and the rest are unique,
+against a stubbed TTS backend with a fixed latency. The cached run is
+pre-warmed first, as the dashboard does at startup. Reports mean latency
+per reply and total API spend.
+
+Usage:
+    python -m tests.benchmarks.bench_tts_cache [--replies 100] [--fixed 0.6]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from unittest.mock import patch
+
+from tools.channels.audio_processor import AudioProcessor, TTSResult
+from tools.channels.tts_generator import TTSGenerator
+from tools.voice.commands import STATIC_CONFIRMATIONS
+
+
+class StubTTSProcessor(AudioProcessor):
+    latency = 0.0
+
+    async def _generate_speech_openai(self, text, voice, output_format, model, speed, config):
+        await asyncio.sleep(self.latency)
+        return TTSResult(
+            success=True,
+            audio_bytes=text.encode() * 200,  # ~ a few KB of audio
+            format=output_format,
+            duration_seconds=self._estimate_speech_duration(text, speed),
+            cost_usd=self._tts_cost(text, model, config),
+        )
+
+
+def build_replies(replies: int, fixed: float, seed: int = 7) -> list[tuple[str, str]]:
+    """(text, channel) pairs."""
+    rng = random.Random(seed)
+    stream = []
+    for i in range(replies):
+        if rng.random() < fixed:
+            text = rng.choice(STATIC_CONFIRMATIONS)
+        else:
+            text = f"Got it! Task added: follow up on item {i}"
+        stream.append((text, rng.choice(("telegram", "discord", "slack", "web"))))
+    return stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replies", type=int, default=100)
+    parser.add_argument("--fixed", type=float, default=0.6)
+    parser.add_argument("--tts-ms", type=float, default=700.0)
+    args = parser.parse_args()
+
+    stream = build_replies(args.replies, args.fixed)
+    StubTTSProcessor.latency = args.tts_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, cache in (("no cache", {"enabled": False}), ("cache", {"directory": tmp})):
+            config = {"generation": {"tts": {"enabled": True, "cache": cache}}}
+            processor = StubTTSProcessor(config=config)
+            generator = TTSGenerator(config=config)
+
+            async def run(generator, cache):
+                prewarm = {"cost_usd": 0.0}
+                if cache.get("enabled", True):
+                    prewarm = await generator.prewarm()
+                spent = 0.0
+                start = time.perf_counter()
+                for text, channel in stream:
+                    result = await generator.generate_for_channel(text, channel)
+                    assert result.success, result.error
+                    spent += result.cost_usd
+                return time.perf_counter() - start, spent, prewarm["cost_usd"]
+
+            with (
+                patch("tools.channels.audio_processor.get_audio_processor", return_value=processor),
+                patch("tools.ops.cost_tracker.record_cache_lookup"),
+            ):
+                elapsed, spent, prewarm_cost = asyncio.run(run(generator, cache))
+
+            print(
+                f"{name:8s}: {elapsed / len(stream) * 1000:6.1f} ms/reply | "
+                f"spend ${spent:.4f} (+ ${prewarm_cost:.4f} one-time prewarm)"
+            )
+            if cache.get("enabled", True):
+                stats = processor.tts_cache.get_stats()
+                print(f"          hit rate {stats['hit_rate']:.0%} | "
+                      f"time saved {stats['time_saved_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark: typosquat lookups, linear difflib scan vs the deletion index.
+
+Builds a corpus of the requested size (the bundled popular-package list,
+padded with synthetic package-like names) and looks up typos of corpus
+names plus unrelated names. The linear variant reproduces the previous
+_detect_typosquatting: difflib.SequenceMatcher against every popular name.
+
+Usage:
+    python -m tests.benchmarks.bench_typosquat [--corpus 50000] [--queries 2000]
+"""
+
+import argparse
+import difflib
+import random
+import time
+import tracemalloc
+
+from tools.security.typosquat import TyposquatIndex, load_corpus
+
+
+# Name families that share long prefixes or suffixes on PyPI
+FAMILIES = (
+    "google-cloud-{}", "azure-mgmt-{}", "types-{}", "django-{}", "pytest-{}",
+    "flake8-{}", "sphinxcontrib-{}", "apache-airflow-providers-{}", "{}-client",
+    "{}-sdk", "py{}", "{}-python", "jupyterlab-{}",
+)
+
+
+def build_corpus(size: int, rng: random.Random) -> list[str]:
+    """Bundled names padded with package-like names (~40% in families)."""
+    syllables = [a + b for a in "bcdfghklmnprstvz" for b in "aeiou"]
+    words = list(dict.fromkeys(
+        "".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))) for _ in range(20000)
+    ))
+    names = dict.fromkeys(load_corpus())
+    while len(names) < size:
+        if rng.random() < 0.4:
+            name = rng.choice(FAMILIES).format(rng.choice(words))
+        else:
+            name = "-".join(rng.sample(words, rng.choice((1, 1, 2))))
+        names[name] = None
+    return list(names)[:size]
+
+
+def typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(len(name))
+    op = rng.randrange(4)
+    if op == 0:
+        return name[:i] + name[i + 1:]
+    if op == 1:
+        return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i:]
+    if op == 2:
+        return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1:]
+    return name[:i] + name[i + 1:i + 2] + name[i] + name[i + 2:]
+
+
+def linear_detect(name: str, popular: list[str]) -> str | None:
+    """The previous difflib scan (normalization as _normalize_package_name)."""
+    normalized = name.lower().replace("-", "_").replace(".", "_")
+    for candidate in popular:
+        other = candidate.lower().replace("-", "_").replace(".", "_")
+        if normalized == other:
+            return None
+        ratio = difflib.SequenceMatcher(None, normalized, other).ratio()
+        if ratio > 0.85:
+            return candidate
+        if abs(len(normalized) - len(other)) == 1 and ratio > 0.8:
+            return candidate
+        if len(normalized) == len(other) and sum(
+            1 for a, b in zip(normalized, other, strict=True) if a != b
+        ) == 1:
+            return candidate
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--linear-queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = build_corpus(args.corpus, rng)
+    queries = [typo(rng.choice(corpus), rng) if i % 2 else f"unrelated-name-{i}"
+               for i, _ in enumerate(range(args.queries))]
+
+    start = time.perf_counter()
+    index = TyposquatIndex(corpus)
+    build = time.perf_counter() - start
+    tracemalloc.start()
+    traced = TyposquatIndex(corpus)  # noqa: F841
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    hits = sum(1 for q in queries if index.nearest(q))
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    sample = queries[: args.linear_queries]
+    start = time.perf_counter()
+    for q in sample:
+        linear_detect(q, corpus)
+    linear = (time.perf_counter() - start) / len(sample)
+
+    print(f"corpus {len(corpus)} names, {len(queries)} queries ({hits} with matches)")
+    print(f"linear difflib  {linear * 1000:9.2f} ms/query")
+    print(f"deletion index  {indexed * 1000:9.3f} ms/query  "
+          f"(build {build:.2f} s, ~{memory / 2**20:.0f} MiB traced)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: startup time of a process that loads 50 secrets, per-call key derivation vs the vault session.
+
+Each variant runs in a fresh interpreter (import, key derivation, reads)
+against a temporary vault, audit and dashboard database. The per-call
+variant reproduces the previous get_secret: derive the key (salt migration
+check + PBKDF2), SELECT, UPDATE access count and audit each secret. The
+session variants derive the key once: get_secret() per key and one bulk
+get_secrets() call.
+
+Usage:
+    python -m tests.benchmarks.bench_vault_startup [--secrets 50] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CHILD = """
+import os, sys
+from pathlib import Path
+from tools.security import audit, vault
+from tools.dashboard.backend import database
+
+workdir = Path(sys.argv[1])
+vault.DB_PATH = workdir / "vault.db"
+vault.SALT_PATH = workdir / ".vault_salt"
+audit.DB_PATH = workdir / "audit.db"
+database.DB_PATH = workdir / "dashboard.db"
+mode, count = sys.argv[2], int(sys.argv[3])
+keys = [f"SECRET_{n}" for n in range(count)]
+
+if mode == "setup":
+    for key in keys:
+        vault.set_secret(key, "x" * 40)
+elif mode == "per-call":
+    for key in keys:
+        encryption_key = vault.derive_key(os.environ[vault.MASTER_KEY_ENV])
+        conn = vault.get_connection()
+        row = conn.execute("SELECT * FROM secrets WHERE namespace = ? AND key = ?",
+                           ("default", key)).fetchone()
+        conn.execute("UPDATE secrets SET accessed_count = accessed_count + 1 "
+                     "WHERE namespace = ? AND key = ?", ("default", key))
+        conn.commit()
+        conn.close()
+        os.environ[key] = vault.decrypt_value(row["encrypted_value"], encryption_key)
+        vault.log_access("get", key, "default", "success")
+elif mode == "session-get":
+    for key in keys:
+        os.environ[key] = vault.get_secret(key)["value"]
+elif mode == "session-bulk":
+    os.environ.update(vault.get_secrets("default", keys)["values"])
+print(vault.get_vault_session().derivations)
+"""
+
+
+def run(workdir: Path, mode: str, count: int) -> tuple[float, str]:
+    start = time.perf_counter()
+    done = subprocess.run(
+        [sys.executable, "-c", CHILD, str(workdir), mode, str(count)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return time.perf_counter() - start, done.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--secrets", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DEXAI_MASTER_KEY", "benchmark-master-key")
+    workdir = Path(tempfile.mkdtemp())
+    run(workdir, "setup", args.secrets)
+    baseline = min(run(workdir, "none", 0)[0] for _ in range(args.runs))
+
+    print(f"{args.secrets} secrets, process startup without vault access {baseline * 1000:.0f} ms")
+    for mode in ("per-call", "session-get", "session-bulk"):
+        times = []
+        for _ in range(args.runs):
+            elapsed, derivations = run(workdir, mode, args.secrets)
+            times.append(elapsed)
+        print(f"{mode:13s} {statistics.median(times) * 1000:8.0f} ms  "
+              f"(key derivations in session: {derivations})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark: FFmpeg work per video in VideoProcessor.
+
+Generates test videos with FFmpeg's lavfi sources and compares:
+
+- per-seek: the previous pipeline - write the video to disk, extract audio
+  in one blocking ffmpeg run, then one blocking "-ss <ts>" run per frame
+- single-pass: VideoProcessor.process_video (asyncio subprocesses, input on
+  stdin, frames + audio from one decode)
+
+Vision and transcription are stubbed; N videos are processed concurrently.
+--gop sets the keyframe interval in frames (phone cameras emit one every
+1-2s); with sparse keyframes the single pass falls back to a full decode.
+
+Usage:
+    python -m tests.benchmarks.bench_video_processor [--videos 4] [--seconds 60]
+"""
+
+import argparse
+import asyncio
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from tools.channels import audio_processor
+from tools.channels.audio_processor import TranscriptionResult
+from tools.channels.video_processor import VideoProcessor, frame_timestamps
+
+
+class StubTranscriber:
+    async def transcribe(self, audio_bytes, filename, mime_type):
+        return TranscriptionResult(success=True, text="...", cost_usd=0.0)
+
+
+def make_video(path: Path, seconds: int, size: str, gop: int) -> bytes:
+    subprocess.run(
+        ["ffmpeg", "-v", "error",
+         "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size={size}:rate=30",
+         "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+         "-shortest", "-c:v", "libx264", "-preset", "veryfast", "-g", str(gop), "-c:a", "aac",
+         str(path), "-y"],
+        check=True,
+    )
+    return path.read_bytes()
+
+
+async def per_seek(video: bytes, workdir: Path, duration: float) -> int:
+    """The previous approach (blocking subprocess.run per step)."""
+    video_path = workdir / "video.mp4"
+    video_path.write_bytes(video)
+    subprocess.run(
+        ["ffmpeg", "-i", str(video_path), "-vn", "-acodec", "libmp3lame", "-ar", "16000",
+         "-ac", "1", "-q:a", "4", str(workdir / "audio.mp3"), "-y"],
+        capture_output=True, timeout=60,
+    )
+    frames = 0
+    for i, ts in enumerate(frame_timestamps(duration, 3)):
+        frame_path = workdir / f"frame_{i}.jpg"
+        subprocess.run(
+            ["ffmpeg", "-ss", str(ts), "-i", str(video_path), "-vframes", "1", "-q:v", "2",
+             str(frame_path), "-y"],
+            capture_output=True, timeout=30,
+        )
+        frames += frame_path.exists()
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=4)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--gop", type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        video = make_video(tmp_path / "clip.mp4", args.seconds, args.size, args.gop)
+        print(f"video: {args.seconds}s {args.size} gop {args.gop}, "
+              f"{len(video) / 1024 / 1024:.1f} MiB, {args.videos} concurrent")
+
+        async def run_per_seek():
+            async def one(i):
+                workdir = tmp_path / f"legacy_{i}"
+                workdir.mkdir()
+                return await per_seek(video, workdir, args.seconds)
+            return await asyncio.gather(*(one(i) for i in range(args.videos)))
+
+        start = time.perf_counter()
+        asyncio.run(run_per_seek())
+        legacy = time.perf_counter() - start
+        print(f"per-seek   : {legacy * 1000:8.0f} ms")
+
+        processor = VideoProcessor({"processing": {"video": {}, "worker_pool": {"workers": 0}}})
+        media = processor._get_media_processor()
+
+        async def run_single_pass():
+            return await asyncio.gather(*(
+                processor.process_video(video, "clip.mp4", "video/mp4")
+                for _ in range(args.videos)
+            ))
+
+        with (
+            patch.object(audio_processor, "get_audio_processor", return_value=StubTranscriber()),
+            patch.object(media, "_call_vision_api", AsyncMock(return_value=("frame", 0.0))),
+        ):
+            start = time.perf_counter()
+            results = asyncio.run(run_single_pass())
+            single = time.perf_counter() - start
+        processor.cleanup()
+
+        assert all(r.success and len(r.frame_descriptions) == 3 for r in results)
+        print(f"single-pass: {single * 1000:8.0f} ms  ({legacy / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
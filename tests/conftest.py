@@ -47,9 +47,13 @@ def temp_db() -> Generator[Path, None, None]:
 
     yield db_path
 
-    # Cleanup
-    if db_path.exists():
-        os.unlink(db_path)
+    # Cleanup: drop pooled connections first so WAL sidecars are not orphaned
+    from tools import db_connections
+
+    db_connections.close_all()
+    for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if path.exists():
+            os.unlink(path)
 
 
 @pytest.fixture
@@ -0,0 +1 @@
+"""Test doubles shared by unit tests and benchmarks."""
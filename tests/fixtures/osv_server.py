@@ -0,0 +1,131 @@
+"""Local OSV API stand-in shared by the advisory feed tests and benchmark.
+
+OSVFixtureServer serves /v1/query, /v1/querybatch and /v1/vulns/<id> over
+fixed entries built with make_vuln().
+
+Usage:
+    with OSVFixtureServer([make_vuln("PYSEC-1", "jinja2", ["2.10"])]) as server:
+        for name, url in server.urls().items():
+            monkeypatch.setattr(advisory_feed, name, url)
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class OSVFixtureServer:
+    """Local OSV API (/v1/query, /v1/querybatch, /v1/vulns/<id>) over fixed entries.
+
+    Affected versions are matched from each entry's explicit ``versions``
+    list. ``page_size`` caps vulns per querybatch result to exercise
+    next_page_token paging.
+    """
+
+    def __init__(self, vulns: list[dict], latency: float = 0.0, page_size: int = 1000):
+        self.vulns = {v["id"]: v for v in vulns}
+        self.latency = latency
+        self.page_size = page_size
+        self.unavailable: set[str] = set()
+        self.requests: dict[str, int] = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: dict) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> dict:
+                return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+            def do_POST(self):
+                server._count(self.path)
+                if self.path == "/v1/query":
+                    query = self._body()
+                    self._reply(200, {"vulns": server.matching(query)})
+                elif self.path == "/v1/querybatch":
+                    self._reply(200, {"results": [
+                        server.page(query) for query in self._body()["queries"]
+                    ]})
+                else:
+                    self._reply(404, {})
+
+            def do_GET(self):
+                server._count(self.path.rsplit("/", 1)[0])
+                vuln_id = self.path.rsplit("/", 1)[-1]
+                if vuln_id in server.unavailable:
+                    self._reply(503, {})
+                    return
+                vuln = server.vulns.get(vuln_id)
+                self._reply(200 if vuln else 404, vuln or {})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _count(self, path: str) -> None:
+        time.sleep(self.latency)
+        self.requests[path] = self.requests.get(path, 0) + 1
+
+    def matching(self, query: dict) -> list[dict]:
+        name = _normalize(query["package"]["name"])
+        return [
+            vuln for vuln in self.vulns.values()
+            if any(_normalize(a["package"]["name"]) == name and query["version"] in a["versions"]
+                   for a in vuln["affected"])
+        ]
+
+    def page(self, query: dict) -> dict:
+        matches = self.matching(query)
+        start = int(query.get("page_token") or 0)
+        result: dict = {"vulns": [{"id": v["id"], "modified": v["modified"]}
+                                  for v in matches[start:start + self.page_size]]}
+        if start + self.page_size < len(matches):
+            result["next_page_token"] = str(start + self.page_size)
+        return result
+
+    def urls(self) -> dict[str, str]:
+        """advisory_feed URL constants pointing at this server."""
+        return {
+            "OSV_API_URL": f"{self.url}/v1/query",
+            "OSV_BATCH_URL": f"{self.url}/v1/querybatch",
+            "OSV_VULN_URL": f"{self.url}/v1/vulns/{{id}}",
+        }
+
+    def __enter__(self) -> "OSVFixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_vuln(vuln_id: str, package: str, versions: list[str], **ranges) -> dict:
+    """OSV entry affecting ``versions`` (and an ECOSYSTEM range if given)."""
+    affected: dict = {"package": {"name": package, "ecosystem": "PyPI"}, "versions": versions}
+    if ranges:
+        affected["ranges"] = [{"type": "ECOSYSTEM", "events": [
+            {key: value} for key, value in ranges.items()
+        ]}]
+    return {
+        "id": vuln_id,
+        "modified": "2026-01-01T00:00:00Z",
+        "summary": f"Issue in {package}",
+        "details": "",
+        "aliases": [],
+        "affected": [affected],
+    }
@@ -144,6 +144,9 @@ def test_client(dashboard_app, temp_dashboard_db):
         conn = sqlite3.connect(str(temp_dashboard_db))
         conn.execute("DELETE FROM dashboard_events")
         conn.execute("DELETE FROM dashboard_metrics")
+        conn.execute("DELETE FROM dashboard_metric_rollups")
+        conn.execute("DELETE FROM dashboard_metric_histograms")
+        conn.execute("DELETE FROM dashboard_event_rollups")
         conn.commit()
         conn.close()
 
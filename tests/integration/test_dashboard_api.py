@@ -9,6 +9,7 @@ Tests the FastAPI dashboard routes:
 These tests use an isolated test database and FastAPI TestClient.
 """
 
+import json
 from datetime import datetime
 
 import pytest
@@ -362,6 +363,39 @@ class TestActivityEndpoint:
 
         assert len(data2["events"]) == 5
 
+    def test_activity_pagination_scrolls_without_overlap(self, test_client):
+        """Following cursors should visit every event once, keeping the total."""
+        for i in range(12):
+            test_client.post(
+                "/api/activity", json={"event_type": "system", "summary": f"Event {i}"}
+            )
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+            data = test_client.get("/api/activity", params=params).json()
+            assert data["total"] == 12
+            seen.extend(event["id"] for event in data["events"])
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                break
+
+        assert len(seen) == len(set(seen)) == 12
+
+    def test_activity_export_streams_ndjson(self, test_client):
+        """GET /api/activity/export should return one JSON event per line."""
+        for i in range(3):
+            test_client.post(
+                "/api/activity", json={"event_type": "task", "summary": f"Task {i}"}
+            )
+
+        response = test_client.get("/api/activity/export", params={"event_type": "task"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["summary"] for line in lines] == ["Task 2", "Task 1", "Task 0"]
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Health Check Tests
@@ -0,0 +1,143 @@
+"""Tests for hook timing metrics (tools/agent/hooks.HookMetrics, tools/ops/sketch)
+
+Hook durations are kept in fixed-memory quantile sketches instead of a list
+per hook: percentiles stay within the sketch's relative accuracy, windows
+merge into rollups after flush_to_db, and the histograms are exported to
+Prometheus.
+"""
+
+import random
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from tools.agent.hooks import HookMetrics
+from tools.ops import MIGRATIONS_DIR
+from tools.ops.prometheus import MetricsCollector
+from tools.ops.sketch import LatencySketch
+
+
+MIGRATIONS = ("0002_create_hook_metrics_table.sql", "0006_add_sketch_to_hook_metrics.sql")
+
+
+@pytest.fixture
+def hook_metrics():
+    """A fresh HookMetrics (the module keeps a process-wide singleton)."""
+    metrics = object.__new__(HookMetrics)
+    metrics._initialize()
+    return metrics
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Temporary DATA_DIR with the hook_metrics table migrated."""
+    conn = sqlite3.connect(str(tmp_path / "audit.db"))
+    for migration in MIGRATIONS:
+        conn.executescript((MIGRATIONS_DIR / migration).read_text())
+    conn.close()
+    with patch("tools.ops.DATA_DIR", tmp_path):
+        yield tmp_path
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sketch
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestLatencySketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(1, 1.2) for _ in range(20000)]
+        sketch = LatencySketch()
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert abs(sketch.quantile(q) - exact) / exact <= 0.02
+        assert sketch.min == ordered[0] and sketch.max == ordered[-1]
+        # Memory depends on the value range, not the number of observations
+        assert len(sketch.buckets) < 1000
+
+    def test_merge_equals_union_and_round_trips(self):
+        whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+        for i in range(1, 500):
+            whole.add(i / 10)
+            (left if i % 2 else right).add(i / 10)
+
+        left.merge(right)
+        restored = LatencySketch.from_dict(left.to_dict())
+        for q in (0.1, 0.5, 0.9, 0.99):
+            assert restored.quantile(q) == whole.quantile(q)
+        assert restored.count == whole.count and restored.max == whole.max
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HookMetrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestHookMetrics:
+    def test_stats_and_slow_calls(self, hook_metrics):
+        for duration in (1.0, 2.0, 3.0, 80.0):
+            hook_metrics.record("pre_tool", duration)
+
+        stats = hook_metrics.get_stats("pre_tool")
+        assert stats["count"] == 4
+        assert stats["avg_ms"] == pytest.approx(21.5)
+        assert stats["min_ms"] == 1.0 and stats["max_ms"] == 80.0
+        assert stats["p50_ms"] == pytest.approx(2.0, rel=0.02)
+
+        slow = hook_metrics.get_slow_calls()
+        assert slow == [{
+            "hook_name": "pre_tool", "slow_count": 1, "total_count": 4,
+            "avg_slow_ms": 80.0, "max_ms": 80.0, "threshold_ms": 50.0,
+        }]
+        assert hook_metrics.summary()["recent_slow_calls"][0]["duration_ms"] == 80.0
+
+    def test_slow_call_ring_is_bounded(self, hook_metrics):
+        for i in range(500):
+            hook_metrics.record("slow_hook", 100.0 + i)
+        assert len(hook_metrics.recent_slow) == 100
+        assert hook_metrics.get_recent_slow_calls(1)[0]["duration_ms"] == 599.0
+        assert hook_metrics.get_stats("slow_hook")["count"] == 500
+
+    def test_flush_and_rollup_merge_windows(self, hook_metrics, data_dir):
+        for duration in range(1, 101):
+            hook_metrics.record("post_tool", float(duration))
+        assert hook_metrics.flush_to_db() == 1
+        assert hook_metrics.get_stats("post_tool")["count"] == 0
+
+        for duration in range(101, 201):
+            hook_metrics.record("post_tool", float(duration))
+        assert hook_metrics.flush_to_db() == 1
+        hook_metrics.record("post_tool", 500.0)
+
+        rollup = hook_metrics.rollup()["post_tool"]
+        assert rollup["count"] == 201
+        assert rollup["max_ms"] == 500.0
+        assert rollup["p50_ms"] == pytest.approx(101.0, rel=0.02)
+
+        conn = sqlite3.connect(str(data_dir / "audit.db"))
+        rows = conn.execute("SELECT call_count, p99_ms FROM hook_metrics").fetchall()
+        conn.close()
+        assert [row[0] for row in rows] == [100, 100]
+
+    def test_prometheus_histogram_survives_flush(self, hook_metrics, data_dir):
+        hook_metrics.record("stop", 0.3)
+        hook_metrics.record("stop", 20.0)
+        hook_metrics.flush_to_db()
+        hook_metrics.record("stop", 3000.0)
+
+        collector = MetricsCollector()
+        with patch("tools.agent.hooks.get_hook_metrics", return_value=hook_metrics):
+            collector.collect_system_metrics()
+        output = collector.format_openmetrics()
+
+        assert "# TYPE dexai_hook_duration_seconds histogram" in output
+        assert 'dexai_hook_duration_seconds_bucket{hook="stop",le="0.0005"} 1' in output
+        assert 'dexai_hook_duration_seconds_bucket{hook="stop",le="0.025"} 2' in output
+        assert 'dexai_hook_duration_seconds_bucket{hook="stop",le="+Inf"} 3' in output
+        assert 'dexai_hook_duration_seconds_count{hook="stop"} 3' in output
@@ -0,0 +1 @@
+"""Automation unit tests."""
@@ -0,0 +1,218 @@
+"""Tests for tools/automation/flow_detector.py
+
+Flow scoring is served from in-memory state:
+- ActivityWindow keeps running aggregates over a per-user ring buffer
+- Patterns and overrides are cached; SQL writes are queued and flushed
+- A fresh process hydrates its state from the persisted tables
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Setup: Patch DB_PATH to use temp database
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def detector(temp_db):
+    """Patch flow detector to use a temporary database and default config.
+
+    The background writer is disabled so tests control when writes are flushed.
+    """
+    from tools.automation import flow_detector
+
+    with (
+        patch.object(flow_detector, "DB_PATH", temp_db),
+        patch.object(flow_detector, "CONFIG_PATH", temp_db.with_suffix(".missing.yaml")),
+        patch.object(flow_detector, "_ensure_writer"),
+    ):
+        flow_detector.reset_state()
+        yield flow_detector
+        flow_detector.reset_state()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ActivityWindow Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestActivityWindow:
+    """Tests for the ring buffer and its running aggregates."""
+
+    def test_running_aggregates(self, detector):
+        window = detector.ActivityWindow(window_seconds=900)
+        window.add(1000.0, 10.0)
+        window.add(1010.0, None)
+        window.add(1020.0, 20.0)
+
+        assert window.summary(1030.0) == (3, 15.0)
+
+    def test_eviction_updates_aggregates(self, detector):
+        window = detector.ActivityWindow(window_seconds=60)
+        window.add(1000.0, 100.0)
+        window.add(1050.0, 10.0)
+
+        assert window.summary(1070.0) == (1, 10.0)
+        assert window.response_count == 1
+        assert window.response_sum == pytest.approx(10.0)
+
+    def test_narrower_window(self, detector):
+        window = detector.ActivityWindow(window_seconds=900)
+        window.add(1000.0, 100.0)
+        window.add(1500.0, 10.0)
+        window.add(1550.0, None)
+
+        assert window.summary(1600.0, window_seconds=300) == (2, 10.0)
+        # The full-window totals are untouched by the narrower query
+        assert window.summary(1600.0) == (3, 55.0)
+
+    def test_capacity_drops_oldest(self, detector):
+        window = detector.ActivityWindow(window_seconds=900, maxlen=2)
+        window.add(1000.0, 30.0)
+        window.add(1001.0, 20.0)
+        window.add(1002.0, 10.0)
+
+        assert window.summary(1003.0) == (2, 15.0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Flow Score Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestFlowScore:
+    """Tests for scoring from in-memory state."""
+
+    def test_score_reflects_unflushed_activity(self, detector):
+        for _ in range(3):
+            detector.record_activity("alice", response_time_seconds=10)
+
+        result = detector.get_flow_score("alice")
+        assert result["activity_count"] == 3
+        assert result["avg_response_time_seconds"] == 10
+        assert result["components"]["response_time"] == 100
+
+    def test_repeat_checks_do_not_touch_database(self, detector):
+        detector.record_activity("alice", response_time_seconds=10)
+        detector.set_override("alice", 30)
+        detector.clear_override("alice")
+        detector.detect_flow("alice")
+
+        with patch.object(detector, "get_connection", side_effect=AssertionError("SQL")):
+            for _ in range(10):
+                result = detector.detect_flow("alice")
+        assert result["success"] is True
+
+    def test_state_hydrates_from_database(self, detector):
+        for rt in (10, 50):
+            detector.record_activity("alice", response_time_seconds=rt)
+        detector.reset_state()  # flushes, then forgets everything
+
+        result = detector.get_flow_score("alice")
+        assert result["activity_count"] == 2
+        assert result["avg_response_time_seconds"] == 30
+
+    def test_wide_window_falls_back_to_sql(self, detector):
+        detector.record_activity("alice", response_time_seconds=10)
+
+        result = detector.get_flow_score("alice", window_minutes=120)
+        assert result["activity_count"] == 1
+
+    def test_get_flow_state_async(self, detector):
+        detector.set_override("alice", 30)
+
+        state = asyncio.run(detector.get_flow_state("alice"))
+        assert state["in_flow"] is True
+        assert state["expected_end"] is not None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persistence Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestPersistence:
+    """Tests for the queued SQL writes."""
+
+    def test_flush_writes_activity_and_patterns(self, detector):
+        for rt in (10, None, 40):
+            detector.record_activity("alice", response_time_seconds=rt)
+
+        conn = detector.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM recent_activity").fetchone()[0] == 0
+        conn.close()
+
+        assert detector.flush_pending()["flushed"] == 3
+
+        conn = detector.get_connection()
+        recent = conn.execute("SELECT COUNT(*) FROM recent_activity").fetchone()[0]
+        pattern = conn.execute(
+            "SELECT message_count, avg_response_time_seconds, sample_count FROM activity_patterns"
+        ).fetchone()
+        conn.close()
+
+        assert recent == 3
+        assert pattern["message_count"] == 3
+        assert pattern["sample_count"] == 3
+        # Same running-average formula as the SQL upsert
+        assert pattern["avg_response_time_seconds"] == pytest.approx(20.0)
+
+        cached = next(iter(detector._state.patterns["alice"].values()))
+        assert cached["avg_response_time_seconds"] == pytest.approx(20.0)
+
+    def test_flush_does_not_block_scoring(self, detector):
+        for rt in (10, 20):
+            detector.record_activity("alice", response_time_seconds=rt)
+        detector._state.windows.clear()  # hydrate while the batch is in flight
+        writing, release = threading.Event(), threading.Event()
+        connect = detector.get_connection
+
+        class SlowConnection:
+            def __init__(self):
+                self.conn = connect()
+
+            def executemany(self, *args):
+                writing.set()
+                release.wait(5)
+                return self.conn.executemany(*args)
+
+            def __getattr__(self, name):
+                return getattr(self.conn, name)
+
+        with patch.object(detector, "get_connection", SlowConnection):
+            flusher = threading.Thread(target=detector.flush_pending)
+            flusher.start()
+            assert writing.wait(5)
+            detector.record_activity("alice", response_time_seconds=30)
+            result = detector.get_flow_score("alice")
+            still_writing = flusher.is_alive()
+            release.set()
+            flusher.join(5)
+
+        assert still_writing
+        assert result["activity_count"] == 3
+        assert detector._state.in_flight == []
+        assert len(detector._state.pending) == 1
+
+    def test_update_scores_refreshes_cache(self, detector):
+        for _ in range(5):
+            detector.record_activity("alice", response_time_seconds=10)
+
+        result = detector.update_historical_flow_scores()
+        assert result["updated"] == 1
+
+        score = detector.get_flow_score("alice")
+        assert score["components"]["historical"] > 0
+
+    def test_cleared_override_not_served_from_cache(self, detector):
+        detector.set_override("alice", 30)
+        assert detector.get_override("alice")["is_focusing"] is True
+
+        detector.clear_override("alice")
+        assert detector.get_override("alice")["is_focusing"] is False
+        assert detector.detect_flow("alice")["source"] != "manual_override"
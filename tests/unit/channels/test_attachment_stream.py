@@ -0,0 +1,113 @@
+"""Tests for tools/channels/media/attachment_stream.py
+
+Attachments stream into a spool that hashes as it goes, rolls over to a
+temp file past a threshold, and aborts once the size cap is exceeded.
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from tools.channels.media.attachment_stream import (
+    AttachmentTooLargeError,
+    spool_chunks,
+    stream_attachment,
+)
+from tools.channels.models import Attachment
+
+
+def make_attachment(size_bytes=0):
+    return Attachment(id="f1", type="video", filename="clip.mp4",
+                      mime_type="video/mp4", size_bytes=size_bytes)
+
+
+class StreamingAdapter:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+
+    async def iter_attachment(self, attachment):
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class BufferedAdapter:
+    async def download_attachment(self, attachment):
+        return b"whole file"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Spooling
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestSpool:
+    def test_small_download_stays_in_memory(self, tmp_path):
+        adapter = StreamingAdapter([b"abc", b"def"])
+        spool = asyncio.run(stream_attachment(adapter, make_attachment(), 1024, directory=tmp_path))
+        with spool:
+            assert spool.in_memory
+            assert spool.read_bytes() == b"abcdef"
+            assert bytes(spool.view()) == b"abcdef"
+            assert spool.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+            assert spool.path.read_bytes() == b"abcdef"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_large_download_rolls_over_to_disk(self, tmp_path):
+        chunks = [bytes([i]) * 1000 for i in range(10)]
+        adapter = StreamingAdapter(chunks)
+        spool = asyncio.run(stream_attachment(
+            adapter, make_attachment(), 1_000_000, spool_bytes=2500, directory=tmp_path
+        ))
+        with spool:
+            assert not spool.in_memory
+            assert spool.size == 10_000
+            assert spool.path.parent == tmp_path
+            assert spool.read_bytes() == b"".join(chunks)
+            assert spool.view()[4000] == 4
+            assert spool.sha256 == hashlib.sha256(b"".join(chunks)).hexdigest()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_buffered_adapter_is_wrapped(self, tmp_path):
+        spool = asyncio.run(stream_attachment(BufferedAdapter(), make_attachment(), 1024))
+        with spool:
+            assert spool.read_bytes() == b"whole file"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Size caps
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestSizeCap:
+    def test_declared_size_rejected_before_download(self):
+        adapter = StreamingAdapter([b"x"])
+        with pytest.raises(AttachmentTooLargeError):
+            asyncio.run(stream_attachment(adapter, make_attachment(size_bytes=2048), 1024))
+        assert adapter.sent == 0
+
+    def test_aborts_mid_stream(self, tmp_path):
+        # Declared size lies (0); the cap still holds on received bytes
+        adapter = StreamingAdapter([b"x" * 400] * 100)
+        with pytest.raises(AttachmentTooLargeError) as exc:
+            asyncio.run(stream_attachment(
+                adapter, make_attachment(), 1000, spool_bytes=500, directory=tmp_path
+            ))
+        assert exc.value.received_bytes == 1200
+        assert adapter.sent == 3
+        assert adapter.closed
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spool_chunks_exact_limit(self):
+        async def chunks():
+            yield b"12345"
+
+        spool = asyncio.run(spool_chunks(chunks(), max_bytes=5))
+        with spool:
+            assert spool.size == 5
@@ -0,0 +1,59 @@
+"""Tests for tools/channels/media/disk_lru.py
+
+Atomic writes with size accounting, eviction of the least recently used
+files (with their companions) down to the low-water mark, and the age limit.
+"""
+
+import os
+import time
+
+from tools.channels.media.disk_lru import DiskLRU
+
+
+def age(path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestDiskLRU:
+    def test_write_is_atomic_and_counted(self, tmp_path):
+        store = DiskLRU(tmp_path, max_bytes=10_000)
+
+        assert store.write(tmp_path / "ab" / "abc.bin", b"x" * 100) == 100
+        store.write(tmp_path / "cd" / "cde.bin", b"y" * 50)
+
+        assert store.size_bytes == 150
+        assert sorted(p.name for p in tmp_path.glob("*/*")) == ["abc.bin", "cde.bin"]
+
+    def test_evicts_least_recently_used_with_companions(self, tmp_path):
+        store = DiskLRU(
+            tmp_path,
+            max_bytes=2500,
+            companions=lambda path: [path.with_suffix(".jpg")] if path.suffix == ".json" else [],
+        )
+        old = tmp_path / "aa" / "old.json"
+        store.write(old, b"a" * 1000)
+        store.write(old.with_suffix(".jpg"), b"t" * 200)
+        store.write(tmp_path / "bb" / "recent.json", b"b" * 1000)
+        for path, seconds in ((old, 120), (old.with_suffix(".jpg"), 60)):
+            age(path, seconds)
+        store.touch(old.with_suffix(".jpg"))
+
+        store.write(tmp_path / "cc" / "new.json", b"c" * 1000)  # Over 2500: evicts
+
+        assert not old.exists()
+        assert not old.with_suffix(".jpg").exists()
+        assert store.evicted == 2
+        assert store.size_bytes == 2000
+
+    def test_age_limit(self, tmp_path):
+        store = DiskLRU(tmp_path, max_bytes=10_000, max_age_days=1)
+        stale = tmp_path / "aa" / "stale.bin"
+        store.write(stale, b"s")
+        store.write(tmp_path / "bb" / "fresh.bin", b"f")
+        age(stale, 2 * 86400)
+
+        result = store.evict()
+
+        assert result["files_removed"] == 1
+        assert not stale.exists()
@@ -0,0 +1,399 @@
+"""Tests for tools/channels/cluster (multi-process gateway)
+
+Adapters and handlers run in separate worker processes: inbound messages
+are relayed to a sticky handler worker, adapter calls (including platform
+objects passed back as RemoteRefs) are relayed to the adapter worker, dead
+workers are restarted and worker metrics are merged for Prometheus.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+
+import pytest
+
+from tools.channels.cluster import GatewaySupervisor, conversation_key
+from tools.channels.cluster import supervisor as supervisor_module
+from tools.channels.cluster.bus import CALL, RefTable, RemoteRef
+from tools.channels.cluster.worker import AdapterProxy, AdapterWorker
+from tools.channels.media import AttachmentTooLargeError, stream_attachment
+from tools.channels.models import Attachment, UnifiedMessage
+from tools.channels.router import ChannelAdapter
+from tools.ops.prometheus import MetricsCollector
+
+
+OUT_ENV = "DEXAI_TEST_CLUSTER_OUT"
+
+
+def _message(channel: str, content: str = "hello") -> UnifiedMessage:
+    return UnifiedMessage(
+        id=str(uuid.uuid4()),
+        channel=channel,
+        channel_message_id="1",
+        channel_user_id="u1",
+        direction="inbound",
+        content=content,
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker-side fakes (imported by spawned worker processes)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class _PlatformMessage:
+    """Unpicklable stand-in for e.g. a discord.Message."""
+
+    def __init__(self, message_id: int):
+        self.id = message_id
+        self.lock = threading.Lock()
+
+
+class FakeAdapter(ChannelAdapter):
+    """Sends one inbound message after connecting and records the outcome."""
+
+    def __init__(self):
+        self.router = None
+        self.sent = 0
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    async def connect(self) -> None:
+        self._task = asyncio.create_task(self._inbound())
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def _inbound(self) -> None:
+        result = await self.router.route_inbound(_message("fake"))
+        with open(os.environ[OUT_ENV], "w") as f:
+            json.dump({"adapter_pid": os.getpid(), "result": result}, f)
+
+    async def send_message(self, message: UnifiedMessage) -> dict:
+        self.sent += 1
+        return {"success": True, "message_id": self.sent, "message_obj": _PlatformMessage(self.sent)}
+
+    async def update_message(self, message_obj, content: str) -> dict:
+        return {"success": True, "edited": message_obj.id, "content": content}
+
+    def to_unified(self, raw_message):
+        return raw_message
+
+    def from_unified(self, message):
+        return message
+
+
+def make_adapter(channel: str):
+    return FakeAdapter() if channel == "fake" else None
+
+
+class FakeRouter:
+    def __init__(self):
+        self.adapters = {}
+        self.message_handlers = []
+
+    def register_adapter(self, adapter):
+        self.adapters[adapter.name] = adapter
+
+    def unregister_adapter(self, name):
+        self.adapters.pop(name, None)
+
+    def add_message_handler(self, handler):
+        self.message_handlers.append(handler)
+
+    async def route_inbound(self, message):
+        results = [await handler(message, {}) for handler in self.message_handlers]
+        return {"success": True, "handlers": results}
+
+
+_router = FakeRouter()
+
+
+def make_router():
+    return _router
+
+
+async def reply_handler(message, context):
+    # The adapter proxy is registered once the adapter worker reports ready
+    for _ in range(100):
+        if "fake" in _router.adapters:
+            break
+        await asyncio.sleep(0.02)
+    adapter = _router.adapters["fake"]
+    sent = await adapter.send_message(_message("fake", "Thinking..."))
+    edited = await adapter.update_message(message_obj=sent["message_obj"], content="Done")
+    return {
+        "handler_pid": os.getpid(),
+        "ref": isinstance(sent["message_obj"], RemoteRef),
+        "edited": edited,
+        "has_update": hasattr(adapter, "update_message"),
+        "has_unknown": hasattr(adapter, "no_such_method"),
+    }
+
+
+WORKER_OPTIONS = {
+    "adapter_factory": f"{__name__}:make_adapter",
+    "router": f"{__name__}:make_router",
+    "handlers": [f"{__name__}:reply_handler"],
+    "log_level": "WARNING",
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Supervisor with real worker processes
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestSupervisor:
+    def test_relays_between_adapter_and_handler_processes(self, tmp_path, monkeypatch):
+        out = tmp_path / "out.json"
+        monkeypatch.setenv(OUT_ENV, str(out))
+
+        async def run():
+            supervisor = GatewaySupervisor(
+                channels=["fake", "slack"], handler_workers=2,
+                health_interval=0.2, worker_options=WORKER_OPTIONS,
+            )
+            await supervisor.start()
+            try:
+                deadline = time.monotonic() + 30
+                while not out.exists() and time.monotonic() < deadline:
+                    await asyncio.sleep(0.05)
+                return supervisor.stats()
+            finally:
+                await supervisor.stop()
+
+        stats = asyncio.run(run())
+        data = json.loads(out.read_text())
+        reply = data["result"]["handlers"][0]
+
+        assert data["result"]["success"] is True
+        assert reply["handler_pid"] != data["adapter_pid"] != os.getpid()
+        # The platform object stayed in the adapter worker and resolved on return
+        assert reply["ref"] is True
+        assert reply["edited"] == {"success": True, "edited": 1, "content": "Done"}
+        assert reply["has_update"] is True
+        assert reply["has_unknown"] is False
+        # Slack has no tokens here: its worker reports idle instead of crashing
+        assert stats["adapters"] == ["fake"]
+        assert stats["workers"]["adapter-slack"]["idle"] is True
+
+    def test_supervisor_router_gets_adapter_proxies(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(OUT_ENV, str(tmp_path / "out.json"))
+        router = FakeRouter()
+
+        async def run():
+            supervisor = GatewaySupervisor(
+                channels=["fake", "slack"], handler_workers=1,
+                health_interval=0.2, worker_options=WORKER_OPTIONS,
+            )
+            supervisor.attach_router(router)
+            await supervisor.start()
+            try:
+                deadline = time.monotonic() + 30
+                while "fake" not in router.adapters and time.monotonic() < deadline:
+                    await asyncio.sleep(0.05)
+                sent = await router.adapters["fake"].send_message(_message("fake", "notice"))
+                return sent, dict(router.adapters)
+            finally:
+                await supervisor.stop()
+
+        sent, adapters = asyncio.run(run())
+        assert sent["success"] is True
+        assert isinstance(sent["message_obj"], RemoteRef)
+        assert isinstance(adapters["fake"], AdapterProxy)
+        assert "slack" not in adapters
+
+    def test_dead_worker_is_restarted(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(OUT_ENV, str(tmp_path / "out.json"))
+
+        async def run():
+            supervisor = GatewaySupervisor(
+                channels=[], handler_workers=1, health_interval=0.1,
+                worker_options=WORKER_OPTIONS,
+            )
+            await supervisor.start()
+            try:
+                handle = supervisor.handlers[0]
+                first_pid = handle.process.pid
+                handle.process.kill()
+                deadline = time.monotonic() + 30
+                while time.monotonic() < deadline:
+                    if handle.restarts and handle.alive:
+                        break
+                    await asyncio.sleep(0.05)
+                return first_pid, handle.process.pid, handle.restarts
+            finally:
+                await supervisor.stop()
+
+        first_pid, new_pid, restarts = asyncio.run(run())
+        assert restarts == 1
+        assert new_pid != first_pid
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Routing, references, metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestRouting:
+    def test_sticky_handler_per_conversation(self):
+        supervisor = GatewaySupervisor(channels=[], handler_workers=3)
+        for channel in ("telegram", "discord", "slack"):
+            picks = {supervisor.handler_for(_message(channel)).name for _ in range(5)}
+            assert len(picks) == 1
+        assert conversation_key(_message("telegram")) == "telegram"
+
+    def test_ref_table_round_trip(self):
+        table = RefTable(max_refs=2)
+        obj = _PlatformMessage(7)
+        exported = table.export({"ok": True, "obj": obj, "items": [1, "a"]})
+
+        assert exported["ok"] is True and exported["items"] == [1, "a"]
+        assert isinstance(exported["obj"], RemoteRef)
+        assert table.resolve({"message_obj": exported["obj"]})["message_obj"] is obj
+        # Project dataclasses travel by value
+        message = _message("x")
+        assert table.export(message) is message
+
+
+class TestSupervisorBookkeeping:
+    def test_backoff_resets_after_stable_uptime(self, monkeypatch):
+        supervisor = GatewaySupervisor(channels=[], handler_workers=1, max_restart_backoff=60)
+        supervisor.running = True
+        delays = []
+
+        async def no_join(handle):
+            pass
+
+        async def record_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(supervisor, "_join", no_join)
+        monkeypatch.setattr(supervisor, "_spawn", lambda handle: None)
+        monkeypatch.setattr(supervisor_module.asyncio, "sleep", record_sleep)
+        handle = supervisor.handlers[0]
+
+        async def crash(uptime: float):
+            handle.started_at = time.monotonic() - uptime
+            await supervisor._restart(handle, "test")
+
+        async def run():
+            for _ in range(3):
+                await crash(1.0)  # Crash loop: 0s, 1s, 3s
+            await crash(supervisor_module.STABLE_UPTIME_SECONDS + 1)
+
+        asyncio.run(run())
+        assert delays == [1, 3]  # The first restart is immediate, the last too
+        assert handle.restarts == 4
+        assert handle.crashes == 1
+
+    def test_timed_out_requests_are_forgotten(self):
+        supervisor = GatewaySupervisor(channels=[], handler_workers=2)
+        origin, target = supervisor.handlers
+        supervisor._pending["old"] = (origin, target, time.monotonic() - 1)
+        supervisor._pending["new"] = (origin, target, time.monotonic() + 30)
+
+        supervisor._expire_pending()
+
+        assert list(supervisor._pending) == ["new"]
+        assert supervisor.stats()["in_flight"] == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Adapter proxy and attachment fetches
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class _RecordingBus:
+    """Bus endpoint stand-in: answers requests with a canned reply, keeps replies."""
+
+    def __init__(self, reply=None):
+        self.canned = reply or {}
+        self.requests = []
+        self.replies = []
+
+    async def request(self, message, timeout=None):
+        self.requests.append(message)
+        return self.canned
+
+    def reply(self, request, result=None, error=None):
+        self.replies.append({"result": result, "error": error})
+        return True
+
+
+class _StreamingAdapter:
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+
+    async def iter_attachment(self, attachment):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _attachment(size: int = 0) -> Attachment:
+    return Attachment(id="a1", type="document", filename="f.bin",
+                      mime_type="application/octet-stream", size_bytes=size)
+
+
+class TestAdapterProxy:
+    def test_unified_round_trip(self):
+        proxy = AdapterProxy("telegram", _RecordingBus(), [])
+        message = _message("telegram")
+
+        assert proxy.to_unified(proxy.from_unified(message)).to_dict() == message.to_dict()
+        assert proxy.to_unified(message) is message
+        with pytest.raises(TypeError):
+            proxy.to_unified(object())
+
+    def test_fetch_too_large_raises(self):
+        proxy = AdapterProxy("telegram", _RecordingBus({"result": {"too_large": 20}}), [])
+
+        with pytest.raises(AttachmentTooLargeError):
+            asyncio.run(proxy.fetch_attachment(_attachment(), 10))
+
+    def test_stream_attachment_uses_fetch(self):
+        bus = _RecordingBus({"result": {"data": b"abc"}})
+        proxy = AdapterProxy("telegram", bus, ["download_attachment"])
+
+        async def run():
+            with await stream_attachment(proxy, _attachment(), 10) as spool:
+                return spool.read_bytes()
+
+        assert asyncio.run(run()) == b"abc"
+        assert [r["method"] for r in bus.requests] == ["fetch_attachment"]
+        assert bus.requests[0]["args"][1] == 10
+
+    def test_adapter_worker_caps_download(self):
+        bus = _RecordingBus()
+        worker = AdapterWorker(bus, {"channel": "telegram"})
+        worker.adapter = _StreamingAdapter([b"x" * 8] * 4)
+
+        async def fetch(max_bytes):
+            await worker.handle({"type": CALL, "id": "1", "method": "fetch_attachment",
+                                 "args": (_attachment(), max_bytes), "kwargs": {}})
+            return bus.replies[-1]
+
+        assert asyncio.run(fetch(64)) == {"result": {"data": b"x" * 32}, "error": None}
+        assert asyncio.run(fetch(10))["result"] == {"too_large": 16}
+
+
+class TestMetricsMerge:
+    def test_worker_snapshot_merged_with_label(self):
+        worker = MetricsCollector()
+        worker.inc_counter("dexai_worker_messages_total", labels={"channel": "telegram"}, value=3)
+        worker.observe_histogram("dexai_worker_message_seconds", 0.2)
+
+        supervisor = MetricsCollector()
+        supervisor.merge_snapshot(worker.snapshot(), labels={"worker": "handler-0"})
+        supervisor.merge_snapshot(worker.snapshot(), labels={"worker": "handler-0"})
+        output = supervisor.format_openmetrics()
+
+        # Merging replaces rather than adds (snapshots are cumulative)
+        assert 'dexai_worker_messages_total{channel="telegram",worker="handler-0"} 3' in output
+        assert 'dexai_worker_message_seconds_count{worker="handler-0"} 1' in output
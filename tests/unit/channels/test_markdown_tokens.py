@@ -0,0 +1,166 @@
+"""Tests for tools/channels/content (tokenizer, converter, splitter)
+
+Markdown is tokenized once; channel emitters render the token stream,
+the splitter never breaks code fences, and streaming renders match a
+full conversion.
+"""
+
+from tools.channels.content.markdown import MarkdownConverter, MarkdownStream
+from tools.channels.content.splitter import ContentSplitter
+from tools.channels.content.tokens import (
+    BLANK,
+    BULLET,
+    CODE,
+    HEADING,
+    TEXT,
+    MarkdownTokenizer,
+    code_blocks,
+    parse_inline,
+    tokenize,
+)
+
+
+DOC = (
+    "# Plan\n"
+    "\n"
+    "Use **bold**, *italic* & ~~old~~ with `a*b<c` and snake_case_name.\n"
+    "- see [docs](https://x.test/?a=1&b=2)\n"
+    "```python\n"
+    "if a < b:\n"
+    "    x = 2 ** 3\n"
+    "```\n"
+    "Done"
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tokenizer
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestTokenizer:
+    def test_blocks_cover_source(self):
+        blocks = tokenize(DOC)
+
+        assert [b.kind for b in blocks] == [HEADING, BLANK, TEXT, BULLET, CODE, TEXT]
+        assert "".join(DOC[b.start:b.end] for b in blocks) == DOC
+        code = blocks[4]
+        assert code.lang == "python"
+        assert code.text == "if a < b:\n    x = 2 ** 3"
+        assert DOC[code.body_start:].startswith("if a < b:")
+
+    def test_feed_matches_tokenize_for_any_chunking(self):
+        expected = [(b.kind, b.raw, b.start, b.end) for b in tokenize(DOC)]
+        for size in (1, 3, 17):
+            tokenizer = MarkdownTokenizer()
+            blocks = []
+            for i in range(0, len(DOC), size):
+                blocks += tokenizer.feed(DOC[i:i + size])
+            blocks += tokenizer.close()
+            assert [(b.kind, b.raw, b.start, b.end) for b in blocks] == expected
+
+    def test_open_fence_stays_pending(self):
+        tokenizer = MarkdownTokenizer()
+        assert tokenizer.feed("```js\nlet a = 1;\n") == []
+
+        pending = tokenizer.pending()
+        assert pending[0].kind == CODE
+        assert pending[0].closed is False
+
+        done = tokenizer.feed("```\n")
+        assert done[0].closed is True
+        assert tokenizer.pending() == []
+
+    def test_code_blocks_match_tokenize(self):
+        for text in (DOC, DOC + "\n```\nopen", "~~~\n```\n~~~", "````\n```\n````\n"):
+            assert code_blocks(text) == [b for b in tokenize(text) if b.kind == CODE]
+
+    def test_inline_code_is_literal(self):
+        spans = parse_inline("`**not bold**` and **bold**")
+        assert [s.kind for s in spans] == ["code", "text", "bold"]
+        assert spans[0].text == "**not bold**"
+
+    def test_unmatched_delimiters_are_text(self):
+        spans = parse_inline("2 * 3 * 4 and a_b_c and **open")
+        assert [s.kind for s in spans] == ["text"]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Emitters
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestConverter:
+    def test_telegram_html(self):
+        html = MarkdownConverter().to_telegram(DOC)
+
+        assert html.startswith("<b>Plan</b>\n\n")
+        assert "<b>bold</b>, <i>italic</i> &amp; <s>old</s>" in html
+        assert "<code>a*b&lt;c</code>" in html
+        assert "snake_case_name" in html
+        assert '• see <a href="https://x.test/?a=1&amp;b=2">docs</a>' in html
+        assert '<pre><code class="language-python">if a &lt; b:\n    x = 2 ** 3</code></pre>' in html
+
+    def test_slack_mrkdwn(self):
+        mrkdwn = MarkdownConverter().to_slack(DOC)
+
+        assert mrkdwn.startswith("*Plan*\n")
+        # Bold stays bold (it used to be re-matched as italic)
+        assert "*bold*, _italic_ & ~old~" in mrkdwn
+        assert "• see <https://x.test/?a=1&b=2|docs>" in mrkdwn
+        assert "```\nif a < b:\n    x = 2 ** 3\n```" in mrkdwn
+
+    def test_discord_only_headers_change(self):
+        assert MarkdownConverter().to_discord(DOC) == DOC.replace("# Plan", "**Plan**")
+
+    def test_strip_markdown(self):
+        plain = MarkdownConverter.strip_markdown("**a** _b_ [c](http://d) `e` # f")
+        assert plain == "a b c e # f"
+
+    def test_stream_matches_full_conversion(self):
+        for channel in ("telegram", "slack", "discord", "cli"):
+            stream = MarkdownStream(channel)
+            for i in range(0, len(DOC), 5):
+                stream.append(DOC[i:i + 5])
+                stream.render()
+            assert stream.render() == MarkdownConverter().convert(DOC, channel)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Splitting
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _fenced(lines: int) -> str:
+    code = "\n".join(f"value_{i} = {i} * 2" for i in range(lines))
+    return f"Intro.\n\n```python\n{code}\n```\n\nOutro " + "word " * 40
+
+
+class TestSplitter:
+    splitter = ContentSplitter({"channel_limits": {"test": 120}})
+
+    def test_code_fences_never_broken(self):
+        chunks = self.splitter.split_text(_fenced(30), "test")
+
+        assert len(chunks) > 3
+        for chunk in chunks:
+            assert len(chunk) <= 120
+            assert chunk.count("```") % 2 == 0
+        assert chunks[1].startswith("```python\n")
+
+    def test_small_code_block_moves_whole(self):
+        text = "A" * 100 + "\n\n```\nx = 1\ny = 2\n```\n"
+        chunks = self.splitter.split_text(text, "test")
+        assert chunks == ["A" * 100, "```\nx = 1\ny = 2\n```\n"]
+
+    def test_resume_matches_full_split(self):
+        text = _fenced(30)
+        full = self.splitter.split_chunks(text, "test")
+        resumed = self.splitter.split_chunks(text, "test", start=full[1].end, reopen=full[1].reopen)
+
+        assert [c.text for c in resumed] == [c.text for c in full[2:]]
+
+    def test_plain_text_boundaries(self):
+        text = "First paragraph. " * 4 + "\n\n" + "Second one. " * 8
+        chunks = self.splitter.split_text(text, "test")
+        assert chunks[0] == ("First paragraph. " * 4).rstrip()
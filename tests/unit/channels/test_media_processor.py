@@ -31,6 +31,10 @@ def multimodal_config():
             "enabled": True,
             "max_file_size_mb": 50,
             "max_processing_cost_usd": 0.20,
+            # In-process so the sys.modules mocks below reach the parsers
+            "worker_pool": {"workers": 0},
+            # Fresh analysis every time (TestResultCache enables it per test)
+            "cache": {"enabled": False},
             "vision": {
                 "enabled": True,
                 "pricing": {
@@ -246,6 +250,25 @@ class TestProcessImage:
         assert result.processed is False
         assert "Download failed" in result.processing_error
 
+    @pytest.mark.asyncio
+    async def test_download_error_omits_url(self, multimodal_config, mock_adapter):
+        """HTTP errors carry the URL (Telegram's embeds the bot token): not stored."""
+        import httpx
+
+        url = "https://api.telegram.org/file/bot123:SECRET/photos/file_1.jpg"
+        request = httpx.Request("GET", url)
+        error = httpx.HTTPStatusError(
+            f"Client error '404 Not Found' for url '{url}'",
+            request=request,
+            response=httpx.Response(404, request=request),
+        )
+        processor = MediaProcessor(config=multimodal_config)
+        mock_adapter.download_attachment = AsyncMock(side_effect=error)
+
+        result = await processor._process_image(make_attachment(), "telegram", mock_adapter)
+
+        assert result.processing_error == "Download failed: HTTPStatusError (HTTP 404)"
+
     @pytest.mark.asyncio
     async def test_vision_disabled_returns_unprocessed(self, mock_adapter):
         """When vision is disabled, returns processed=False."""
@@ -512,3 +535,220 @@ class TestProcessAttachmentsBatch:
         assert len(result) == 2
         assert result[0].processing_cost_usd == 0.005
         assert result[1].processing_cost_usd == 0.010
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Concurrent batch pipeline
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestBatchPipeline:
+    """Concurrent downloads, bounded analysis and budget reservations."""
+
+    @pytest.mark.asyncio
+    async def test_downloads_overlap_and_order_is_kept(self, multimodal_config):
+        """All downloads are in flight together; results keep priority order."""
+        import asyncio
+
+        processor = MediaProcessor(config=multimodal_config)
+        in_flight = 0
+        peak = 0
+
+        async def slow_download(attachment):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05 if attachment.type == "image" else 0.01)
+            in_flight -= 1
+            return b"text content"
+
+        adapter = AsyncMock()
+        adapter.download_attachment = AsyncMock(side_effect=slow_download)
+        doc = make_attachment(id="doc-1", type="document", filename="notes.txt")
+        images = [make_attachment(id=f"img-{i}") for i in range(2)]
+
+        with patch.object(
+            processor, "_analyze_image", new_callable=AsyncMock
+        ) as mock_analyze:
+            mock_analyze.side_effect = lambda a, data: MediaContent(attachment=a, processed=True)
+            result = await processor.process_attachments_batch(
+                [doc, *images], "telegram", adapter
+            )
+
+        assert peak == 3
+        assert [m.attachment.id for m in result] == ["img-0", "img-1", "doc-1"]
+        assert result[2].extracted_text == "text content"
+
+    @pytest.mark.asyncio
+    async def test_analysis_parallelism_bounded(self, multimodal_config, mock_adapter):
+        """max_parallel_analyses caps concurrent analyses."""
+        import asyncio
+
+        multimodal_config["processing"]["max_parallel_analyses"] = 1
+        processor = MediaProcessor(config=multimodal_config)
+        active = 0
+        peak = 0
+
+        async def analyze(attachment, data):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return MediaContent(attachment=attachment, processed=True)
+
+        attachments = [make_attachment(id=f"img-{i}") for i in range(3)]
+        with patch.object(processor, "_analyze_image", side_effect=analyze):
+            result = await processor.process_attachments_batch(
+                attachments, "telegram", mock_adapter
+            )
+
+        assert peak == 1
+        assert all(m.processed for m in result)
+
+    @pytest.mark.asyncio
+    async def test_deferred_attachment_runs_after_reconciliation(
+        self, multimodal_config, mock_adapter
+    ):
+        """Attachments that did not fit the reservation run once actual costs are lower."""
+        multimodal_config["processing"]["max_processing_cost_usd"] = 0.02
+        processor = MediaProcessor(config=multimodal_config)
+        attachments = [make_attachment(id=f"img-{i}") for i in range(3)]
+        waves = []
+
+        async def cheap(attachment, channel, adapter):
+            waves.append(attachment.id)
+            return MediaContent(attachment=attachment, processed=True, processing_cost_usd=0.001)
+
+        with patch.object(processor, "process_attachment", side_effect=cheap):
+            result = await processor.process_attachments_batch(
+                attachments, "telegram", mock_adapter
+            )
+
+        assert waves == ["img-0", "img-1", "img-2"]
+        assert all(m.processing_error is None for m in result)
+
+    def test_estimate_cost(self, multimodal_config):
+        """Images reserve worst-case vision cost; local documents are free."""
+        processor = MediaProcessor(config=multimodal_config)
+
+        image_cost = processor.estimate_cost(make_attachment())
+        assert image_cost == pytest.approx((3300 * 3.0 + 300 * 15.0) / 1_000_000)
+
+        doc = make_attachment(type="document", filename="a.pdf")
+        assert processor.estimate_cost(doc) == 0.0
+
+        voice = make_attachment(type="audio", filename="v.ogg", size_bytes=4000 * 60)
+        assert processor.estimate_cost(voice) == pytest.approx(0.006)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Result cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestResultCache:
+    """Repeat attachments reuse cached results instead of re-analysing."""
+
+    @pytest.fixture
+    def cached_config(self, multimodal_config, tmp_path):
+        multimodal_config["processing"]["cache"] = {"directory": str(tmp_path / "cache")}
+        return multimodal_config
+
+    @pytest.mark.asyncio
+    async def test_same_bytes_analyzed_once(self, cached_config, mock_adapter):
+        """A forwarded copy (new file id) is served from the content hash."""
+        processor = MediaProcessor(config=cached_config)
+        processor.cache.record_lookup = AsyncMock()
+        first = make_attachment(id="att-1")
+        forward = make_attachment(id="att-2")
+
+        with patch.object(processor, "_analyze_image", new_callable=AsyncMock) as mock_analyze:
+            mock_analyze.side_effect = lambda a, data: MediaContent(
+                attachment=a, processed=True, vision_description="a cat", processing_cost_usd=0.004
+            )
+            await processor.process_attachment(first, "telegram", mock_adapter)
+            result = await processor.process_attachment(forward, "discord", mock_adapter)
+
+        assert mock_analyze.await_count == 1
+        assert mock_adapter.download_attachment.await_count == 2
+        assert result.attachment is forward
+        assert result.vision_description == "a cat"
+        assert result.processing_cost_usd == 0.0
+        processor.cache.record_lookup.assert_awaited_with(True, 0.004, "discord")
+
+    @pytest.mark.asyncio
+    async def test_same_file_id_skips_download(self, cached_config, mock_adapter):
+        """Re-sending the same platform file hits before downloading."""
+        processor = MediaProcessor(config=cached_config)
+        processor.cache.record_lookup = AsyncMock()
+        attachment = make_attachment(type="document", filename="notes.txt")
+        mock_adapter.download_attachment = AsyncMock(return_value=b"meeting notes")
+
+        await processor.process_attachment(attachment, "telegram", mock_adapter)
+        result = await processor.process_attachment(attachment, "telegram", mock_adapter)
+
+        assert mock_adapter.download_attachment.await_count == 1
+        assert result.extracted_text == "meeting notes"
+        assert result.metadata["cache_hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_config_change_invalidates(self, cached_config, mock_adapter):
+        """Changing the analysis config produces a fresh result."""
+        processor = MediaProcessor(config=cached_config)
+        processor.cache.record_lookup = AsyncMock()
+        attachment = make_attachment(type="document", filename="notes.txt")
+        mock_adapter.download_attachment = AsyncMock(return_value=b"x" * 50)
+
+        await processor.process_attachment(attachment, "telegram", mock_adapter)
+        cached_config["processing"]["documents"]["max_chars_per_doc"] = 10
+        result = await processor.process_attachment(attachment, "telegram", mock_adapter)
+
+        assert "cache_hit" not in result.metadata
+        assert result.extracted_text.startswith("x" * 10 + "\n\n[Truncated")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Streaming downloads
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestStreamingDownload:
+    """Size caps hold on received bytes; large files reach processors as paths."""
+
+    @pytest.mark.asyncio
+    async def test_cap_enforced_on_received_bytes(self, multimodal_config, mock_adapter):
+        """A file whose declared size is wrong is still stopped at the cap."""
+        multimodal_config["processing"]["max_file_size_mb"] = 1
+        processor = MediaProcessor(config=multimodal_config)
+        mock_adapter.download_attachment = AsyncMock(return_value=b"x" * (2 * 1024 * 1024))
+        attachment = make_attachment(size_bytes=1024)
+
+        result = await processor.process_attachment(attachment, "telegram", mock_adapter)
+
+        assert result.processed is False
+        assert "too large" in result.processing_error
+
+    @pytest.mark.asyncio
+    async def test_video_gets_spooled_file(self, multimodal_config, mock_adapter, tmp_path):
+        """Videos past the spool threshold are handed over as a file path."""
+        from pathlib import Path
+
+        multimodal_config["processing"]["spool_threshold_mb"] = 0.001
+        processor = MediaProcessor(config=multimodal_config)
+        mock_adapter.download_attachment = AsyncMock(return_value=b"v" * 4096)
+        attachment = make_attachment(type="video", filename="clip.mp4", mime_type="video/mp4")
+        seen = {}
+
+        async def analyze(attachment, video):
+            seen["video"] = video
+            seen["content"] = video.read_bytes()
+            return MediaContent(attachment=attachment, processed=True)
+
+        with patch.object(processor, "_analyze_video", side_effect=analyze):
+            result = await processor.process_attachment(attachment, "telegram", mock_adapter)
+
+        assert result.processed is True
+        assert isinstance(seen["video"], Path)
+        assert seen["content"] == b"v" * 4096
+        assert not seen["video"].exists()  # Spool removed after processing
@@ -0,0 +1,191 @@
+"""Tests for tools/channels/media/result_cache.py
+
+Results are keyed by content hash + analysis variant + config version,
+stored on disk, evicted least-recently-used first, and reported to the
+cost tracker.
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tools.channels.media.result_cache import MediaResultCache, config_version
+from tools.channels.media.storage_cleanup import StorageCleanup
+from tools.channels.models import Attachment, MediaContent
+from tools.ops import cost_tracker
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = MediaResultCache(directory=tmp_path / "cache", max_size_mb=1)
+    cache.record_lookup = AsyncMock()
+    return cache
+
+
+def make_attachment(id="att-1", type="image"):
+    return Attachment(id=id, type=type, filename="photo.jpg", mime_type="image/jpeg", size_bytes=10)
+
+
+def store(cache, data: bytes, description: str = "a cat", cost: float = 0.004) -> str:
+    key = asyncio.run(cache.content_key(data, "image", "v1"))
+    media = MediaContent(
+        attachment=make_attachment(),
+        processed=True,
+        vision_description=description,
+        processing_cost_usd=cost,
+        metadata={"language": None},
+    )
+    cache.put(key, media)
+    return key
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keys and lookups
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestLookup:
+    def test_hit_is_reattached_and_free(self, cache):
+        key = store(cache, b"image bytes")
+        other = make_attachment(id="att-2")
+
+        media = cache.get(key, other)
+
+        assert media.attachment is other
+        assert media.processed is True
+        assert media.vision_description == "a cat"
+        assert media.processing_cost_usd == 0.0
+        assert media.metadata["cache_hit"] is True
+        assert media.metadata["cache_saved_usd"] == 0.004
+
+    def test_key_depends_on_content_variant_and_version(self, cache):
+        key = asyncio.run(cache.content_key(b"data", "image", "v1"))
+        assert key == asyncio.run(cache.content_key(b"data", "image", "v1"))
+        assert key != asyncio.run(cache.content_key(b"other", "image", "v1"))
+        assert key != asyncio.run(cache.content_key(b"data", "document:pdf", "v1"))
+        assert key != asyncio.run(cache.content_key(b"data", "image", "v2"))
+
+    def test_config_version_tracks_config(self):
+        assert config_version({"model": "a"}) == config_version({"model": "a"})
+        assert config_version({"model": "a"}) != config_version({"model": "b"})
+
+    def test_unprocessed_results_are_not_stored(self, cache):
+        key = asyncio.run(cache.content_key(b"bad", "image", "v1"))
+        cache.put(key, MediaContent(attachment=make_attachment(), processing_error="boom"))
+        assert cache.get(key, make_attachment()) is None
+
+    def test_alias_and_thumbnail(self, cache):
+        key = asyncio.run(cache.content_key(b"img", "image", "v1"))
+        cache.put(key, MediaContent(attachment=make_attachment(), processed=True), thumbnail=b"jpg")
+        alias = cache.alias_key("telegram", make_attachment(), "image", "v1")
+        cache.put_alias(alias, key)
+
+        assert cache.get_alias(alias, make_attachment()).metadata["cache_key"] == key
+        assert cache.get_thumbnail(key) == b"jpg"
+        assert cache.get_alias(
+            cache.alias_key("discord", make_attachment(), "image", "v1"), make_attachment()
+        ) is None
+
+    def test_no_alias_without_file_id(self, cache):
+        key = store(cache, b"img")
+        alias = cache.alias_key("slack", make_attachment(id=""), "image", "v1")
+        cache.put_alias(alias, key)
+
+        assert alias is None
+        assert cache.get_alias(alias, make_attachment(id="")) is None
+
+    def test_disabled_cache_stores_nothing(self, tmp_path):
+        cache = MediaResultCache(directory=tmp_path / "off", enabled=False)
+        key = store(cache, b"image bytes")
+        assert cache.get(key, make_attachment()) is None
+        assert not (tmp_path / "off").exists()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Eviction
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestEviction:
+    def test_lru_keeps_recently_hit_entries(self, cache):
+        text = "x" * 300_000  # ~0.3 MB per entry, 1 MB limit
+        old = store(cache, b"old", text)
+        recent = store(cache, b"recent", text)
+        # Age both, then hit "old" so it becomes the most recent
+        past = time.time() - 60
+        for key in (old, recent):
+            os.utime(cache._path(key, ".json"), (past, past))
+        assert cache.get(old, make_attachment()) is not None
+
+        store(cache, b"third", text)
+        store(cache, b"fourth", text)  # Over 1 MB: evicts down to 90%
+
+        assert cache.get(old, make_attachment()) is not None
+        assert cache.get(recent, make_attachment()) is None
+        assert cache.get_stats()["total_bytes"] <= cache.max_bytes
+
+    def test_hits_refresh_alias_and_thumbnail(self, cache):
+        key = asyncio.run(cache.content_key(b"img", "image", "v1"))
+        cache.put(key, MediaContent(attachment=make_attachment(), processed=True), thumbnail=b"jpg")
+        alias = cache.alias_key("telegram", make_attachment(), "image", "v1")
+        cache.put_alias(alias, key)
+        past = time.time() - 31 * 86400
+        for path in cache.directory.glob("*/*"):
+            os.utime(path, (past, past))
+
+        assert cache.get_alias(alias, make_attachment()) is not None
+        assert cache.get_thumbnail(key) == b"jpg"
+        result = cache.evict()
+
+        assert result["files_removed"] == 0
+        assert cache.get_alias(alias, make_attachment()) is not None
+
+    def test_age_limit(self, cache):
+        key = store(cache, b"stale")
+        past = time.time() - 31 * 86400
+        os.utime(cache._path(key, ".json"), (past, past))
+
+        result = cache.evict()
+
+        assert result["files_removed"] == 1
+        assert cache.get(key, make_attachment()) is None
+
+    def test_storage_cleanup_evicts_cache(self, tmp_path):
+        cleanup = StorageCleanup(config={
+            "processing": {"cache": {"directory": str(tmp_path / "cache"), "max_age_days": 1}},
+        })
+        key = store(cleanup.result_cache, b"stale")
+        past = time.time() - 2 * 86400
+        os.utime(cleanup.result_cache._path(key, ".json"), (past, past))
+
+        result = asyncio.run(cleanup.cleanup_result_cache())
+
+        assert result["success"] is True
+        assert result["files_removed"] == 1
+        assert cleanup.get_stats()["result_cache"]["entries"] == 0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cost tracker reporting
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestCostReporting:
+    def test_hit_rate_and_savings(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cost_tracker, "DB_PATH", tmp_path / "audit.db")
+        cache = MediaResultCache(directory=tmp_path / "cache")
+
+        asyncio.run(cache.record_lookup(False, channel="telegram"))
+        asyncio.run(cache.record_lookup(True, 0.004, channel="telegram"))
+        asyncio.run(cache.record_lookup(True, 0.002, channel="discord"))
+
+        savings = cost_tracker.get_cache_savings(days=1)
+        assert savings["lookups"] == 3
+        assert savings["hits"] == 2
+        assert savings["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+        assert savings["saved_usd"] == pytest.approx(0.006)
+        assert savings["by_cache"]["media"]["hits"] == 2
+        assert cache.get_stats()["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
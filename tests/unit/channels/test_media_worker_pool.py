@@ -0,0 +1,130 @@
+"""Tests for tools/channels/media/worker_pool.py
+
+CPU-bound media work runs in warm worker processes with per-task timeouts
+and a per-worker memory limit; workers: 0 runs tasks in-process.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+
+import pytest
+
+from tools.channels.media.worker_pool import (
+    MediaWorkerPool,
+    extract_pdf_text,
+    make_thumbnail,
+    prepare_image,
+)
+
+
+@pytest.fixture
+def pool():
+    pool = MediaWorkerPool(workers=1, task_timeout=30, memory_limit_mb=512)
+    yield pool
+    pool.shutdown()
+
+
+def _png(width: int, height: int, mode: str = "RGBA") -> bytes:
+    pil_image = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    pil_image.new(mode, (width, height), color=(200, 10, 10, 255)).save(output, format="PNG")
+    return output.getvalue()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker functions
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestWorkerFunctions:
+    def test_prepare_image_downscales_to_jpeg(self):
+        pil_image = pytest.importorskip("PIL.Image")
+        data = prepare_image(_png(3136, 1000))
+        img = pil_image.open(io.BytesIO(data))
+        assert img.format == "JPEG"
+        assert img.size == (1568, 500)
+
+    def test_thumbnail(self):
+        pil_image = pytest.importorskip("PIL.Image")
+        img = pil_image.open(io.BytesIO(make_thumbnail(_png(1000, 500), 100)))
+        assert max(img.size) == 100
+
+    def test_pdf_missing_dependency_message(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "PyPDF2", None)
+        with pytest.raises(ImportError, match="pypdf2"):
+            extract_pdf_text(b"%PDF", 5)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pool behaviour
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestPool:
+    def test_runs_in_worker_process(self, pool):
+        pid = asyncio.run(pool.run(os.getpid))
+        assert pid != os.getpid()
+
+    def test_image_through_pool(self, pool):
+        pytest.importorskip("PIL.Image")
+        data = asyncio.run(pool.prepare_image(_png(2000, 2000)))
+        assert data[:2] == b"\xff\xd8"
+
+    def test_event_loop_not_blocked(self, pool):
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await pool.run(time.sleep, 0.5)
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(run()) >= 20
+
+    def test_timeout_replaces_worker(self, pool):
+        async def run():
+            first = await pool.run(os.getpid)
+            with pytest.raises(TimeoutError):
+                await pool.run(time.sleep, 10, timeout=0.3)
+            second = await pool.run(os.getpid)
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first != second
+        assert pool.stats["timeouts"] == 1
+        assert pool.stats["restarts"] == 1
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="RLIMIT_AS enforcement")
+    def test_memory_limit(self, pool):
+        async def run():
+            with pytest.raises(MemoryError):
+                await pool.run(bytearray, 2 * 1024**3)
+            # The worker survives a failed allocation
+            return await pool.run(len, b"ok")
+
+        assert asyncio.run(run()) == 2
+
+    def test_worker_errors_propagate(self, pool):
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run(int, "not a number"))
+
+    def test_in_process_mode(self):
+        pool = MediaWorkerPool(workers=0)
+        assert asyncio.run(pool.run(os.getpid)) == os.getpid()
+        with pytest.raises(TimeoutError):
+            asyncio.run(pool.run(time.sleep, 1, timeout=0.05))
+
+    def test_from_config(self):
+        pool = MediaWorkerPool.from_config(
+            {"workers": 3, "task_timeout_seconds": 5, "memory_limit_mb": 256}
+        )
+        assert (pool.workers, pool.task_timeout, pool.memory_limit_mb) == (3, 5, 256)
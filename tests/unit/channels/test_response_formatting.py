@@ -2,15 +2,21 @@
 
 Tests the three content formatting functions:
 - parse_response_blocks: Parse AI response into text/code blocks
+- ResponseBlockParser: The same blocks, incrementally from streamed deltas
 - format_blocks_for_channel: Apply channel-specific formatting
 - split_for_channel: Split content respecting channel message limits
+- _format_response_for_channel: Non-streaming replies keep image lines
 """
 
+import pytest
+
 from tools.channels.media_processor import (
+    ResponseBlockParser,
     format_blocks_for_channel,
     parse_response_blocks,
     split_for_channel,
 )
+from tools.channels.sdk_handler import _format_response_for_channel
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -93,6 +99,55 @@ class TestParseResponseBlocks:
         assert "&amp;" in code_blocks[0]["content"]
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# ResponseBlockParser Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+STREAMED = (
+    "Intro text\n"
+    "```python\nx = 1\n```\n"
+    "![chart](https://img.test/c.png)\n"
+    "| a | b |\n|---|---|\n| 1 | 2 |\n"
+    "Outro | not a table"
+)
+
+
+class TestResponseBlockParser:
+    """Tests for incremental block parsing of streamed responses."""
+
+    def test_matches_full_parse_for_any_chunking(self):
+        """Feeding deltas of any size yields the same blocks as a full parse."""
+        expected = parse_response_blocks(STREAMED)
+        for size in (1, 4, 29):
+            parser = ResponseBlockParser()
+            blocks = []
+            for i in range(0, len(STREAMED), size):
+                blocks += parser.feed(STREAMED[i:i + size])
+            assert blocks + parser.close() == expected
+
+        assert [b["type"] for b in expected] == ["text", "code", "image", "text", "text"]
+        assert expected[2]["content"] == "https://img.test/c.png"
+        assert expected[2]["metadata"]["alt"] == "chart"
+        assert expected[3]["metadata"] == {"table": True}
+        assert expected[3]["content"].endswith("| 1 | 2 |")
+
+    def test_blocks_emitted_when_they_close(self):
+        """A code block is emitted at its closing fence, not at stream end."""
+        parser = ResponseBlockParser()
+        assert parser.feed("Intro\n```js\nlet a;\n") == []
+        assert parser.pending()[-1]["type"] == "code"
+
+        emitted = parser.feed("```\nmore")
+        assert [b["type"] for b in emitted] == ["text", "code"]
+        assert emitted[1]["content"] == "let a;"
+        assert parser.close() == [{"type": "text", "content": "more", "metadata": {}}]
+
+    def test_pipe_line_without_delimiter_is_text(self):
+        """A lone pipe row is not a table and stays in its text block."""
+        result = parse_response_blocks("a\n| b |\nc")
+        assert result == [{"type": "text", "content": "a\n| b |\nc", "metadata": {}}]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # format_blocks_for_channel Tests
 # ─────────────────────────────────────────────────────────────────────────────
@@ -164,6 +219,41 @@ class TestFormatBlocksForChannel:
         assert result_tg == "Hello world"
         assert result_dc == "Hello world"
 
+    def test_image_blocks_kept_as_links(self):
+        """Image blocks keep their URL and alt text as a link."""
+        blocks = parse_response_blocks("See:\n![Weekly tasks](https://example.com/chart.png)")
+
+        assert blocks[1]["type"] == "image"
+        assert format_blocks_for_channel(blocks, "discord") == (
+            "See:\n\n[Weekly tasks](https://example.com/chart.png)"
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Non-streaming reply formatting
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestFormatResponseForChannel:
+    """Replies sent as one text message must not lose standalone image lines."""
+
+    @pytest.mark.parametrize(
+        ("channel", "link"),
+        [
+            ("telegram", '<a href="https://example.com/chart.png">Weekly tasks</a>'),
+            ("discord", "[Weekly tasks](https://example.com/chart.png)"),
+            ("slack", "[Weekly tasks](https://example.com/chart.png)"),
+        ],
+    )
+    def test_image_line_kept_as_link(self, channel, link):
+        response = "Here is the chart:\n![Weekly tasks](https://example.com/chart.png)\nDone."
+
+        result = _format_response_for_channel(response, channel)
+
+        assert link in result
+        assert "Here is the chart:" in result
+        assert "Done." in result
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # split_for_channel Tests
@@ -0,0 +1,243 @@
+"""Tests for tools/channels/handlers/stream_renderer.py
+
+The renderer decouples token consumption from platform edits: push() never
+waits on the adapter, edits carry the latest text, pacing adapts to rate
+limit feedback and long responses roll over into new messages.
+"""
+
+import asyncio
+
+from tools.channels.handlers.stream_renderer import (
+    EMPTY_RESPONSE_TEXT,
+    SURPLUS_PAGE_TEXT,
+    TYPING_CURSOR,
+    StreamRenderer,
+)
+
+
+class FakeAdapter:
+    """Records edits/sends; edits take ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0, rate_limit_first: int = 0):
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.messages: dict[int, str] = {0: "Thinking..."}
+        self.edits: list[tuple[int, str]] = []
+        self.calls = 0
+
+    async def edit(self, handle, content):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.calls <= self.rate_limit_first:
+            return {"success": False, "error": "429 Too Many Requests", "retry_after": 0.05}
+        self.messages[handle] = content
+        self.edits.append((handle, content))
+        return {"success": True}
+
+    async def send(self, content):
+        handle = len(self.messages)
+        self.messages[handle] = content
+        return handle
+
+
+def _renderer(adapter, **kwargs):
+    kwargs.setdefault("min_interval", 0.01)
+    return StreamRenderer("discord", handle=0, edit=adapter.edit, send=adapter.send, **kwargs)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Coalescing
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestCoalescing:
+    def test_push_does_not_wait_for_edits(self):
+        async def run():
+            adapter = FakeAdapter(latency=0.2)
+            renderer = _renderer(adapter)
+            renderer.start()
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for i in range(100):
+                renderer.push(f"tok{i} ")
+                await asyncio.sleep(0)
+            elapsed = loop.time() - start
+            await renderer.finish()
+            return elapsed, adapter
+
+        elapsed, adapter = asyncio.run(run())
+        assert elapsed < 0.1
+        # Far fewer edits than deltas, and the final edit has everything
+        assert len(adapter.edits) < 10
+        assert adapter.messages[0] == "".join(f"tok{i} " for i in range(100))
+
+    def test_latest_value_wins(self):
+        async def run():
+            adapter = FakeAdapter(latency=0.02)
+            renderer = _renderer(adapter, min_interval=0.05)
+            renderer.start()
+            for word in ["a", "b", "c", "d"]:
+                renderer.push(word)
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.1)
+            await renderer.finish()
+            return adapter
+
+        adapter = asyncio.run(run())
+        in_progress = [c for _, c in adapter.edits if c.endswith(TYPING_CURSOR)]
+        assert in_progress[-1] == "abcd" + TYPING_CURSOR
+        assert adapter.messages[0] == "abcd"
+
+    def test_identical_content_not_re_edited(self):
+        async def run():
+            adapter = FakeAdapter()
+            renderer = _renderer(adapter)
+            renderer.start()
+            renderer.push("done")
+            await asyncio.sleep(0.05)
+            await renderer.finish()
+            await renderer.finish()
+            return adapter
+
+        adapter = asyncio.run(run())
+        assert [c for _, c in adapter.edits] == ["done" + TYPING_CURSOR, "done"]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Final flush / rollover
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestFinish:
+    def test_empty_response_placeholder(self):
+        async def run():
+            adapter = FakeAdapter()
+            renderer = _renderer(adapter)
+            renderer.start()
+            stats = await renderer.finish()
+            return adapter, stats
+
+        adapter, stats = asyncio.run(run())
+        assert adapter.messages[0] == EMPTY_RESPONSE_TEXT
+        assert stats["edits"] == 1
+
+    def test_final_text_override(self):
+        async def run():
+            adapter = FakeAdapter()
+            renderer = _renderer(adapter)
+            renderer.start()
+            renderer.push("partial")
+            await renderer.finish("Error: boom")
+            return adapter
+
+        assert asyncio.run(run()).messages[0] == "Error: boom"
+
+    def test_rollover_into_new_messages(self):
+        text = ("word " * 60).strip()  # ~300 chars
+
+        async def run():
+            adapter = FakeAdapter()
+            renderer = _renderer(adapter, limit=100)
+            renderer.start()
+            for word in text.split(" "):
+                renderer.push(word + " ")
+                await asyncio.sleep(0.001)
+            stats = await renderer.finish()
+            return adapter, stats
+
+        adapter, stats = asyncio.run(run())
+        assert stats["messages"] == len(adapter.messages) > 1
+        for content in adapter.messages.values():
+            assert len(content) <= 100
+            assert not content.endswith(TYPING_CURSOR)
+        joined = " ".join(adapter.messages[i].strip() for i in range(len(adapter.messages)))
+        assert joined.split() == text.split()
+
+    def test_short_final_text_after_rollover(self):
+        async def run():
+            adapter = FakeAdapter()
+            renderer = _renderer(adapter, limit=100)
+            renderer.start()
+            for _ in range(10):
+                renderer.push("word " * 19 + "\n\n")
+                await asyncio.sleep(0.02)
+            sent = len(adapter.messages)
+            stats = await renderer.finish("short error")
+            return adapter, stats, sent
+
+        adapter, stats, sent = asyncio.run(run())
+        assert sent >= 10
+        assert stats["messages"] == sent
+        assert adapter.messages[0] == "short error"
+        assert {adapter.messages[i] for i in range(1, sent)} == {SURPLUS_PAGE_TEXT}
+
+    def test_without_send_stays_in_one_message(self):
+        async def run():
+            adapter = FakeAdapter()
+            renderer = StreamRenderer("discord", handle=0, edit=adapter.edit, limit=50)
+            renderer.start()
+            renderer.push("x " * 100)
+            stats = await renderer.finish()
+            return adapter, stats
+
+        adapter, stats = asyncio.run(run())
+        assert stats["messages"] == 1
+        assert len(adapter.messages[0]) <= 50
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rate adaptation
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestRateAdaptation:
+    def test_backs_off_on_rate_limit_and_recovers(self):
+        async def run():
+            adapter = FakeAdapter(rate_limit_first=2)
+            renderer = _renderer(adapter, min_interval=0.01, max_interval=1.0)
+            renderer.start()
+            renderer.push("a")
+            await asyncio.sleep(0.02)
+            backed_off = renderer.interval
+            for ch in "bcdefgh":
+                renderer.push(ch)
+                await asyncio.sleep(0.06)
+            stats = await renderer.finish()
+            return adapter, stats, backed_off
+
+        adapter, stats, backed_off = asyncio.run(run())
+        assert backed_off >= 0.05
+        assert stats["rate_limited"] == 2
+        assert stats["interval_s"] < backed_off
+        assert adapter.messages[0] == "abcdefgh"
+
+    def test_platform_intervals(self):
+        async def edit(handle, content):
+            return {"success": True}
+
+        assert StreamRenderer("slack", 0, edit).min_interval == 1.0
+        assert StreamRenderer("discord", 0, edit).min_interval == 0.5
+        assert StreamRenderer("discord", 0, edit).limit == 2000
+        assert StreamRenderer("telegram", 0, edit).limit == 4096
+
+    def test_adapter_exception_does_not_stop_stream(self):
+        calls = []
+
+        async def edit(handle, content):
+            calls.append(content)
+            if len(calls) == 1:
+                raise ConnectionError("network blip")
+            return {"success": True}
+
+        async def run():
+            renderer = StreamRenderer("discord", 0, edit, min_interval=0.01)
+            renderer.start()
+            renderer.push("hello")
+            await asyncio.sleep(0.03)
+            renderer.push(" world")
+            return await renderer.finish()
+
+        stats = asyncio.run(run())
+        assert calls[-1] == "hello world"
+        assert stats["failed_edits"] == 1
+        assert stats["time_to_first_visible_ms"] is not None
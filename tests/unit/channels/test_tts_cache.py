@@ -0,0 +1,220 @@
+"""Tests for tools/channels/tts_cache.py
+
+Synthesized speech is cached by (normalized text, provider, voice, model,
+format, speed), evicted least-recently-used first by bytes, and pre-warmed
+with the fixed voice command confirmations.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from tools.channels.audio_processor import AudioProcessor, TTSResult
+from tools.channels.tts_cache import TTSCache, normalize_text
+from tools.channels.tts_generator import TTSGenerator
+from tools.ops import cost_tracker
+from tools.voice.commands import STATIC_CONFIRMATIONS
+
+
+class StubTTSProcessor(AudioProcessor):
+    """AudioProcessor whose provider call is a local, counting stub."""
+
+    def __init__(self, config):
+        super().__init__(config=config)
+        self.calls = []
+
+    async def _generate_speech_openai(self, text, voice, output_format, model, speed, config):
+        self.calls.append((text, voice, output_format, speed))
+        return TTSResult(
+            success=True,
+            audio_bytes=f"{voice}:{output_format}:{speed}:{text}".encode(),
+            format=output_format,
+            duration_seconds=self._estimate_speech_duration(text, speed),
+            cost_usd=self._tts_cost(text, model, config),
+        )
+
+
+def make_config(tmp_path, **cache):
+    return {
+        "generation": {
+            "tts": {
+                "enabled": True,
+                "model": "tts-1",
+                "voice": "nova",
+                "speed": 1.0,
+                "output_format": "opus",
+                "cache": {"directory": str(tmp_path / "tts"), **cache},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.setattr(cost_tracker, "DB_PATH", tmp_path / "audit.db")
+    return StubTTSProcessor(make_config(tmp_path))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keys
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestKeys:
+    def test_normalize_collapses_whitespace(self):
+        assert normalize_text("  Reminder\n cancelled.\t") == "Reminder cancelled."
+
+    def test_key_covers_voice_model_format_speed(self):
+        base = {"provider": "openai", "voice": "alloy", "model": "tts-1", "output_format": "opus", "speed": 1.0}
+        key = TTSCache.key("Hi there", **base)
+
+        assert TTSCache.key("Hi   there ", **base) == key
+        assert TTSCache.key("Hi there", **{**base, "voice": "nova"}) != key
+        assert TTSCache.key("Hi there", **{**base, "model": "tts-1-hd"}) != key
+        assert TTSCache.key("Hi there", **{**base, "output_format": "mp3"}) != key
+        assert TTSCache.key("Hi there", **{**base, "speed": 1.25}) != key
+        assert TTSCache.key("hi there", **base) != key
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AudioProcessor integration
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestGenerateSpeech:
+    def test_repeat_phrase_served_from_cache(self, processor):
+        first = asyncio.run(processor.generate_speech("Reminder cancelled."))
+        second = asyncio.run(processor.generate_speech(" Reminder  cancelled. "))
+
+        assert len(processor.calls) == 1
+        assert first.cached is False
+        assert first.cost_usd > 0
+        assert second.cached is True
+        assert second.cost_usd == 0.0
+        assert second.audio_bytes == first.audio_bytes
+        assert second.duration_seconds == first.duration_seconds
+
+    def test_defaults_resolved_before_lookup(self, processor):
+        asyncio.run(processor.generate_speech("Snoozed.", voice=None, output_format="opus"))
+        hit = asyncio.run(processor.generate_speech("Snoozed.", voice="nova", output_format="bogus", speed=1.0))
+
+        assert hit.cached is True
+        assert processor.calls == [("Snoozed.", "nova", "opus", 1.0)]
+
+    def test_savings_reported(self, processor):
+        for _ in range(3):
+            asyncio.run(processor.generate_speech("Focus mode ended. Notifications resumed."))
+
+        stats = processor.tts_cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["saved_usd"] == pytest.approx(2 * 40 / 1000 * 0.015)
+        assert stats["time_saved_seconds"] >= 0
+
+        savings = cost_tracker.get_cache_savings(days=1)
+        assert savings["by_cache"]["tts"]["hits"] == 2
+
+    def test_failures_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cost_tracker, "DB_PATH", tmp_path / "audit.db")
+
+        class FailingProcessor(StubTTSProcessor):
+            async def _generate_speech_openai(self, *args):
+                self.calls.append(args)
+                return TTSResult(success=False, error="TTS API error")
+
+        processor = FailingProcessor(make_config(tmp_path))
+        asyncio.run(processor.generate_speech("Hello"))
+        result = asyncio.run(processor.generate_speech("Hello"))
+
+        assert result.success is False
+        assert len(processor.calls) == 2
+
+    def test_disabled_cache(self, tmp_path):
+        processor = StubTTSProcessor(make_config(tmp_path, enabled=False))
+        asyncio.run(processor.generate_speech("Hello"))
+        asyncio.run(processor.generate_speech("Hello"))
+
+        assert len(processor.calls) == 2
+        assert not (tmp_path / "tts").exists()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Eviction
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestEviction:
+    def test_lru_by_bytes(self, tmp_path):
+        cache = TTSCache(directory=tmp_path, max_size_mb=0.0035)  # ~3.5 KB
+        keys = [
+            TTSCache.key(f"phrase {i}", provider="openai", voice="alloy",
+                         model="tts-1", output_format="mp3", speed=1.0)
+            for i in range(4)
+        ]
+        cache.put(keys[0], "mp3", b"a" * 1000)
+        cache.put(keys[1], "mp3", b"b" * 1000)
+        old = time.time() - 60
+        os.utime(cache._path(keys[0], "mp3"), (old, old))
+        os.utime(cache._path(keys[1], "mp3"), (old - 60, old - 60))
+        assert cache.get(keys[1], "mp3") is not None  # Now most recent
+
+        cache.put(keys[2], "mp3", b"c" * 1000)
+        cache.put(keys[3], "mp3", b"d" * 1000)
+
+        assert cache.get(keys[0], "mp3") is None
+        assert cache.get(keys[1], "mp3") is not None
+        assert cache.get(keys[3], "mp3") is not None
+        assert cache.get(keys[2], "mp3") is not None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pre-warming
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestPrewarm:
+    def test_confirmations_are_fixed_strings(self):
+        assert "Focus mode ended. Notifications resumed." in STATIC_CONFIRMATIONS
+        assert "Reminder cancelled." in STATIC_CONFIRMATIONS
+        assert len(set(STATIC_CONFIRMATIONS)) == len(STATIC_CONFIRMATIONS)
+
+    def test_prewarm_then_hits(self, tmp_path, processor, monkeypatch):
+        monkeypatch.setattr("tools.channels.audio_processor.get_audio_processor", lambda: processor)
+        generator = TTSGenerator(config=make_config(tmp_path))
+        formats = sorted(set(TTSGenerator.CHANNEL_FORMATS.values()))
+
+        first = asyncio.run(generator.prewarm())
+        again = asyncio.run(generator.prewarm())
+        reply = asyncio.run(generator.generate_for_channel("Reminder cancelled.", "telegram"))
+
+        assert first["synthesized"] == len(STATIC_CONFIRMATIONS) * len(formats)
+        assert first["failed"] == 0
+        assert again["synthesized"] == 0
+        assert again["cost_usd"] == 0.0
+        assert reply.cached is True
+        assert len(processor.calls) == first["synthesized"]
+
+    def test_prewarm_not_reported_as_savings(self, tmp_path, processor, monkeypatch):
+        monkeypatch.setattr("tools.channels.audio_processor.get_audio_processor", lambda: processor)
+        generator = TTSGenerator(config=make_config(tmp_path))
+
+        asyncio.run(generator.prewarm(phrases=["Reminder cancelled."]))
+        asyncio.run(generator.prewarm(phrases=["Reminder cancelled."]))
+
+        stats = processor.tts_cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["saved_usd"]) == (0, 0, 0.0)
+        assert "tts" not in cost_tracker.get_cache_savings(days=1)["by_cache"]
+
+    def test_prewarm_disabled(self, tmp_path):
+        generator = TTSGenerator(config={"generation": {"tts": {"enabled": False}}})
+        assert asyncio.run(generator.prewarm())["success"] is False
+
+    def test_generator_passes_speed(self, tmp_path, processor, monkeypatch):
+        monkeypatch.setattr("tools.channels.audio_processor.get_audio_processor", lambda: processor)
+        generator = TTSGenerator(config=make_config(tmp_path))
+        asyncio.run(generator.generate("Hello", speed=1.5))
+
+        assert processor.calls[0][3] == 1.5
@@ -0,0 +1,186 @@
+"""Tests for tools/channels/video_processor.py
+
+Covers the FFmpeg helpers (stream summary parsing, MP4 index detection,
+frame selection) and, when ffmpeg is installed, the single-pass extraction,
+per-job temp directories and cancellation.
+"""
+
+import asyncio
+import shutil
+import struct
+import subprocess
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tools.channels import audio_processor
+from tools.channels.audio_processor import TranscriptionResult
+from tools.channels.video_processor import (
+    VideoProcessor,
+    frame_timestamps,
+    keyframe_select_expression,
+    mp4_index_first,
+    parse_stream_info,
+    run_ffmpeg,
+    select_expression,
+)
+
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+FFMPEG_SUMMARY = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'pipe:0':
+  Duration: 00:01:02.50, start: 0.000000, bitrate: N/A
+  Stream #0:0[0x1](und): Video: h264 (avc1 / 0x31637661), yuv420p, 1280x720 [SAR 1:1 DAR 16:9], 29.97 fps, 29.97 tbr, 30k tbn (default)
+  Stream #0:1[0x2](und): Audio: aac (mp4a / 0x6134706D), 44100 Hz, mono, fltp, 69 kb/s (default)
+At least one output file must be specified
+"""
+
+
+def _box(kind: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _make_video(tmp_path, seconds: int = 6, audio: bool = True) -> bytes:
+    path = tmp_path / "clip.webm"
+    cmd = ["ffmpeg", "-v", "error", "-f", "lavfi",
+           "-i", f"testsrc=duration={seconds}:size=160x120:rate=10"]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}", "-shortest"]
+    subprocess.run([*cmd, "-c:v", "libvpx", str(path), "-y"], check=True)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = VideoProcessor({"processing": {"video": {}, "worker_pool": {"workers": 0}}})
+    media = processor._get_media_processor()
+
+    class Transcriber:
+        async def transcribe(self, audio_bytes, filename, mime_type):
+            return TranscriptionResult(success=True, text="beep", cost_usd=0.001)
+
+    with (
+        patch.object(audio_processor, "get_audio_processor", return_value=Transcriber()),
+        patch.object(media, "_call_vision_api", AsyncMock(return_value=("test card", 0.01))),
+    ):
+        yield processor
+    processor.cleanup()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestHelpers:
+    def test_parse_stream_info(self):
+        info = parse_stream_info(FFMPEG_SUMMARY)
+        assert info == {
+            "duration": 62.5,
+            "width": 1280,
+            "height": 720,
+            "fps": 29.97,
+            "has_audio": True,
+        }
+
+    def test_parse_stream_info_without_video(self):
+        assert parse_stream_info("pipe:0: Invalid data found when processing input") is None
+
+    def test_mp4_index_position(self):
+        assert mp4_index_first(_box(b"ftyp", b"isom") + _box(b"moov") + _box(b"mdat"))
+        assert not mp4_index_first(_box(b"ftyp", b"isom") + _box(b"mdat") + _box(b"moov"))
+        assert not mp4_index_first(b"\x1a\x45\xdf\xa3 webm")
+
+    def test_frame_timestamps(self):
+        assert frame_timestamps(4, 3) == [2]
+        assert frame_timestamps(20, 3) == [1, 10, 19]
+        assert frame_timestamps(100, 3) == [25, 50, 75]
+        assert frame_timestamps(20, 2) == [1, 10]
+
+    def test_select_expression(self):
+        expr = select_expression([1, 10])
+        assert expr.count("gte(t,") == 2
+        assert "lt(prev_selected_t,10.000)" in expr
+
+    def test_keyframe_windows_end_at_timestamp(self):
+        expr = keyframe_select_expression([1, 2.5, 10], 2.0)
+        # Never after the timestamp, never before the previous one
+        assert "gt(t,-1.000)*lte(t,1.000)" in expr
+        assert "gt(t,1.000)*lte(t,2.500)" in expr
+        assert "gt(t,8.000)*lte(t,10.000)" in expr
+        assert "lte(prev_selected_t,8.000)" in expr
+
+    def test_collect_frames_labels(self, tmp_path):
+        for n in (1, 2):
+            (tmp_path / f"frame_{n:02d}.jpg").write_bytes(b"jpg %d" % n)
+
+        labelled = VideoProcessor._collect_frames(tmp_path, "frame_*.jpg", [1.0, 10.0])
+        short = VideoProcessor._collect_frames(tmp_path, "frame_*.jpg", [1.0, 10.0, 19.0])
+
+        assert [f["timestamp"] for f in labelled] == [1.0, 10.0]
+        # Which timestamp produced no frame is unknown: no label is shifted
+        assert [(f["bytes"], f["timestamp"]) for f in short] == [(b"jpg 1", None), (b"jpg 2", None)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FFmpeg pipeline
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@needs_ffmpeg
+class TestPipeline:
+    def test_single_pass_frames_and_audio(self, processor, tmp_path):
+        video = _make_video(tmp_path)
+        result = asyncio.run(processor.process_video(video, "clip.webm", "video/webm"))
+
+        assert result.success, result.error
+        assert result.duration_seconds == pytest.approx(6, abs=0.2)
+        assert (result.width, result.height) == (160, 120)
+        assert result.transcription == "beep"
+        assert result.frame_descriptions == ["[1.0s] test card", "[3.0s] test card",
+                                             "[5.0s] test card"]
+        assert result.thumbnail_bytes[:2] == b"\xff\xd8"
+
+    def test_concurrent_jobs_use_separate_directories(self, processor, tmp_path):
+        video = _make_video(tmp_path, audio=False)
+
+        async def run():
+            return await asyncio.gather(*(
+                processor.process_video(video, "clip.webm", "video/webm") for _ in range(3)
+            ))
+
+        results = asyncio.run(run())
+        assert all(r.success and len(r.frame_descriptions) == 3 for r in results)
+        assert list(processor._temp_dir.iterdir()) == []
+
+    def test_cancellation_kills_ffmpeg(self):
+        procs = []
+        spawn = asyncio.create_subprocess_exec
+
+        async def spy(*args, **kwargs):
+            procs.append(await spawn(*args, **kwargs))
+            return procs[-1]
+
+        async def run():
+            task = asyncio.create_task(run_ffmpeg(
+                ["-v", "error", "-re", "-f", "lavfi", "-i", "testsrc=duration=30",
+                 "-f", "null", "-"],
+                timeout=60,
+            ))
+            await asyncio.sleep(0.3)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with patch("asyncio.create_subprocess_exec", spy):
+            asyncio.run(asyncio.wait_for(run(), 5))
+        assert procs[0].returncode is not None
+
+    def test_timeout(self):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run_ffmpeg(
+                ["-v", "error", "-re", "-f", "lavfi", "-i", "testsrc=duration=30",
+                 "-f", "null", "-"],
+                timeout=0.3,
+            ))
@@ -0,0 +1,165 @@
+"""Tests for activity feed pagination in tools/dashboard/backend/database.py
+
+Keyset pages on (timestamp, id), opaque cursors carrying the first page's
+total, index-only event counts and the batched export iterator.
+"""
+
+import sqlite3
+
+import pytest
+
+from tools.dashboard.backend import database, seed
+
+
+FILTERS = [
+    {},
+    {"event_type": "task"},
+    {"severity": "error"},
+    {"channel": "telegram"},
+    {"event_type": "task", "severity": "error"},
+    {"event_type": "task", "severity": "error", "channel": "telegram"},
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "dashboard.db")
+    monkeypatch.setattr(
+        seed,
+        "seed_database",
+        lambda force=False: {"success": True, "message": "", "events": 0, "metrics": 0},
+    )
+    database.init_db()
+    return database
+
+
+@pytest.fixture
+def events(db):
+    """60 events in 20 groups sharing a timestamp, written as seed data is."""
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.executemany(
+        "INSERT INTO dashboard_events (event_type, timestamp, channel, summary, severity) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (
+                ("task", "message", "system")[n % 3],
+                f"2026-03-02T10:{n // 3:02d}:00",
+                ("telegram", "discord", None, "telegram")[n % 4],
+                f"event {n}",
+                "error" if n % 5 == 0 else "info",
+            )
+            for n in range(60)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    db.rebuild_rollups()
+    return db
+
+
+def scroll(db, limit: int, **filters) -> list[int]:
+    """Event ids of every page, following keyset positions."""
+    ids, before = [], None
+    while True:
+        page = db.get_events(limit=limit, before=before, **filters)
+        ids.extend(event["id"] for event in page)
+        if len(page) < limit:
+            return ids
+        before = (page[-1]["timestamp"], page[-1]["id"])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keyset Pages
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestKeysetPages:
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_pages_match_one_full_query(self, events, filters):
+        expected = [e["id"] for e in events.get_events(limit=1000, **filters)]
+
+        assert scroll(events, 7, **filters) == expected
+        assert len(expected) == events.count_events(**filters)
+
+    def test_ties_on_timestamp_ordered_by_id(self, events):
+        first = events.get_events(limit=4)
+
+        assert [e["timestamp"] for e in first[:3]] == ["2026-03-02T10:19:00"] * 3
+        assert [e["id"] for e in first] == [60, 59, 58, 57]
+
+    def test_new_events_do_not_shift_later_pages(self, events):
+        page = events.get_events(limit=10)
+        events.log_event("message", "arrived while scrolling")
+
+        after = events.get_events(limit=10, before=(page[-1]["timestamp"], page[-1]["id"]))
+        assert after[0]["id"] == page[-1]["id"] - 1
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_pages_seek_an_index(self, events, filters):
+        conn = sqlite3.connect(events.DB_PATH)
+        where, params = events._event_filters(
+            filters.get("event_type"), filters.get("severity"), filters.get("channel"),
+            None, None,
+        )
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM dashboard_events WHERE {where} "
+                "AND (timestamp, id) < (?, ?) ORDER BY timestamp DESC, id DESC LIMIT 51",
+                [*params, "2026", 1],
+            )
+        )
+        conn.close()
+
+        assert "USING INDEX idx_dashboard_events_" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_iter_events_streams_in_batches(self, events):
+        exported = list(events.iter_events(event_type="message", batch_size=4))
+
+        assert [e["id"] for e in exported] == [
+            e["id"] for e in events.get_events(event_type="message", limit=1000)
+        ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cursors and Counts
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestCursorsAndCounts:
+    def test_cursor_round_trip(self, events):
+        last = events.get_events(limit=5)[-1]
+        cursor = events.encode_event_cursor(last, 60)
+
+        assert not cursor.isdigit()
+        assert events.decode_event_cursor(cursor) == ((last["timestamp"], last["id"]), 60)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "W10", "WyJ4IiwgMV0"])
+    def test_malformed_cursor(self, db, cursor):
+        assert db.decode_event_cursor(cursor) is None
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_count_reads_only_an_index(self, events, filters):
+        conn = sqlite3.connect(events.DB_PATH)
+        where, params = events._event_filters(
+            filters.get("event_type"), filters.get("severity"), filters.get("channel"),
+            None, None,
+        )
+        (plan,) = [
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM dashboard_events WHERE {where}", params
+            )
+        ]
+        conn.close()
+
+        assert "USING COVERING INDEX idx_dashboard_events_" in plan
+
+    def test_count_includes_events_from_every_writer(self, db):
+        db.log_event("task", "t", channel="telegram")
+        db.record_tool_use("bash", "tu_1", success=True)
+        db.create_task("telegram:u1", "t2")
+
+        assert db.count_events() == 3
+        assert db.count_events(channel="telegram") == 2
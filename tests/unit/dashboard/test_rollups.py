@@ -0,0 +1,268 @@
+"""Tests for dashboard metric/event rollups in tools/dashboard/backend/database.py
+
+record_metric() and the event writers maintain minute, hour and day
+buckets at write time; aggregate_metrics() and get_quick_stats() read only
+the buckets, and raw metric rows are aged out by apply_retention().
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from tools.dashboard.backend import database, seed
+
+
+MONDAY = datetime(2026, 3, 2, 9, 15)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "dashboard.db")
+    monkeypatch.setattr(database, "RETENTION_INTERVAL_SECONDS", 3600.0)
+    monkeypatch.setattr(
+        seed,
+        "seed_database",
+        lambda force=False: {"success": True, "message": "", "events": 0, "metrics": 0},
+    )
+    database.init_db()
+    return database
+
+
+def raw_sql(sql: str, params: tuple = ()) -> list[tuple]:
+    conn = sqlite3.connect(database.DB_PATH)
+    rows = conn.execute(sql, params).fetchall()
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def rollup_rows() -> list[tuple]:
+    return raw_sql(
+        "SELECT * FROM dashboard_metric_rollups ORDER BY metric_name, resolution, bucket"
+    ) + raw_sql(
+        "SELECT * FROM dashboard_metric_histograms ORDER BY metric_name, resolution, bucket, bin"
+    ) + raw_sql(
+        "SELECT * FROM dashboard_event_rollups ORDER BY resolution, bucket, event_type, channel"
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Write-time Buckets
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestWriteTimeBuckets:
+    def test_record_metric_updates_every_resolution(self, db):
+        for minutes, value in ((0, 2.0), (0, 8.0), (30, 5.0)):
+            db.record_metric("api_cost_usd", value, timestamp=MONDAY + timedelta(minutes=minutes))
+
+        rows = raw_sql(
+            "SELECT resolution, bucket, count, total, min_value, max_value "
+            "FROM dashboard_metric_rollups ORDER BY resolution, bucket"
+        )
+        assert rows == [
+            ("day", "2026-03-02 00:00:00", 3, 15.0, 2.0, 8.0),
+            ("hour", "2026-03-02 09:00:00", 3, 15.0, 2.0, 8.0),
+            ("minute", "2026-03-02 09:15:00", 2, 10.0, 2.0, 8.0),
+            ("minute", "2026-03-02 09:45:00", 1, 5.0, 5.0, 5.0),
+        ]
+
+    def test_event_writers_update_event_buckets(self, db):
+        db.log_event("message", "hi", channel="telegram")
+        db.record_tool_use("bash", "tu_1", success=False)
+        db.log_audit("auth.login", severity="error")
+
+        rows = raw_sql(
+            "SELECT event_type, severity, channel, count FROM dashboard_event_rollups "
+            "WHERE resolution = 'day' ORDER BY event_type"
+        )
+        assert rows == [
+            ("auth.login", "error", "", 1),
+            ("message", "info", "telegram", 1),
+            ("tool_use", "warning", "", 1),
+        ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chart Queries
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestAggregateMetrics:
+    @pytest.fixture
+    def costs(self, db):
+        for day in range(8):
+            for hour in (1, 13):
+                db.record_metric(
+                    "api_cost_usd", float(day + hour), timestamp=MONDAY + timedelta(days=day, hours=hour)
+                )
+        # Charts must not need the raw rows
+        raw_sql("DELETE FROM dashboard_metrics")
+        return db
+
+    @pytest.mark.parametrize(
+        ("aggregation", "expected"),
+        [("sum", 14.0), ("avg", 7.0), ("min", 1.0), ("max", 13.0), ("count", 2)],
+    )
+    def test_daily_aggregations(self, costs, aggregation, expected):
+        points = costs.aggregate_metrics("api_cost_usd", aggregation, group_by_interval="1d")
+
+        assert len(points) == 8
+        assert points[0] == {"timestamp": "2026-03-02 00:00:00", "value": expected}
+
+    def test_range_and_hourly_buckets(self, costs):
+        points = costs.aggregate_metrics(
+            "api_cost_usd",
+            start_date=MONDAY + timedelta(days=1),
+            end_date=MONDAY + timedelta(days=1, hours=12),
+            group_by_interval="1h",
+        )
+
+        assert points == [{"timestamp": "2026-03-03 10:00:00", "value": 2.0}]
+
+    def test_weekly_buckets(self, costs):
+        points = costs.aggregate_metrics("api_cost_usd", "count", group_by_interval="1w")
+
+        assert points == [
+            {"timestamp": "2026-09", "value": 14},
+            {"timestamp": "2026-10", "value": 2},
+        ]
+
+    def test_many_metrics_in_one_call(self, costs):
+        costs.record_metric("tokens_input", 100.0, timestamp=MONDAY)
+        series = costs.aggregate_metrics_many(
+            ["api_cost_usd", "tokens_input", "unknown"], group_by_interval="1d"
+        )
+
+        assert len(series["api_cost_usd"]) == 8
+        assert series["tokens_input"] == [{"timestamp": "2026-03-02 00:00:00", "value": 100.0}]
+        assert series["unknown"] == []
+
+    def test_response_time_percentiles(self, db):
+        values = [float(v) for v in range(1, 1001)]
+        for n, value in enumerate(values):
+            db.record_metric("response_time_ms", value, timestamp=MONDAY + timedelta(seconds=n))
+
+        for aggregation, exact in (("p50", 500.0), ("p99", 990.0)):
+            (point,) = db.aggregate_metrics("response_time_ms", aggregation, group_by_interval="1d")
+            assert point["value"] == pytest.approx(exact, rel=0.02)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Quick Stats
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestQuickStats:
+    def test_today_from_day_buckets(self, db):
+        db.log_event("task", "t1", channel="telegram")
+        db.log_event("task", "t2", channel="discord", severity="error")
+        db.log_event("message", "m1", channel="telegram")
+        db.log_event("message", "m2")
+        db.record_metric("api_cost_usd", 0.25)
+        db.record_metric("api_cost_usd", 0.5)
+        db.record_metric("response_time_ms", 100.0)
+        db.record_metric("response_time_ms", 300.0)
+        db.record_metric("api_cost_usd", 9.0, timestamp=datetime.now() - timedelta(days=1))
+
+        assert db.get_quick_stats() == {
+            "tasks_today": 2,
+            "messages_today": 2,
+            "cost_today_usd": 0.75,
+            "active_channels": 2,
+            "avg_response_time_ms": 200.0,
+            "error_rate_percent": 25.0,
+        }
+
+    def test_task_writers_counted(self, db):
+        task_id = db.create_task("telegram:u1", "summarize the thread")
+        db.update_task(task_id, status="completed", summary="done")
+        db.log_event("message", "m1", channel="discord")
+
+        stats = db.get_quick_stats()
+        assert stats["tasks_today"] == 2
+        assert stats["messages_today"] == 1
+        assert stats["active_channels"] == 2
+        assert db.count_events(event_type="task") == 2
+        written = rollup_rows()
+        db.rebuild_rollups()
+        assert rollup_rows() == written
+
+    def test_empty_day(self, db):
+        stats = db.get_quick_stats()
+
+        assert stats["tasks_today"] == 0
+        assert stats["cost_today_usd"] == 0.0
+        assert stats["avg_response_time_ms"] == 0.0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Backfill and Retention
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestMaintenance:
+    def test_rebuild_matches_write_time_buckets(self, db):
+        for n in range(50):
+            ts = MONDAY + timedelta(minutes=7 * n)
+            db.record_metric("response_time_ms", float(n * 13 % 400), timestamp=ts)
+            db.record_metric("api_cost_usd", n / 4, timestamp=ts)
+        db.log_event("message", "hi", channel="telegram")
+        db.log_event("task", "t")
+        written = rollup_rows()
+
+        db.rebuild_rollups()
+
+        assert rollup_rows() == written
+
+    def test_init_backfills_database_without_rollups(self, db):
+        raw_sql(
+            "INSERT INTO dashboard_metrics (metric_name, metric_value, timestamp) "
+            "VALUES ('api_cost_usd', 1.5, ?)",
+            (datetime.now().isoformat(),),
+        )
+        raw_sql("DELETE FROM dashboard_metric_rollups")
+
+        db.init_db()
+
+        assert db.get_quick_stats()["cost_today_usd"] == 1.5
+
+    def test_forced_reseed_rebuilds_rollups(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "dashboard.db")
+        monkeypatch.setattr(seed, "DASHBOARD_DB_PATH", tmp_path / "dashboard.db")
+        monkeypatch.setattr(seed, "ACTIVITY_DB_PATH", tmp_path / "activity.db")
+        database.init_db()
+
+        assert seed.seed_database(force=True)["success"] is True
+
+        assert raw_sql("SELECT COUNT(*) FROM dashboard_metric_rollups")[0][0] > 0
+        assert raw_sql("SELECT COUNT(*) FROM dashboard_event_rollups")[0][0] > 0
+        stats = database.get_quick_stats()
+        assert stats["cost_today_usd"] > 0
+        assert stats["avg_response_time_ms"] > 0
+
+    def test_retention_keeps_coarse_buckets(self, db):
+        now = datetime(2026, 6, 1, 12, 0)
+        old = now - timedelta(days=30)
+        db.record_metric("api_cost_usd", 3.0, timestamp=old)
+        db.record_metric("api_cost_usd", 4.0, timestamp=now)
+
+        deleted = db.apply_retention(now)
+
+        assert deleted["raw_metrics"] == 1
+        assert deleted["minute"] == 1
+        assert deleted["hour"] == 0
+        assert len(db.get_metrics("api_cost_usd")) == 1
+        assert db.aggregate_metrics("api_cost_usd", group_by_interval="1h") == [
+            {"timestamp": "2026-05-02 12:00:00", "value": 3.0},
+            {"timestamp": "2026-06-01 12:00:00", "value": 4.0},
+        ]
+
+    def test_record_metric_applies_retention_when_due(self, db, monkeypatch):
+        db.record_metric("api_cost_usd", 1.0, timestamp=datetime.now() - timedelta(days=30))
+        monkeypatch.setattr(db, "RETENTION_INTERVAL_SECONDS", 0.0)
+        db.record_metric("api_cost_usd", 2.0)
+
+        assert [m["metric_value"] for m in db.get_metrics("api_cost_usd")] == [2.0]
+        assert len(db.aggregate_metrics("api_cost_usd", group_by_interval="1d")) == 2
@@ -0,0 +1 @@
+"""Learning and personalization unit tests."""
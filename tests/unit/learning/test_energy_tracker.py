@@ -0,0 +1,106 @@
+"""Tests for tools/learning/energy_tracker.py
+
+Energy profiles are maintained incrementally as observations arrive:
+- Each (user, day, hour) bucket keeps a decayed running mean
+- Peak hours follow the bucket averages without a rebuild
+- rebuild_profiles() is a backfill that must agree with the incremental path
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Setup: Patch DB_PATH to use temp database
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def tracker(temp_db):
+    """Patch energy tracker to use temporary database and default config."""
+    from tools.learning import energy_tracker
+
+    with (
+        patch.object(energy_tracker, "DB_PATH", temp_db),
+        patch.object(energy_tracker, "CONFIG_PATH", temp_db.with_suffix(".missing.yaml")),
+    ):
+        yield energy_tracker
+
+
+# Monday 09:00
+MONDAY_9AM = datetime(2026, 10, 5, 9, 0)
+
+FAST = {"response_time_ms": 1000}
+SLOW = {"response_time_ms": 12000}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Incremental Profile Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestIncrementalProfile:
+    """Tests for O(1) profile maintenance in record_observation."""
+
+    def test_profile_available_without_rebuild(self, tracker):
+        """Recording should update the bucket immediately."""
+        tracker.record_observation("alice", FAST, MONDAY_9AM)
+        tracker.record_observation("alice", SLOW, MONDAY_9AM + timedelta(minutes=5))
+
+        bucket = tracker.get_energy_profile("alice")["profile"]["monday"][9]
+        assert bucket["samples"] == 2
+        assert bucket["score"] == pytest.approx(0.5, abs=0.01)
+
+    def test_older_observations_decay(self, tracker):
+        """A week-old observation should weigh less than today's."""
+        tracker.record_observation("alice", SLOW, MONDAY_9AM)
+        tracker.record_observation("alice", FAST, MONDAY_9AM + timedelta(days=7))
+
+        bucket = tracker.get_energy_profile("alice")["profile"]["monday"][9]
+        weight = 0.95**7
+        assert bucket["score"] == pytest.approx(1.0 / (1.0 + weight), abs=0.001)
+
+    def test_peak_hours_follow_bucket(self, tracker):
+        """Peak hours should be added and removed as the average moves."""
+        tracker.record_observation("alice", FAST, MONDAY_9AM)
+        assert tracker.get_peak_hours("alice", "monday")["peak_hours"] == [9]
+
+        for i in range(3):
+            tracker.record_observation("alice", SLOW, MONDAY_9AM + timedelta(minutes=i + 1))
+        assert tracker.get_peak_hours("alice", "monday")["peak_hours"] == []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rebuild Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestRebuildProfiles:
+    """Tests for the SQL backfill."""
+
+    def test_rebuild_matches_incremental(self, tracker):
+        """Backfill should reproduce the incrementally maintained profile."""
+        now = datetime.now().replace(hour=14, minute=0, second=0, microsecond=0)
+        for week in range(3):
+            for signals in (FAST, SLOW, FAST):
+                ts = now - timedelta(days=7 * (2 - week)) + timedelta(minutes=week)
+                tracker.record_observation("alice", signals, ts)
+
+        day = tracker.DAY_NAMES[now.weekday()]
+        incremental = tracker.get_energy_profile("alice")["profile"][day][14]
+
+        result = tracker.rebuild_profiles("alice", lookback_days=30)
+        rebuilt = tracker.get_energy_profile("alice")["profile"][day][14]
+
+        assert result["profiles_updated"] == 1
+        assert result["observations_analyzed"] == 9
+        assert rebuilt["samples"] == incremental["samples"] == 9
+        assert rebuilt["score"] == pytest.approx(incremental["score"], abs=0.001)
+
+    def test_rebuild_without_observations(self, tracker):
+        """Rebuild should report nothing to do for unknown users."""
+        result = tracker.rebuild_profiles("nobody")
+        assert result["success"] is True
+        assert result["profiles_updated"] == 0
@@ -0,0 +1,145 @@
+"""Tests for tools/learning/pattern_analyzer.py
+
+Pattern analysis reads events once into daily rollups and derives every
+pattern family from a single pass over the lookback window:
+- Avoidance (with an "eventually completed" flag)
+- Daily routines and weekly cycles
+- Incremental pickup of events recorded since the last run
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Setup: Patch DB_PATH to use temp database
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def analyzer(temp_db):
+    """Patch pattern analyzer to use temporary database and default config."""
+    from tools.learning import pattern_analyzer
+
+    with (
+        patch.object(pattern_analyzer, "DB_PATH", temp_db),
+        patch.object(pattern_analyzer, "CONFIG_PATH", temp_db.with_suffix(".missing.yaml")),
+    ):
+        yield pattern_analyzer
+
+
+def _days_ago(days: int, hour: int = 9) -> datetime:
+    return (datetime.now() - timedelta(days=days)).replace(
+        hour=hour, minute=15, second=0, microsecond=0
+    )
+
+
+def _insert_task_event(analyzer, task_id: str, event_type: str, when: datetime) -> None:
+    conn = analyzer.get_connection()
+    conn.execute(
+        """
+        INSERT INTO task_events (id, user_id, task_id, task_name, event_type, event_time)
+        VALUES (?, 'alice', ?, ?, ?, ?)
+    """,
+        (
+            f"{task_id}-{event_type}-{when.isoformat()}",
+            task_id,
+            f"Task {task_id}",
+            event_type,
+            when.isoformat(),
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Detection Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestScanPatterns:
+    """Tests for the single-pass detector."""
+
+    def test_avoidance_with_completion_flag(self, analyzer):
+        """Repeatedly postponed tasks are reported with completion status."""
+        for day in (5, 4, 3):
+            _insert_task_event(analyzer, "taxes", "postponed", _days_ago(day))
+            _insert_task_event(analyzer, "email", "postponed", _days_ago(day))
+        _insert_task_event(analyzer, "email", "completed", _days_ago(1))
+
+        avoidance = analyzer.scan_patterns("alice", analyzer.load_config())["avoidance"]
+        by_task = {p["task_id"]: p for p in avoidance}
+
+        assert by_task["taxes"]["postpone_count"] == 3
+        assert by_task["taxes"]["eventually_completed"] is False
+        assert by_task["taxes"]["task_name"] == "Task taxes"
+        assert by_task["email"]["eventually_completed"] is True
+
+    def test_events_outside_window_are_ignored(self, analyzer):
+        """Only events inside lookback_days count."""
+        for day in (60, 59, 58):
+            _insert_task_event(analyzer, "old", "postponed", _days_ago(day))
+
+        assert analyzer.scan_patterns("alice", analyzer.load_config())["avoidance"] == []
+
+    def test_daily_routine_and_weekday_names(self, analyzer):
+        """Routines group by hour; weekly cycles use Monday-based day names."""
+        for day in (7, 14, 21):
+            analyzer.record_activity("alice", "email_check", timestamp=_days_ago(day, hour=8))
+
+        result = analyzer.scan_patterns("alice", analyzer.load_config())
+        routine = result["daily_routines"][0]
+        expected_day = analyzer.DAY_NAMES[_days_ago(7).weekday()]
+
+        assert routine["activity_type"] == "email_check"
+        assert routine["typical_hour"] == 8
+        assert routine["occurrence_count"] == 3
+        assert routine["days_observed"] == [expected_day]
+        assert result["weekly_cycles"][0]["day"] == expected_day
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Incremental Analysis Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestIncrementalAnalysis:
+    """Tests for rollup checkpointing between runs."""
+
+    def test_only_new_events_are_read(self, analyzer):
+        """A second run folds in just the events recorded since the first."""
+        for day in (3, 2, 1):
+            analyzer.record_activity("alice", "message", timestamp=_days_ago(day))
+
+        first = analyzer.analyze_patterns("alice")
+        analyzer.record_activity("alice", "message", timestamp=_days_ago(0))
+        second = analyzer.analyze_patterns("alice")
+
+        assert first["events_processed"] == 3
+        assert second["events_processed"] == 1
+        assert second["patterns"]["daily_routines"][0]["occurrence_count"] == 4
+
+    def test_late_events_are_picked_up(self, analyzer):
+        """Events recorded after a run with older timestamps still count."""
+        analyzer.record_activity("alice", "message", timestamp=_days_ago(1))
+        analyzer.analyze_patterns("alice")
+
+        analyzer.record_activity("alice", "message", timestamp=_days_ago(10))
+        analyzer.record_activity("alice", "message", timestamp=_days_ago(11))
+        result = analyzer.analyze_patterns("alice")
+
+        assert result["patterns"]["daily_routines"][0]["occurrence_count"] == 3
+
+    def test_full_rebuild_matches_incremental(self, analyzer):
+        """Forcing re-detection reproduces the incremental result."""
+        for day in range(1, 8):
+            analyzer.record_activity("alice", "command", timestamp=_days_ago(day, hour=14))
+            analyzer.analyze_patterns("alice")
+
+        incremental = analyzer.analyze_patterns("alice")["patterns"]
+        rebuilt = analyzer.analyze_patterns("alice", full=True)["patterns"]
+
+        assert rebuilt == incremental
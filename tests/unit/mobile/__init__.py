@@ -0,0 +1 @@
+"""Mobile push notification unit tests."""
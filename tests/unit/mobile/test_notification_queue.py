@@ -0,0 +1,186 @@
+"""Tests for tools/mobile/queue/notification_queue.py
+
+process_queue() runs as a pipeline over a whole cycle:
+- Send eligibility is evaluated per user in bulk, with a per-cycle rate budget
+- Expirations and reschedules are written in one transaction
+- Deliveries run concurrently, capped per push provider
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Setup: Patch DB_PATH, flow state and the push sender
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def sender():
+    """Stub Web Push sender that always succeeds."""
+    return AsyncMock(return_value={"success": True, "delivery_id": None})
+
+
+@pytest.fixture
+def mobile(temp_db, sender):
+    """Point the mobile package at a temp database with stubbed sends."""
+    import tools.mobile
+    from tools.mobile.queue import notification_queue
+
+    with (
+        patch.object(tools.mobile, "DB_PATH", temp_db),
+        patch("tools.mobile.push.delivery.send_push", sender),
+        patch(
+            "tools.mobile.queue.scheduler._check_flow_state",
+            AsyncMock(return_value={"in_flow": False, "expected_end": None}),
+        ),
+    ):
+        yield notification_queue
+
+
+def _add_user(user_id: str, subscriptions: int = 1, **prefs) -> None:
+    from tools.mobile import get_connection
+    from tools.mobile.preferences.user_preferences import update_preferences
+
+    conn = get_connection()
+    for i in range(subscriptions):
+        conn.execute(
+            "INSERT INTO push_subscriptions (id, user_id, endpoint, p256dh_key, auth_key) "
+            "VALUES (?, ?, ?, 'p256dh', 'auth')",
+            (f"sub_{user_id}_{i}", user_id, f"https://push.example/{user_id}/{i}"),
+        )
+    conn.commit()
+    conn.close()
+
+    # Empty quiet hours disable them regardless of the wall clock
+    settings = {"quiet_hours_start": "", "quiet_hours_end": "", **prefs}
+    asyncio.run(update_preferences(user_id, **settings))
+
+
+def _enqueue(queue, user_id: str, count: int, **kwargs) -> None:
+    for i in range(count):
+        asyncio.run(queue.enqueue(user_id, "task_reminder", f"Reminder {i}", **kwargs))
+
+
+def _statuses(queue, user_id: str) -> dict:
+    return asyncio.run(queue.get_queue_stats(user_id))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pipeline Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestProcessQueue:
+    """Tests for the pipelined processor."""
+
+    def test_delivers_eligible_notifications(self, mobile):
+        _add_user("alice", max_notifications_per_hour=50)
+        _add_user("bob", max_notifications_per_hour=50)
+        _enqueue(mobile, "alice", 3)
+        _enqueue(mobile, "bob", 2)
+
+        results = asyncio.run(mobile.process_queue(limit=100))
+
+        assert results["processed"] == 5
+        assert results["sent"] == 5
+        assert results["errors"] == 0
+        assert _statuses(mobile, "alice")["sent"] == 3
+        assert set(results["timings_ms"]) >= {
+            "fetch",
+            "triage",
+            "eligibility",
+            "writes",
+            "delivery",
+            "total",
+        }
+
+    def test_rate_budget_applies_within_cycle(self, mobile):
+        _add_user("alice", max_notifications_per_hour=2)
+        _enqueue(mobile, "alice", 5)
+
+        results = asyncio.run(mobile.process_queue(limit=100))
+
+        assert results["sent"] == 2
+        assert results["suppressed"] == 3
+        pending = asyncio.run(mobile.get_pending("alice", include_scheduled=True))
+        assert len(pending) == 3
+        assert all(row["scheduled_for"] for row in pending)
+
+    def test_rate_budget_counts_each_subscription(self, mobile, sender):
+        _add_user("alice", subscriptions=2, max_notifications_per_hour=4)
+        _enqueue(mobile, "alice", 3)
+
+        results = asyncio.run(mobile.process_queue(limit=100))
+
+        assert results["sent"] == 2
+        assert sender.await_count == 4
+
+    def test_expired_and_quiet_hours_written_in_bulk(self, mobile, sender):
+        _add_user("alice", quiet_hours_start="00:00", quiet_hours_end="23:59")
+        _enqueue(mobile, "alice", 2)
+        _enqueue(mobile, "alice", 2, expires_at=datetime.now() - timedelta(minutes=1))
+
+        results = asyncio.run(mobile.process_queue(limit=100))
+
+        assert results["expired"] == 2
+        assert results["suppressed"] == 2
+        assert results["sent"] == 0
+        assert _statuses(mobile, "alice")["expired"] == 2
+        assert sender.await_count == 0
+
+    def test_high_priority_bypasses_quiet_hours(self, mobile):
+        _add_user(
+            "alice",
+            quiet_hours_start="00:00",
+            quiet_hours_end="23:59",
+            max_notifications_per_hour=50,
+        )
+        _enqueue(mobile, "alice", 1, priority=9)
+
+        results = asyncio.run(mobile.process_queue(limit=100))
+        assert results["sent"] == 1
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Concurrency Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestProviderLimits:
+    """Tests for concurrent delivery bounded per provider."""
+
+    def test_web_push_concurrency_capped(self, mobile):
+        in_flight = 0
+        peak = 0
+
+        async def slow_send(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"success": True, "delivery_id": None}
+
+        for user in ("alice", "bob", "carol", "dave"):
+            _add_user(user, max_notifications_per_hour=50)
+            _enqueue(mobile, user, 3)
+
+        with (
+            patch("tools.mobile.push.delivery.send_push", side_effect=slow_send),
+            patch.object(mobile, "load_provider_limits", return_value={"web_push": 3}),
+        ):
+            results = asyncio.run(mobile.process_queue(limit=100))
+
+        assert results["sent"] == 12
+        assert peak == 3
+
+    def test_subscription_provider(self, mobile):
+        from tools.mobile.push.delivery import subscription_provider
+
+        assert subscription_provider({"endpoint": "https://push"}) == "web_push"
+        assert subscription_provider({"expo_token": "ExponentPushToken[x]"}) == "expo"
+        assert subscription_provider({"fcm_token": "abc"}) == "fcm"
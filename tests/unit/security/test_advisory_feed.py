@@ -0,0 +1,174 @@
+"""Tests for tools/security/advisory_feed.py
+
+Vulnerability checks for whole dependency lists:
+- One OSV querybatch request (with paging) instead of one query per package
+- Cache reads and writes for all packages at once
+- Offline OSV dump ingested into a local index of affected versions/ranges
+
+Runs against the local OSV fixture server in tests/fixtures/osv_server.py.
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from tests.fixtures.osv_server import OSVFixtureServer, make_vuln
+from tools.security import advisory_feed
+
+
+VULNS = [
+    make_vuln("PYSEC-1", "Jinja2", ["2.10", "2.10.1"]),
+    make_vuln("PYSEC-2", "jinja2", ["2.10"]),
+    make_vuln("GHSA-3", "requests", ["2.5.0"]),
+]
+
+
+@pytest.fixture
+def feed(tmp_path, monkeypatch):
+    monkeypatch.setattr(advisory_feed, "DB_PATH", tmp_path / "advisory_cache.db")
+    return advisory_feed
+
+
+@pytest.fixture
+def osv(feed, monkeypatch):
+    with OSVFixtureServer(VULNS) as server:
+        for attr, url in server.urls().items():
+            monkeypatch.setattr(feed, attr, url)
+        yield server
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk API Queries
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestBulkQueries:
+    def test_one_batch_request_for_whole_list(self, feed, osv):
+        pins = [("jinja2", "2.10"), ("requests", "2.31.0"), ("Requests", "2.5.0")]
+        results = feed.check_packages_vulnerable(pins)
+
+        assert [a["id"] for a in results[("jinja2", "2.10")]["advisories"]] == [
+            "PYSEC-1", "PYSEC-2",
+        ]
+        assert results[("requests", "2.31.0")]["vulnerable"] is False
+        assert results[("Requests", "2.5.0")]["advisories"][0]["summary"] == "Issue in requests"
+        assert {r["source"] for r in results.values()} == {"osv"}
+        assert osv.requests == {"/v1/querybatch": 1, "/v1/vulns": 3}
+
+    def test_second_check_is_served_from_cache(self, feed, osv):
+        pins = [("jinja2", "2.10"), ("requests", "2.31.0")]
+        feed.check_packages_vulnerable(pins)
+        results = feed.check_packages_vulnerable([*pins, ("Jinja_2", "2.10")])
+
+        assert results[("jinja2", "2.10")]["source"] == "cache"
+        assert results[("requests", "2.31.0")]["source"] == "cache"
+        assert osv.requests["/v1/querybatch"] == 2  # only the new name
+
+    def test_follows_page_tokens(self, feed, osv):
+        osv.page_size = 1
+        results = feed.check_packages_vulnerable([("jinja2", "2.10")])
+
+        assert len(results[("jinja2", "2.10")]["advisories"]) == 2
+        assert osv.requests["/v1/querybatch"] == 2
+
+    def test_advisory_details_fetched_once(self, feed, osv):
+        feed.check_packages_vulnerable([("jinja2", "2.10")])
+        feed.check_packages_vulnerable([("jinja2", "2.10.1")])
+
+        assert osv.requests["/v1/vulns"] == 2
+
+    def test_failed_details_not_cached(self, feed, osv):
+        osv.unavailable.add("GHSA-3")
+        first = feed.is_package_vulnerable("requests", "2.5.0")
+        osv.unavailable.clear()
+        second = feed.is_package_vulnerable("requests", "2.5.0")
+
+        assert first["vulnerable"] is True
+        assert first["advisories"][0]["incomplete"] is True
+        assert second["source"] == "osv"
+        assert second["advisories"][0]["summary"] == "Issue in requests"
+        assert feed.is_package_vulnerable("requests", "2.5.0")["source"] == "cache"
+
+    def test_is_package_vulnerable_keeps_result_shape(self, feed, osv):
+        result = feed.is_package_vulnerable("requests", "2.5.0")
+
+        assert result["vulnerable"] is True
+        assert result["advisories"][0]["id"] == "GHSA-3"
+        assert result["source"] == "osv"
+
+    def test_unreachable_api_degrades(self, feed, monkeypatch):
+        monkeypatch.setattr(feed, "OSV_BATCH_URL", "http://127.0.0.1:9/v1/querybatch")
+        result = feed.is_package_vulnerable("jinja2", "2.10")
+
+        assert result == {
+            "vulnerable": False,
+            "advisories": [],
+            "source": "osv",
+            "error": "osv_unreachable",
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Offline Dump
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def dump(tmp_path):
+    vulns = [*VULNS, make_vuln("PYSEC-4", "urllib3", [], introduced="1.0", fixed="1.26.5"), make_vuln("PYSEC-5", "urllib3", [], introduced="0", last_affected="0.9")]
+    path = tmp_path / "all.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for vuln in vulns:
+            archive.writestr(f"{vuln['id']}.json", json.dumps(vuln))
+    return path
+
+
+class TestOfflineDump:
+    def test_ingest_and_check_without_network(self, feed, dump, monkeypatch):
+        monkeypatch.setattr(feed, "OSV_BATCH_URL", "http://127.0.0.1:9/v1/querybatch")
+        assert feed.ingest_osv_dump(dump) == 5
+
+        results = feed.check_packages_vulnerable([
+            ("jinja2", "2.10"), ("urllib3", "1.26.4"), ("urllib3", "1.26.5"),
+            ("urllib3", "0.9"), ("flask", "3.0.0"),
+        ])
+
+        assert [a["id"] for a in results[("jinja2", "2.10")]["advisories"]] == [
+            "PYSEC-1", "PYSEC-2",
+        ]
+        assert results[("urllib3", "1.26.4")]["advisories"][0]["id"] == "PYSEC-4"
+        assert results[("urllib3", "1.26.5")]["vulnerable"] is False
+        assert results[("urllib3", "0.9")]["advisories"][0]["id"] == "PYSEC-5"
+        assert results[("flask", "3.0.0")]["vulnerable"] is False
+        assert {r["source"] for r in results.values()} == {"osv_dump"}
+
+    def test_reingest_replaces_index(self, feed, dump, tmp_path):
+        feed.ingest_osv_dump(dump)
+        directory = tmp_path / "dump"
+        directory.mkdir()
+        (directory / "GHSA-3.json").write_text(json.dumps(VULNS[2]))
+        assert feed.ingest_osv_dump(directory) == 1
+
+        result = feed.check_packages_vulnerable([("jinja2", "2.10")], offline=True)
+        assert result[("jinja2", "2.10")]["vulnerable"] is False
+
+    def test_stale_dump_used_only_when_api_unreachable(self, feed, dump, osv, monkeypatch):
+        feed.ingest_osv_dump(dump)
+        monkeypatch.setattr(feed, "DUMP_TTL_HOURS", 0)
+
+        online = feed.is_package_vulnerable("urllib3", "1.26.4")
+        assert online["source"] == "osv" and online["vulnerable"] is False
+
+        monkeypatch.setattr(feed, "OSV_BATCH_URL", "http://127.0.0.1:9/v1/querybatch")
+        offline = feed.is_package_vulnerable("urllib3", "1.26.3")
+        assert offline["source"] == "osv_dump" and offline["vulnerable"] is True
+
+    def test_uncomparable_version_falls_through_to_osv(self, feed, dump, osv):
+        feed.ingest_osv_dump(dump)
+
+        results = feed.check_packages_vulnerable([("urllib3", "1.26-custom"), ("urllib3", "1.26.4")])
+
+        assert results[("urllib3", "1.26-custom")]["source"] == "osv"
+        assert results[("urllib3", "1.26.4")]["source"] == "osv_dump"
+        assert osv.requests["/v1/querybatch"] == 1
@@ -0,0 +1,193 @@
+"""Tests for tools/security/container_executor.py (warm pool, persistent shell)
+
+Sessions get pre-started sandboxes from a ContainerPool, commands run
+through one persistent exec shell per container, and sandboxes are
+destroyed (never reused) when a session closes. Runs against the fake
+Docker client from the container pool benchmark.
+"""
+
+import os
+import socket
+import subprocess
+import time
+
+import pytest
+
+from tests.benchmarks.bench_container_pool import FakeDockerClient
+from tools.security import container_executor
+from tools.security.container_executor import POOL_LABEL, ContainerExecutor, ContainerPool
+
+
+@pytest.fixture
+def client():
+    return FakeDockerClient()
+
+
+@pytest.fixture
+def pool(client, tmp_path):
+    pool = ContainerPool(tmp_path, size=2, client=client)
+    yield pool
+    pool.shutdown()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pool
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestContainerPool:
+    def test_fill_prestarts_paused_sandboxes(self, pool, client):
+        assert pool.fill() == 2
+        assert pool.fill() == 0
+        assert [c.status for c in client.live.values()] == ["paused", "paused"]
+        assert all(POOL_LABEL in c.labels for c in client.live.values())
+
+    def test_acquire_hands_out_warm_sandbox_once_per_session(self, pool, client):
+        pool.fill()
+        executor = pool.acquire("s1")
+
+        assert executor.start()["success"] is True
+        assert executor._container.status == "running"
+        assert pool.acquire("s1") is executor
+        assert pool.status()["warm_hits"] == 1
+
+    def test_release_destroys_and_refills(self, pool, client):
+        pool.fill()
+        executor = pool.acquire("s1")
+        used = executor._container
+        pool.release("s1")
+        pool._refill_thread.join(5)
+
+        assert used.status == "removed"
+        status = pool.status()
+        assert status["idle"] == 2 and status["assigned"] == 0
+        # The used sandbox never goes to another session
+        assert pool.acquire("s2")._container is not used
+
+    def test_cold_start_when_pool_empty(self, tmp_path, client):
+        pool = ContainerPool(tmp_path, size=0, client=client)
+        executor = pool.acquire("s1")
+        assert executor._container is None
+
+        assert executor.start()["success"] is True
+        assert executor.execute("echo hi")["stdout"] == "hi\n"
+        assert pool.status()["cold_starts"] == 1
+        pool.shutdown()
+        assert client.live == {}
+
+    def test_first_fill_reaps_orphans_of_dead_processes(self, pool, client):
+        dead = subprocess.Popen(["true"])
+        dead.wait()
+        host = socket.gethostname()
+        for name, owner in (
+            ("orphan", f"{host}-{dead.pid}"),
+            ("live-owner", f"{host}-{os.getppid()}"),
+            ("other-host", f"elsewhere-{dead.pid}"),
+        ):
+            client.containers.run(name=name, labels={POOL_LABEL: owner})
+        client.containers.run(name="unlabelled")
+
+        assert pool.fill() == 2
+        assert {"live-owner", "other-host", "unlabelled"} <= set(client.live)
+        assert "orphan" not in client.live
+        # Later fills do not list containers again
+        client.containers.run(name="late-orphan", labels={POOL_LABEL: f"{host}-{dead.pid}"})
+        pool.fill()
+        assert "late-orphan" in client.live
+
+    def test_cold_start_sandboxes_are_labelled(self, tmp_path, client):
+        pool = ContainerPool(tmp_path, size=0, client=client)
+        pool.acquire("s1").start()
+
+        (container,) = client.live.values()
+        assert container.labels == {POOL_LABEL: pool._owner}
+        pool.shutdown()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persistent shell
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestPersistentShell:
+    def test_commands_share_one_exec(self, pool, client):
+        pool.fill()
+        executor = pool.acquire("s1")
+        executor.start()
+
+        first = executor.execute("printf 'no newline'; echo oops >&2; exit 3")
+        second = executor.execute("cd /; export X=1; echo $X")
+        third = executor.execute("pwd; echo ${X:-unset}")
+
+        assert first == {"success": False, "stdout": "no newline", "stderr": "oops\n", "exit_code": 3}
+        assert second["stdout"] == "1\n" and second["success"] is True
+        # Each command starts fresh, as with exec_run
+        assert third["stdout"] == f"{executor._container.dir}\nunset\n"
+        assert client.exec_shells == 1 and client.exec_runs == 0
+
+    def test_large_output_and_timeout(self, pool):
+        pool.fill()
+        executor = pool.acquire("s1")
+        executor.start()
+
+        big = executor.execute("head -c 300000 /dev/zero | tr '\\0' x")
+        timed_out = executor.execute("sleep 5", timeout=1)
+
+        assert big["stdout"] == "x" * 300000
+        assert timed_out["exit_code"] == 124
+        assert executor.execute("echo ok")["stdout"] == "ok\n"
+
+    def test_falls_back_to_exec_run_when_shell_breaks(self, pool, client):
+        pool.fill()
+        executor = pool.acquire("s1")
+        executor.start()
+        executor.execute("true")
+        executor._shell._sock.close()
+
+        assert executor.execute("echo again")["stdout"] == "again\n"
+        assert client.exec_runs == 1
+
+    def test_shell_dying_mid_command_does_not_rerun(self, pool, client):
+        pool.fill()
+        executor = pool.acquire("s1")
+        executor.start()
+        executor.execute("true")
+        shell = executor._shell
+        runs = executor._container.dir / "runs"
+
+        def stream_dies():
+            # The stream breaks once the command has had its effect
+            deadline = time.monotonic() + 5
+            while not runs.exists() and time.monotonic() < deadline:
+                time.sleep(0.02)
+            raise OSError("Exec stream closed")
+
+        shell._read_frame = stream_dies
+        result = executor.execute("echo ran >> runs")
+
+        assert result["success"] is False and result["exit_code"] == -1
+        assert runs.read_text() == "ran\n"
+        assert client.exec_runs == 0
+        assert shell.closed and executor._shell is None
+        # The next command gets a fresh shell
+        assert executor.execute("echo ok")["stdout"] == "ok\n"
+
+    def test_shell_timeout_reported_not_rerun(self, pool, client, monkeypatch):
+        monkeypatch.setattr(container_executor, "SHELL_GRACE_SECONDS", 0)
+        pool.fill()
+        executor = pool.acquire("s1")
+        executor.start()
+
+        # Ignores the SIGTERM from timeout, so only the socket timeout ends the wait
+        result = executor.execute("trap '' TERM; echo ran >> runs; sleep 3", timeout=1)
+
+        assert result["exit_code"] == 124
+        assert (executor._container.dir / "runs").read_text() == "ran\n"
+        assert client.exec_runs == 0
+
+    def test_exec_run_only(self, tmp_path, client):
+        executor = ContainerExecutor("s1", tmp_path, client=client, persistent_shell=False)
+        executor.start()
+        assert executor.execute("echo hi")["stdout"] == "hi\n"
+        assert client.exec_shells == 0
+        executor.stop()
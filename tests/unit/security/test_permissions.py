@@ -359,3 +359,125 @@ class TestEdgeCases:
         # Owner should match anything
         result = permissions_temp_db.check_permission(mock_user_id, "some_resource:some-action")
         assert result["allowed"] is True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Compiled Matcher and Decision Cache Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestPermissionMatcher:
+    """Tests for the compiled PermissionMatcher."""
+
+    def test_agrees_with_permission_matches(self, permissions_temp_db):
+        """Compiled matching should give the same answer as permission_matches."""
+        granted = ["memory:*", "files:read", "mem?:write", "[ab]:x", "tools:ex*", "bad"]
+        matcher = permissions_temp_db.PermissionMatcher(granted)
+        required = [
+            "memory:read", "memory:anything", "files:read", "files:write", "memo:write",
+            "meme:read", "a:x", "b:x", "[ab]:x", "c:x", "tools:execute", "tools:run",
+            "bad", "bad:x", "nope",
+        ]
+        for perm in required:
+            expected = any(permissions_temp_db.permission_matches(g, perm) for g in granted)
+            assert matcher.matches(perm) is expected, perm
+
+    def test_superuser(self, permissions_temp_db):
+        """*:* should match everything, including malformed permissions."""
+        matcher = permissions_temp_db.PermissionMatcher(["*:*"])
+        assert matcher.matches("anything:here") is True
+        assert matcher.matches("malformed") is True
+
+
+class TestDecisionCache:
+    """Tests for cached permission decisions and their invalidation."""
+
+    def _count_loads(self, module):
+        calls = []
+        real = module._load_user_permissions
+
+        def counting(user_id):
+            calls.append(user_id)
+            return real(user_id)
+
+        return calls, patch.object(module, "_load_user_permissions", counting)
+
+    def test_repeated_checks_use_compiled_permissions(self, permissions_temp_db, mock_user_id):
+        """Repeated checks should not reload the user's roles."""
+        permissions_temp_db.grant_role(mock_user_id, "user")
+        calls, patcher = self._count_loads(permissions_temp_db)
+        with patcher:
+            for _ in range(5):
+                assert permissions_temp_db.check_permission(mock_user_id, "chat:send")["allowed"]
+        assert len(calls) == 1
+
+    def test_role_changes_invalidate(self, permissions_temp_db, mock_user_id):
+        """grant/revoke/create/delete role should take effect immediately."""
+        check = permissions_temp_db.check_permission
+        assert check(mock_user_id, "beta:use")["allowed"] is False
+
+        permissions_temp_db.create_role("beta", ["beta:*"])
+        permissions_temp_db.grant_role(mock_user_id, "beta")
+        assert check(mock_user_id, "beta:use")["allowed"] is True
+
+        permissions_temp_db.revoke_role(mock_user_id, "beta")
+        assert check(mock_user_id, "beta:use")["allowed"] is False
+
+        permissions_temp_db.grant_role(mock_user_id, "beta")
+        assert check(mock_user_id, "beta:use")["allowed"] is True
+        permissions_temp_db.delete_role("beta")
+        assert check(mock_user_id, "beta:use")["allowed"] is False
+
+    def test_picks_up_writes_from_other_processes(
+        self, permissions_temp_db, mock_user_id, temp_db, monkeypatch
+    ):
+        """A role granted through another connection should be seen after revalidation."""
+        monkeypatch.setattr(permissions_temp_db, "REVALIDATE_SECONDS", 0.0)
+        assert permissions_temp_db.check_permission(mock_user_id, "chat:send")["allowed"] is False
+
+        import sqlite3
+
+        other = sqlite3.connect(str(temp_db))
+        other.execute(
+            "INSERT INTO user_roles (user_id, role_name) VALUES (?, 'user')", (mock_user_id,)
+        )
+        other.commit()
+        other.close()
+
+        assert permissions_temp_db.check_permission(mock_user_id, "chat:send")["allowed"] is True
+
+    def test_role_expiry_invalidates(self, permissions_temp_db, mock_user_id, monkeypatch):
+        """A cached decision should not outlive the role it came from."""
+        permissions_temp_db.grant_role(mock_user_id, "user", expires_at="2999-01-01 00:00:00")
+        assert permissions_temp_db.check_permission(mock_user_id, "chat:send")["allowed"] is True
+
+        # Time passes beyond the expiry; the SQL filter agrees with the cache
+        monkeypatch.setattr(permissions_temp_db, "_sqlite_now", lambda: "2999-01-01 00:00:01")
+        with patch.object(
+            permissions_temp_db, "_load_user_permissions", return_value=([], None)
+        ) as load:
+            result = permissions_temp_db.check_permission(mock_user_id, "chat:send")
+        assert load.called
+        assert result["allowed"] is False
+
+
+class TestAuditSampling:
+    """Tests for aggregated audit logging of permission checks."""
+
+    def test_repeated_allows_aggregated_denials_always_logged(
+        self, permissions_temp_db, mock_user_id
+    ):
+        """Allows are logged once per window with a count; every denial is logged."""
+        permissions_temp_db.grant_role(mock_user_id, "user")
+        permissions_temp_db.flush_permission_audit()
+
+        with patch("tools.security.audit.log_event") as log_event:
+            for _ in range(5):
+                permissions_temp_db.check_permission(mock_user_id, "chat:send")
+            for _ in range(3):
+                permissions_temp_db.check_permission(mock_user_id, "admin:users")
+            assert permissions_temp_db.flush_permission_audit() == 1
+
+        statuses = [call.kwargs["status"] for call in log_event.call_args_list]
+        assert statuses == ["success"] + ["failure"] * 3 + ["success"]
+        assert log_event.call_args_list[-1].kwargs["details"]["repeated"] == 4
@@ -0,0 +1,167 @@
+"""Tests for tools/security/session.py (validation cache, batched activity)
+
+Validated sessions are cached by token hash:
+- Until the session expires or goes idle
+- Dropped immediately on revoke, revoke-all and refresh
+- Dropped when another process commits to the sessions database
+
+last_activity updates are buffered and written back in batches.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from tools.security import session
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(session, "DB_PATH", tmp_path / "sessions.db")
+    monkeypatch.setattr(session, "REVALIDATE_SECONDS", 3600.0)
+    monkeypatch.setattr(session, "ACTIVITY_FLUSH_SECONDS", 3600.0)
+    monkeypatch.setattr(session, "log_session_event", lambda *args, **kwargs: None)
+    session.invalidate_session_cache()
+    session._pending_activity.clear()
+    yield session
+    session._pending_activity.clear()
+
+
+@pytest.fixture
+def loads(sessions, monkeypatch):
+    """Token hashes validate_session() had to read from the database."""
+    hashes = []
+    load = sessions._load_session
+    monkeypatch.setattr(
+        sessions, "_load_session", lambda *args: hashes.append(args[1]) or load(*args)
+    )
+    return hashes
+
+
+def stored_activity(token: str) -> str:
+    conn = sqlite3.connect(session.DB_PATH)
+    row = conn.execute(
+        "SELECT last_activity FROM sessions WHERE token_hash = ?", (session.hash_token(token),)
+    ).fetchone()
+    conn.close()
+    return row[0]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Validation Cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestValidationCache:
+    def test_repeat_validations_skip_the_database(self, sessions, loads):
+        token = sessions.create_session("alice", channel="dashboard")["token"]
+        first = sessions.validate_session(token)
+        second = sessions.validate_session(token)
+
+        assert first["valid"] and second["valid"]
+        assert second["user_id"] == "alice"
+        assert len(loads) == 1
+
+    def test_binding_checked_on_cached_sessions(self, sessions):
+        token = sessions.create_session("alice", channel="dashboard")["token"]
+        sessions.validate_session(token)
+
+        result = sessions.validate_session(token, channel="discord")
+        assert result == {"success": True, "valid": False, "reason": "channel_mismatch"}
+
+    def test_revoke_invalidates_immediately(self, sessions):
+        token = sessions.create_session("alice")["token"]
+        sessions.validate_session(token)
+        sessions.revoke_session(token)
+
+        assert sessions.validate_session(token)["reason"] == "session_revoked"
+
+    def test_revoke_all_invalidates_immediately(self, sessions):
+        tokens = [sessions.create_session("alice")["token"] for _ in range(2)]
+        other = sessions.create_session("bob")["token"]
+        for token in [*tokens, other]:
+            sessions.validate_session(token)
+        sessions.revoke_all_sessions("alice")
+
+        assert [sessions.validate_session(t)["valid"] for t in tokens] == [False, False]
+        assert sessions.validate_session(other)["valid"] is True
+
+    def test_commit_from_another_process_is_noticed(self, sessions, monkeypatch):
+        token = sessions.create_session("alice")["token"]
+        sessions.validate_session(token)
+        monkeypatch.setattr(sessions, "REVALIDATE_SECONDS", 0.0)
+        sessions.validate_session(token)
+
+        conn = sqlite3.connect(sessions.DB_PATH)
+        conn.execute("UPDATE sessions SET is_active = 0")
+        conn.commit()
+        conn.close()
+
+        assert sessions.validate_session(token)["reason"] == "session_revoked"
+
+    def test_cache_entry_ends_at_session_expiry(self, sessions):
+        token = sessions.create_session("alice")["token"]
+        sessions.validate_session(token)
+        conn = sqlite3.connect(sessions.DB_PATH)
+        past = (datetime.now() - timedelta(seconds=1)).isoformat()
+        conn.execute("UPDATE sessions SET expires_at = ?", (past,))
+        conn.commit()
+        conn.close()
+        for cached in sessions._sessions.values():
+            cached.expires_at = datetime.fromisoformat(past)
+
+        assert sessions.validate_session(token)["reason"] == "session_expired"
+        assert sessions.list_sessions("alice")["count"] == 0
+
+    def test_refresh_extends_cached_expiry(self, sessions):
+        token = sessions.create_session("alice", ttl_hours=1)["token"]
+        before = sessions.validate_session(token)["expires_at"]
+        sessions.refresh_session(token, extend_hours=48)
+
+        assert sessions.validate_session(token)["expires_at"] > before
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Activity Write-back
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestActivityWriteBack:
+    def test_activity_buffered_until_flush(self, sessions):
+        token = sessions.create_session("alice")["token"]
+        created = stored_activity(token)
+        for _ in range(5):
+            sessions.validate_session(token)
+
+        assert stored_activity(token) == created
+        assert sessions.flush_session_activity() == 1
+        assert stored_activity(token) > created
+        assert sessions.flush_session_activity() == 0
+
+    def test_flush_due_during_validation(self, sessions, monkeypatch):
+        token = sessions.create_session("alice")["token"]
+        created = stored_activity(token)
+        monkeypatch.setattr(sessions, "ACTIVITY_FLUSH_SECONDS", 0.0)
+        sessions.validate_session(token)
+
+        assert stored_activity(token) > created
+
+    def test_idle_check_counts_buffered_activity(self, sessions):
+        token = sessions.create_session("alice")["token"]
+        conn = sqlite3.connect(sessions.DB_PATH)
+        idle = (datetime.now() - timedelta(hours=sessions.IDLE_TIMEOUT_HOURS + 1)).isoformat()
+        conn.execute("UPDATE sessions SET last_activity = ?", (idle,))
+        conn.commit()
+        conn.close()
+        session_id = sessions.list_sessions("alice")["sessions"][0]["id"]
+        sessions._pending_activity[(str(sessions.DB_PATH), session_id)] = datetime.now().isoformat()
+
+        assert sessions.validate_session(token)["valid"] is True
+
+    def test_list_sessions_sees_buffered_activity(self, sessions):
+        token = sessions.create_session("alice")["token"]
+        sessions.validate_session(token)
+        latest = sessions._pending_activity[(str(sessions.DB_PATH), 1)]
+
+        assert sessions.list_sessions("alice")["sessions"][0]["last_activity"] == latest
@@ -0,0 +1,144 @@
+"""Tests for tools/security/typosquat.py
+
+The typosquat index flags package names that imitate popular packages:
+- Misspellings (insertions, deletions, substitutions, transpositions)
+- Look-alike characters (I/l/1, 0/O, rn/m, Cyrillic and Greek letters)
+
+Lookups must agree with a brute-force scan of the whole corpus.
+"""
+
+import random
+
+from tools.security.typosquat import (
+    CORPUS_PATH,
+    TyposquatIndex,
+    _max_distance,
+    canonical_name,
+    get_typosquat_index,
+    load_corpus,
+    osa_distance,
+    skeleton,
+)
+
+
+def reference_osa(a: str, b: str) -> int:
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Normalization Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestNormalization:
+    """Tests for canonical names and look-alike skeletons."""
+
+    def test_canonical_name_follows_pep_503(self):
+        assert canonical_name("Typing_Extensions") == "typing-extensions"
+        assert canonical_name("zope.interface") == "zope-interface"
+
+    def test_skeleton_folds_homoglyphs(self):
+        assert skeleton("cIick") == skeleton("click")
+        assert skeleton("n0de") == skeleton("node")
+        assert skeleton("rnatplotlib") == skeleton("matplotlib")
+        assert skeleton("rеquests") == skeleton("requests")  # noqa: RUF001 - Cyrillic e
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Distance Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestOsaDistance:
+    """Tests for the bounded optimal string alignment distance."""
+
+    def test_transposition_is_one_edit(self):
+        assert osa_distance("reqeusts", "requests", 2) == 1
+
+    def test_matches_reference_within_limit(self):
+        rng = random.Random(1)
+        for _ in range(1000):
+            a = "".join(rng.choice("ab-") for _ in range(rng.randint(0, 8)))
+            b = "".join(rng.choice("ab-") for _ in range(rng.randint(0, 8)))
+            expected = reference_osa(a, b)
+            for limit in (0, 1, 2):
+                assert osa_distance(a, b, limit) == min(expected, limit + 1), (a, b, limit)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Index Tests
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestTyposquatIndex:
+    """Tests for nearest-name lookups."""
+
+    def test_finds_misspellings(self):
+        index = get_typosquat_index()
+        assert index.nearest("reqeusts")[0] == ("requests", 1)
+        assert index.nearest("colourama")[0] == ("colorama", 1)
+        assert index.nearest("python-dateutils")[0] == ("python-dateutil", 1)
+
+    def test_finds_homoglyphs_at_distance_zero(self):
+        index = get_typosquat_index()
+        assert index.nearest("rеquests")[0] == ("requests", 0)  # noqa: RUF001
+        assert index.nearest("cIick")[0] == ("click", 0)
+
+    def test_popular_names_imitate_nothing(self):
+        index = get_typosquat_index()
+        assert index.nearest("requests") == []
+        assert index.nearest("Typing_Extensions") == []
+        assert "typing.extensions" in index
+
+    def test_unrelated_names_have_no_matches(self):
+        assert get_typosquat_index().nearest("dexai-internal-tools") == []
+
+    def test_ties_broken_by_popularity(self):
+        index = TyposquatIndex(["abcdx", "abcdy"])
+        assert index.nearest("abcdz") == [("abcdx", 1), ("abcdy", 1)]
+
+    def test_agrees_with_brute_force(self):
+        rng = random.Random(2)
+        words = list(dict.fromkeys(
+            "".join(rng.choice("abcde-") for _ in range(rng.randint(3, 16)))
+            for _ in range(300)
+        ))
+        words = [w for w in words if w.strip("-")]
+        index = TyposquatIndex(words)
+        canonical = {canonical_name(w) for w in words}
+        for _ in range(200):
+            query = rng.choice(words)
+            for _ in range(rng.randint(1, 3)):
+                i = rng.randrange(len(query))
+                query = query[:i] + rng.choice("abcde") + query[i + 1:]
+            if canonical_name(query) in canonical:
+                continue
+            key = skeleton(query)
+            limit = _max_distance(len(key))
+            distances = {
+                rank: reference_osa(key, skeleton(name)) for rank, name in enumerate(index.names)
+            }
+            expected = sorted((d, rank) for rank, d in distances.items() if d <= limit)
+            expected = [(index.names[rank], d) for d, rank in expected]
+            assert index.nearest(query) == expected, query
+
+
+class TestCorpus:
+    """Tests for the bundled popular-package corpus."""
+
+    def test_bundled_corpus_loads(self):
+        names = load_corpus(CORPUS_PATH)
+        assert len(names) > 500
+        assert "requests" in names
+        assert not any(name.startswith("#") for name in names)
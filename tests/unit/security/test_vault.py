@@ -0,0 +1,142 @@
+"""Tests for tools/security/vault.py (vault session, bulk reads)
+
+The vault session derives the key once per process and master key,
+zeroizes it when idle or closed, and get_secrets() reads many secrets
+with one query and one audit event per outcome.
+"""
+
+import threading
+import time
+
+import pytest
+
+
+pytest.importorskip("cryptography")
+
+from tools.security import vault
+
+
+@pytest.fixture
+def secrets(tmp_path, monkeypatch):
+    monkeypatch.setattr(vault, "DB_PATH", tmp_path / "vault.db")
+    monkeypatch.setattr(vault, "SALT_PATH", tmp_path / ".vault_salt")
+    monkeypatch.setattr(vault, "KDF_ITERATIONS", 1000)
+    monkeypatch.setattr(vault, "_session", None)
+    monkeypatch.setenv(vault.MASTER_KEY_ENV, "test-master-key")
+    monkeypatch.setattr(vault, "log_access", lambda *args: None)
+    for n in range(3):
+        vault.set_secret(f"KEY_{n}", f"value-{n}")
+    yield vault
+    vault.get_vault_session().close()
+
+
+@pytest.fixture
+def accesses(secrets, monkeypatch):
+    """Audit events written by the vault."""
+    events = []
+    monkeypatch.setattr(secrets, "log_access", lambda *args: events.append(args))
+    return events
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Vault Session
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestVaultSession:
+    def test_key_derived_once_per_process(self, secrets):
+        secrets.get_secret("KEY_0")
+        secrets.get_secret("KEY_1")
+        secrets.inject_env(keys=["KEY_2"])
+
+        assert secrets.get_vault_session().derivations == 1
+
+    def test_master_key_change_rederives(self, secrets, monkeypatch):
+        first = bytes(secrets.get_master_key())
+        monkeypatch.setenv(secrets.MASTER_KEY_ENV, "another-master-key")
+
+        assert bytes(secrets.get_master_key()) != first
+        assert secrets.get_vault_session().derivations == 2
+
+    def test_missing_master_key_fails_closed(self, secrets, monkeypatch):
+        monkeypatch.delenv(secrets.MASTER_KEY_ENV)
+
+        assert secrets.get_master_key() is None
+        assert secrets.get_secrets("default", ["KEY_0"])["success"] is False
+
+    def test_close_zeroizes_key(self, secrets):
+        session = secrets.get_vault_session()
+        with session.use_key() as key:
+            pass
+        session.close()
+
+        assert key == bytearray(len(key))
+        assert not session.active
+        assert secrets.get_secret("KEY_0")["value"] == "value-0"
+
+    def test_idle_timeout_zeroizes_key(self, secrets):
+        session = secrets.VaultSession(idle_timeout=0.05)
+        with session.use_key() as key:
+            pass
+        deadline = time.monotonic() + 5
+        while session.active and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not session.active
+        assert key == bytearray(len(key))
+        assert session.available()
+        assert session.derivations == 2
+        session.close()
+
+    def test_close_waits_for_key_in_use(self, secrets, monkeypatch):
+        session = secrets.get_vault_session()
+        encrypt = secrets.encrypt_value
+        closer = threading.Thread(target=session.close)
+
+        def encrypt_while_closing(plaintext, key):
+            closer.start()
+            closer.join(0.2)  # close() must not zeroize the key under us
+            return encrypt(plaintext, key)
+
+        monkeypatch.setattr(secrets, "encrypt_value", encrypt_while_closing)
+        assert secrets.set_secret("RACE", "value")["success"] is True
+        closer.join()
+        monkeypatch.setattr(secrets, "encrypt_value", encrypt)
+
+        assert not session.active
+        assert secrets.get_secret("RACE")["value"] == "value"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk Reads
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestGetSecrets:
+    def test_reads_requested_keys(self, secrets):
+        result = secrets.get_secrets("default", ["KEY_0", "KEY_2", "NOPE"])
+
+        assert result["values"] == {"KEY_0": "value-0", "KEY_2": "value-2"}
+        assert result["missing"] == ["NOPE"]
+        assert result["success"] is False
+
+    def test_whole_namespace(self, secrets):
+        result = secrets.get_secrets("default")
+
+        assert result["success"] is True
+        assert result["count"] == 3
+
+    def test_coalesced_audit_and_access_counts(self, secrets, accesses):
+        secrets.get_secrets("default", ["KEY_0", "KEY_1", "NOPE"], user="alice")
+
+        assert accesses == [
+            ("get", "KEY_0,KEY_1", "default", "success", "alice"),
+            ("get", "NOPE", "default", "failure", "alice"),
+        ]
+        counts = {s["key"]: s["accessed_count"] for s in secrets.list_secrets("default")["secrets"]}
+        assert counts == {"KEY_0": 1, "KEY_1": 1, "KEY_2": 0}
+
+    def test_expired_secrets_excluded(self, secrets):
+        secrets.set_secret("OLD", "gone", expires_at="2000-01-01 00:00:00")
+
+        assert secrets.get_secrets("default", ["OLD"])["missing"] == ["OLD"]
@@ -0,0 +1,174 @@
+"""Tests for tools/db_connections.py
+
+The connection registry keeps long-lived per-thread SQLite connections so
+module-level get_connection() helpers stop paying connect + DDL per call.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from tools import db_connections
+
+
+@pytest.fixture
+def registry():
+    """Start every test with an empty pool and zeroed counters."""
+    db_connections.close_all()
+    db_connections.reset_stats()
+    yield db_connections
+    db_connections.close_all()
+
+
+def _make_init(calls: list):
+    def init(conn: sqlite3.Connection) -> None:
+        calls.append(1)
+        conn.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+
+    return init
+
+
+class TestPooling:
+    """Checkout/release behaviour."""
+
+    def test_close_returns_connection_for_reuse(self, registry, temp_db):
+        # reset_stats() carries over connections still open on other threads
+        open_before = registry.get_stats()["connects"]
+        first = registry.get_connection(temp_db)
+        first.close()
+        second = registry.get_connection(temp_db)
+        second.close()
+
+        assert first is second
+        stats = registry.get_stats()
+        assert stats["connects"] - open_before == 1
+        assert stats["reuses"] == 1
+
+    def test_nested_checkouts_get_distinct_connections(self, registry, temp_db):
+        outer = registry.get_connection(temp_db)
+        inner = registry.get_connection(temp_db)
+        assert outer is not inner
+        inner.close()
+        outer.close()
+
+    def test_double_close_is_harmless(self, registry, temp_db):
+        conn = registry.get_connection(temp_db)
+        conn.close()
+        conn.close()
+
+        a = registry.get_connection(temp_db)
+        b = registry.get_connection(temp_db)
+        assert a is not b
+        a.close()
+        b.close()
+
+    def test_close_rolls_back_uncommitted_work(self, registry, temp_db):
+        init = _make_init([])
+        conn = registry.get_connection(temp_db, init)
+        conn.execute("INSERT INTO items (name) VALUES ('pending')")
+        conn.close()
+
+        conn = registry.get_connection(temp_db, init)
+        count = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        conn.close()
+        assert count == 0
+
+    def test_pragmas_applied(self, registry, temp_db):
+        conn = registry.get_connection(temp_db, foreign_keys=True)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert isinstance(conn.execute("SELECT 1 AS one").fetchone(), sqlite3.Row)
+        conn.close()
+
+    def test_connections_are_per_thread(self, registry, temp_db):
+        main_conn = registry.get_connection(temp_db)
+        main_conn.close()
+
+        seen = []
+
+        def worker():
+            conn = registry.get_connection(temp_db)
+            seen.append(conn)
+            conn.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen[0] is not main_conn
+
+
+class TestSchemaInit:
+    """Schema initializers run once per database file."""
+
+    def test_schema_runs_once(self, registry, temp_db):
+        calls: list = []
+        init = _make_init(calls)
+        for _ in range(5):
+            registry.get_connection(temp_db, init).close()
+        assert len(calls) == 1
+
+    def test_schema_reruns_when_file_replaced(self, registry, temp_db):
+        calls: list = []
+        init = _make_init(calls)
+        registry.get_connection(temp_db, init).close()
+
+        os.unlink(temp_db)
+        open(temp_db, "w").close()
+
+        conn = registry.get_connection(temp_db, init)
+        conn.execute("SELECT COUNT(*) FROM items").fetchone()
+        conn.close()
+        assert len(calls) == 2
+        assert registry.get_stats()["stale_drops"] == 1
+
+    def test_failed_init_releases_connection(self, registry, temp_db):
+        def broken(conn):
+            raise sqlite3.OperationalError("boom")
+
+        with pytest.raises(sqlite3.OperationalError):
+            registry.get_connection(temp_db, broken)
+
+        assert registry.get_stats()["idle_on_thread"] == 1
+
+
+class TestDataVersionWatcher:
+    """Cache revalidation on commits from other connections."""
+
+    def test_reports_only_foreign_commits(self, registry, temp_db):
+        init = _make_init([])
+        watcher = registry.DataVersionWatcher()
+
+        def connect():
+            return registry.get_connection(temp_db, init)
+
+        assert watcher.poll(temp_db, connect) is True  # First look at the connection
+        assert watcher.poll(temp_db, connect) is False
+
+        conn = connect()
+        conn.execute("INSERT INTO items (name) VALUES ('own')")
+        conn.commit()
+        conn.close()
+        assert watcher.poll(temp_db, connect) is False
+
+        other = sqlite3.connect(temp_db)
+        other.execute("INSERT INTO items (name) VALUES ('other')")
+        other.commit()
+        other.close()
+        assert watcher.poll(temp_db, connect) is True
+
+    def test_polls_throttled_per_database(self, registry, temp_db):
+        calls = []
+        watcher = registry.DataVersionWatcher()
+
+        def connect():
+            calls.append(1)
+            return registry.get_connection(temp_db)
+
+        watcher.poll(temp_db, connect, interval=3600)
+        assert watcher.poll(temp_db, connect, interval=3600) is False
+        assert len(calls) == 1
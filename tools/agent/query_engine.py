@@ -24,6 +24,46 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+OFFICE_DB_PATH = PROJECT_ROOT / "data" / "office.db"
+
+# (office.db and WAL file stats) -> highest integration level of any account
+_office_level_cache: tuple[tuple, int] | None = None
+
+
+def _office_db_signature() -> tuple | None:
+    """Identity of the office database's current contents (None if absent)."""
+    signature = []
+    for path in (OFFICE_DB_PATH, OFFICE_DB_PATH.with_name(OFFICE_DB_PATH.name + "-wal")):
+        try:
+            st = path.stat()
+        except OSError:
+            if path == OFFICE_DB_PATH:
+                return None
+            st = None
+        signature.append((st.st_ino, st.st_mtime_ns, st.st_size) if st else None)
+    return tuple(signature)
+
+
+def _max_office_integration_level() -> int:
+    """Highest office integration level, re-queried only when office.db changed."""
+    global _office_level_cache
+    signature = _office_db_signature()
+    if signature is None:
+        return 0
+    if _office_level_cache is not None and _office_level_cache[0] == signature:
+        return _office_level_cache[1]
+
+    import sqlite3 as _sqlite3
+
+    conn = _sqlite3.connect(str(OFFICE_DB_PATH))
+    try:
+        row = conn.execute("SELECT MAX(integration_level) FROM office_accounts").fetchone()
+    finally:
+        conn.close()
+    level = int(row[0]) if row and row[0] else 0
+    _office_level_cache = (signature, level)
+    return level
+
 
 def _extract_session_id(msg: Any, client: Any = None) -> str | None:
     if hasattr(msg, "session_id") and msg.session_id:
@@ -90,31 +130,16 @@ class DexAIClient:
         tools.extend(f"{prefix}{name}" for name in always_available)
 
         try:
-            import sqlite3 as _sqlite3
-            from pathlib import Path as _Path
-
-            db_path = _Path(__file__).parent.parent.parent / "data" / "office.db"
-            if db_path.exists():
-                conn = _sqlite3.connect(str(db_path))
-                conn.row_factory = _sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT MAX(integration_level) as max_level FROM office_accounts"
-                )
-                row = cursor.fetchone()
-                conn.close()
-
-                if row and row["max_level"]:
-                    max_level = int(row["max_level"])
+            max_level = _max_office_integration_level()
 
-                    if max_level >= 2:
-                        tools.extend(f"{prefix}{name}" for name in [
-                            "email_list", "email_read",
-                            "calendar_today", "calendar_propose",
-                        ])
+            if max_level >= 2:
+                tools.extend(f"{prefix}{name}" for name in [
+                    "email_list", "email_read",
+                    "calendar_today", "calendar_propose",
+                ])
 
-                    if max_level >= 3:
-                        tools.append(f"{prefix}email_draft")
+            if max_level >= 3:
+                tools.append(f"{prefix}email_draft")
         except Exception as e:
             logger.debug(f"Office tools authorization check failed: {e}")
 
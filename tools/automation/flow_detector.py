@@ -17,8 +17,20 @@ Usage:
     python tools/automation/flow_detector.py --action record --user alice --response-time 5.2
     python tools/automation/flow_detector.py --action patterns --user alice
 
+Flow checks run on every notification, so scoring is served from memory:
+a per-user ring buffer of recent activity with running count/sum, cached
+(hour, day_of_week) patterns and cached overrides. record_activity() updates
+the in-memory state immediately and queues the SQL writes, which a
+background thread persists in batches (flush_pending() forces a flush).
+The batch is written outside the cache lock, so scoring never waits on
+SQLite. The cache is per process: each user's state is hydrated from
+recent_activity/activity_patterns on first use (so a restart resumes where
+the last flush left off), but activity recorded by other processes is not
+seen until reset_state().
+
 Dependencies:
     - sqlite3 (stdlib)
+    - threading (stdlib)
     - pyyaml (for config)
 
 Output:
@@ -26,9 +38,14 @@ Output:
 """
 
 import argparse
+import atexit
+import contextlib
 import json
 import sqlite3
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -38,15 +55,39 @@ from typing import Any
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools import db_connections  # noqa: E402
 from tools.automation import DB_PATH
 
 
 # Config path
 CONFIG_PATH = PROJECT_ROOT / "args" / "smart_notifications.yaml"
 
+# In-memory state limits
+MAX_EVENTS_PER_USER = 1024  # ring buffer capacity per user
+FLUSH_INTERVAL_SECONDS = 2.0  # background persistence cadence
+FLUSH_BATCH_SIZE = 256  # pending writes that trigger an early flush
+OVERRIDE_CACHE_TTL_SECONDS = 5.0  # re-read overrides set by other processes
+
+_config_cache: tuple[tuple[str, float], dict[str, Any]] | None = None
+
 
 def load_config() -> dict[str, Any]:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file (cached until the file changes)."""
+    global _config_cache
+
+    try:
+        cache_key = (str(CONFIG_PATH), CONFIG_PATH.stat().st_mtime)
+    except OSError:
+        cache_key = (str(CONFIG_PATH), -1.0)
+    if _config_cache is not None and _config_cache[0] == cache_key:
+        return _config_cache[1]
+
+    config = _read_config()
+    _config_cache = (cache_key, config)
+    return config
+
+
+def _read_config() -> dict[str, Any]:
     default_config = {
         "smart_notifications": {
             "flow_protection": {
@@ -76,10 +117,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Activity patterns table - tracks flow patterns by time of day
@@ -123,7 +165,6 @@ def get_connection() -> sqlite3.Connection:
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_recent_time ON recent_activity(recorded_at)")
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -133,6 +174,288 @@ def row_to_dict(row) -> dict | None:
     return dict(row)
 
 
+# =============================================================================
+# In-memory flow state
+# =============================================================================
+
+
+class ActivityWindow:
+    """Ring buffer of one user's recent activity with running aggregates.
+
+    Holds (timestamp, response_time) pairs no older than ``window_seconds``
+    and keeps the event count, response-time sum and response-time count in
+    step with the buffer, so a flow score needs no scan or query.
+    """
+
+    __slots__ = ("events", "response_count", "response_sum", "window_seconds")
+
+    def __init__(self, window_seconds: float, maxlen: int = MAX_EVENTS_PER_USER):
+        self.window_seconds = window_seconds
+        self.events: deque[tuple[float, float | None]] = deque(maxlen=maxlen)
+        self.response_sum = 0.0
+        self.response_count = 0
+
+    def add(self, ts: float, response_time: float | None) -> None:
+        if len(self.events) == self.events.maxlen:
+            self._drop(self.events[0])
+        self.events.append((ts, response_time))
+        if response_time is not None:
+            self.response_sum += response_time
+            self.response_count += 1
+
+    def evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        events = self.events
+        while events and events[0][0] < cutoff:
+            self._drop(events.popleft())
+
+    def _drop(self, event: tuple[float, float | None]) -> None:
+        if event[1] is not None:
+            self.response_sum -= event[1]
+            self.response_count -= 1
+
+    def summary(self, now: float, window_seconds: float | None = None) -> tuple[int, float | None]:
+        """Return (activity_count, avg_response_time) for the trailing window."""
+        self.evict(now)
+        if window_seconds is None or window_seconds >= self.window_seconds:
+            count = len(self.events)
+            total, n = self.response_sum, self.response_count
+        else:
+            # Narrower window than the buffer: walk back from the newest event
+            cutoff = now - window_seconds
+            count, total, n = 0, 0.0, 0
+            for ts, rt in reversed(self.events):
+                if ts < cutoff:
+                    break
+                count += 1
+                if rt is not None:
+                    total += rt
+                    n += 1
+        return count, (total / n if n else None)
+
+
+class _FlowState:
+    """Process-wide caches plus the queue of writes awaiting persistence."""
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.windows: dict[str, ActivityWindow] = {}
+        # user_id -> {(hour, day_of_week): pattern row dict}
+        self.patterns: dict[str, dict[tuple[int, int], dict[str, Any]]] = {}
+        # user_id -> (loaded_at monotonic, override row dict or None)
+        self.overrides: dict[str, tuple[float, dict[str, Any] | None]] = {}
+        # (user_id, response_time, recorded_at iso, hour, day_of_week)
+        self.pending: list[tuple[str, float | None, str, int, int]] = []
+        # Batch being written by flush_pending(), visible to hydration until committed
+        self.in_flight: list[tuple[str, float | None, str, int, int]] = []
+        # Serializes flushes; never acquired while holding ``lock``
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.writer: threading.Thread | None = None
+
+
+_state = _FlowState()
+
+
+def _detection_window_seconds() -> float:
+    flow_config = load_config().get("smart_notifications", {}).get("flow_protection", {})
+    return flow_config.get("detection_window_minutes", 15) * 60.0
+
+
+def _get_window(user_id: str, now: float) -> ActivityWindow:
+    """Return the user's activity window, hydrating it from SQL on first use."""
+    window_seconds = _detection_window_seconds()
+    window = _state.windows.get(user_id)
+    if window is not None and window.window_seconds == window_seconds:
+        return window
+
+    window = ActivityWindow(window_seconds)
+    cutoff = datetime.fromtimestamp(now - window_seconds).isoformat()
+    conn = get_connection()
+    rows = conn.execute(
+        """
+        SELECT recorded_at, response_time_seconds
+        FROM recent_activity
+        WHERE user_id = ? AND recorded_at >= ?
+        ORDER BY recorded_at
+    """,
+        (user_id, cutoff),
+    ).fetchall()
+    conn.close()
+
+    for row in rows:
+        try:
+            ts = datetime.fromisoformat(row["recorded_at"]).timestamp()
+        except (TypeError, ValueError):
+            continue
+        window.add(ts, row["response_time_seconds"])
+    # Writes from this process that have not reached the database yet
+    for pending_user, rt, recorded_at, _, _ in (*_state.in_flight, *_state.pending):
+        if pending_user == user_id:
+            window.add(datetime.fromisoformat(recorded_at).timestamp(), rt)
+
+    _state.windows[user_id] = window
+    return window
+
+
+def _get_patterns(user_id: str) -> dict[tuple[int, int], dict[str, Any]]:
+    """Return the user's (hour, day_of_week) patterns, loading them on first use."""
+    patterns = _state.patterns.get(user_id)
+    if patterns is not None:
+        return patterns
+
+    conn = get_connection()
+    rows = conn.execute(
+        """
+        SELECT hour, day_of_week, message_count, avg_response_time_seconds,
+               flow_score, sample_count
+        FROM activity_patterns
+        WHERE user_id = ?
+    """,
+        (user_id,),
+    ).fetchall()
+    conn.close()
+
+    patterns = {(row["hour"], row["day_of_week"]): dict(row) for row in rows}
+    for pending_user, rt, _, hour, dow in (*_state.in_flight, *_state.pending):
+        if pending_user == user_id:
+            _fold_pattern(patterns, hour, dow, rt)
+    _state.patterns[user_id] = patterns
+    return patterns
+
+
+def _fold_pattern(
+    patterns: dict[tuple[int, int], dict[str, Any]],
+    hour: int,
+    day_of_week: int,
+    response_time: float | None,
+) -> None:
+    """Apply one activity to a cached pattern, mirroring the SQL upsert."""
+    pattern = patterns.get((hour, day_of_week))
+    if pattern is None:
+        patterns[(hour, day_of_week)] = {
+            "hour": hour,
+            "day_of_week": day_of_week,
+            "message_count": 1,
+            "avg_response_time_seconds": response_time,
+            "flow_score": 0,
+            "sample_count": 1,
+        }
+        return
+
+    samples = pattern["sample_count"] or 0
+    if response_time is not None:
+        avg = pattern["avg_response_time_seconds"] or 0
+        pattern["avg_response_time_seconds"] = (avg * samples + response_time) / (samples + 1)
+    pattern["message_count"] = (pattern["message_count"] or 0) + 1
+    pattern["sample_count"] = samples + 1
+
+
+def _ensure_writer() -> None:
+    if _state.writer is not None and _state.writer.is_alive():
+        return
+    _state.writer = threading.Thread(
+        target=_writer_loop, name="flow-detector-writer", daemon=True
+    )
+    _state.writer.start()
+
+
+def _writer_loop() -> None:
+    while True:
+        _state.wakeup.wait(FLUSH_INTERVAL_SECONDS)
+        _state.wakeup.clear()
+        with contextlib.suppress(sqlite3.Error):
+            # A failed batch is requeued; retry on the next tick
+            flush_pending()
+
+
+def flush_pending() -> dict[str, Any]:
+    """
+    Persist queued activity to recent_activity and activity_patterns.
+
+    Called periodically by the background writer; call it directly before
+    reading the tables from SQL (reports, update_historical_flow_scores).
+
+    Returns:
+        dict with the number of activity records written
+    """
+    # The batch moves to in_flight and is written without holding the cache
+    # lock, so record_activity()/get_flow_score() are not blocked by SQLite
+    with _state.flush_lock:
+        with _state.lock:
+            batch = _state.pending
+            if not batch:
+                return {"success": True, "flushed": 0}
+            _state.pending = []
+            _state.in_flight = batch
+
+        conn = get_connection()
+        try:
+            conn.executemany(
+                """
+                INSERT INTO recent_activity (user_id, response_time_seconds, recorded_at)
+                VALUES (?, ?, ?)
+            """,
+                [(user_id, rt, recorded_at) for user_id, rt, recorded_at, _, _ in batch],
+            )
+            # Sequential upserts keep the running average identical to per-call writes
+            conn.executemany(
+                """
+                INSERT INTO activity_patterns (user_id, hour, day_of_week, message_count, avg_response_time_seconds, sample_count, updated_at)
+                VALUES (?, ?, ?, 1, ?, 1, ?)
+                ON CONFLICT(user_id, hour, day_of_week) DO UPDATE SET
+                    message_count = message_count + 1,
+                    avg_response_time_seconds = CASE
+                        WHEN excluded.avg_response_time_seconds IS NOT NULL THEN
+                            (COALESCE(avg_response_time_seconds, 0) * sample_count + excluded.avg_response_time_seconds) / (sample_count + 1)
+                        ELSE avg_response_time_seconds
+                    END,
+                    sample_count = sample_count + 1,
+                    updated_at = excluded.updated_at
+            """,
+                [
+                    (user_id, hour, dow, rt, recorded_at)
+                    for user_id, rt, recorded_at, hour, dow in batch
+                ],
+            )
+
+            # Clean up old recent_activity (keep last 24 hours)
+            cutoff = (datetime.fromisoformat(batch[-1][2]) - timedelta(hours=24)).isoformat()
+            conn.execute("DELETE FROM recent_activity WHERE recorded_at < ?", (cutoff,))
+            # Committed under the cache lock: hydration sees the batch either
+            # in in_flight or in the database, never both or neither
+            with _state.lock:
+                conn.commit()
+                _state.in_flight = []
+        except sqlite3.Error:
+            conn.rollback()
+            with _state.lock:
+                _state.pending[:0] = batch
+                _state.in_flight = []
+            raise
+        finally:
+            conn.close()
+
+    return {"success": True, "flushed": len(batch)}
+
+
+def reset_state() -> None:
+    """Flush queued writes and drop every in-memory cache."""
+    flush_pending()
+    with _state.lock:
+        _state.windows.clear()
+        _state.patterns.clear()
+        _state.overrides.clear()
+
+
+def _flush_at_exit() -> None:
+    with contextlib.suppress(sqlite3.Error):
+        flush_pending()
+
+
+atexit.register(_flush_at_exit)
+
+
 def record_activity(user_id: str, response_time_seconds: float | None = None) -> dict[str, Any]:
     """
     Record user activity for flow detection.
@@ -144,47 +467,26 @@ def record_activity(user_id: str, response_time_seconds: float | None = None) ->
     Returns:
         dict with success status
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
     now = datetime.now()
-
-    # Record in recent_activity for real-time detection
-    cursor.execute(
-        """
-        INSERT INTO recent_activity (user_id, response_time_seconds, recorded_at)
-        VALUES (?, ?, ?)
-    """,
-        (user_id, response_time_seconds, now.isoformat()),
-    )
-
-    # Update activity_patterns for historical learning
     hour = now.hour
     day_of_week = now.weekday()
 
-    cursor.execute(
-        """
-        INSERT INTO activity_patterns (user_id, hour, day_of_week, message_count, avg_response_time_seconds, sample_count, updated_at)
-        VALUES (?, ?, ?, 1, ?, 1, ?)
-        ON CONFLICT(user_id, hour, day_of_week) DO UPDATE SET
-            message_count = message_count + 1,
-            avg_response_time_seconds = CASE
-                WHEN excluded.avg_response_time_seconds IS NOT NULL THEN
-                    (COALESCE(avg_response_time_seconds, 0) * sample_count + excluded.avg_response_time_seconds) / (sample_count + 1)
-                ELSE avg_response_time_seconds
-            END,
-            sample_count = sample_count + 1,
-            updated_at = excluded.updated_at
-    """,
-        (user_id, hour, day_of_week, response_time_seconds, now.isoformat()),
-    )
+    with _state.lock:
+        # Hydrate before queueing so the new event is not counted twice
+        window = _get_window(user_id, now.timestamp())
+        patterns = _get_patterns(user_id)
 
-    # Clean up old recent_activity (keep last 24 hours)
-    cutoff = (now - timedelta(hours=24)).isoformat()
-    cursor.execute("DELETE FROM recent_activity WHERE recorded_at < ?", (cutoff,))
+        window.add(now.timestamp(), response_time_seconds)
+        _fold_pattern(patterns, hour, day_of_week, response_time_seconds)
 
-    conn.commit()
-    conn.close()
+        # recent_activity feeds restarts and reports; activity_patterns feeds
+        # update_historical_flow_scores. Both are written by the background writer.
+        _state.pending.append(
+            (user_id, response_time_seconds, now.isoformat(), hour, day_of_week)
+        )
+        if len(_state.pending) >= FLUSH_BATCH_SIZE:
+            _state.wakeup.set()
+    _ensure_writer()
 
     return {"success": True, "message": "Activity recorded", "user_id": user_id}
 
@@ -213,43 +515,22 @@ def get_flow_score(user_id: str, window_minutes: int | None = None) -> dict[str,
 
     min_activity = flow_config.get("min_activity_for_flow", 3)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
     now = datetime.now()
-    cutoff = (now - timedelta(minutes=window_minutes)).isoformat()
 
-    # Get recent activity count and avg response time
-    cursor.execute(
-        """
-        SELECT
-            COUNT(*) as activity_count,
-            AVG(response_time_seconds) as avg_response_time
-        FROM recent_activity
-        WHERE user_id = ? AND recorded_at >= ?
-    """,
-        (user_id, cutoff),
-    )
+    with _state.lock:
+        window = _get_window(user_id, now.timestamp())
+        in_memory = window_minutes * 60 <= window.window_seconds
+        if in_memory:
+            activity_count, avg_response_time = window.summary(
+                now.timestamp(), window_minutes * 60
+            )
 
-    recent = cursor.fetchone()
-    activity_count = recent["activity_count"] or 0
-    avg_response_time = recent["avg_response_time"]
+        # Historical pattern for this time slot
+        historical = _get_patterns(user_id).get((now.hour, now.weekday()))
 
-    # Get historical pattern for this time slot
-    hour = now.hour
-    day_of_week = now.weekday()
-
-    cursor.execute(
-        """
-        SELECT flow_score, message_count, avg_response_time_seconds, sample_count
-        FROM activity_patterns
-        WHERE user_id = ? AND hour = ? AND day_of_week = ?
-    """,
-        (user_id, hour, day_of_week),
-    )
-
-    historical = cursor.fetchone()
-    conn.close()
+    if not in_memory:
+        # Flushes first, which must not happen under the cache lock
+        activity_count, avg_response_time = _window_from_sql(user_id, now, window_minutes)
 
     # Calculate component scores
 
@@ -301,6 +582,27 @@ def get_flow_score(user_id: str, window_minutes: int | None = None) -> dict[str,
     }
 
 
+def _window_from_sql(
+    user_id: str, now: datetime, window_minutes: int
+) -> tuple[int, float | None]:
+    """Aggregate recent_activity for windows wider than the in-memory buffer."""
+    flush_pending()
+    cutoff = (now - timedelta(minutes=window_minutes)).isoformat()
+    conn = get_connection()
+    row = conn.execute(
+        """
+        SELECT
+            COUNT(*) as activity_count,
+            AVG(response_time_seconds) as avg_response_time
+        FROM recent_activity
+        WHERE user_id = ? AND recorded_at >= ?
+    """,
+        (user_id, cutoff),
+    ).fetchone()
+    conn.close()
+    return row["activity_count"] or 0, row["avg_response_time"]
+
+
 def detect_flow(user_id: str) -> dict[str, Any]:
     """
     Detect if user is currently in flow state.
@@ -355,6 +657,28 @@ def detect_flow(user_id: str) -> dict[str, Any]:
     }
 
 
+async def get_flow_state(user_id: str) -> dict[str, Any]:
+    """
+    Async flow check for notification schedulers and widgets.
+
+    Served from the in-memory flow state, so it is cheap enough to call on
+    every notification.
+
+    Args:
+        user_id: User identifier
+
+    Returns:
+        dict with in_flow, deep_flow, score and expected_end (manual focus only)
+    """
+    result = detect_flow(user_id)
+    until = result.get("until")
+    return {
+        **result,
+        "in_flow": result.get("in_flow", False),
+        "expected_end": datetime.fromisoformat(until) if until else None,
+    }
+
+
 def set_override(user_id: str, duration_minutes: int) -> dict[str, Any]:
     """
     Set manual focus mode for user.
@@ -393,6 +717,10 @@ def set_override(user_id: str, duration_minutes: int) -> dict[str, Any]:
     conn.commit()
     conn.close()
 
+    _cache_override(
+        user_id, {"is_focusing": 1, "until": until.isoformat(), "created_at": now.isoformat()}
+    )
+
     # Log to audit
     try:
         from tools.security import audit
@@ -441,6 +769,11 @@ def clear_override(user_id: str) -> dict[str, Any]:
     conn.commit()
     conn.close()
 
+    with _state.lock:
+        cached = _state.overrides.pop(user_id, None)
+    if cached and cached[1]:
+        _cache_override(user_id, {**cached[1], "is_focusing": 0, "until": None})
+
     # Log to audit
     try:
         from tools.security import audit
@@ -457,31 +790,45 @@ def clear_override(user_id: str) -> dict[str, Any]:
     }
 
 
-def get_override(user_id: str) -> dict[str, Any]:
-    """
-    Get current focus mode status for user.
+def _cache_override(user_id: str, row: dict[str, Any] | None) -> None:
+    with _state.lock:
+        _state.overrides[user_id] = (time.monotonic(), row)
 
-    Args:
-        user_id: User identifier
 
-    Returns:
-        dict with focus mode status
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
+def _load_override(user_id: str) -> dict[str, Any] | None:
+    """Return the user's override row, re-reading SQL once the cache entry is stale."""
+    cached = _state.overrides.get(user_id)
+    if cached is not None and time.monotonic() - cached[0] < OVERRIDE_CACHE_TTL_SECONDS:
+        return cached[1]
 
-    cursor.execute(
+    conn = get_connection()
+    row = conn.execute(
         """
         SELECT is_focusing, until, created_at
         FROM flow_overrides
         WHERE user_id = ?
     """,
         (user_id,),
-    )
-
-    row = cursor.fetchone()
+    ).fetchone()
     conn.close()
 
+    row = row_to_dict(row)
+    _cache_override(user_id, row)
+    return row
+
+
+def get_override(user_id: str) -> dict[str, Any]:
+    """
+    Get current focus mode status for user.
+
+    Args:
+        user_id: User identifier
+
+    Returns:
+        dict with focus mode status
+    """
+    row = _load_override(user_id)
+
     if not row:
         return {"success": True, "is_focusing": False, "message": "No focus mode set"}
 
@@ -517,6 +864,8 @@ def get_patterns(user_id: str) -> dict[str, Any]:
     Returns:
         dict with patterns and identified peak hours
     """
+    flush_pending()
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -570,6 +919,8 @@ def update_historical_flow_scores() -> dict[str, Any]:
     Returns:
         dict with update count
     """
+    flush_pending()
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -628,6 +979,10 @@ def update_historical_flow_scores() -> dict[str, Any]:
     conn.commit()
     conn.close()
 
+    # Cached patterns pick up the new flow scores on next use
+    with _state.lock:
+        _state.patterns.clear()
+
     return {
         "success": True,
         "updated": updated,
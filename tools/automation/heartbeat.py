@@ -44,6 +44,7 @@ from typing import Any
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools import db_connections  # noqa: E402
 from tools.automation import CONFIG_PATH, DB_PATH, HEARTBEAT_FILE
 
 
@@ -77,10 +78,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Heartbeat checks table
@@ -102,7 +104,6 @@ def get_connection() -> sqlite3.Connection:
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_heartbeat_section ON heartbeat_checks(section)")
 
     conn.commit()
-    return conn
 
 
 def parse_heartbeat_file(path: Path | None = None) -> list[dict[str, Any]]:
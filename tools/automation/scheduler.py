@@ -38,6 +38,7 @@ from typing import Any
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools import db_connections  # noqa: E402
 from tools.automation import CONFIG_PATH, DB_PATH
 
 
@@ -84,10 +85,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Jobs table
@@ -138,7 +140,6 @@ def get_connection() -> sqlite3.Connection:
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_executions_started ON executions(started_at)")
 
     conn.commit()
-    return conn
 
 
 def calculate_next_run(schedule: str, base_time: datetime | None = None) -> datetime | None:
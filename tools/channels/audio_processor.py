@@ -5,6 +5,7 @@ Handles audio/voice processing:
 - Whisper API transcription for voice notes and audio files
 - TTS generation for voice responses
 - Duration limits and cost controls
+- TTS cache for recurring phrases (tools/channels/tts_cache.py)
 - Format conversion (OGG/Opus, MP3, WAV, M4A)
 
 Usage:
@@ -17,10 +18,12 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import io
 import logging
 import sys
 import tempfile
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -33,6 +36,9 @@ import yaml
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools.channels.tts_cache import TTSCache  # noqa: E402
+
+
 logger = logging.getLogger(__name__)
 
 # Config path
@@ -92,6 +98,7 @@ class TTSResult:
     duration_seconds: float | None = None
     cost_usd: float = 0.0
     error: str | None = None
+    cached: bool = False
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to JSON-serializable dict (without audio bytes)."""
@@ -102,6 +109,7 @@ class TTSResult:
             "cost_usd": self.cost_usd,
             "error": self.error,
             "has_audio": self.audio_bytes is not None,
+            "cached": self.cached,
         }
 
 
@@ -135,6 +143,10 @@ class AudioProcessor:
         "audio/opus": "ogg",  # Opus usually in OGG container
     }
 
+    # OpenAI TTS voices and response formats
+    TTS_VOICES = frozenset({"alloy", "echo", "fable", "onyx", "nova", "shimmer"})
+    TTS_FORMATS = frozenset({"mp3", "opus", "aac", "flac", "wav", "pcm"})
+
     def __init__(self, config: dict[str, Any] | None = None):
         """
         Initialize audio processor.
@@ -144,6 +156,8 @@ class AudioProcessor:
         """
         self.config = config or load_config()
         self._temp_dir = Path(tempfile.mkdtemp(prefix="dexai_audio_"))
+        tts_config = self.config.get("generation", {}).get("tts", {})
+        self.tts_cache = TTSCache.from_config(tts_config.get("cache"))
 
     async def transcribe(
         self,
@@ -312,14 +326,20 @@ class AudioProcessor:
         text: str,
         voice: str | None = None,
         output_format: str = "opus",
+        speed: float | None = None,
+        count_lookup: bool = True,
     ) -> TTSResult:
         """
         Generate speech audio from text using TTS.
 
+        Recurring phrases are served from the TTS cache at no cost.
+
         Args:
             text: Text to convert to speech
             voice: Voice ID (provider-specific)
             output_format: Output format (opus, mp3, aac, flac)
+            speed: Speech speed (defaults to config)
+            count_lookup: Report the cache lookup (False when pre-warming)
 
         Returns:
             TTSResult with audio bytes
@@ -342,21 +362,75 @@ class AudioProcessor:
 
         provider = tts_config.get("provider", "openai")
 
-        if provider == "openai":
-            return await self._generate_speech_openai(
-                text, voice, output_format, tts_config
-            )
-        else:
+        if provider != "openai":
             return TTSResult(
                 success=False,
                 error=f"Unsupported TTS provider: {provider}",
             )
 
+        # Resolve defaults first so equivalent requests share a cache entry
+        voice = voice or tts_config.get("voice", "alloy")
+        if voice not in self.TTS_VOICES:
+            voice = "alloy"
+        # Opus is best for voice notes
+        if output_format not in self.TTS_FORMATS:
+            output_format = "opus"
+        model = tts_config.get("model", "tts-1")
+        speed = speed or tts_config.get("speed", 1.0)
+
+        start = time.perf_counter()
+        key = self.tts_cache.key(
+            text, provider=provider, voice=voice, model=model,
+            output_format=output_format, speed=speed,
+        )
+        # Cache file I/O runs off the event loop
+        audio_bytes = await asyncio.to_thread(self.tts_cache.get, key, output_format)
+        if audio_bytes is not None:
+            if count_lookup:
+                await self.tts_cache.record_lookup(
+                    True,
+                    time.perf_counter() - start,
+                    saved_usd=self._tts_cost(text, model, tts_config),
+                )
+            return TTSResult(
+                success=True,
+                audio_bytes=audio_bytes,
+                format=output_format,
+                duration_seconds=self._estimate_speech_duration(text, speed),
+                cached=True,
+            )
+
+        result = await self._generate_speech_openai(
+            text, voice, output_format, model, speed, tts_config
+        )
+        if result.success:
+            if count_lookup:
+                await self.tts_cache.record_lookup(False, time.perf_counter() - start)
+            await asyncio.to_thread(self.tts_cache.put, key, output_format, result.audio_bytes)
+        return result
+
+    @staticmethod
+    def _estimate_speech_duration(text: str, speed: float) -> float:
+        """Rough spoken duration: ~150 words per minute."""
+        return (len(text.split()) / 150) * 60 / speed
+
+    @staticmethod
+    def _tts_cost(text: str, model: str, config: dict[str, Any]) -> float:
+        """TTS cost: $0.015/1K chars for tts-1, $0.030 for tts-1-hd."""
+        pricing = config.get("pricing", {})
+        if model == "tts-1-hd":
+            cost_per_1k_chars = pricing.get("hd_per_1k_chars_usd", 0.030)
+        else:
+            cost_per_1k_chars = pricing.get("per_1k_chars_usd", 0.015)
+        return (len(text) / 1000) * cost_per_1k_chars
+
     async def _generate_speech_openai(
         self,
         text: str,
-        voice: str | None,
+        voice: str,
         output_format: str,
+        model: str,
+        speed: float,
         config: dict[str, Any],
     ) -> TTSResult:
         """
@@ -364,8 +438,10 @@ class AudioProcessor:
 
         Args:
             text: Text to convert
-            voice: Voice ID
-            output_format: Output format
+            voice: Voice ID (validated)
+            output_format: Output format (validated)
+            model: TTS model
+            speed: Speech speed
             config: TTS configuration
 
         Returns:
@@ -379,23 +455,6 @@ class AudioProcessor:
                 error="OpenAI library not installed. Run: uv pip install openai",
             )
 
-        # Get voice (default to "alloy")
-        voice = voice or config.get("voice", "alloy")
-
-        # Validate voice
-        valid_voices = {"alloy", "echo", "fable", "onyx", "nova", "shimmer"}
-        if voice not in valid_voices:
-            voice = "alloy"
-
-        # Validate format (opus is best for voice notes)
-        valid_formats = {"mp3", "opus", "aac", "flac", "wav", "pcm"}
-        if output_format not in valid_formats:
-            output_format = "opus"
-
-        # Get model
-        model = config.get("model", "tts-1")
-        speed = config.get("speed", 1.0)
-
         try:
             client = openai.AsyncOpenAI()
 
@@ -410,18 +469,8 @@ class AudioProcessor:
             # Read audio bytes
             audio_bytes = response.read()
 
-            # Estimate duration (rough: ~150 words per minute)
-            word_count = len(text.split())
-            estimated_duration = (word_count / 150) * 60 / speed
-
-            # Calculate cost (TTS: $0.015/1K chars for tts-1, $0.030 for tts-1-hd)
-            pricing = config.get("pricing", {})
-            if model == "tts-1-hd":
-                cost_per_1k_chars = pricing.get("hd_per_1k_chars_usd", 0.030)
-            else:
-                cost_per_1k_chars = pricing.get("per_1k_chars_usd", 0.015)
-
-            cost = (len(text) / 1000) * cost_per_1k_chars
+            estimated_duration = self._estimate_speech_duration(text, speed)
+            cost = self._tts_cost(text, model, config)
 
             return TTSResult(
                 success=True,
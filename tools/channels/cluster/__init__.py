@@ -0,0 +1,22 @@
+"""
+Multi-Process Gateway (supervisor mode)
+
+Runs each channel adapter and the message handlers in their own worker
+processes, connected by a pipe-based bus through a supervisor:
+- GatewaySupervisor: spawns, relays between, health-checks and restarts workers
+- conversation_key: sticky routing key for handler workers
+- BusEndpoint / RemoteRef: the IPC bus used by supervisor and workers
+"""
+
+from __future__ import annotations
+
+from tools.channels.cluster.bus import BusEndpoint, RemoteRef
+from tools.channels.cluster.supervisor import GatewaySupervisor, conversation_key
+
+
+__all__ = [
+    "BusEndpoint",
+    "GatewaySupervisor",
+    "RemoteRef",
+    "conversation_key",
+]
@@ -0,0 +1,220 @@
+"""
+Gateway Worker Bus
+
+Message bus between the gateway supervisor and its worker processes. Each
+worker is connected to the supervisor by one multiprocessing Pipe; the
+supervisor relays between workers (star topology), so workers never need
+to know where another worker lives or whether it was restarted.
+
+Features:
+- Pickled dict messages with a "type" field (see the constants below)
+- Request/response matching by id, usable from asyncio on both ends
+- A reader thread per endpoint, so a blocking recv() never stalls the loop
+- RemoteRef handles for platform objects that cannot cross processes
+  (e.g. a discord.Message returned by send_message)
+
+Usage:
+    from tools.channels.cluster.bus import BusEndpoint
+
+    bus = BusEndpoint(conn, "handler-0")
+    bus.start()
+    reply = await bus.request({"type": CALL, "channel": "discord", ...})
+    message = await bus.receive()  # None once the other end is gone
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+
+logger = logging.getLogger(__name__)
+
+# Message types
+INBOUND = "inbound"  # adapter -> handler: {"message": UnifiedMessage}
+CALL = "call"  # handler -> adapter: {"channel", "method", "args", "kwargs"}
+RESULT = "result"  # reply to a request: {"id", "result", "error"}
+READY = "ready"  # adapter -> supervisor: {"channel", "methods"}
+ADAPTERS = "adapters"  # supervisor -> handlers: {"adapters": {channel: methods}}
+PING = "ping"  # supervisor -> worker; replied with a metrics snapshot
+STOP = "stop"  # supervisor -> worker
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+MAX_REFS = 4096
+
+_PLAIN_TYPES = (str, int, float, bool, bytes, type(None), datetime)
+
+
+@dataclasses.dataclass(frozen=True)
+class RemoteRef:
+    """Stand-in for an object that lives in another worker process."""
+
+    id: str
+    type: str = ""
+
+
+class RefTable:
+    """
+    Objects exported as RemoteRefs, most recently used kept (bounded).
+
+    Values crossing the bus are exported: plain data and the project's own
+    dataclasses travel as-is, anything else (client library objects) is
+    kept here and replaced by a RemoteRef that resolves back on return.
+    """
+
+    def __init__(self, max_refs: int = MAX_REFS):
+        self.max_refs = max_refs
+        self._objects: OrderedDict[str, Any] = OrderedDict()
+
+    def export(self, value: Any) -> Any:
+        if isinstance(value, (_PLAIN_TYPES, RemoteRef)):
+            return value
+        if isinstance(value, dict):
+            return {k: self.export(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.export(v) for v in value)
+        if dataclasses.is_dataclass(value) and type(value).__module__.startswith("tools."):
+            return value
+        ref = RemoteRef(uuid.uuid4().hex, type(value).__name__)
+        self._objects[ref.id] = value
+        while len(self._objects) > self.max_refs:
+            self._objects.popitem(last=False)
+        return ref
+
+    def resolve(self, value: Any) -> Any:
+        if isinstance(value, RemoteRef):
+            if value.id not in self._objects:
+                raise LookupError(f"Expired remote reference to {value.type or 'object'}")
+            self._objects.move_to_end(value.id)
+            return self._objects[value.id]
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.resolve(v) for v in value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+
+class BusEndpoint:
+    """
+    One end of a worker pipe, used from an asyncio event loop.
+
+    Replies to this endpoint's own requests resolve their futures; every
+    other message (including replies it must relay) is queued for receive().
+
+    Args:
+        conn: multiprocessing Connection
+        name: Name of the worker on the other end (or this worker)
+    """
+
+    def __init__(self, conn: Connection, name: str):
+        self.conn = conn
+        self.name = name
+        self.closed = False
+        self._send_lock = threading.Lock()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._inbox: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        """Start the reader thread (call from the event loop)."""
+        self._loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue()
+        threading.Thread(target=self._read, name=f"bus-{self.name}", daemon=True).start()
+
+    def send(self, message: dict[str, Any]) -> bool:
+        """Send a message; False if the other end is gone."""
+        if self.closed:
+            return False
+        try:
+            with self._send_lock:
+                self.conn.send(message)
+            return True
+        except (OSError, EOFError, BrokenPipeError):
+            self.closed = True
+            return False
+
+    async def request(
+        self, message: dict[str, Any], timeout: float = DEFAULT_REQUEST_TIMEOUT
+    ) -> dict[str, Any]:
+        """
+        Send a request and wait for its RESULT.
+
+        The timeout travels with the request, so a relay can forget it once
+        nobody is waiting for the answer any more.
+
+        Returns:
+            The RESULT message; {"error": ...} if the peer is gone or too slow
+        """
+        request_id = message.setdefault("id", uuid.uuid4().hex)
+        message["timeout"] = timeout
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        try:
+            if not self.send(message):
+                return {"type": RESULT, "id": request_id, "error": "worker_unavailable"}
+            return await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            return {"type": RESULT, "id": request_id, "error": "worker_timeout"}
+        finally:
+            self._pending.pop(request_id, None)
+
+    def reply(self, request: dict[str, Any], result: Any = None, error: str | None = None) -> bool:
+        """Answer a request received from the other end."""
+        return self.send({"type": RESULT, "id": request.get("id"), "result": result, "error": error})
+
+    async def receive(self) -> dict[str, Any] | None:
+        """Next message that is not a reply to our own request (None when closed)."""
+        return await self._inbox.get()
+
+    def close(self) -> None:
+        self.closed = True
+        with contextlib.suppress(OSError):
+            self.conn.close()
+
+    # -------------------------------------------------------------------------
+
+    def _read(self) -> None:
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                message = None
+            except Exception as e:  # Unpicklable payload; keep the pipe
+                logger.warning(f"Dropped undecodable bus message from {self.name}: {e}")
+                continue
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, message)
+            except RuntimeError:
+                return  # Loop closed
+            if message is None:
+                return
+
+    def _deliver(self, message: dict[str, Any] | None) -> None:
+        if message is None:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"type": RESULT, "error": "worker_unavailable"})
+            self._inbox.put_nowait(None)
+            return
+        if message.get("type") == RESULT:
+            future = self._pending.get(message.get("id"))
+            if future is not None:
+                if not future.done():
+                    future.set_result(message)
+                return
+        self._inbox.put_nowait(message)
@@ -0,0 +1,446 @@
+"""
+Gateway Supervisor
+
+Runs channel adapters and message handling in separate worker processes,
+so CPU work (sanitization, markdown, media, hooks) for one channel no
+longer adds latency to every other channel's event loop.
+
+Features:
+- One adapter worker per channel, plus N handler workers (security
+  pipeline + SDK handlers)
+- Relays UnifiedMessages from adapters to handlers, and adapter calls
+  (send_message, update_message, ...) from handlers back to adapters
+- Sticky routing: every message of a conversation goes to the same handler
+  worker, which keeps its SDK session in memory and processes it in order
+- Health checks: workers are pinged; a dead or unresponsive worker is
+  restarted with exponential backoff (reset once it has run stably), and
+  its in-flight requests fail fast
+- Relayed requests are forgotten once their sender's timeout has passed
+- attach_router(): the supervisor process's own router gets an
+  AdapterProxy per running adapter, so broadcast(), notifications and
+  adapter health checks keep working there. Only outbound calls are
+  supported: inbound messages are handled in the handler workers, and
+  platform objects returned by a call come back as RemoteRefs
+- Per-worker metrics are merged into tools.ops.prometheus under a
+  ``worker`` label, next to dexai_worker_up / dexai_worker_restarts_total
+
+Usage:
+    from tools.channels.cluster import GatewaySupervisor
+
+    supervisor = GatewaySupervisor.from_config(load_config().get("workers"))
+    await supervisor.start()
+    supervisor.attach_router(get_router())
+    ...
+    await supervisor.stop()
+
+    python tools/channels/gateway.py --supervise
+
+Config (args/channels.yaml, gateway.workers):
+    enabled: false
+    channels: [telegram, discord, slack]
+    handler_workers: 2
+    health_interval: 5          # Seconds between pings
+    health_timeout: 20          # Restart after this long without a pong
+    max_restart_backoff: 60
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from tools.channels.cluster.bus import (
+    ADAPTERS,
+    CALL,
+    DEFAULT_REQUEST_TIMEOUT,
+    INBOUND,
+    PING,
+    READY,
+    RESULT,
+    STOP,
+    BusEndpoint,
+)
+from tools.channels.cluster.worker import ADAPTER, HANDLER, sync_adapter_proxies, worker_main
+
+
+if TYPE_CHECKING:
+    from tools.channels.models import UnifiedMessage
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNELS = ("telegram", "discord", "slack")
+DEFAULT_HANDLER_WORKERS = 2
+DEFAULT_HEALTH_INTERVAL = 5.0
+DEFAULT_HEALTH_TIMEOUT = 20.0
+DEFAULT_MAX_RESTART_BACKOFF = 60.0
+STOP_GRACE_SECONDS = 5.0
+# A worker that ran this long before failing restarts without backoff
+STABLE_UPTIME_SECONDS = 120.0
+
+
+def conversation_key(message: UnifiedMessage) -> str:
+    """
+    Routing key of the conversation a message belongs to.
+
+    Must be at least as coarse as SessionManager._session_key (one SDK
+    session per channel), so a session is only ever held by one worker.
+    """
+    return message.channel
+
+
+@dataclass
+class WorkerHandle:
+    """A worker slot; the process and bus are replaced on restart."""
+
+    name: str
+    role: str
+    options: dict[str, Any]
+    process: Any = None
+    bus: BusEndpoint | None = None
+    started_at: float = 0.0
+    last_seen: float = 0.0
+    restarts: int = 0
+    crashes: int = 0  # Restarts since the worker last ran stably (sets the backoff)
+    idle: bool = False  # Adapter not configured: nothing to supervise
+    tasks: set = field(default_factory=set)
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.process is not None
+            and self.process.is_alive()
+            and self.bus is not None
+            and not self.bus.closed
+        )
+
+
+class GatewaySupervisor:
+    """
+    Supervises adapter and handler worker processes.
+
+    Args:
+        channels: Channels to run an adapter worker for
+        handler_workers: Number of handler worker processes
+        health_interval: Seconds between health pings
+        health_timeout: Seconds without a pong before a restart
+        max_restart_backoff: Cap on the restart delay (doubles per restart,
+            reset after STABLE_UPTIME_SECONDS of uptime)
+        worker_options: Extra options for every worker (e.g. handler specs)
+    """
+
+    def __init__(
+        self,
+        channels: list[str] | tuple[str, ...] = DEFAULT_CHANNELS,
+        handler_workers: int = DEFAULT_HANDLER_WORKERS,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+        health_timeout: float = DEFAULT_HEALTH_TIMEOUT,
+        max_restart_backoff: float = DEFAULT_MAX_RESTART_BACKOFF,
+        worker_options: dict[str, Any] | None = None,
+    ):
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_restart_backoff = max_restart_backoff
+        options = worker_options or {}
+
+        self.adapters = {
+            channel: WorkerHandle(f"adapter-{channel}", ADAPTER, {**options, "channel": channel})
+            for channel in channels
+        }
+        self.handlers = [
+            WorkerHandle(f"handler-{i}", HANDLER, dict(options))
+            for i in range(max(1, handler_workers))
+        ]
+        self.adapter_methods: dict[str, list[str] | None] = {}
+        # request id -> (origin worker, target worker, deadline)
+        self._pending: dict[str, tuple[WorkerHandle, WorkerHandle, float]] = {}
+        # request id -> (target worker, future) for calls made by this process
+        self._local: dict[str, tuple[WorkerHandle, asyncio.Future]] = {}
+        self.router = None
+        self._context = multiprocessing.get_context("spawn")
+        self._health_task: asyncio.Task | None = None
+        self._restarting: set[str] = set()
+        self.running = False
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> GatewaySupervisor:
+        config = config or {}
+        return cls(
+            channels=config.get("channels", DEFAULT_CHANNELS),
+            handler_workers=config.get("handler_workers", DEFAULT_HANDLER_WORKERS),
+            health_interval=config.get("health_interval", DEFAULT_HEALTH_INTERVAL),
+            health_timeout=config.get("health_timeout", DEFAULT_HEALTH_TIMEOUT),
+            max_restart_backoff=config.get("max_restart_backoff", DEFAULT_MAX_RESTART_BACKOFF),
+            worker_options=config.get("worker_options"),
+        )
+
+    @property
+    def workers(self) -> list[WorkerHandle]:
+        return [*self.adapters.values(), *self.handlers]
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Lifecycle
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Start every worker and the health check loop."""
+        self.running = True
+        for handle in self.handlers:
+            self._spawn(handle)
+        for handle in self.adapters.values():
+            self._spawn(handle)
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self) -> None:
+        """Stop workers gracefully (terminating any that do not exit)."""
+        self.running = False
+        if self._health_task is not None:
+            self._health_task.cancel()
+        # Adapters first, so no new messages arrive while handlers stop
+        for group in (list(self.adapters.values()), self.handlers):
+            for handle in group:
+                if handle.bus is not None:
+                    handle.bus.send({"type": STOP})
+            await asyncio.gather(*(self._join(handle) for handle in group))
+
+    def stats(self) -> dict[str, Any]:
+        """Worker status for health endpoints."""
+        now = time.monotonic()
+        return {
+            "workers": {
+                handle.name: {
+                    "role": handle.role,
+                    "alive": handle.alive,
+                    "idle": handle.idle,
+                    "pid": handle.process.pid if handle.process is not None else None,
+                    "restarts": handle.restarts,
+                    "uptime_seconds": round(now - handle.started_at, 1) if handle.alive else 0,
+                }
+                for handle in self.workers
+            },
+            "in_flight": len(self._pending),
+            "adapters": sorted(c for c, methods in self.adapter_methods.items() if methods),
+        }
+
+    def attach_router(self, router: Any) -> None:
+        """Keep an AdapterProxy per running adapter worker registered on ``router``."""
+        self.router = router
+        sync_adapter_proxies(router, self, self.adapter_methods)
+
+    async def request(
+        self, message: dict[str, Any], timeout: float = DEFAULT_REQUEST_TIMEOUT
+    ) -> dict[str, Any]:
+        """
+        Send a CALL from this process to its adapter worker and wait for the RESULT.
+
+        Same contract as BusEndpoint.request(), so the proxies registered
+        by attach_router() can use the supervisor as their bus.
+        """
+        request_id = message.setdefault("id", uuid.uuid4().hex)
+        message["timeout"] = timeout
+        target = self.adapters.get(message.get("channel"))
+        if target is None or target.idle:
+            return {"type": RESULT, "id": request_id,
+                    "error": f"no adapter for {message.get('channel')}"}
+        if not target.alive or not target.bus.send(message):
+            return {"type": RESULT, "id": request_id,
+                    "error": f"worker_unavailable: {target.name}"}
+        future = asyncio.get_running_loop().create_future()
+        self._local[request_id] = (target, future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            return {"type": RESULT, "id": request_id, "error": "worker_timeout"}
+        finally:
+            self._local.pop(request_id, None)
+
+    def handler_for(self, message: UnifiedMessage) -> WorkerHandle:
+        """Handler worker for a message (stable across restarts)."""
+        key = conversation_key(message).encode()
+        return self.handlers[zlib.crc32(key) % len(self.handlers)]
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Processes
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _spawn(self, handle: WorkerHandle) -> None:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=worker_main,
+            args=(handle.role, handle.name, child, handle.options),
+            name=f"dexai-{handle.name}",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+
+        handle.process = process
+        handle.bus = BusEndpoint(parent, handle.name)
+        handle.bus.start()
+        handle.started_at = handle.last_seen = time.monotonic()
+        handle.idle = False
+        self._track(handle, self._pump(handle, handle.bus))
+        if handle.role == HANDLER and self.adapter_methods:
+            handle.bus.send({"type": ADAPTERS, "adapters": dict(self.adapter_methods)})
+        self._set_up_gauge(handle)
+        logger.info(f"Started gateway worker {handle.name} (pid {process.pid})")
+
+    async def _join(self, handle: WorkerHandle) -> None:
+        process = handle.process
+        if process is None:
+            return
+        await asyncio.to_thread(process.join, STOP_GRACE_SECONDS)
+        if process.is_alive():
+            process.terminate()
+            await asyncio.to_thread(process.join, STOP_GRACE_SECONDS)
+        if handle.bus is not None:
+            handle.bus.close()
+        self._set_up_gauge(handle, up=False)
+
+    async def _restart(self, handle: WorkerHandle, reason: str) -> None:
+        if handle.name in self._restarting or not self.running:
+            return
+        self._restarting.add(handle.name)
+        try:
+            from tools.ops.prometheus import metrics
+
+            logger.warning(f"Restarting gateway worker {handle.name}: {reason}")
+            self._fail_pending(handle, f"worker_restarted: {handle.name}")
+            if handle.bus is not None:
+                handle.bus.send({"type": STOP})
+            await self._join(handle)
+
+            if time.monotonic() - handle.started_at >= STABLE_UPTIME_SECONDS:
+                handle.crashes = 0
+            delay = min(self.max_restart_backoff, 2 ** handle.crashes - 1)
+            handle.crashes += 1
+            handle.restarts += 1
+            metrics.inc_counter("dexai_worker_restarts_total", labels={"worker": handle.name})
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.running:
+                self._spawn(handle)
+        finally:
+            self._restarting.discard(handle.name)
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Relay
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def _pump(self, handle: WorkerHandle, bus: BusEndpoint) -> None:
+        while True:
+            message = await bus.receive()
+            if message is None:
+                return  # Worker gone; the health loop restarts it
+            handle.last_seen = time.monotonic()
+            try:
+                self._dispatch(handle, message)
+            except Exception as e:
+                logger.error(f"Gateway relay error from {handle.name}: {e}")
+
+    def _dispatch(self, source: WorkerHandle, message: dict[str, Any]) -> None:
+        kind = message.get("type")
+
+        if kind == INBOUND:
+            self._forward(source, self.handler_for(message["message"]), message)
+
+        elif kind == CALL:
+            target = self.adapters.get(message.get("channel"))
+            if target is None or target.idle:
+                source.bus.reply(message, error=f"no adapter for {message.get('channel')}")
+            else:
+                self._forward(source, target, message)
+
+        elif kind == RESULT:
+            local = self._local.get(message.get("id"))
+            if local is not None:
+                if not local[1].done():
+                    local[1].set_result(message)
+                return
+            route = self._pending.pop(message.get("id"), None)
+            if route is not None and route[0].bus is not None:
+                route[0].bus.send(message)
+
+        elif kind == READY:
+            channel = message["channel"]
+            source.idle = message.get("methods") is None
+            self.adapter_methods[channel] = message.get("methods")
+            if self.router is not None:
+                sync_adapter_proxies(self.router, self, {channel: message.get("methods")})
+            for handler in self.handlers:
+                if handler.bus is not None:
+                    handler.bus.send({"type": ADAPTERS, "adapters": {channel: message.get("methods")}})
+
+    def _forward(self, source: WorkerHandle, target: WorkerHandle, message: dict[str, Any]) -> None:
+        if not target.alive or not target.bus.send(message):
+            source.bus.reply(message, error=f"worker_unavailable: {target.name}")
+            return
+        timeout = message.get("timeout") or DEFAULT_REQUEST_TIMEOUT
+        self._pending[message["id"]] = (source, target, time.monotonic() + timeout)
+
+    def _expire_pending(self) -> None:
+        """Forget requests whose sender has stopped waiting (a late RESULT is dropped)."""
+        now = time.monotonic()
+        for request_id, (_, _, deadline) in list(self._pending.items()):
+            if now > deadline:
+                del self._pending[request_id]
+
+    def _fail_pending(self, handle: WorkerHandle, error: str) -> None:
+        """Answer requests waiting on (or sent by) a worker that is going away."""
+        for request_id, (origin, target, _) in list(self._pending.items()):
+            if handle not in (origin, target):
+                continue
+            del self._pending[request_id]
+            if target is handle and origin.bus is not None:
+                origin.bus.send({"type": RESULT, "id": request_id, "result": None, "error": error})
+        for request_id, (target, future) in list(self._local.items()):
+            if target is handle and not future.done():
+                future.set_result({"type": RESULT, "id": request_id, "result": None, "error": error})
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Health
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def _health_loop(self) -> None:
+        while self.running:
+            await asyncio.sleep(self.health_interval)
+            self._expire_pending()
+            for handle in self.workers:
+                if handle.name in self._restarting:
+                    continue
+                if not handle.alive:
+                    if handle.idle and handle.process is not None and not handle.process.is_alive():
+                        continue  # Unconfigured adapter exited; nothing to restart
+                    self._track(handle, self._restart(handle, "process exited"))
+                elif time.monotonic() - handle.last_seen > self.health_timeout:
+                    self._track(handle, self._restart(handle, "health check timed out"))
+                else:
+                    self._track(handle, self._ping(handle))
+
+    async def _ping(self, handle: WorkerHandle) -> None:
+        from tools.ops.prometheus import metrics
+
+        reply = await handle.bus.request({"type": PING}, timeout=self.health_timeout)
+        if reply.get("error") or not isinstance(reply.get("result"), dict):
+            return
+        handle.last_seen = time.monotonic()
+        metrics.merge_snapshot(reply["result"], labels={"worker": handle.name})
+        self._set_up_gauge(handle)
+
+    def _set_up_gauge(self, handle: WorkerHandle, up: bool = True) -> None:
+        from tools.ops.prometheus import metrics
+
+        labels = {"worker": handle.name, "role": handle.role}
+        metrics.set_gauge("dexai_worker_up", 1.0 if up else 0.0, labels=labels)
+        metrics.set_gauge("dexai_gateway_in_flight", float(len(self._pending)))
+
+    def _track(self, handle: WorkerHandle, coro) -> None:
+        task = asyncio.create_task(coro)
+        handle.tasks.add(task)
+        task.add_done_callback(handle.tasks.discard)
@@ -0,0 +1,405 @@
+"""
+Gateway Worker Processes
+
+Entry point and runtime for the two kinds of gateway worker processes:
+
+- Adapter worker: runs one channel adapter (Telegram, Discord or Slack).
+  Inbound messages go to the supervisor instead of a local router, and
+  calls from handler workers (send_message, update_message, ...) are run
+  against the real adapter.
+- Handler worker: runs a MessageRouter (security pipeline) and the SDK
+  message handlers. Its router holds an AdapterProxy per channel, so
+  handlers use adapters exactly as they do in a single process. The
+  supervisor process registers the same proxies on its own router (see
+  GatewaySupervisor.attach_router).
+
+Workers exit when the supervisor's end of the pipe closes, so a crashed
+supervisor never leaves orphans behind.
+
+Usage (started by GatewaySupervisor, not directly):
+    worker_main("adapter", "adapter-telegram", conn, {"channel": "telegram"})
+    worker_main("handler", "handler-0", conn, {})
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import inspect
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from tools.channels.cluster.bus import (
+    ADAPTERS,
+    CALL,
+    INBOUND,
+    PING,
+    READY,
+    STOP,
+    BusEndpoint,
+    RefTable,
+)
+from tools.channels.media.attachment_stream import AttachmentTooLargeError, stream_attachment
+from tools.channels.models import UnifiedMessage
+from tools.channels.router import ChannelAdapter
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+logger = logging.getLogger(__name__)
+
+ADAPTER = "adapter"
+HANDLER = "handler"
+
+# Longer than the router's 5 minute handler timeout
+INBOUND_TIMEOUT = 330.0
+CALL_TIMEOUT = 120.0
+
+DEFAULT_HANDLERS = ("tools.channels.sdk_handler:sdk_handler_with_streaming",)
+DEFAULT_ROUTER = "tools.channels.router:get_router"
+DEFAULT_ADAPTER_FACTORY = "tools.channels.cluster.worker:create_adapter"
+
+# Served by the adapter worker itself rather than forwarded to the adapter
+FETCH_ATTACHMENT = "fetch_attachment"
+
+
+def load_object(spec: str) -> Any:
+    """Import ``module:attribute``."""
+    module, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def create_adapter(channel: str) -> ChannelAdapter | None:
+    """Build the adapter for ``channel`` from vault/environment tokens (None if not configured)."""
+    if channel == "telegram":
+        from tools.channels.telegram_adapter import TelegramAdapter, get_telegram_token
+
+        token = get_telegram_token()
+        return TelegramAdapter(token) if token else None
+    if channel == "discord":
+        from tools.channels.discord import DiscordAdapter, get_discord_token
+
+        token = get_discord_token()
+        return DiscordAdapter(token) if token else None
+    if channel == "slack":
+        from tools.channels.slack import SlackAdapter, get_slack_tokens
+
+        tokens = get_slack_tokens()
+        if tokens["bot_token"] and tokens["app_token"]:
+            return SlackAdapter(tokens["bot_token"], tokens["app_token"])
+        return None
+    raise ValueError(f"Unknown channel: {channel}")
+
+
+def public_methods(adapter: Any) -> list[str]:
+    """Names of the adapter's public methods (what an AdapterProxy may call)."""
+    return sorted(
+        name
+        for name in dir(adapter)
+        if not name.startswith("_") and callable(getattr(type(adapter), name, None))
+    )
+
+
+def _portable(value: Any) -> Any:
+    """Reduce a router result to plain data so it always pickles."""
+    return json.loads(json.dumps(value, default=str))
+
+
+# =============================================================================
+# Handler worker side
+# =============================================================================
+
+
+class AdapterProxy(ChannelAdapter):
+    """
+    Adapter living in another worker process.
+
+    Known adapter methods are forwarded over the bus; platform objects in
+    results come back as RemoteRefs, which the adapter worker resolves when
+    they are passed back (e.g. a Discord message to edit). Raw platform
+    messages never leave the adapter worker, so on this side a message's
+    raw form is its wire dict (UnifiedMessage.to_dict()).
+
+    Args:
+        channel: Channel name
+        bus: Bus to send CALLs on (a BusEndpoint, or the GatewaySupervisor
+            itself in the supervisor process); only request() is used
+        methods: Public method names of the real adapter
+    """
+
+    def __init__(self, channel: str, bus: Any, methods: list[str]):
+        self._channel = channel
+        self._bus = bus
+        self.methods = set(methods)
+        self.router = None
+
+    @property
+    def name(self) -> str:
+        return self._channel
+
+    async def connect(self) -> None:
+        pass  # Connected in its adapter worker
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def send_message(self, message: UnifiedMessage) -> dict[str, Any]:
+        return await self.call("send_message", message)
+
+    async def send_rich_message(self, rendered: Any) -> dict[str, Any]:
+        return await self.call("send_rich_message", rendered)
+
+    async def upload_file(
+        self, file_path: str, channel_id: str, caption: str | None = None
+    ) -> dict[str, Any]:
+        return await self.call("upload_file", file_path, channel_id, caption)
+
+    async def fetch_attachment(self, attachment: Any, max_bytes: int) -> bytes:
+        """
+        Download an attachment in the adapter worker, capped at ``max_bytes``.
+
+        A stream cannot cross the pipe, so the adapter worker spools it and
+        enforces the cap mid-stream before anything is sent back.
+
+        Raises:
+            AttachmentTooLargeError: The download exceeded max_bytes
+        """
+        result = await self.call(FETCH_ATTACHMENT, attachment, max_bytes)
+        if result.get("too_large") is not None:
+            raise AttachmentTooLargeError(max_bytes, result["too_large"])
+        return result["data"]
+
+    def to_unified(self, raw_message: Any) -> UnifiedMessage:
+        if isinstance(raw_message, UnifiedMessage):
+            return raw_message
+        if isinstance(raw_message, dict):
+            return UnifiedMessage.from_dict(raw_message)
+        raise TypeError(
+            f"{self._channel} platform messages stay in the adapter worker; "
+            f"expected a UnifiedMessage or its dict, got {type(raw_message).__name__}"
+        )
+
+    def from_unified(self, message: UnifiedMessage) -> dict[str, Any]:
+        return message.to_dict()
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("_") or name not in self.__dict__.get("methods", ()):
+            raise AttributeError(name)
+
+        async def remote(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+
+        remote.__name__ = name
+        return remote
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        reply = await self._bus.request(
+            {"type": CALL, "channel": self._channel, "method": method,
+             "args": args, "kwargs": kwargs},
+            timeout=CALL_TIMEOUT,
+        )
+        if reply.get("error"):
+            raise RuntimeError(f"{self._channel}.{method} failed: {reply['error']}")
+        return reply.get("result")
+
+
+def sync_adapter_proxies(router: Any, bus: Any, adapters: dict[str, list[str] | None]) -> None:
+    """Register, update or drop the AdapterProxy of each channel on ``router``."""
+    for channel, methods in adapters.items():
+        if methods is None:
+            router.unregister_adapter(channel)
+            continue
+        proxy = router.adapters.get(channel)
+        if isinstance(proxy, AdapterProxy):
+            proxy.methods = set(methods)
+        else:
+            router.register_adapter(AdapterProxy(channel, bus, methods))
+
+
+class HandlerWorker:
+    """Security pipeline and message handlers, fed by the supervisor."""
+
+    def __init__(self, bus: BusEndpoint, options: dict[str, Any]):
+        self.bus = bus
+        self.options = options
+        self.router = None
+
+    async def start(self) -> None:
+        self.router = load_object(self.options.get("router", DEFAULT_ROUTER))()
+        for spec in self.options.get("handlers", DEFAULT_HANDLERS):
+            self.router.add_message_handler(load_object(spec))
+
+    async def stop(self) -> None:
+        pass
+
+    def set_adapters(self, adapters: dict[str, list[str] | None]) -> None:
+        sync_adapter_proxies(self.router, self.bus, adapters)
+
+    async def handle(self, message: dict[str, Any]) -> None:
+        if message["type"] != INBOUND:
+            return
+        from tools.ops.prometheus import metrics
+
+        start = time.monotonic()
+        inbound: UnifiedMessage = message["message"]
+        try:
+            result = _portable(await self.router.route_inbound(inbound))
+            self.bus.reply(message, result=result)
+        except Exception as e:
+            logger.error(f"Handler worker failed on {inbound.channel} message: {e}")
+            self.bus.reply(message, error=str(e) or type(e).__name__)
+        labels = {"channel": inbound.channel}
+        metrics.inc_counter("dexai_worker_messages_total", labels=labels)
+        metrics.observe_histogram(
+            "dexai_worker_message_seconds", time.monotonic() - start, labels=labels
+        )
+
+
+# =============================================================================
+# Adapter worker side
+# =============================================================================
+
+
+class RouterClient:
+    """
+    Router stand-in for an adapter in an adapter worker.
+
+    route_inbound() ships the message to a handler worker (through the
+    supervisor) and returns that worker's routing result.
+    """
+
+    def __init__(self, bus: BusEndpoint, adapter: ChannelAdapter):
+        self.bus = bus
+        self.adapters = {adapter.name: adapter}
+
+    async def route_inbound(self, message: UnifiedMessage) -> dict[str, Any]:
+        from tools.ops.prometheus import metrics
+
+        start = time.monotonic()
+        reply = await self.bus.request({"type": INBOUND, "message": message}, timeout=INBOUND_TIMEOUT)
+        metrics.observe_histogram(
+            "dexai_worker_inbound_seconds", time.monotonic() - start,
+            labels={"channel": message.channel},
+        )
+        if reply.get("error"):
+            return {"success": False, "reason": "handler_unavailable", "error": reply["error"]}
+        return reply.get("result") or {"success": False, "reason": "handler_unavailable"}
+
+
+class AdapterWorker:
+    """One channel adapter, serving calls from handler workers."""
+
+    def __init__(self, bus: BusEndpoint, options: dict[str, Any]):
+        self.bus = bus
+        self.options = options
+        self.channel = options["channel"]
+        self.adapter: ChannelAdapter | None = None
+        self.refs = RefTable()
+
+    async def start(self) -> None:
+        factory = load_object(self.options.get("adapter_factory", DEFAULT_ADAPTER_FACTORY))
+        self.adapter = factory(self.channel)
+        if self.adapter is None:
+            logger.info(f"{self.channel} adapter not configured; worker idle")
+            self.bus.send({"type": READY, "channel": self.channel, "methods": None})
+            return
+        self.adapter.set_router(RouterClient(self.bus, self.adapter))
+        await self.adapter.connect()
+        self.bus.send({"type": READY, "channel": self.channel,
+                       "methods": public_methods(self.adapter)})
+
+    async def stop(self) -> None:
+        if self.adapter is not None:
+            try:
+                await self.adapter.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting {self.channel} adapter: {e}")
+
+    async def handle(self, message: dict[str, Any]) -> None:
+        if message["type"] != CALL:
+            return
+        from tools.ops.prometheus import metrics
+
+        method = message.get("method", "")
+        metrics.inc_counter("dexai_worker_calls_total",
+                            labels={"channel": self.channel, "method": method})
+        worker_method = method == FETCH_ATTACHMENT
+        if self.adapter is None or method.startswith("_") or not (
+            worker_method or hasattr(self.adapter, method)
+        ):
+            self.bus.reply(message, error=f"unsupported: {method}")
+            return
+        try:
+            args = self.refs.resolve(message.get("args", ()))
+            kwargs = self.refs.resolve(message.get("kwargs", {}))
+            target = self if worker_method else self.adapter
+            result = getattr(target, method)(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            self.bus.reply(message, result=self.refs.export(result))
+        except Exception as e:
+            self.bus.reply(message, error=str(e) or type(e).__name__)
+
+    async def fetch_attachment(self, attachment: Any, max_bytes: int) -> dict[str, Any]:
+        """Stream an attachment from the platform under ``max_bytes`` (see AdapterProxy)."""
+        try:
+            spool = await stream_attachment(self.adapter, attachment, max_bytes)
+        except AttachmentTooLargeError as e:
+            return {"too_large": e.received_bytes}
+        with spool:
+            return {"data": spool.read_bytes()}
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+
+def worker_main(role: str, name: str, conn, options: dict[str, Any]) -> None:
+    """Process entry point (runs until STOP or the supervisor disappears)."""
+    logging.basicConfig(
+        level=options.get("log_level", "INFO"),
+        format=f"%(asctime)s [{name}] %(levelname)s %(name)s: %(message)s",
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run(role, name, conn, options))
+
+
+async def _run(role: str, name: str, conn, options: dict[str, Any]) -> None:
+    from tools.ops.prometheus import metrics
+
+    bus = BusEndpoint(conn, name)
+    bus.start()
+    worker = AdapterWorker(bus, options) if role == ADAPTER else HandlerWorker(bus, options)
+    await worker.start()
+    if isinstance(worker, AdapterWorker) and worker.adapter is None:
+        bus.close()  # Channel not configured: READY told the supervisor
+        return
+
+    tasks: set[asyncio.Task] = set()
+    try:
+        while True:
+            message = await bus.receive()
+            if message is None or message["type"] == STOP:
+                break
+            if message["type"] == PING:
+                metrics.set_gauge("dexai_worker_tasks", float(len(tasks)))
+                metrics.collect_system_metrics()
+                bus.reply(message, result=metrics.snapshot())
+            elif message["type"] == ADAPTERS and isinstance(worker, HandlerWorker):
+                worker.set_adapters(message["adapters"])
+            else:
+                # Requests run concurrently; the router serializes per channel
+                task = asyncio.create_task(worker.handle(message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await worker.stop()
+        bus.close()
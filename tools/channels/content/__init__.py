@@ -8,7 +8,7 @@ Usage:
     from tools.channels.content import ContentSplitter, MarkdownConverter
 """
 
-from tools.channels.content.markdown import MarkdownConverter
+from tools.channels.content.markdown import MarkdownConverter, MarkdownStream
 from tools.channels.content.splitter import ContentSplitter
 
-__all__ = ["ContentSplitter", "MarkdownConverter"]
+__all__ = ["ContentSplitter", "MarkdownConverter", "MarkdownStream"]
@@ -6,28 +6,207 @@ Converts standard markdown to platform-specific formatting:
 - Discord: Discord-flavored markdown
 - Slack: Slack mrkdwn format
 
+The text is tokenized once (tools/channels/content/tokens.py) and each
+block is rendered by a per-channel emitter, so conversion is a single
+linear pass and code (inline or fenced) is never reformatted.
+MarkdownStream renders a growing stream, rendering each finished block
+only once.
+
 Usage:
     from tools.channels.content.markdown import MarkdownConverter
 
     converter = MarkdownConverter()
     html = converter.to_telegram("**bold** and _italic_")
     mrkdwn = converter.to_slack("**bold** and _italic_")
+
+    stream = MarkdownStream("telegram")
+    for delta in deltas:
+        stream.append(delta)
+        preview = stream.render()
 """
 
 from __future__ import annotations
 
-import re
+import html
 import logging
+from typing import TYPE_CHECKING, ClassVar
+
+from tools.channels.content.tokens import (
+    BLANK,
+    BOLD,
+    BULLET,
+    CODE,
+    HEADING,
+    INLINE_CODE,
+    INLINE_TEXT,
+    ITALIC,
+    LINK,
+    STRIKE,
+    Block,
+    Inline,
+    MarkdownTokenizer,
+    tokenize,
+)
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# Emitters
+# =============================================================================
+
+
+class Emitter:
+    """
+    Renders block tokens for one platform.
+
+    The base class emits plain text (all markers removed); subclasses
+    override the pieces their platform formats.
+    """
+
+    def block(self, block: Block) -> str:
+        """Render one block (without its trailing newline)."""
+        if block.kind == CODE:
+            return self.code_block(block)
+        if block.kind == BLANK:
+            return block.raw
+        inline = self.inline(block.inline())
+        if block.kind == HEADING:
+            return self.heading(inline)
+        if block.kind == BULLET:
+            return self.bullet(block.prefix, inline)
+        return inline
+
+    def inline(self, spans: Iterable[Inline]) -> str:
+        parts = []
+        for span in spans:
+            if span.kind == INLINE_TEXT:
+                parts.append(self.text(span.text))
+            elif span.kind == INLINE_CODE:
+                parts.append(self.code(span.text))
+            elif span.kind == LINK:
+                parts.append(self.link(self.inline(span.children), span.url))
+            else:
+                parts.append(self.emphasis(span.kind, self.inline(span.children)))
+        return "".join(parts)
+
+    def text(self, text: str) -> str:
+        return text
+
+    def code(self, code: str) -> str:
+        return code
+
+    def emphasis(self, kind: str, inner: str) -> str:
+        return inner
+
+    def link(self, inner: str, url: str) -> str:
+        return inner
+
+    def heading(self, inner: str) -> str:
+        return inner
+
+    def bullet(self, prefix: str, inner: str) -> str:
+        return prefix + inner
+
+    def code_block(self, block: Block) -> str:
+        return block.text
+
+
+class TelegramEmitter(Emitter):
+    """Telegram HTML (parse_mode=HTML): <b>, <i>, <s>, <code>, <pre>, <a href="">."""
+
+    TAGS: ClassVar[dict[str, str]] = {BOLD: "b", ITALIC: "i", STRIKE: "s"}
+
+    def text(self, text: str) -> str:
+        return html.escape(text, quote=False)
+
+    def code(self, code: str) -> str:
+        return f"<code>{html.escape(code, quote=False)}</code>"
+
+    def emphasis(self, kind: str, inner: str) -> str:
+        tag = self.TAGS[kind]
+        return f"<{tag}>{inner}</{tag}>"
+
+    def link(self, inner: str, url: str) -> str:
+        return f'<a href="{html.escape(url)}">{inner}</a>'
+
+    def heading(self, inner: str) -> str:
+        # Telegram has no headers
+        return f"<b>{inner}</b>"
+
+    def bullet(self, prefix: str, inner: str) -> str:
+        indent = prefix[: len(prefix) - len(prefix.lstrip())]
+        return f"{indent}• {inner}"
+
+    def code_block(self, block: Block) -> str:
+        code = html.escape(block.text, quote=False)
+        if block.lang:
+            return f'<pre><code class="language-{block.lang}">{code}</code></pre>'
+        return f"<pre><code>{code}</code></pre>"
+
+
+class DiscordEmitter(Emitter):
+    """Discord markdown: standard markdown, except headers become bold."""
+
+    def block(self, block: Block) -> str:
+        if block.kind == HEADING:
+            # Discord doesn't support # headers well in messages
+            return f"**{block.text}**"
+        return block.raw
+
+
+class SlackEmitter(Emitter):
+    """Slack mrkdwn: *bold*, _italic_, ~strike~, `code`, <url|text>."""
+
+    MARKS: ClassVar[dict[str, str]] = {BOLD: "*", ITALIC: "_", STRIKE: "~"}
+
+    def code(self, code: str) -> str:
+        return f"`{code}`"
+
+    def emphasis(self, kind: str, inner: str) -> str:
+        mark = self.MARKS[kind]
+        return f"{mark}{inner}{mark}"
+
+    def link(self, inner: str, url: str) -> str:
+        return f"<{url}|{inner}>"
+
+    def heading(self, inner: str) -> str:
+        # Bold, since Slack has no headers
+        return f"*{inner}*"
+
+    def bullet(self, prefix: str, inner: str) -> str:
+        indent = prefix[: len(prefix) - len(prefix.lstrip())]
+        return f"{indent}• {inner}"
+
+    def code_block(self, block: Block) -> str:
+        # Slack code blocks take no language hint
+        return f"```\n{block.text}\n```"
+
+
+EMITTERS: dict[str, Emitter] = {
+    "telegram": TelegramEmitter(),
+    "discord": DiscordEmitter(),
+    "slack": SlackEmitter(),
+}
+PLAIN = Emitter()
+
+
+def render_blocks(blocks: Iterable[Block], emitter: Emitter) -> str:
+    """Render block tokens, keeping the source line breaks."""
+    return "".join(emitter.block(block) + block.eol for block in blocks)
+
+
 class MarkdownConverter:
     """
     Convert standard markdown to platform-specific formats.
 
-    Handles bold, italic, strikethrough, code, links, and lists.
-    Each platform has unique escaping and formatting requirements.
+    Handles bold, italic, strikethrough, code, links, headers, lists and
+    fenced code blocks. Each platform has unique escaping and formatting
+    requirements, implemented by its Emitter.
     """
 
     # Telegram HTML special characters that need escaping
@@ -50,37 +229,7 @@ class MarkdownConverter:
         Returns:
             Telegram HTML formatted text
         """
-        result = text
-
-        # Escape HTML special chars first (but not in existing HTML tags)
-        result = self._escape_html(result)
-
-        # Bold: **text** or __text__ -> <b>text</b>
-        result = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', result)
-        result = re.sub(r'__(.+?)__', r'<b>\1</b>', result)
-
-        # Italic: *text* or _text_ -> <i>text</i>
-        result = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<i>\1</i>', result)
-        result = re.sub(r'(?<!_)_(?!_)(.+?)(?<!_)_(?!_)', r'<i>\1</i>', result)
-
-        # Strikethrough: ~~text~~ -> <s>text</s>
-        result = re.sub(r'~~(.+?)~~', r'<s>\1</s>', result)
-
-        # Inline code: `code` -> <code>code</code>
-        result = re.sub(r'`([^`]+)`', r'<code>\1</code>', result)
-
-        # Links: [text](url) -> <a href="url">text</a>
-        result = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', result)
-
-        # Headers: # text -> <b>text</b> (Telegram has no headers)
-        result = re.sub(r'^#{1,6}\s+(.+)$', r'<b>\1</b>', result, flags=re.MULTILINE)
-
-        # Bullet lists: - item -> • item
-        result = re.sub(r'^[-*]\s+', '• ', result, flags=re.MULTILINE)
-
-        # Numbered lists: keep as-is (Telegram handles fine)
-
-        return result
+        return render_blocks(tokenize(text), EMITTERS["telegram"])
 
     def to_discord(self, text: str) -> str:
         """
@@ -96,16 +245,7 @@ class MarkdownConverter:
         Returns:
             Discord-formatted text
         """
-        # Discord uses standard markdown, so minimal conversion needed
-        # Just ensure compatibility
-
-        result = text
-
-        # Discord doesn't support # headers well in messages
-        # Convert to **bold** for visual emphasis
-        result = re.sub(r'^#{1,6}\s+(.+)$', r'**\1**', result, flags=re.MULTILINE)
-
-        return result
+        return render_blocks(tokenize(text), EMITTERS["discord"])
 
     def to_slack(self, text: str) -> str:
         """
@@ -121,28 +261,7 @@ class MarkdownConverter:
         Returns:
             Slack mrkdwn formatted text
         """
-        result = text
-
-        # Bold: **text** -> *text* (Slack uses single asterisk)
-        result = re.sub(r'\*\*(.+?)\*\*', r'*\1*', result)
-
-        # Italic: *text* or _text_ -> _text_ (Slack uses underscore)
-        # Only convert non-bold asterisks
-        result = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'_\1_', result)
-
-        # Strikethrough: ~~text~~ -> ~text~ (Slack uses single tilde)
-        result = re.sub(r'~~(.+?)~~', r'~\1~', result)
-
-        # Links: [text](url) -> <url|text>
-        result = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<\2|\1>', result)
-
-        # Headers: # text -> *text* (bold, since Slack has no headers)
-        result = re.sub(r'^#{1,6}\s+(.+)$', r'*\1*', result, flags=re.MULTILINE)
-
-        # Bullet lists: - item -> • item
-        result = re.sub(r'^[-*]\s+', '• ', result, flags=re.MULTILINE)
-
-        return result
+        return render_blocks(tokenize(text), EMITTERS["slack"])
 
     def convert(self, text: str, channel: str) -> str:
         """
@@ -155,17 +274,10 @@ class MarkdownConverter:
         Returns:
             Platform-formatted text
         """
-        converters = {
-            "telegram": self.to_telegram,
-            "discord": self.to_discord,
-            "slack": self.to_slack,
-        }
-
-        converter = converters.get(channel)
-        if converter:
-            return converter(text)
-
-        return text  # No conversion for unknown channels
+        emitter = EMITTERS.get(channel)
+        if emitter is None:
+            return text  # No conversion for unknown channels
+        return render_blocks(tokenize(text), emitter)
 
     def _escape_html(self, text: str) -> str:
         """Escape HTML special characters."""
@@ -180,24 +292,42 @@ class MarkdownConverter:
 
         Useful for character counting before rendering.
         """
-        result = text
-
-        # Remove bold/italic markers
-        result = re.sub(r'\*\*(.+?)\*\*', r'\1', result)
-        result = re.sub(r'__(.+?)__', r'\1', result)
-        result = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'\1', result)
-        result = re.sub(r'(?<!_)_(?!_)(.+?)(?<!_)_(?!_)', r'\1', result)
+        return render_blocks(tokenize(text), PLAIN)
 
-        # Remove strikethrough
-        result = re.sub(r'~~(.+?)~~', r'\1', result)
 
-        # Remove inline code backticks
-        result = re.sub(r'`([^`]+)`', r'\1', result)
+class MarkdownStream:
+    """
+    Incrementally render a growing markdown stream for one channel.
 
-        # Convert links to just text
-        result = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', result)
+    Finished blocks are rendered once and kept; each render() only renders
+    the unfinished tail (the partial last line or an open code fence).
 
-        # Remove header markers
-        result = re.sub(r'^#{1,6}\s+', '', result, flags=re.MULTILINE)
+    Args:
+        channel: Target channel (unknown channels get the text unchanged)
+    """
 
-        return result
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._emitter = EMITTERS.get(channel)
+        self._tokenizer = MarkdownTokenizer()
+        self._parts: list[str] = []
+        self._rendered = ""
+        self.text = ""
+
+    def append(self, delta: str) -> None:
+        """Consume a streamed delta."""
+        self.text += delta
+        if self._emitter is None:
+            return
+        for block in self._tokenizer.feed(delta):
+            self._parts.append(self._emitter.block(block) + block.eol)
+
+    def render(self) -> str:
+        """Rendered output for everything received so far."""
+        if self._emitter is None:
+            return self.text
+        if self._parts:
+            self._rendered += "".join(self._parts)
+            self._parts = []
+        tail = self._tokenizer.pending()
+        return self._rendered + render_blocks(tail, self._emitter) if tail else self._rendered
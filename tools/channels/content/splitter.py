@@ -4,19 +4,26 @@ Content Splitter (Phase 15c)
 Splits content blocks into message-sized chunks for channel limits.
 Preserves code block integrity and splits at natural boundaries.
 
+Text is split in one pass over offsets: each chunk searches only its own
+window for a boundary, and fenced code blocks (from the markdown
+tokenizer) are moved whole to the next chunk or, when too large, closed
+at a line boundary and reopened in the next chunk.
+
 Usage:
     from tools.channels.content.splitter import ContentSplitter
 
     splitter = ContentSplitter()
     chunks = splitter.split_blocks(blocks, channel="telegram")
+    pages = splitter.split_text(markdown, channel="discord")
 """
 
 from __future__ import annotations
 
+import bisect
 import logging
-import re
-from typing import Any
+from typing import Any, NamedTuple
 
+from tools.channels.content.tokens import code_blocks
 from tools.channels.models import BlockType, ContentBlock
 
 logger = logging.getLogger(__name__)
@@ -33,6 +40,14 @@ CHANNEL_LIMITS = {
 DEFAULT_LIMIT = 2000
 
 
+class TextChunk(NamedTuple):
+    """One chunk of split text and where the next chunk resumes."""
+
+    text: str  # Chunk as sent (code fences closed/reopened as needed)
+    end: int  # Source offset where the next chunk starts
+    reopen: str  # Fence opener the next chunk starts with ("" outside code)
+
+
 class ContentSplitter:
     """
     Split content blocks into message-sized chunks.
@@ -106,7 +121,7 @@ class ContentSplitter:
 
     def split_text(self, text: str, channel: str) -> list[str]:
         """
-        Split plain text for channel limits.
+        Split plain text or markdown for channel limits.
 
         Args:
             text: Text to split
@@ -120,17 +135,92 @@ class ContentSplitter:
         if len(text) <= limit:
             return [text]
 
-        chunks = []
-        remaining = text
+        return [chunk.text for chunk in self._split(text, limit)]
+
+    def split_chunks(
+        self,
+        text: str,
+        channel: str,
+        start: int = 0,
+        reopen: str = "",
+    ) -> list[TextChunk]:
+        """
+        Split text, optionally resuming after an earlier chunk.
+
+        Chunks other than the last never change as more text is appended,
+        so a growing stream can keep them and resume from the last one's
+        ``end`` and ``reopen`` instead of splitting from the start.
+
+        Args:
+            text: Full text
+            channel: Target channel
+            start: Offset to resume at (a previous chunk's end)
+            reopen: Fence opener to resume with (a previous chunk's reopen)
 
-        while remaining:
-            if len(remaining) <= limit:
-                chunks.append(remaining)
+        Returns:
+            List of TextChunk (offsets refer to ``text``)
+        """
+        limit = self.get_limit(channel)
+        if not start and not reopen and len(text) <= limit:
+            return [TextChunk(text, len(text), "")]
+
+        source = reopen + text[start:] if start or reopen else text
+        shift = start - len(reopen)
+        return [
+            TextChunk(chunk.text, chunk.end + shift, chunk.reopen)
+            for chunk in self._split(source, limit)
+        ]
+
+    def _split(self, text: str, limit: int) -> list[TextChunk]:
+        """Split ``text`` into chunks of at most ``limit`` characters."""
+        fences = code_blocks(text)
+        fence_starts = [fence.start for fence in fences]
+
+        chunks: list[TextChunk] = []
+        reopen = ""
+        pos = 0
+        n = len(text)
+
+        while True:
+            if not reopen:
+                while pos < n and text[pos].isspace():
+                    pos += 1
+            if pos >= n:
                 break
 
-            split_point = self._find_split_point(remaining, limit)
-            chunks.append(remaining[:split_point].rstrip())
-            remaining = remaining[split_point:].lstrip()
+            room = limit - len(reopen)
+            if n - pos <= room:
+                chunks.append(TextChunk(reopen + text[pos:], n, ""))
+                break
+
+            split_point = self._find_split_point(text, room, pos)
+            index = bisect.bisect_left(fence_starts, split_point) - 1
+            fence = fences[index] if index >= 0 and split_point < fences[index].end else None
+            opener = fence.raw.split("\n", 1)[0] if fence else ""
+            closing = "\n" + opener.strip()[:3]  # ``` or ~~~
+
+            if fence is None or room <= len(closing) + 1:
+                chunks.append(TextChunk(reopen + text[pos:split_point].rstrip(), split_point, ""))
+                reopen = ""
+                pos = split_point
+            elif fence.start > pos and fence.start - pos > room // 3:
+                # Move the whole code block to the next chunk
+                chunks.append(TextChunk(reopen + text[pos:fence.start].rstrip(), fence.start, ""))
+                reopen = ""
+                pos = fence.start
+            else:
+                # Close the fence at a line boundary and reopen it next chunk
+                window_end = pos + room - len(closing)
+                body_start = max(pos, fence.body_start)
+                line_end = text.rfind("\n", body_start, window_end)
+                if line_end > pos:
+                    content_end, cut = line_end, line_end + 1
+                else:
+                    content_end = cut = max(window_end, pos + 1)
+                chunk = reopen + text[pos:content_end] + closing
+                reopen = opener + "\n"
+                chunks.append(TextChunk(chunk, cut, reopen))
+                pos = cut
 
         return chunks
 
@@ -233,30 +323,32 @@ class ContentSplitter:
             if chunk.strip()
         ]
 
-    def _find_split_point(self, text: str, limit: int) -> int:
-        """Find the best point to split text within the limit."""
-        if len(text) <= limit:
+    def _find_split_point(self, text: str, limit: int, start: int = 0) -> int:
+        """Find the best offset to split ``text[start:]`` within the limit."""
+        end = start + limit
+        if len(text) <= end:
             return len(text)
+        floor = start + limit // 3
 
         # Try paragraph boundary
-        paragraph_break = text[:limit].rfind("\n\n")
-        if paragraph_break > limit // 3:
+        paragraph_break = text.rfind("\n\n", start, end)
+        if paragraph_break > floor:
             return paragraph_break + 2
 
         # Try line boundary
-        line_break = text[:limit].rfind("\n")
-        if line_break > limit // 3:
+        line_break = text.rfind("\n", start, end)
+        if line_break > floor:
             return line_break + 1
 
         # Try sentence boundary
-        sentence_end = text[:limit].rfind(". ")
-        if sentence_end > limit // 3:
+        sentence_end = text.rfind(". ", start, end)
+        if sentence_end > floor:
             return sentence_end + 2
 
         # Try word boundary
-        word_break = text[:limit].rfind(" ")
-        if word_break > limit // 3:
+        word_break = text.rfind(" ", start, end)
+        if word_break > floor:
             return word_break + 1
 
         # Hard split at limit
-        return limit
+        return end
@@ -0,0 +1,369 @@
+"""
+Markdown Tokenizer (Phase 15c)
+
+Parses model markdown once into a flat stream of block tokens: one per
+line, or one per fenced code block. MarkdownConverter's channel emitters
+and ContentSplitter both work from this stream, so a response is scanned
+once instead of once per regex substitution.
+
+Features:
+- Single left-to-right pass over lines; inline spans are matched with one
+  forward search per delimiter, and a delimiter with no closer left in the
+  line is never searched for again (linear in the line length)
+- Fenced code blocks are opaque: nothing inside them is formatted, and
+  their offsets let the splitter avoid breaking them
+- Incremental: MarkdownTokenizer.feed() consumes streamed deltas and keeps
+  only the unterminated line or code fence as working state
+
+Usage:
+    from tools.channels.content.tokens import MarkdownTokenizer, tokenize
+
+    blocks = tokenize(text)
+
+    tokenizer = MarkdownTokenizer()
+    for delta in stream:
+        finished = tokenizer.feed(delta)  # Blocks that can no longer change
+    finished += tokenizer.close()
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+
+# Block kinds
+TEXT = "text"
+HEADING = "heading"
+BULLET = "bullet"
+BLANK = "blank"
+CODE = "code"
+
+# Inline kinds
+INLINE_TEXT = "text"
+INLINE_CODE = "code"
+BOLD = "bold"
+ITALIC = "italic"
+STRIKE = "strike"
+LINK = "link"
+
+_FENCE = re.compile(r"[ ]{0,3}(`{3,}|~{3,})[ \t]*([^\s`]*)[^`]*$")
+_HEADING = re.compile(r"(#{1,6}[ \t]+)(.*?)[ \t]*$")
+_BULLET = re.compile(r"([ \t]*[-*+][ \t]+)(.*)$")
+_LINK = re.compile(r"\[([^\]\n]+)\]\(([^)\s]+)\)")
+_INLINE_START = re.compile(r"[`*_~\[]")
+
+
+@dataclass(slots=True)
+class Inline:
+    """Inline span: plain text, code, emphasis (with children) or a link."""
+
+    kind: str
+    text: str = ""
+    children: list[Inline] = field(default_factory=list)
+    url: str = ""
+
+
+@dataclass(slots=True)
+class Block:
+    """
+    One block token.
+
+    Attributes:
+        kind: text, heading, bullet, blank or code
+        text: Line content without its marker, or the code body
+        raw: Source of the block without the trailing newline
+        start: Offset of the block in the source
+        end: Offset just past the block (including its newline)
+        prefix: Marker before ``text`` ("## ", "  - ")
+        lang: Code fence language
+        closed: False for a code fence that was never closed
+        eol: "\\n" if the block ended with a newline in the source
+    """
+
+    kind: str
+    text: str
+    raw: str
+    start: int
+    end: int
+    prefix: str = ""
+    lang: str = ""
+    closed: bool = True
+    eol: str = "\n"
+
+    @property
+    def body_start(self) -> int:
+        """Offset of the first code line (code blocks)."""
+        return self.start + len(self.raw.split("\n", 1)[0]) + 1
+
+    def inline(self) -> list[Inline]:
+        """Inline spans of ``text`` (empty for code and blank blocks)."""
+        if self.kind in (CODE, BLANK):
+            return []
+        return parse_inline(self.text)
+
+
+class MarkdownTokenizer:
+    """
+    Incremental block tokenizer.
+
+    feed() returns the blocks completed by a delta; the partial last line
+    and an unterminated code fence stay pending until a later delta (or
+    close()) completes them.
+    """
+
+    def __init__(self) -> None:
+        self._offset = 0  # Source offset of the pending line
+        self._parts: list[str] = []  # Pending (unterminated) line
+        self._fence: tuple[int, str, str, str] | None = None  # start, opener, marker, lang
+        self._fence_lines: list[str] = []
+
+    def feed(self, delta: str) -> list[Block]:
+        """Consume a delta and return the blocks it completed."""
+        if "\n" not in delta:
+            if delta:
+                self._parts.append(delta)
+            return []
+
+        self._parts.append(delta)
+        data = "".join(self._parts)
+        lines = data.split("\n")
+        tail = lines.pop()
+        self._parts = [tail] if tail else []
+
+        blocks: list[Block] = []
+        for line in lines:
+            block = self._line(line, "\n")
+            if block is not None:
+                blocks.append(block)
+        return blocks
+
+    def close(self) -> list[Block]:
+        """Finish the stream: flush the partial line and any open fence."""
+        blocks = []
+        tail = "".join(self._parts)
+        self._parts = []
+        if tail:
+            block = self._line(tail, "")
+            if block is not None:
+                blocks.append(block)
+        if self._fence is not None:
+            # The last fence line kept its newline unless it was the tail
+            blocks.append(self._close_fence("", closed=False, eol="" if tail else "\n"))
+        return blocks
+
+    def pending(self) -> list[Block]:
+        """Blocks for the unfinished tail, as they would be if the stream ended now."""
+        if not self._parts and self._fence is None:
+            return []
+        snapshot = MarkdownTokenizer()
+        snapshot._offset = self._offset
+        snapshot._parts = list(self._parts)
+        snapshot._fence = self._fence
+        snapshot._fence_lines = list(self._fence_lines)
+        return snapshot.close()
+
+    # -------------------------------------------------------------------------
+
+    def _line(self, line: str, eol: str) -> Block | None:
+        start = self._offset
+        self._offset += len(line) + len(eol)
+
+        if self._fence is not None:
+            if _closes_fence(line, self._fence[2]):
+                return self._close_fence(line, closed=True, eol=eol)
+            self._fence_lines.append(line)
+            return None
+
+        fence = _FENCE.match(line)
+        if fence:
+            self._fence = (start, line, fence.group(1), fence.group(2))
+            self._fence_lines = []
+            return None
+
+        if not line.strip():
+            return Block(BLANK, "", line, start, self._offset, eol=eol)
+        heading = _HEADING.match(line)
+        if heading:
+            return Block(HEADING, heading.group(2), line, start, self._offset,
+                         prefix=heading.group(1), eol=eol)
+        bullet = _BULLET.match(line)
+        if bullet:
+            return Block(BULLET, bullet.group(2), line, start, self._offset,
+                         prefix=bullet.group(1), eol=eol)
+        return Block(TEXT, line, line, start, self._offset, eol=eol)
+
+    def _close_fence(self, closing: str, closed: bool, eol: str) -> Block:
+        start, opener, _, lang = self._fence
+        body = "\n".join(self._fence_lines)
+        raw = "\n".join([opener, *self._fence_lines, *([closing] if closed else [])])
+        self._fence = None
+        self._fence_lines = []
+        return Block(CODE, body, raw, start, start + len(raw) + len(eol),
+                     lang=lang, closed=closed, eol=eol)
+
+
+def _closes_fence(line: str, marker: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith(marker) and not stripped.strip(marker[0])
+
+
+def tokenize(text: str) -> list[Block]:
+    """Tokenize a complete markdown document."""
+    tokenizer = MarkdownTokenizer()
+    return tokenizer.feed(text) + tokenizer.close()
+
+
+def _fence_lines(text: str):
+    """(start, end) of each line that starts (after indentation) with ``` or ~~~."""
+    pos = 0
+    ticks = text.find("```")
+    tildes = text.find("~~~")
+    while ticks != -1 or tildes != -1:
+        hit = min(i for i in (ticks, tildes) if i != -1)
+        start = text.rfind("\n", 0, hit) + 1
+        end = text.find("\n", hit)
+        if end == -1:
+            end = len(text)
+        if start >= pos and not text[start:hit].strip(" \t"):
+            yield start, end
+        pos = end + 1
+        if ticks != -1 and ticks < pos:
+            ticks = text.find("```", pos)
+        if tildes != -1 and tildes < pos:
+            tildes = text.find("~~~", pos)
+
+
+def code_blocks(text: str) -> list[Block]:
+    """
+    Only the fenced code blocks of a document, as tokenize() would return them.
+
+    Jumps between candidate fence lines instead of tokenizing every line,
+    for callers (the splitter) that only need to know where code is.
+    """
+    blocks: list[Block] = []
+    fence: tuple[int, int, str, str] | None = None  # start, opener end, marker, lang
+
+    for line_start, line_end in _fence_lines(text):
+        line = text[line_start:line_end]
+        if fence is None:
+            opener = _FENCE.match(line)
+            if opener:
+                fence = (line_start, line_end, opener.group(1), opener.group(2))
+        elif _closes_fence(line, fence[2]):
+            start, opener_end, _, lang = fence
+            eol = "\n" if line_end < len(text) else ""
+            body = text[opener_end + 1:line_start - 1] if line_start > opener_end + 1 else ""
+            blocks.append(Block(CODE, body, text[start:line_end], start,
+                                line_end + len(eol), lang=lang, eol=eol))
+            fence = None
+
+    if fence is not None:
+        start, opener_end, _, lang = fence
+        eol = "\n" if text.endswith("\n") else ""
+        raw = text[start:len(text) - len(eol)]
+        body = raw[opener_end - start + 1:]
+        blocks.append(Block(CODE, body, raw, start, len(text), lang=lang, closed=False, eol=eol))
+    return blocks
+
+
+# =============================================================================
+# Inline spans
+# =============================================================================
+
+
+def _word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+def parse_inline(text: str) -> list[Inline]:
+    """
+    Parse inline spans of one line.
+
+    Supports `code`, **bold**, __bold__, *italic*, _italic_, ~~strike~~ and
+    [text](url). Underscore emphasis is not recognised inside words, so
+    snake_case identifiers stay intact.
+    """
+    spans: list[Inline] = []
+    exhausted: set[str] = set()  # Delimiters with no closer left in the line
+    n = len(text)
+    emitted = 0
+    pos = 0
+
+    while pos < n:
+        match = _INLINE_START.search(text, pos)
+        if match is None:
+            break
+        i = match.start()
+        span, end = _span_at(text, i, exhausted)
+        if span is None:
+            pos = end
+            continue
+        if i > emitted:
+            spans.append(Inline(INLINE_TEXT, text[emitted:i]))
+        spans.append(span)
+        emitted = pos = end
+
+    if emitted < n:
+        spans.append(Inline(INLINE_TEXT, text[emitted:]))
+    return spans
+
+
+def _span_at(text: str, i: int, exhausted: set[str]) -> tuple[Inline | None, int]:
+    """Span opening at ``i`` and the offset after it, or (None, next scan offset)."""
+    ch = text[i]
+    n = len(text)
+
+    if ch == "`":
+        run = 1
+        while i + run < n and text[i + run] == "`":
+            run += 1
+        delim = "`" * run
+        if delim not in exhausted:
+            close = text.find(delim, i + run)
+            if close != -1:
+                return Inline(INLINE_CODE, text[i + run:close]), close + run
+            exhausted.add(delim)
+        return None, i + run
+
+    if ch == "[":
+        link = _LINK.match(text, i)
+        if link:
+            return Inline(LINK, children=parse_inline(link.group(1)), url=link.group(2)), link.end()
+        return None, i + 1
+
+    double = text.startswith(ch * 2, i)
+    if ch == "~":
+        if not double:
+            return None, i + 1
+        return _emphasis(text, i, "~~", STRIKE, exhausted)
+
+    delim = ch * 2 if double else ch
+    if ch == "_" and i > 0 and _word_char(text[i - 1]):
+        return None, i + len(delim)  # Intraword underscore
+    kind = BOLD if double else ITALIC
+    return _emphasis(text, i, delim, kind, exhausted)
+
+
+def _emphasis(
+    text: str, i: int, delim: str, kind: str, exhausted: set[str]
+) -> tuple[Inline | None, int]:
+    size = len(delim)
+    inner = i + size
+    if delim in exhausted or inner >= len(text) or text[inner].isspace():
+        return None, inner
+
+    close = text.find(delim, inner + 1)
+    while close != -1:
+        after = close + size
+        if (
+            # A single delimiter must not be half of a double one
+            (size == 2 or (text[close + 1:close + 2] != delim and text[close - 1] != delim))
+            and not text[close - 1].isspace()
+            and not (delim[0] == "_" and after < len(text) and _word_char(text[after]))
+        ):
+            return Inline(kind, children=parse_inline(text[inner:close])), after
+        close = text.find(delim, close + size)
+
+    exhausted.add(delim)
+    return None, inner
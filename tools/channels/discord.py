@@ -23,6 +23,7 @@ import json
 import logging
 import sys
 import uuid
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
@@ -36,7 +37,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from tools.channels.models import Attachment, UnifiedMessage
-from tools.channels.router import ChannelAdapter, get_router
+from tools.channels.router import DOWNLOAD_CHUNK_BYTES, ChannelAdapter, get_router
 
 
 class DiscordAdapter(ChannelAdapter):
@@ -376,7 +377,12 @@ class DiscordAdapter(ChannelAdapter):
             return {"success": True}
 
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            result = {"success": False, "error": str(e)}
+            # Surface rate limiting (discord.RateLimited / HTTP 429) so
+            # streaming callers can slow their edit rate
+            if getattr(e, "status", None) == 429 or hasattr(e, "retry_after"):
+                result["retry_after"] = float(getattr(e, "retry_after", 0) or 0)
+            return result
 
     def to_unified(self, message) -> UnifiedMessage:
         """
@@ -492,6 +498,33 @@ class DiscordAdapter(ChannelAdapter):
             response.raise_for_status()
             return response.content
 
+    async def iter_attachment(self, attachment: Attachment) -> AsyncIterator[bytes]:
+        """
+        Stream attachment content from Discord CDN in chunks.
+
+        Args:
+            attachment: Attachment with Discord CDN URL
+
+        Yields:
+            Byte chunks in order
+
+        Raises:
+            ValueError: If no URL available
+            Exception: On download failure
+        """
+        if not attachment.url:
+            raise ValueError("No URL in Discord attachment")
+
+        import httpx
+
+        async with (
+            httpx.AsyncClient(timeout=30.0) as client,
+            client.stream("GET", attachment.url) as response,
+        ):
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                yield chunk
+
     # =========================================================================
     # Message Handlers
     # =========================================================================
@@ -13,6 +13,7 @@ Usage:
     python tools/channels/gateway.py --start --host 0.0.0.0 --port 18789
     python tools/channels/gateway.py --status
     python tools/channels/gateway.py --health
+    python tools/channels/gateway.py --supervise   # Adapters/handlers in worker processes
 
 Dependencies (pip):
     - websockets>=12.0
@@ -480,6 +481,31 @@ async def run_server(host: str, port: int) -> None:
     await server.start()
 
 
+async def run_supervisor() -> None:
+    """
+    Run channel adapters and message handlers in supervised worker processes.
+
+    See tools/channels/cluster and the gateway.workers section of
+    args/channels.yaml.
+    """
+    from tools.channels.cluster import GatewaySupervisor
+
+    supervisor = GatewaySupervisor.from_config(load_config().get("workers"))
+    stopped = asyncio.Event()
+
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopped.set)
+
+    await supervisor.start()
+    print(f"Gateway supervisor started ({len(supervisor.workers)} workers)")
+    try:
+        await stopped.wait()
+    finally:
+        await supervisor.stop()
+        print("Gateway supervisor stopped")
+
+
 # =============================================================================
 # CLI Interface
 # =============================================================================
@@ -490,6 +516,11 @@ def main():
     parser.add_argument("--start", action="store_true", help="Start the gateway server")
     parser.add_argument("--status", action="store_true", help="Get server status")
     parser.add_argument("--health", action="store_true", help="Get health check")
+    parser.add_argument(
+        "--supervise",
+        action="store_true",
+        help="Run adapters and handlers in supervised worker processes",
+    )
     parser.add_argument("--host", default=None, help=f"Host to bind to (default: {DEFAULT_HOST})")
     parser.add_argument(
         "--port", type=int, default=None, help=f"Port to listen on (default: {DEFAULT_PORT})"
@@ -505,6 +536,9 @@ def main():
         print(f"Starting gateway on ws://{host}:{port}")
         asyncio.run(run_server(host, port))
 
+    elif args.supervise:
+        asyncio.run(run_supervisor())
+
     elif args.status:
         status = get_server_status()
         print("OK" if status.get("running") else "STOPPED")
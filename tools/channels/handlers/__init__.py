@@ -1,9 +1,15 @@
 from tools.channels.handlers.slack_streaming import sdk_handler_slack_streaming
 from tools.channels.handlers.discord_streaming import sdk_handler_discord_streaming
-from tools.channels.handlers.telegram_streaming import sdk_handler_telegram_fallback
+from tools.channels.handlers.telegram_streaming import (
+    sdk_handler_telegram_fallback,
+    sdk_handler_telegram_streaming,
+)
+from tools.channels.handlers.stream_renderer import StreamRenderer
 
 __all__ = [
     "sdk_handler_slack_streaming",
     "sdk_handler_discord_streaming",
     "sdk_handler_telegram_fallback",
+    "sdk_handler_telegram_streaming",
+    "StreamRenderer",
 ]
@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import uuid
 from datetime import datetime
 from typing import Any
 
+from tools.channels.handlers.stream_renderer import (
+    TYPING_CURSOR,
+    StreamRenderer,
+    stream_sdk_response,
+)
 from tools.channels.models import UnifiedMessage
-from tools.channels.session_manager import get_session_manager
+import contextlib
 
 logger = logging.getLogger(__name__)
 
-STREAM_UPDATE_INTERVAL_MS = 500
-TYPING_CURSOR = "\u258c"
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def _outbound(message: UnifiedMessage, content: str) -> UnifiedMessage:
+    return UnifiedMessage(
+        id=str(uuid.uuid4()),
+        channel="discord",
+        channel_message_id=None,
+        user_id=message.user_id,
+        channel_user_id=message.channel_user_id,
+        direction="outbound",
+        content=content,
+        content_type="text",
+        attachments=[],
+        reply_to=message.id,
+        timestamp=datetime.now(),
+        metadata=message.metadata,
+    )
 
 
 async def sdk_handler_discord_streaming(
@@ -20,7 +40,7 @@ async def sdk_handler_discord_streaming(
     context: dict,
 ) -> dict[str, Any]:
     try:
-        from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
+        import claude_agent_sdk  # noqa: F401
     except ImportError:
         return {"success": False, "error": "SDK not installed"}
 
@@ -31,22 +51,7 @@ async def sdk_handler_discord_streaming(
     if not adapter:
         return {"success": False, "error": "Discord adapter not available"}
 
-    initial_message = UnifiedMessage(
-        id=str(uuid.uuid4()),
-        channel="discord",
-        channel_message_id=None,
-        user_id=message.user_id,
-        channel_user_id=message.channel_user_id,
-        direction="outbound",
-        content=f"Thinking...{TYPING_CURSOR}",
-        content_type="text",
-        attachments=[],
-        reply_to=message.id,
-        timestamp=datetime.now(),
-        metadata=message.metadata,
-    )
-
-    send_result = await adapter.send_message(initial_message)
+    send_result = await adapter.send_message(_outbound(message, f"Thinking...{TYPING_CURSOR}"))
 
     if not send_result.get("success"):
         from tools.channels.sdk_handler import sdk_handler
@@ -58,48 +63,23 @@ async def sdk_handler_discord_streaming(
         from tools.channels.sdk_handler import sdk_handler
         return await sdk_handler(message, context)
 
-    manager = get_session_manager()
+    from tools.channels.sdk_handler import _log_to_dashboard
+
+    async def edit(handle, content: str) -> dict[str, Any]:
+        return await adapter.update_message(message_obj=handle, content=content)
 
-    from tools.channels.sdk_handler import create_ask_user_handler, _log_to_dashboard
-    ask_handler = create_ask_user_handler(message)
+    async def send(content: str):
+        result = await adapter.send_message(_outbound(message, content))
+        return result.get("message_obj") if result.get("success") else None
 
-    accumulated_text = ""
-    last_update_time = asyncio.get_event_loop().time()
+    renderer = StreamRenderer(
+        "discord", handle=message_obj, edit=edit, send=send, limit=DISCORD_MESSAGE_LIMIT
+    )
+    renderer.start()
 
     try:
-        async for msg in manager.stream_message(
-            channel=message.channel,
-            content=message.content,
-            ask_user_handler=ask_handler,
-        ):
-            if isinstance(msg, AssistantMessage):
-                for block in msg.content:
-                    if isinstance(block, TextBlock):
-                        accumulated_text += block.text
-
-                        current_time = asyncio.get_event_loop().time()
-                        if (current_time - last_update_time) * 1000 >= STREAM_UPDATE_INTERVAL_MS:
-                            display_text = accumulated_text[:1997] + TYPING_CURSOR
-                            await adapter.update_message(
-                                message_obj=message_obj,
-                                content=display_text,
-                            )
-                            last_update_time = current_time
-
-            elif isinstance(msg, ResultMessage):
-                break
-
-        if accumulated_text:
-            final_text = accumulated_text[:2000]
-            await adapter.update_message(
-                message_obj=message_obj,
-                content=final_text,
-            )
-        else:
-            await adapter.update_message(
-                message_obj=message_obj,
-                content="I completed the task but have no text response.",
-            )
+        accumulated_text = await stream_sdk_response(message, renderer)
+        stats = await renderer.finish()
 
         _log_to_dashboard(
             event_type="task",
@@ -110,7 +90,7 @@ async def sdk_handler_discord_streaming(
                 "message_id": message.id,
                 "response_length": len(accumulated_text),
                 "streaming": True,
-                "truncated": len(accumulated_text) > 2000,
+                "render": stats,
             },
             severity="info",
         )
@@ -120,18 +100,13 @@ async def sdk_handler_discord_streaming(
             "handler": "sdk_handler_discord_streaming",
             "response_length": len(accumulated_text),
             "streaming": True,
-            "truncated": len(accumulated_text) > 2000,
+            "messages": stats["messages"],
+            "edits": stats["edits"],
         }
 
     except Exception as e:
         logger.error(f"Discord streaming error: {e}")
-        try:
-            error_msg = accumulated_text[:2000] if accumulated_text else f"Error: {str(e)[:100]}"
-            await adapter.update_message(
-                message_obj=message_obj,
-                content=error_msg,
-            )
-        except Exception:
-            pass
+        with contextlib.suppress(Exception):
+            await renderer.finish(renderer.text or f"Error: {str(e)[:100]}")
 
         return {"success": False, "error": str(e)}
@@ -1,26 +1,27 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import uuid
 from datetime import datetime
 from typing import Any
 
+from tools.channels.handlers.stream_renderer import (
+    TYPING_CURSOR,
+    StreamRenderer,
+    stream_sdk_response,
+)
 from tools.channels.models import UnifiedMessage
-from tools.channels.session_manager import get_session_manager
+import contextlib
 
 logger = logging.getLogger(__name__)
 
-STREAM_UPDATE_INTERVAL_MS = 500
-TYPING_CURSOR = "\u258c"
-
 
 async def sdk_handler_slack_streaming(
     message: UnifiedMessage,
     context: dict,
 ) -> dict[str, Any]:
     try:
-        from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
+        import claude_agent_sdk  # noqa: F401
     except ImportError:
         return {"success": False, "error": "SDK not installed"}
 
@@ -40,25 +41,26 @@ async def sdk_handler_slack_streaming(
     if not channel_id:
         return {"success": False, "error": "No channel ID for Slack message"}
 
-    initial_message = UnifiedMessage(
-        id=str(uuid.uuid4()),
-        channel="slack",
-        channel_message_id=None,
-        user_id=message.user_id,
-        channel_user_id=message.channel_user_id,
-        direction="outbound",
-        content=f"Thinking...{TYPING_CURSOR}",
-        content_type="text",
-        attachments=[],
-        reply_to=message.id,
-        timestamp=datetime.now(),
-        metadata={
-            "slack_channel_id": channel_id,
-            "slack_thread_ts": thread_ts,
-        },
-    )
+    def outbound(content: str) -> UnifiedMessage:
+        return UnifiedMessage(
+            id=str(uuid.uuid4()),
+            channel="slack",
+            channel_message_id=None,
+            user_id=message.user_id,
+            channel_user_id=message.channel_user_id,
+            direction="outbound",
+            content=content,
+            content_type="text",
+            attachments=[],
+            reply_to=message.id,
+            timestamp=datetime.now(),
+            metadata={
+                "slack_channel_id": channel_id,
+                "slack_thread_ts": thread_ts,
+            },
+        )
 
-    send_result = await adapter.send_message(initial_message)
+    send_result = await adapter.send_message(outbound(f"Thinking...{TYPING_CURSOR}"))
 
     if not send_result.get("success"):
         from tools.channels.sdk_handler import sdk_handler
@@ -67,49 +69,29 @@ async def sdk_handler_slack_streaming(
     message_ts = send_result.get("message_id")
     response_channel = send_result.get("channel_id", channel_id)
 
-    manager = get_session_manager()
+    from tools.channels.sdk_handler import _log_to_dashboard
+
+    async def edit(handle, content: str) -> dict[str, Any]:
+        return await adapter.update_message(
+            channel_id=handle[0],
+            message_ts=handle[1],
+            content=content,
+        )
 
-    from tools.channels.sdk_handler import create_ask_user_handler, _log_to_dashboard
-    ask_handler = create_ask_user_handler(message)
+    async def send(content: str):
+        result = await adapter.send_message(outbound(content))
+        if not result.get("success"):
+            return None
+        return (result.get("channel_id", response_channel), result.get("message_id"))
 
-    accumulated_text = ""
-    last_update_time = asyncio.get_event_loop().time()
+    renderer = StreamRenderer(
+        "slack", handle=(response_channel, message_ts), edit=edit, send=send
+    )
+    renderer.start()
 
     try:
-        async for msg in manager.stream_message(
-            channel=message.channel,
-            content=message.content,
-            ask_user_handler=ask_handler,
-        ):
-            if isinstance(msg, AssistantMessage):
-                for block in msg.content:
-                    if isinstance(block, TextBlock):
-                        accumulated_text += block.text
-
-                        current_time = asyncio.get_event_loop().time()
-                        if (current_time - last_update_time) * 1000 >= STREAM_UPDATE_INTERVAL_MS:
-                            await adapter.update_message(
-                                channel_id=response_channel,
-                                message_ts=message_ts,
-                                content=accumulated_text + TYPING_CURSOR,
-                            )
-                            last_update_time = current_time
-
-            elif isinstance(msg, ResultMessage):
-                break
-
-        if accumulated_text:
-            await adapter.update_message(
-                channel_id=response_channel,
-                message_ts=message_ts,
-                content=accumulated_text,
-            )
-        else:
-            await adapter.update_message(
-                channel_id=response_channel,
-                message_ts=message_ts,
-                content="I completed the task but have no text response.",
-            )
+        accumulated_text = await stream_sdk_response(message, renderer)
+        stats = await renderer.finish()
 
         _log_to_dashboard(
             event_type="task",
@@ -120,6 +102,7 @@ async def sdk_handler_slack_streaming(
                 "message_id": message.id,
                 "response_length": len(accumulated_text),
                 "streaming": True,
+                "render": stats,
             },
             severity="info",
         )
@@ -129,18 +112,13 @@ async def sdk_handler_slack_streaming(
             "handler": "sdk_handler_slack_streaming",
             "response_length": len(accumulated_text),
             "streaming": True,
+            "messages": stats["messages"],
+            "edits": stats["edits"],
         }
 
     except Exception as e:
         logger.error(f"Slack streaming error: {e}")
-        try:
-            error_msg = accumulated_text or f"Error: {str(e)[:100]}"
-            await adapter.update_message(
-                channel_id=response_channel,
-                message_ts=message_ts,
-                content=error_msg,
-            )
-        except Exception:
-            pass
+        with contextlib.suppress(Exception):
+            await renderer.finish(renderer.text or f"Error: {str(e)[:100]}")
 
         return {"success": False, "error": str(e)}
@@ -0,0 +1,348 @@
+"""
+Stream Renderer
+
+Renders a streaming AI response into progressively edited channel messages.
+
+The token consumer only calls push(); a background task per outbound
+message performs the edits, so adapter round-trips never pause the stream:
+
+- Latest-value-wins: every edit carries the full accumulated text, and
+  deltas that arrive while an edit is in flight are coalesced into the next
+- Adaptive pacing: the edit interval backs off when the platform reports
+  rate limiting (or edits slow down) and relaxes after successful edits
+- Rollover: when the text outgrows the channel limit, pages produced by
+  ContentSplitter are sealed and streaming continues in a new message;
+  sealed pages are kept, so each render only re-splits the last page
+- finish() stops the task and flushes a final edit without the cursor;
+  a replacement text that needs fewer messages than were already sent
+  blanks the surplus ones (adapters cannot delete them)
+
+Usage:
+    from tools.channels.handlers.stream_renderer import StreamRenderer
+
+    renderer = StreamRenderer("discord", handle=message_obj, edit=edit, send=send)
+    renderer.start()
+    async for delta in stream:
+        renderer.push(delta)
+    stats = await renderer.finish()
+    # {"time_to_first_visible_ms": ..., "edits": ..., "messages": ..., ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from tools.channels.content.splitter import ContentSplitter
+
+
+logger = logging.getLogger(__name__)
+
+TYPING_CURSOR = "\u258c"
+EMPTY_RESPONSE_TEXT = "I completed the task but have no text response."
+SURPLUS_PAGE_TEXT = "(response ended above)"
+
+# Minimum seconds between edits of one message, per platform
+EDIT_INTERVALS = {
+    "discord": 0.5,  # 5 edits / 5s per channel
+    "slack": 1.0,  # chat.update is Tier 3 (~50/min)
+    "telegram": 1.0,  # ~1 edit/s per chat
+}
+DEFAULT_EDIT_INTERVAL = 0.5
+MAX_EDIT_INTERVAL = 10.0
+
+BACKOFF_FACTOR = 2.0  # interval multiplier when rate limited
+RECOVERY_FACTOR = 0.8  # interval multiplier after a successful edit
+FINAL_EDIT_ATTEMPTS = 3
+
+# edit(handle, content) -> {"success": bool, "error"?: str, "retry_after"?: float}
+EditFn = Callable[[Any, str], Awaitable[dict[str, Any]]]
+# send(content) -> handle of the new message, or None on failure
+SendFn = Callable[[str], Awaitable[Any]]
+
+
+class StreamRenderer:
+    """
+    Progressive renderer for one streamed response.
+
+    Args:
+        channel: Channel name (selects edit interval and message limit)
+        handle: Adapter handle of the already-sent placeholder message
+        edit: Coroutine editing a message by handle
+        send: Coroutine sending a follow-up message (enables rollover)
+        min_interval: Override the platform's minimum edit interval
+        limit: Override the channel's message character limit
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        handle: Any,
+        edit: EditFn,
+        send: SendFn | None = None,
+        *,
+        min_interval: float | None = None,
+        max_interval: float = MAX_EDIT_INTERVAL,
+        limit: int | None = None,
+        cursor: str = TYPING_CURSOR,
+    ):
+        self.channel = channel
+        self.cursor = cursor
+        self.min_interval = (
+            min_interval
+            if min_interval is not None
+            else EDIT_INTERVALS.get(channel, DEFAULT_EDIT_INTERVAL)
+        )
+        self.max_interval = max(max_interval, self.min_interval)
+        self.interval = self.min_interval
+        self.limit = limit or ContentSplitter().get_limit(channel)
+        # Reserve room for the cursor so an in-progress page never overflows
+        self._splitter = ContentSplitter(
+            {"channel_limits": {channel: self.limit - len(cursor)}}
+        )
+
+        self._edit_fn = edit
+        self._send_fn = send
+        self._handles: list[Any] = [handle]
+        self._rendered: list[str | None] = [None]
+        self._can_rollover = send is not None
+
+        self.text = ""
+        # Pages that can no longer change, and where splitting resumes after them
+        self._sealed_pages: list[str] = []
+        self._resume_at = 0
+        self._reopen = ""
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._last_edit: float | None = None
+
+        self._started = time.monotonic()
+        self._first_visible: float | None = None
+        self.edits = 0
+        self.failed_edits = 0
+        self.rate_limited = 0
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Producer side
+    # ─────────────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the background edit task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def push(self, delta: str) -> None:
+        """Append streamed text; never blocks on the platform."""
+        if delta:
+            self.text += delta
+            self._changed.set()
+
+    async def finish(self, final_text: str | None = None) -> dict[str, Any]:
+        """
+        Stop streaming and flush the final content without the cursor.
+
+        Args:
+            final_text: Replace the accumulated text (e.g. an error message)
+
+        Returns:
+            stats() for this response
+        """
+        if final_text is not None:
+            self.text = final_text
+            self._unseal()
+        self._finished.set()
+        self._changed.set()
+        if self._task is not None:
+            await self._task
+
+        for _ in range(FINAL_EDIT_ATTEMPTS):
+            if await self._render(final=True):
+                break
+            await asyncio.sleep(min(self.interval, self.max_interval))
+        return self.stats()
+
+    def stats(self) -> dict[str, Any]:
+        """Rendering metrics for this response."""
+        ttfv = None
+        if self._first_visible is not None:
+            ttfv = round((self._first_visible - self._started) * 1000, 1)
+        return {
+            "time_to_first_visible_ms": ttfv,
+            "edits": self.edits,
+            "failed_edits": self.failed_edits,
+            "rate_limited": self.rate_limited,
+            "messages": len(self._handles),
+            "length": len(self.text),
+            "interval_s": round(self.interval, 3),
+        }
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Edit loop
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def _run(self) -> None:
+        while not self._finished.is_set():
+            await self._changed.wait()
+            if self._finished.is_set():
+                return
+
+            # Pace edits; deltas arriving meanwhile coalesce into this edit
+            if self._last_edit is not None:
+                delay = self._last_edit + self.interval - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._finished.wait(), delay)
+                        return
+                    except TimeoutError:
+                        pass
+
+            self._changed.clear()
+            try:
+                await self._render(final=False)
+            except Exception as e:
+                logger.debug(f"Stream edit failed on {self.channel}: {e}")
+
+    def _paginate(self, text: str) -> list[str]:
+        chunks = self._splitter.split_chunks(
+            text, self.channel, start=self._resume_at, reopen=self._reopen
+        )
+        pages = self._sealed_pages + [chunk.text for chunk in chunks]
+        for chunk in chunks[:-1]:
+            self._sealed_pages.append(chunk.text)
+            self._resume_at, self._reopen = chunk.end, chunk.reopen
+        return pages or [text]
+
+    def _unseal(self) -> None:
+        self._sealed_pages = []
+        self._resume_at = 0
+        self._reopen = ""
+
+    async def _render(self, final: bool) -> bool:
+        """Bring every message up to date with the latest text."""
+        text = self.text
+        if not text.strip():
+            if not final:
+                return True
+            text = EMPTY_RESPONSE_TEXT
+            self._unseal()
+        pages = self._paginate(text)
+
+        # Pages before the last one no longer change: seal them, rolling
+        # over into a new message when the text first outgrows one
+        while self._can_rollover and len(self._handles) < len(pages):
+            index = len(self._handles) - 1
+            await self._show(index, pages[index])
+            content = pages[index + 1] + ("" if final else self.cursor)
+            handle = await self._send(content)
+            if handle is None:
+                self._can_rollover = False
+                break
+            self._handles.append(handle)
+            self._rendered.append(content)
+
+        ok = True
+        last = min(len(self._handles), len(pages)) - 1
+        for index in range(last):
+            ok = await self._show(index, pages[index]) and ok
+        content = pages[last] + ("" if final else self.cursor)
+        ok = await self._show(last, content) and ok
+        # finish(final_text) can leave fewer pages than sent messages
+        for index in range(last + 1, len(self._handles)):
+            ok = await self._show(index, SURPLUS_PAGE_TEXT) and ok
+        return ok
+
+    async def _send(self, content: str) -> Any:
+        try:
+            handle = await self._send_fn(content)
+        except Exception as e:
+            logger.debug(f"Stream rollover failed on {self.channel}: {e}")
+            return None
+        if handle is not None and self._first_visible is None:
+            self._first_visible = time.monotonic()
+        return handle
+
+    async def _show(self, index: int, content: str) -> bool:
+        """Edit one message unless it already shows ``content``."""
+        if self._rendered[index] == content:
+            return True
+
+        sent_at = time.monotonic()
+        try:
+            result = await self._edit_fn(self._handles[index], content)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        now = time.monotonic()
+        self._last_edit = now
+
+        if result.get("success"):
+            self.edits += 1
+            self._rendered[index] = content
+            if self._first_visible is None:
+                self._first_visible = now
+            # Relax toward the platform minimum, but never edit faster than
+            # the platform is answering (libraries may absorb 429s by waiting)
+            self.interval = min(
+                self.max_interval,
+                max(self.min_interval, self.interval * RECOVERY_FACTOR, now - sent_at),
+            )
+            return True
+
+        self.failed_edits += 1
+        retry_after = _retry_after(result)
+        if retry_after is not None:
+            self.rate_limited += 1
+            self.interval = min(
+                self.max_interval, max(self.interval * BACKOFF_FACTOR, retry_after)
+            )
+        return False
+
+
+def _retry_after(result: dict[str, Any]) -> float | None:
+    """Extract rate-limit feedback from an adapter result (None if not rate limited)."""
+    if result.get("retry_after") is not None:
+        try:
+            return float(result["retry_after"])
+        except (TypeError, ValueError):
+            return 0.0
+    error = str(result.get("error", "")).lower()
+    if "429" in error or "rate limit" in error or "ratelimit" in error or "retry after" in error:
+        return 0.0
+    return None
+
+
+async def stream_sdk_response(message, renderer: StreamRenderer) -> str:
+    """
+    Feed the session's streamed text blocks for ``message`` into ``renderer``.
+
+    Args:
+        message: Inbound UnifiedMessage
+        renderer: Started StreamRenderer for the outbound message
+
+    Returns:
+        The full accumulated response text
+    """
+    from claude_agent_sdk import AssistantMessage, ResultMessage, TextBlock
+
+    from tools.channels.sdk_handler import create_ask_user_handler
+    from tools.channels.session_manager import get_session_manager
+
+    manager = get_session_manager()
+    ask_handler = create_ask_user_handler(message)
+
+    async for msg in manager.stream_message(
+        channel=message.channel,
+        content=message.content,
+        ask_user_handler=ask_handler,
+    ):
+        if isinstance(msg, AssistantMessage):
+            for block in msg.content:
+                if isinstance(block, TextBlock):
+                    renderer.push(block.text)
+        elif isinstance(msg, ResultMessage):
+            break
+
+    return renderer.text
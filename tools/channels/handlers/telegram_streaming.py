@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Any
 
 from tools.channels.models import UnifiedMessage
+import contextlib
 
 logger = logging.getLogger(__name__)
 
@@ -40,3 +41,102 @@ async def sdk_handler_telegram_fallback(
 
     from tools.channels.sdk_handler import sdk_handler
     return await sdk_handler(message, context)
+
+
+async def sdk_handler_telegram_streaming(
+    message: UnifiedMessage,
+    context: dict,
+) -> dict[str, Any]:
+    try:
+        import claude_agent_sdk  # noqa: F401
+    except ImportError:
+        return {"success": False, "error": "SDK not installed"}
+
+    from tools.channels.handlers.stream_renderer import (
+        TYPING_CURSOR,
+        StreamRenderer,
+        stream_sdk_response,
+    )
+    from tools.channels.router import get_router
+    router = get_router()
+    adapter = router.adapters.get("telegram")
+
+    if not adapter or not hasattr(adapter, "update_message"):
+        return await sdk_handler_telegram_fallback(message, context)
+
+    def outbound(content: str) -> UnifiedMessage:
+        return UnifiedMessage(
+            id=str(uuid.uuid4()),
+            channel="telegram",
+            channel_message_id=None,
+            user_id=message.user_id,
+            channel_user_id=message.channel_user_id,
+            direction="outbound",
+            content=content,
+            content_type="text",
+            attachments=[],
+            reply_to=message.channel_message_id,
+            timestamp=datetime.now(),
+            metadata=message.metadata,
+        )
+
+    send_result = await adapter.send_message(outbound(f"Thinking...{TYPING_CURSOR}"))
+
+    if not send_result.get("success"):
+        from tools.channels.sdk_handler import sdk_handler
+        return await sdk_handler(message, context)
+
+    chat_id = send_result.get("chat_id")
+    message_id = send_result.get("message_id")
+
+    from tools.channels.sdk_handler import _log_to_dashboard
+
+    async def edit(handle, content: str) -> dict[str, Any]:
+        return await adapter.update_message(
+            chat_id=handle[0],
+            message_id=handle[1],
+            content=content,
+        )
+
+    async def send(content: str):
+        result = await adapter.send_message(outbound(content))
+        if not result.get("success"):
+            return None
+        return (result.get("chat_id", chat_id), result.get("message_id"))
+
+    renderer = StreamRenderer("telegram", handle=(chat_id, message_id), edit=edit, send=send)
+    renderer.start()
+
+    try:
+        accumulated_text = await stream_sdk_response(message, renderer)
+        stats = await renderer.finish()
+
+        _log_to_dashboard(
+            event_type="task",
+            summary=f"Telegram streaming response ({len(accumulated_text)} chars)",
+            channel="telegram",
+            user_id=message.user_id,
+            details={
+                "message_id": message.id,
+                "response_length": len(accumulated_text),
+                "streaming": True,
+                "render": stats,
+            },
+            severity="info",
+        )
+
+        return {
+            "success": True,
+            "handler": "sdk_handler_telegram_streaming",
+            "response_length": len(accumulated_text),
+            "streaming": True,
+            "messages": stats["messages"],
+            "edits": stats["edits"],
+        }
+
+    except Exception as e:
+        logger.error(f"Telegram streaming error: {e}")
+        with contextlib.suppress(Exception):
+            await renderer.finish(renderer.text or f"Error: {str(e)[:100]}")
+
+        return {"success": False, "error": str(e)}
@@ -29,6 +29,7 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools import db_connections  # noqa: E402
 from tools.channels.models import (
     Attachment,
     UnifiedMessage,
@@ -41,10 +42,7 @@ DB_PATH = PROJECT_ROOT / "data" / "inbox.db"
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection with row factory."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_connections.get_connection(DB_PATH)
 
 
 def init_database() -> None:
@@ -5,10 +5,15 @@ Re-exports key processors for convenient access:
 - LocationProcessor: Geocoding and place lookup
 - ContactProcessor: vCard parsing and contact extraction
 - StorageCleanup: Temp file and DB entry cleanup
+- MediaWorkerPool: Process pool for CPU-bound image/document work
+- MediaResultCache: Content-addressed cache of processing results
+- DiskLRU: Size/age-bounded file store behind the on-disk caches
+- stream_attachment: Chunked attachment download with mid-stream size cap
 """
 
 from __future__ import annotations
 
+
 try:
     from tools.channels.media.location_processor import (
         LocationProcessor,
@@ -38,6 +43,16 @@ except ImportError:
     get_storage_cleanup = None  # type: ignore[assignment]
     run_cleanup = None  # type: ignore[assignment]
 
+from tools.channels.media.attachment_stream import (
+    AttachmentTooLargeError,
+    SpooledAttachment,
+    stream_attachment,
+)
+from tools.channels.media.disk_lru import DiskLRU
+from tools.channels.media.result_cache import MediaResultCache
+from tools.channels.media.worker_pool import MediaWorkerPool
+
+
 __all__ = [
     "LocationProcessor",
     "get_location_processor",
@@ -46,4 +61,10 @@ __all__ = [
     "StorageCleanup",
     "get_storage_cleanup",
     "run_cleanup",
+    "MediaWorkerPool",
+    "MediaResultCache",
+    "DiskLRU",
+    "AttachmentTooLargeError",
+    "SpooledAttachment",
+    "stream_attachment",
 ]
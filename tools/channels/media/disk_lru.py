@@ -0,0 +1,162 @@
+"""
+Disk LRU Store
+
+File storage shared by the on-disk caches (media results, TTS audio): atomic
+writes, size accounting, and eviction of the least recently used files.
+
+Features:
+- Files live one level below the cache directory (``<dir>/<xx>/<name>``)
+- Writes go through a temp file and os.replace, so readers never see a
+  partial file
+- Recency is the file mtime: callers touch() every file a hit reads
+- Size-based eviction down to a low-water mark, plus an optional age limit
+- Companion files (e.g. a thumbnail next to its result) are removed with
+  the file they belong to
+
+Usage:
+    from tools.channels.media.disk_lru import DiskLRU
+
+    store = DiskLRU(directory, max_bytes=100 * 1024 * 1024, label="TTS cache")
+    store.write(directory / key[:2] / f"{key}.opus", audio)  # May evict
+    store.touch(path)                                        # On a hit
+
+Dependencies:
+    - os, time (stdlib)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of max size so writes do not evict one by one
+EVICTION_LOW_WATER = 0.9
+
+
+class DiskLRU:
+    """
+    Directory of cache files bounded by total size (and optionally age).
+
+    Args:
+        directory: Cache directory
+        max_bytes: Total size before least recently used files are evicted
+        max_age_days: Files unused for this long are dropped on eviction (0 = no limit)
+        companions: Maps an evicted file to files that go with it
+        label: Name used in log messages
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int,
+        max_age_days: float = 0,
+        companions: Callable[[Path], Iterable[Path]] | None = None,
+        label: str = "Cache",
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.companions = companions
+        self.label = label
+        # Bytes on disk as seen by this process (None until first scan)
+        self.size_bytes: int | None = None
+        self.evicted = 0
+
+    def write(self, path: Path, data: bytes) -> int:
+        """
+        Atomically write ``data`` to ``path``, evicting if over size.
+
+        Returns:
+            Bytes written
+
+        Raises:
+            OSError: The write failed
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)  # Readers never see a partial file
+
+        if self.size_bytes is None:
+            self.size_bytes = self.scan()[1]
+        else:
+            self.size_bytes += len(data)
+        if self.size_bytes > self.max_bytes:
+            self.evict()
+        return len(data)
+
+    @staticmethod
+    def touch(path: Path) -> None:
+        """Refresh a file's mtime so eviction sees it as recently used."""
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+    def scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        """(mtime, size, path) for every cache file, and their total size."""
+        files = []
+        total = 0
+        if not self.directory.exists():
+            return files, total
+        for path in self.directory.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return files, total
+
+    def evict(self) -> dict[str, Any]:
+        """
+        Drop expired files, then least recently used ones until under the low-water mark.
+
+        Returns:
+            Dict with keys: success, files_removed, bytes_freed, size_bytes
+        """
+        files, total = self.scan()
+        files.sort()  # Oldest mtime first
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        target = int(self.max_bytes * EVICTION_LOW_WATER)
+        removed = 0
+        freed = 0
+
+        for mtime, size, path in files:
+            expired = cutoff is not None and mtime < cutoff
+            if not expired and total - freed <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += size
+            for companion in self.companions(path) if self.companions else ():
+                try:
+                    companion_size = companion.stat().st_size
+                    companion.unlink()
+                except OSError:
+                    continue
+                removed += 1
+                freed += companion_size
+
+        self.size_bytes = max(0, total - freed)
+        self.evicted += removed
+        if removed:
+            logger.info(f"{self.label} evicted {removed} files ({freed / 1024:.1f} KB)")
+        return {
+            "success": True,
+            "files_removed": removed,
+            "bytes_freed": freed,
+            "size_bytes": self.size_bytes,
+        }
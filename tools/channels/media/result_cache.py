@@ -0,0 +1,303 @@
+"""
+Content-Addressed Media Result Cache
+
+Users forward the same screenshots, PDFs and voice notes again and again.
+MediaProcessor looks results up here by the SHA-256 of the downloaded bytes
+before paying for vision, transcription or parsing a second time.
+
+Features:
+- Keys: SHA-256 of the content + analysis variant + config version, so a
+  changed vision/transcription config never serves stale results
+- Stores MediaContent results (descriptions, extracted text, transcriptions)
+  as JSON and image thumbnails as JPEG, under data/media_cache/
+- Aliases (channel, attachment id) -> content key, so re-sending the same
+  platform file skips the download as well
+- Size-based LRU eviction (hits refresh the mtime of every file a lookup
+  reads: result, thumbnail and alias) plus an age limit; run on
+  write when over the limit and by StorageCleanup
+- Hit rate and dollars saved reported to tools/ops/cost_tracker
+
+Usage:
+    from tools.channels.media.result_cache import MediaResultCache
+
+    cache = MediaResultCache.from_config(config["processing"].get("cache"))
+    key = await cache.content_key(data, "image", version)
+    media = cache.get(key, attachment)
+    if media is None:
+        media = await analyze(...)
+        cache.put(key, media, thumbnail=thumb)
+
+Config (args/multimodal.yaml, processing.cache):
+    enabled: true
+    max_size_mb: 500
+    max_age_days: 30
+
+Dependencies:
+    - hashlib, json (stdlib)
+    - tools/channels/media/disk_lru.py (storage and eviction)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from tools.channels.media.disk_lru import DiskLRU
+from tools.channels.models import Attachment, MediaContent
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "media_cache"
+
+DEFAULT_MAX_SIZE_MB = 500
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Bump when the stored payload or the analysis code (prompts, models) changes
+CACHE_SCHEMA_VERSION = 1
+
+# Hash larger payloads off the event loop (hashlib releases the GIL)
+HASH_OFFLOAD_BYTES = 1024 * 1024
+
+# MediaContent fields stored per entry (the attachment is per message)
+RESULT_FIELDS = (
+    "vision_description",
+    "ocr_text",
+    "extracted_text",
+    "page_count",
+    "transcription",
+    "duration_seconds",
+    "audio_language",
+    "metadata",
+)
+
+
+def config_version(*sections: dict[str, Any] | None) -> str:
+    """Short, stable hash of the config sections an analysis depends on."""
+    blob = json.dumps([CACHE_SCHEMA_VERSION, *sections], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:12]
+
+
+def _thumbnail_of(path: Path) -> list[Path]:
+    """Thumbnails go with their entry."""
+    return [path.with_suffix(".jpg")] if path.suffix == ".json" else []
+
+
+class MediaResultCache:
+    """
+    On-disk media result cache with LRU eviction.
+
+    Args:
+        directory: Cache directory (default: data/media_cache)
+        max_size_mb: Total size before least recently used entries are evicted
+        max_age_days: Entries unused for this long are dropped (0 = no limit)
+        enabled: When False every lookup misses and nothing is stored
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_days = max_age_days
+        self.enabled = enabled
+        self._store = DiskLRU(
+            self.directory,
+            self.max_bytes,
+            max_age_days=max_age_days,
+            companions=_thumbnail_of,
+            label="Media cache",
+        )
+        self.stats = {"hits": 0, "misses": 0, "saved_usd": 0.0}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> MediaResultCache:
+        """Build a cache from the processing.cache config section."""
+        config = config or {}
+        return cls(
+            directory=config.get("directory"),
+            max_size_mb=config.get("max_size_mb", DEFAULT_MAX_SIZE_MB),
+            max_age_days=config.get("max_age_days", DEFAULT_MAX_AGE_DAYS),
+            enabled=config.get("enabled", True),
+        )
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _key(content_hash: str, variant: str, version: str) -> str:
+        return hashlib.sha256(f"{content_hash}:{variant}:{version}".encode()).hexdigest()
+
+    async def content_key(self, data: bytes, variant: str, version: str) -> str:
+        """
+        Cache key for downloaded bytes.
+
+        Args:
+            data: Attachment content
+            variant: Analysis kind, e.g. "image" or "document:pdf"
+            version: config_version() of the sections the analysis depends on
+        """
+        if len(data) >= HASH_OFFLOAD_BYTES:
+            digest = await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+        else:
+            digest = hashlib.sha256(data).hexdigest()
+        return self.digest_key(digest, variant, version)
+
+    def digest_key(self, digest: str, variant: str, version: str) -> str:
+        """Cache key for content whose SHA-256 is already known (streamed downloads)."""
+        return self._key(digest, variant, version)
+
+    def alias_key(
+        self, channel: str, attachment: Attachment, variant: str, version: str
+    ) -> str | None:
+        """
+        Key for a platform file id (same file re-sent on the same channel).
+
+        None when the platform gave no id: every such file would share one alias.
+        """
+        if not attachment.id:
+            return None
+        return self._key(f"{channel}:{attachment.id}:{attachment.size_bytes}", variant, version)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    # -------------------------------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str, attachment: Attachment) -> MediaContent | None:
+        """
+        Return the cached result for ``key`` re-attached to ``attachment``.
+
+        The returned MediaContent costs nothing; the original cost is in
+        metadata["cache_saved_usd"].
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key, ".json")
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        # LRU: a hit makes the entry recent
+        self._store.touch(path)
+        self._store.touch(self._path(key, ".jpg"))
+
+        saved = payload.get("cost_usd", 0.0)
+        result = {name: payload.get(name) for name in RESULT_FIELDS}
+        result["metadata"] = {
+            **(result["metadata"] or {}),
+            "cache_key": key,
+            "cache_hit": True,
+            "cache_saved_usd": saved,
+        }
+        return MediaContent(attachment=attachment, processed=True, **result)
+
+    def get_alias(self, alias: str | None, attachment: Attachment) -> MediaContent | None:
+        """Resolve an alias written by put_alias() and return its entry."""
+        if not self.enabled or alias is None:
+            return None
+        path = self._path(alias, ".ref")
+        try:
+            key = path.read_text().strip()
+        except OSError:
+            return None
+        self._store.touch(path)
+        return self.get(key, attachment)
+
+    def put(self, key: str, media: MediaContent, thumbnail: bytes | None = None) -> None:
+        """Store a successful result (and optional JPEG thumbnail) under ``key``."""
+        if not self.enabled or not media.processed:
+            return
+        payload = {name: getattr(media, name) for name in RESULT_FIELDS}
+        payload["cost_usd"] = media.processing_cost_usd
+        payload["stored_at"] = time.time()
+        try:
+            self._store.write(self._path(key, ".json"), json.dumps(payload, default=str).encode())
+            if thumbnail:
+                self._store.write(self._path(key, ".jpg"), thumbnail)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Media cache write failed: {e}")
+            return
+        media.metadata["cache_key"] = key
+
+    def put_alias(self, alias: str | None, key: str) -> None:
+        """Point ``alias`` at an existing entry (no-op without an alias)."""
+        if not self.enabled or alias is None:
+            return
+        try:
+            self._store.write(self._path(alias, ".ref"), key.encode())
+        except OSError as e:
+            logger.debug(f"Media cache alias write failed: {e}")
+
+    def get_thumbnail(self, key: str) -> bytes | None:
+        """JPEG thumbnail stored with an entry, if any."""
+        path = self._path(key, ".jpg")
+        try:
+            thumbnail = path.read_bytes()
+        except OSError:
+            return None
+        self._store.touch(path)
+        return thumbnail
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    async def record_lookup(
+        self, hit: bool, saved_usd: float = 0.0, channel: str | None = None
+    ) -> None:
+        """Count a lookup here and in the cost tracker (written off the event loop)."""
+        if not self.enabled:
+            return
+        if hit:
+            self.stats["hits"] += 1
+            self.stats["saved_usd"] += saved_usd
+        else:
+            self.stats["misses"] += 1
+        try:
+            from tools.ops.cost_tracker import record_cache_lookup
+
+            await asyncio.to_thread(
+                record_cache_lookup, "media", hit, saved_usd=saved_usd, channel=channel
+            )
+        except Exception as e:
+            logger.debug(f"Cache lookup not recorded: {e}")
+
+    # -------------------------------------------------------------------------
+    # Eviction
+    # -------------------------------------------------------------------------
+
+    def evict(self) -> dict[str, Any]:
+        """
+        Drop expired entries, then least recently used ones until under size.
+
+        Returns:
+            Dict with keys: success, files_removed, bytes_freed, size_bytes
+        """
+        return self._store.evict()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Entry count and disk usage plus this process's hit statistics."""
+        files, total = self._store.scan()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": sum(1 for _, _, path in files if path.suffix == ".json"),
+            "total_bytes": total,
+            "total_mb": round(total / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "saved_usd": round(self.stats["saved_usd"], 6),
+        }
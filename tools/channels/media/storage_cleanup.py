@@ -4,6 +4,7 @@ Storage Cleanup for Multi-Modal Messaging (Phase 15d)
 Handles scheduled cleanup of temporary media files and stale database entries:
 - Removes expired temp files from dexai_media_* directories
 - Cleans up stale interactive_state entries from media.db
+- Evicts expired and least recently used media result cache entries
 - Reports storage usage statistics
 
 Usage:
@@ -29,9 +30,13 @@ from typing import Any
 
 import yaml
 
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools.channels.media.result_cache import MediaResultCache  # noqa: E402
+
+
 logger = logging.getLogger(__name__)
 
 # Config path
@@ -78,6 +83,9 @@ class StorageCleanup:
         )
         self.cleanup_enabled: bool = storage_config.get("cleanup_enabled", True)
         self._temp_base_dir = Path(tempfile.gettempdir())
+        self.result_cache = MediaResultCache.from_config(
+            self.config.get("processing", {}).get("cache")
+        )
 
     async def cleanup(self) -> dict[str, Any]:
         """
@@ -200,6 +208,27 @@ class StorageCleanup:
 
         return files_removed, bytes_freed
 
+    async def cleanup_result_cache(self) -> dict[str, Any]:
+        """
+        Enforce the media result cache's age and size limits.
+
+        Returns:
+            Dict with keys: success, files_removed, bytes_freed, size_bytes.
+        """
+        if not self.result_cache.enabled:
+            return {"success": True, "files_removed": 0, "bytes_freed": 0, "size_bytes": 0}
+
+        try:
+            return self.result_cache.evict()
+        except Exception as e:
+            logger.error(f"Result cache cleanup failed: {e}")
+            return {
+                "success": False,
+                "files_removed": 0,
+                "bytes_freed": 0,
+                "error": str(e)[:200],
+            }
+
     async def cleanup_db_entries(
         self, db_path: str | None = None
     ) -> dict[str, Any]:
@@ -284,7 +313,7 @@ class StorageCleanup:
 
         Returns:
             Dict with keys: total_files, total_bytes, total_mb,
-            directories, oldest_file_age_hours.
+            directories, oldest_file_age_hours, result_cache.
         """
         total_files = 0
         total_bytes = 0
@@ -333,6 +362,7 @@ class StorageCleanup:
             "total_mb": round(total_bytes / (1024 * 1024), 2),
             "directories": directories,
             "oldest_file_age_hours": round(oldest_age_hours, 2),
+            "result_cache": self.result_cache.get_stats(),
         }
 
 
@@ -363,25 +393,29 @@ async def run_cleanup(config: dict[str, Any] | None = None) -> dict[str, Any]:
     """
     Convenience function to run a full cleanup cycle.
 
-    Performs both file cleanup and database entry cleanup, then returns
-    combined results.
+    Performs temp file cleanup, result cache eviction and database entry
+    cleanup, then returns combined results.
 
     Args:
         config: Optional config override.
 
     Returns:
         Dict with keys: success, files_removed, bytes_freed,
-        db_entries_removed.
+        cache_files_removed, cache_bytes_freed, db_entries_removed.
     """
     cleanup = get_storage_cleanup(config=config)
 
     file_result = await cleanup.cleanup()
+    cache_result = await cleanup.cleanup_result_cache()
     db_result = await cleanup.cleanup_db_entries()
 
     return {
         "success": file_result.get("success", False)
+        and cache_result.get("success", False)
         and db_result.get("success", False),
         "files_removed": file_result.get("files_removed", 0),
         "bytes_freed": file_result.get("bytes_freed", 0),
+        "cache_files_removed": cache_result.get("files_removed", 0),
+        "cache_bytes_freed": cache_result.get("bytes_freed", 0),
         "db_entries_removed": db_result.get("entries_removed", 0),
     }
@@ -0,0 +1,380 @@
+"""
+Media Worker Pool
+
+Runs CPU-bound media work (Pillow, PyPDF2, python-docx) in warm worker
+processes so a large PDF or image never stalls the event loop and every
+channel adapter with it.
+
+Features:
+- ProcessPoolExecutor with workers started (and libraries imported) up front
+- Per-task timeouts; a worker stuck past its timeout is killed and replaced
+- Per-worker memory limit (RLIMIT_AS) so a decompression bomb fails alone
+- In-process mode (workers: 0) runs tasks in a thread instead
+
+Usage:
+    from tools.channels.media.worker_pool import MediaWorkerPool
+
+    pool = MediaWorkerPool.from_config(config["processing"].get("worker_pool"))
+    jpeg = await pool.prepare_image(image_bytes)
+    text, pages = await pool.extract_pdf(pdf_bytes, max_pages=20)
+    pool.shutdown()
+
+Config (args/multimodal.yaml, processing.worker_pool):
+    workers: 2                  # 0 = run in-process (threads)
+    task_timeout_seconds: 60
+    memory_limit_mb: 1024
+
+Dependencies:
+    - pillow (images), pypdf2 (PDF), python-docx (DOCX) - imported in workers
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+DEFAULT_TASK_TIMEOUT_SECONDS = 60.0
+DEFAULT_MEMORY_LIMIT_MB = 1024
+
+# Claude Vision recommendations
+VISION_MAX_DIMENSION = 1568
+VISION_MAX_BYTES = 5 * 1024 * 1024
+
+THUMBNAIL_MAX_DIMENSION = 320
+
+# Imported once per worker so the first task does not pay for it
+PRELOAD_MODULES = ("PIL.Image", "PyPDF2", "docx")
+
+
+# =============================================================================
+# Worker Functions (run inside worker processes; must stay picklable)
+# =============================================================================
+
+
+def _init_worker(memory_limit_bytes: int | None) -> None:
+    """Apply the memory limit and preload media libraries."""
+    if memory_limit_bytes:
+        try:
+            import resource
+
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = memory_limit_bytes
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        except (ImportError, ValueError, OSError):
+            pass  # Not supported on this platform
+
+    for module in PRELOAD_MODULES:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(module)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def prepare_image(
+    image_bytes: bytes,
+    max_dimension: int = VISION_MAX_DIMENSION,
+    max_bytes: int = VISION_MAX_BYTES,
+) -> bytes:
+    """
+    Normalize an image for the Vision API: downscale and re-encode as JPEG.
+
+    Args:
+        image_bytes: Raw image data
+        max_dimension: Longest side after resizing
+        max_bytes: Re-encode at lower quality above this size
+
+    Returns:
+        JPEG bytes
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow not installed. Run: uv pip install pillow")
+
+    img = Image.open(io.BytesIO(image_bytes))
+
+    if max(img.size) > max_dimension:
+        ratio = max_dimension / max(img.size)
+        new_size = tuple(int(dim * ratio) for dim in img.size)
+        img = img.resize(new_size, Image.LANCZOS)
+
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=85)
+    data = output.getvalue()
+
+    if len(data) > max_bytes:
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=60)
+        data = output.getvalue()
+
+    return data
+
+
+def make_thumbnail(image_bytes: bytes, max_dimension: int = THUMBNAIL_MAX_DIMENSION) -> bytes:
+    """
+    Create a JPEG thumbnail no larger than max_dimension on either side.
+
+    Args:
+        image_bytes: Raw image data
+        max_dimension: Longest side of the thumbnail
+
+    Returns:
+        JPEG bytes
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow not installed. Run: uv pip install pillow")
+
+    img = Image.open(io.BytesIO(image_bytes))
+    img.thumbnail((max_dimension, max_dimension))
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=80)
+    return output.getvalue()
+
+
+def extract_pdf_text(pdf_bytes: bytes, max_pages: int) -> tuple[str, int]:
+    """
+    Extract text from a PDF using PyPDF2.
+
+    Args:
+        pdf_bytes: PDF file content
+        max_pages: Maximum pages to extract
+
+    Returns:
+        Tuple of (text, page_count)
+    """
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        raise ImportError("PyPDF2 not installed. Run: uv pip install pypdf2")
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+
+    page_count = len(reader.pages)
+    pages_to_read = min(page_count, max_pages)
+
+    text_parts = []
+    for i in range(pages_to_read):
+        page_text = reader.pages[i].extract_text()
+        if page_text:
+            text_parts.append(f"--- Page {i + 1} ---\n{page_text}")
+
+    text = "\n\n".join(text_parts)
+
+    if pages_to_read < page_count:
+        text += f"\n\n[Showing {pages_to_read} of {page_count} pages]"
+
+    return text, page_count
+
+
+def extract_docx_text(docx_bytes: bytes) -> tuple[str, int]:
+    """
+    Extract text from a Word document using python-docx.
+
+    Args:
+        docx_bytes: DOCX file content
+
+    Returns:
+        Tuple of (text, page_count estimate)
+    """
+    try:
+        from docx import Document
+    except ImportError:
+        raise ImportError("python-docx not installed. Run: uv pip install python-docx")
+
+    doc = Document(io.BytesIO(docx_bytes))
+
+    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+    text = "\n\n".join(paragraphs)
+
+    # Estimate page count (rough: ~3000 chars per page)
+    page_count = max(1, len(text) // 3000)
+
+    return text, page_count
+
+
+# =============================================================================
+# Pool
+# =============================================================================
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    # forkserver avoids forking a process that is running threads
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class MediaWorkerPool:
+    """
+    Awaitable front end for a pool of media worker processes.
+
+    Args:
+        workers: Worker processes (0 runs tasks in-process on threads)
+        task_timeout: Default per-task timeout in seconds
+        memory_limit_mb: Address-space limit per worker (None/0 = unlimited)
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        task_timeout: float = DEFAULT_TASK_TIMEOUT_SECONDS,
+        memory_limit_mb: int | None = DEFAULT_MEMORY_LIMIT_MB,
+    ):
+        self.workers = max(0, int(workers))
+        self.task_timeout = task_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.stats = {"tasks": 0, "timeouts": 0, "restarts": 0}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> MediaWorkerPool:
+        """Build a pool from the processing.worker_pool config section."""
+        config = config or {}
+        return cls(
+            workers=config.get("workers", DEFAULT_WORKERS),
+            task_timeout=config.get("task_timeout_seconds", DEFAULT_TASK_TIMEOUT_SECONDS),
+            memory_limit_mb=config.get("memory_limit_mb", DEFAULT_MEMORY_LIMIT_MB),
+        )
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the workers now instead of on first use."""
+        if self.workers:
+            self._ensure_executor()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                limit = (self.memory_limit_mb or 0) * 1024 * 1024 or None
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                    initargs=(limit,),
+                )
+                # Warm: spawn every worker and run its initializer now
+                for _ in range(self.workers):
+                    self._executor.submit(_ping)
+            return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Kill ``executor``'s workers and drop it (no-op if already replaced)."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.stats["restarts"] += 1
+
+        # ProcessPoolExecutor cannot cancel a running task; kill the workers
+        for process in list(getattr(executor, "_processes", {}).values()):
+            with contextlib.suppress(Exception):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop all workers."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------------------------------------------------------------------------
+    # Task API
+    # -------------------------------------------------------------------------
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float | None = None) -> Any:
+        """
+        Run ``fn(*args)`` in a worker and await its result.
+
+        Args:
+            fn: Module-level (picklable) function
+            *args: Picklable arguments
+            timeout: Seconds before the task is abandoned (default: task_timeout)
+
+        Returns:
+            fn's return value
+
+        Raises:
+            TimeoutError: Task exceeded its timeout (its worker is replaced)
+            MemoryError: Task exceeded the worker memory limit
+            RuntimeError: Worker process died
+        """
+        timeout = timeout if timeout is not None else self.task_timeout
+        self.stats["tasks"] += 1
+
+        if not self.workers:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+
+        for attempt in range(2):
+            executor = self._ensure_executor()
+            try:
+                future = asyncio.wrap_future(executor.submit(fn, *args))
+                return await asyncio.wait_for(future, timeout)
+            except TimeoutError:
+                self.stats["timeouts"] += 1
+                self._restart(executor)
+                raise TimeoutError(
+                    f"Media task {getattr(fn, '__name__', fn)} exceeded {timeout}s"
+                ) from None
+            except BrokenProcessPool as e:
+                # Broken by another task's timeout restart: retry once on the
+                # fresh pool. Otherwise this task took its worker down.
+                replaced = self._executor is not executor
+                self._restart(executor)
+                if replaced and attempt == 0:
+                    continue
+                raise RuntimeError(f"Media worker exited unexpectedly: {e}") from e
+
+    async def prepare_image(
+        self,
+        image_bytes: bytes,
+        max_dimension: int = VISION_MAX_DIMENSION,
+        max_bytes: int = VISION_MAX_BYTES,
+    ) -> bytes:
+        """Normalize an image for the Vision API (JPEG bytes)."""
+        return await self.run(prepare_image, image_bytes, max_dimension, max_bytes)
+
+    async def thumbnail(
+        self, image_bytes: bytes, max_dimension: int = THUMBNAIL_MAX_DIMENSION
+    ) -> bytes:
+        """Create a JPEG thumbnail."""
+        return await self.run(make_thumbnail, image_bytes, max_dimension)
+
+    async def extract_pdf(self, pdf_bytes: bytes, max_pages: int) -> tuple[str, int]:
+        """Extract PDF text; returns (text, page_count)."""
+        return await self.run(extract_pdf_text, pdf_bytes, max_pages)
+
+    async def extract_docx(self, docx_bytes: bytes) -> tuple[str, int]:
+        """Extract DOCX text; returns (text, page_count estimate)."""
+        return await self.run(extract_docx_text, docx_bytes)
+
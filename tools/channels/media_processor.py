@@ -6,7 +6,10 @@ Handles processing of images, documents, audio, video, and other attachments:
 - Document text extraction (PDF, DOCX)
 - Audio/voice transcription via Whisper API (Phase 15b)
 - Video frame extraction and audio track transcription (Phase 15b)
-- Cost tracking
+- Cost tracking with up-front budget reservation
+- Concurrent streaming downloads (size cap enforced mid-stream, large
+  files spooled to disk) with bounded analysis parallelism
+- Content-addressed result cache (repeat forwards cost nothing)
 
 Usage:
     from tools.channels.media_processor import MediaProcessor
@@ -17,9 +20,10 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import base64
-import io
 import logging
+import re
 
 # Ensure project root is in path
 import sys
@@ -33,10 +37,21 @@ import yaml
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from tools.channels.content.tokens import CODE, Block, MarkdownTokenizer  # noqa: E402
+from tools.channels.media.attachment_stream import (  # noqa: E402
+    DEFAULT_SPOOL_BYTES,
+    AttachmentTooLargeError,
+    SpooledAttachment,
+    stream_attachment,
+)
+from tools.channels.media.result_cache import MediaResultCache, config_version  # noqa: E402
+from tools.channels.media.worker_pool import MediaWorkerPool  # noqa: E402
 from tools.channels.models import Attachment, MediaContent
 
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from tools.channels.router import ChannelAdapter
 
 logger = logging.getLogger(__name__)
@@ -44,6 +59,22 @@ logger = logging.getLogger(__name__)
 # Config path
 CONFIG_PATH = PROJECT_ROOT / "args" / "multimodal.yaml"
 
+# Concurrent analyses (vision, transcription, extraction) per processor
+DEFAULT_MAX_PARALLEL_ANALYSES = 4
+
+# Cost estimation for budget reservations (worst case, reconciled after)
+VISION_MAX_INPUT_TOKENS = 3300  # 1568px image (~3.3k tokens) + prompt
+VISION_MAX_OUTPUT_TOKENS = 300
+AUDIO_BYTES_PER_SECOND = 4000  # 32 kbps voice notes; overestimates duration
+
+# Config sections each analysis depends on (part of its cache key)
+CACHE_CONFIG_SECTIONS = {
+    "image": ("vision",),
+    "document": ("documents",),
+    "audio": ("transcription",),
+    "video": ("video", "vision", "transcription"),
+}
+
 
 def load_config() -> dict[str, Any]:
     """Load multimodal configuration."""
@@ -53,6 +84,40 @@ def load_config() -> dict[str, Any]:
     return {}
 
 
+def _download_error(error: Exception) -> str:
+    """
+    Describe a failed download by exception type and HTTP status only.
+
+    HTTP client errors include the request URL, and Telegram download URLs
+    embed the bot token, so the message itself is never stored.
+    """
+    status = getattr(error, "status", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    return f"{type(error).__name__} (HTTP {status})" if status else type(error).__name__
+
+
+class _CostBudget:
+    """Per-batch cost budget with up-front reservations."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.spent = 0.0
+        self.reserved = 0.0
+
+    def reserve(self, estimate: float) -> bool:
+        """Reserve an estimate; refused once spent + reserved reaches the limit."""
+        if self.spent + self.reserved >= self.limit:
+            return False
+        self.reserved += estimate
+        return True
+
+    def settle(self, estimate: float, actual: float) -> None:
+        """Replace a reservation with the actual cost."""
+        self.reserved = max(0.0, self.reserved - estimate)
+        self.spent += actual
+
+
 class MediaProcessor:
     """
     Process media attachments for AI context.
@@ -74,6 +139,15 @@ class MediaProcessor:
         """
         self.config = config or load_config()
         self._temp_dir = Path(tempfile.mkdtemp(prefix="dexai_media_"))
+        self._max_parallel = self.config.get("processing", {}).get(
+            "max_parallel_analyses", DEFAULT_MAX_PARALLEL_ANALYSES
+        )
+        self._slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+        # CPU-bound decoding/parsing runs in worker processes, off the event loop
+        self.workers = MediaWorkerPool.from_config(
+            self.config.get("processing", {}).get("worker_pool")
+        )
+        self.cache = MediaResultCache.from_config(self.config.get("processing", {}).get("cache"))
 
     async def process_attachment(
         self,
@@ -97,8 +171,8 @@ class MediaProcessor:
         if not processing_config.get("enabled", True):
             return MediaContent(attachment=attachment, processed=False)
 
-        # Check file size limit
-        max_size_mb = processing_config.get("max_file_size_mb", 50)
+        # Check declared size (the download enforces the actual size)
+        max_size_mb = self._max_file_size_mb(attachment)
         if attachment.size_bytes > max_size_mb * 1024 * 1024:
             return MediaContent(
                 attachment=attachment,
@@ -168,27 +242,229 @@ class MediaProcessor:
             key=lambda a: 0 if a.type == "image" else 1,
         )
 
-        # Process sequentially (not parallel - ADHD cognitive load)
-        results = []
-        total_cost = 0.0
+        # Process concurrently: downloads overlap, analyses share the
+        # processor's slots. Costs are reserved from estimates before
+        # starting; anything that did not fit is retried in a later wave
+        # once actual costs are known. Results keep the prioritized order.
         max_cost = self.config.get("processing", {}).get("max_processing_cost_usd", 0.20)
+        budget = _CostBudget(max_cost)
+        results: list[MediaContent | None] = [None] * len(sorted_attachments)
+        pending = list(enumerate(sorted_attachments))
+
+        while pending:
+            wave, deferred = [], []
+            for index, attachment in pending:
+                estimate = self.estimate_cost(attachment)
+                if budget.reserve(estimate):
+                    wave.append((index, attachment, estimate))
+                else:
+                    deferred.append((index, attachment))
+            if not wave:
+                break
+
+            processed = await asyncio.gather(*(
+                self.process_attachment(attachment, channel, adapter)
+                for _, attachment, _ in wave
+            ))
+            for (index, _, estimate), media in zip(wave, processed, strict=True):
+                budget.settle(estimate, media.processing_cost_usd)
+                results[index] = media
+            pending = deferred
+
+        if pending:
+            logger.warning(f"Processing budget exceeded: ${budget.spent:.3f}")
+        for index, attachment in pending:
+            results[index] = MediaContent(
+                attachment=attachment,
+                processed=False,
+                processing_error="Processing budget exceeded",
+            )
 
-        for attachment in sorted_attachments:
-            # Check budget
-            if total_cost >= max_cost:
-                logger.warning(f"Processing budget exceeded: ${total_cost:.3f}")
-                results.append(MediaContent(
-                    attachment=attachment,
-                    processed=False,
-                    processing_error="Processing budget exceeded",
-                ))
-                continue
+        return results
 
-            media = await self.process_attachment(attachment, channel, adapter)
-            total_cost += media.processing_cost_usd
-            results.append(media)
+    def estimate_cost(self, attachment: Attachment) -> float:
+        """
+        Worst-case processing cost for an attachment, before download.
 
-        return results
+        Args:
+            attachment: Attachment to estimate
+
+        Returns:
+            Estimated cost in USD (0.0 for local-only processing)
+        """
+        processing = self.config.get("processing", {})
+
+        if attachment.type == "image":
+            return self._estimate_vision_cost()
+
+        if attachment.type == "audio":
+            transcription = processing.get("transcription", {})
+            seconds = min(
+                attachment.size_bytes / AUDIO_BYTES_PER_SECOND,
+                transcription.get("max_duration_seconds", 300),
+            )
+            return self._estimate_transcription_cost(seconds)
+
+        if attachment.type == "video":
+            video = processing.get("video", {})
+            cost = 0.0
+            if video.get("transcribe_audio", True):
+                cost += self._estimate_transcription_cost(video.get("max_duration_seconds", 300))
+            if video.get("analyze_frames", True):
+                cost += video.get("max_frames", 3) * self._estimate_vision_cost()
+            return cost
+
+        return 0.0
+
+    def _estimate_vision_cost(self) -> float:
+        vision = self.config.get("processing", {}).get("vision", {})
+        pricing = vision.get("pricing", {})
+        cost = (
+            VISION_MAX_INPUT_TOKENS * pricing.get("input_per_mtok", 3.0)
+            + VISION_MAX_OUTPUT_TOKENS * pricing.get("output_per_mtok", 15.0)
+        ) / 1_000_000
+        return min(cost, vision.get("max_cost_per_image", cost))
+
+    def _estimate_transcription_cost(self, seconds: float) -> float:
+        transcription = self.config.get("processing", {}).get("transcription", {})
+        per_minute = transcription.get("pricing", {}).get("per_minute_usd", 0.006)
+        return seconds / 60.0 * per_minute
+
+    def _analysis_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent analyses (one per event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self._max_parallel))
+        return self._slots[1]
+
+    def _max_file_size_mb(self, attachment: Attachment) -> float:
+        """Size cap for an attachment (video has its own, larger limit)."""
+        processing = self.config.get("processing", {})
+        max_size_mb = processing.get("max_file_size_mb", 50)
+        if attachment.type == "video":
+            max_size_mb = processing.get("video", {}).get("max_file_size_mb", max_size_mb)
+        return max_size_mb
+
+    async def _download(
+        self, attachment: Attachment, adapter: ChannelAdapter
+    ) -> tuple[SpooledAttachment | None, MediaContent | None]:
+        """
+        Stream attachment content into a spool, enforcing the size cap.
+
+        Returns:
+            Tuple of (spool, None) on success or (None, error MediaContent).
+            The caller closes the spool.
+        """
+        max_size_mb = self._max_file_size_mb(attachment)
+        spool_mb = self.config.get("processing", {}).get(
+            "spool_threshold_mb", DEFAULT_SPOOL_BYTES / (1024 * 1024)
+        )
+        try:
+            spool = await stream_attachment(
+                adapter,
+                attachment,
+                max_bytes=int(max_size_mb * 1024 * 1024),
+                spool_bytes=int(spool_mb * 1024 * 1024),
+                directory=self._temp_dir,
+            )
+        except AttachmentTooLargeError:
+            return None, MediaContent(
+                attachment=attachment,
+                processed=False,
+                processing_error=f"File too large (>{max_size_mb}MB)",
+            )
+        except Exception as e:
+            return None, MediaContent(
+                attachment=attachment,
+                processed=False,
+                processing_error=f"Download failed: {_download_error(e)}",
+            )
+        if not spool.size:
+            spool.close()
+            return None, MediaContent(
+                attachment=attachment,
+                processed=False,
+                processing_error="Downloaded file is empty",
+            )
+        return spool, None
+
+    def _cache_version(self, kind: str) -> str:
+        processing = self.config.get("processing", {})
+        return config_version(*(processing.get(name) for name in CACHE_CONFIG_SECTIONS[kind]))
+
+    async def _fetch_and_analyze(
+        self,
+        attachment: Attachment,
+        channel: str,
+        adapter: ChannelAdapter,
+        variant: str,
+        analyze: Callable[[SpooledAttachment], Awaitable[MediaContent]],
+    ) -> MediaContent:
+        """
+        Download and analyze an attachment, reusing cached results.
+
+        A result is found by platform file id before downloading, then by
+        the content hash computed while downloading. Fresh results are
+        stored with a thumbnail for images.
+
+        Args:
+            attachment: Attachment to process
+            channel: Source channel
+            adapter: Channel adapter for download
+            variant: Analysis kind ("image", "document:pdf", ...)
+            analyze: Coroutine function analyzing the downloaded content
+
+        Returns:
+            MediaContent (processing_cost_usd is 0.0 on a cache hit)
+        """
+        cache = self.cache
+        if not cache.enabled:
+            download, error = await self._download(attachment, adapter)
+            if error:
+                return error
+            with download:
+                async with self._analysis_slots():
+                    return await analyze(download)
+
+        version = self._cache_version(attachment.type)
+        alias = cache.alias_key(channel, attachment, variant, version)
+
+        cached = cache.get_alias(alias, attachment)
+        if cached is not None:
+            return await self._cache_hit(cached, alias, channel)
+
+        download, error = await self._download(attachment, adapter)
+        if error:
+            return error
+        with download:
+            key = cache.digest_key(download.sha256, variant, version)
+            cached = cache.get(key, attachment)
+            if cached is not None:
+                return await self._cache_hit(cached, alias, channel)
+
+            async with self._analysis_slots():
+                media = await analyze(download)
+
+            if media.processed:
+                thumbnail = None
+                if attachment.type == "image":
+                    try:
+                        thumbnail = await self.workers.thumbnail(download.read_bytes())
+                    except Exception as e:
+                        logger.debug(f"Thumbnail failed: {e}")
+                cache.put(key, media, thumbnail=thumbnail)
+                cache.put_alias(alias, key)
+        await cache.record_lookup(False, channel=channel)
+        return media
+
+    async def _cache_hit(
+        self, cached: MediaContent, alias: str | None, channel: str
+    ) -> MediaContent:
+        saved = cached.metadata["cache_saved_usd"]
+        self.cache.put_alias(alias, cached.metadata["cache_key"])
+        await self.cache.record_lookup(True, saved, channel)
+        logger.debug(f"Media cache hit for {cached.attachment.filename} (saved ${saved:.4f})")
+        return cached
 
     # =========================================================================
     # Image Processing
@@ -216,22 +492,13 @@ class MediaProcessor:
         if not vision_config.get("enabled", True):
             return MediaContent(attachment=attachment, processed=False)
 
-        # Download image
-        try:
-            image_bytes = await adapter.download_attachment(attachment)
-            if not image_bytes:
-                return MediaContent(
-                    attachment=attachment,
-                    processed=False,
-                    processing_error="Downloaded file is empty",
-                )
-        except Exception as e:
-            return MediaContent(
-                attachment=attachment,
-                processed=False,
-                processing_error=f"Download failed: {str(e)[:100]}",
-            )
+        return await self._fetch_and_analyze(
+            attachment, channel, adapter, "image",
+            lambda download: self._analyze_image(attachment, download.read_bytes()),
+        )
 
+    async def _analyze_image(self, attachment: Attachment, image_bytes: bytes) -> MediaContent:
+        """Describe downloaded image bytes with the Vision API."""
         # Prepare image for Vision API
         prepared_image = await self._prepare_image_for_vision(image_bytes)
 
@@ -267,7 +534,7 @@ class MediaProcessor:
         """
         Prepare image for Claude Vision API.
 
-        Resizes large images and converts to base64.
+        Resizes large images in a media worker and converts to base64.
 
         Args:
             image_bytes: Raw image data
@@ -276,31 +543,7 @@ class MediaProcessor:
             Dict in Claude Vision format or None on error
         """
         try:
-            from PIL import Image
-
-            # Open and check image
-            img = Image.open(io.BytesIO(image_bytes))
-
-            # Resize if too large (Claude recommendation: 1568px max)
-            max_size = 1568
-            if max(img.size) > max_size:
-                ratio = max_size / max(img.size)
-                new_size = tuple(int(dim * ratio) for dim in img.size)
-                img = img.resize(new_size, Image.LANCZOS)
-
-            # Convert to JPEG for consistency
-            output = io.BytesIO()
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            img.save(output, format="JPEG", quality=85)
-            image_bytes = output.getvalue()
-
-            # Check size (Claude limit: 5MB)
-            if len(image_bytes) > 5 * 1024 * 1024:
-                # Reduce quality
-                output = io.BytesIO()
-                img.save(output, format="JPEG", quality=60)
-                image_bytes = output.getvalue()
+            image_bytes = await self.workers.prepare_image(image_bytes)
 
             # Encode to base64
             b64_data = base64.standard_b64encode(image_bytes).decode("utf-8")
@@ -404,23 +647,17 @@ class MediaProcessor:
                 processing_error=f"Unsupported format: {ext}",
             )
 
-        # Download document
-        try:
-            doc_bytes = await adapter.download_attachment(attachment)
-            if not doc_bytes:
-                return MediaContent(
-                    attachment=attachment,
-                    processed=False,
-                    processing_error="Downloaded file is empty",
-                )
-        except Exception as e:
-            return MediaContent(
-                attachment=attachment,
-                processed=False,
-                processing_error=f"Download failed: {str(e)[:100]}",
-            )
+        return await self._fetch_and_analyze(
+            attachment, channel, adapter, f"document:{ext}",
+            lambda download: self._analyze_document(attachment, download.read_bytes(), ext),
+        )
+
+    async def _analyze_document(
+        self, attachment: Attachment, doc_bytes: bytes, ext: str
+    ) -> MediaContent:
+        """Extract text from downloaded document bytes."""
+        doc_config = self.config.get("processing", {}).get("documents", {})
 
-        # Extract text
         try:
             max_pages = doc_config.get("max_pages", 20)
             max_chars = doc_config.get("max_chars_per_doc", 10000)
@@ -460,7 +697,7 @@ class MediaProcessor:
         self, pdf_bytes: bytes, max_pages: int
     ) -> tuple[str, int]:
         """
-        Extract text from PDF using PyPDF2.
+        Extract text from PDF using PyPDF2 (in a media worker).
 
         Args:
             pdf_bytes: PDF file content
@@ -469,34 +706,11 @@ class MediaProcessor:
         Returns:
             Tuple of (text, page_count)
         """
-        try:
-            from PyPDF2 import PdfReader
-
-            pdf_file = io.BytesIO(pdf_bytes)
-            reader = PdfReader(pdf_file)
-
-            page_count = len(reader.pages)
-            pages_to_read = min(page_count, max_pages)
-
-            text_parts = []
-            for i in range(pages_to_read):
-                page_text = reader.pages[i].extract_text()
-                if page_text:
-                    text_parts.append(f"--- Page {i + 1} ---\n{page_text}")
-
-            text = "\n\n".join(text_parts)
-
-            if pages_to_read < page_count:
-                text += f"\n\n[Showing {pages_to_read} of {page_count} pages]"
-
-            return text, page_count
-
-        except ImportError:
-            raise ImportError("PyPDF2 not installed. Run: uv pip install pypdf2")
+        return await self.workers.extract_pdf(pdf_bytes, max_pages)
 
     async def _extract_docx(self, docx_bytes: bytes) -> tuple[str, int]:
         """
-        Extract text from Word document using python-docx.
+        Extract text from Word document using python-docx (in a media worker).
 
         Args:
             docx_bytes: DOCX file content
@@ -504,22 +718,7 @@ class MediaProcessor:
         Returns:
             Tuple of (text, page_count estimate)
         """
-        try:
-            from docx import Document
-
-            doc_file = io.BytesIO(docx_bytes)
-            doc = Document(doc_file)
-
-            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-            text = "\n\n".join(paragraphs)
-
-            # Estimate page count (rough: ~3000 chars per page)
-            page_count = max(1, len(text) // 3000)
-
-            return text, page_count
-
-        except ImportError:
-            raise ImportError("python-docx not installed. Run: uv pip install python-docx")
+        return await self.workers.extract_docx(docx_bytes)
 
     # =========================================================================
     # Audio Processing (Phase 15b)
@@ -547,23 +746,13 @@ class MediaProcessor:
         if not transcription_config.get("enabled", True):
             return MediaContent(attachment=attachment, processed=False)
 
-        # Download audio
-        try:
-            audio_bytes = await adapter.download_attachment(attachment)
-            if not audio_bytes:
-                return MediaContent(
-                    attachment=attachment,
-                    processed=False,
-                    processing_error="Downloaded file is empty",
-                )
-        except Exception as e:
-            return MediaContent(
-                attachment=attachment,
-                processed=False,
-                processing_error=f"Download failed: {str(e)[:100]}",
-            )
+        return await self._fetch_and_analyze(
+            attachment, channel, adapter, "audio",
+            lambda download: self._analyze_audio(attachment, download.read_bytes()),
+        )
 
-        # Use AudioProcessor for transcription
+    async def _analyze_audio(self, attachment: Attachment, audio_bytes: bytes) -> MediaContent:
+        """Transcribe downloaded audio bytes with the AudioProcessor."""
         try:
             from tools.channels.audio_processor import get_audio_processor
 
@@ -627,29 +816,20 @@ class MediaProcessor:
         if not video_config.get("enabled", True):
             return MediaContent(attachment=attachment, processed=False)
 
-        # Download video
-        try:
-            video_bytes = await adapter.download_attachment(attachment)
-            if not video_bytes:
-                return MediaContent(
-                    attachment=attachment,
-                    processed=False,
-                    processing_error="Downloaded file is empty",
-                )
-        except Exception as e:
-            return MediaContent(
-                attachment=attachment,
-                processed=False,
-                processing_error=f"Download failed: {str(e)[:100]}",
-            )
+        return await self._fetch_and_analyze(
+            attachment, channel, adapter, "video",
+            # FFmpeg reads the spooled file in place
+            lambda download: self._analyze_video(attachment, download.path),
+        )
 
-        # Use VideoProcessor
+    async def _analyze_video(self, attachment: Attachment, video: bytes | Path) -> MediaContent:
+        """Extract frames and transcribe audio from a downloaded video (bytes or file)."""
         try:
             from tools.channels.video_processor import get_video_processor
 
             video_processor = get_video_processor()
             result = await video_processor.process_video(
-                video_bytes,
+                video,
                 attachment.filename,
                 attachment.mime_type,
             )
@@ -704,9 +884,11 @@ class MediaProcessor:
     # =========================================================================
 
     def cleanup(self) -> None:
-        """Remove temporary files."""
+        """Remove temporary files and stop media workers."""
         import shutil
 
+        self.workers.shutdown()
+
         try:
             shutil.rmtree(self._temp_dir, ignore_errors=True)
         except Exception:
@@ -718,11 +900,132 @@ class MediaProcessor:
 # =============================================================================
 
 
+# A line holding only an image: ![alt](url) or ![alt](url "title")
+_IMAGE_LINE = re.compile(r'!\[([^\]\n]*)\]\((\S+?)(?:\s+"[^"\n]*")?\)')
+_TABLE_DELIMITER = re.compile(r"\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?")
+
+
+def _is_table_row(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith("|") and stripped.count("|") >= 2
+
+
+class ResponseBlockParser:
+    """
+    Incremental parser for streamed AI responses.
+
+    Consumes text deltas and returns content blocks (the same dicts as
+    parse_response_blocks) as soon as they are finished, so code blocks,
+    images and tables can be acted on while the rest of the response is
+    still arriving. Only the open block is kept as working
+    state, so each delta costs time proportional to its own length.
+
+    Blocks:
+    - code: fenced code block, finished at its closing fence
+    - image: a line holding only ![alt](url), finished at its newline
+    - table: pipe table (text block with metadata {"table": True}),
+      finished at the first line that is not a table row
+    - text: everything else, finished when another block starts
+
+    Usage:
+        parser = ResponseBlockParser()
+        for delta in stream:
+            for block in parser.feed(delta):
+                await send_block(block)
+        for block in parser.close():
+            await send_block(block)
+    """
+
+    def __init__(self) -> None:
+        self._tokenizer = MarkdownTokenizer()
+        self._text: list[str] = []  # Lines of the open text block
+        self._table: list[str] = []  # Rows of the open table
+        self._table_confirmed = False  # Delimiter row seen
+
+    def feed(self, delta: str) -> list[dict[str, Any]]:
+        """Consume a delta and return the blocks it finished."""
+        return self._consume(self._tokenizer.feed(delta))
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish the stream and return the remaining blocks."""
+        return self._consume(self._tokenizer.close()) + self._flush()
+
+    def pending(self) -> list[dict[str, Any]]:
+        """Blocks still open, as they would be if the stream ended now."""
+        snapshot = ResponseBlockParser()
+        snapshot._text = list(self._text)
+        snapshot._table = list(self._table)
+        snapshot._table_confirmed = self._table_confirmed
+        return snapshot._consume(self._tokenizer.pending()) + snapshot._flush()
+
+    def _consume(self, tokens: list[Block]) -> list[dict[str, Any]]:
+        blocks: list[dict[str, Any]] = []
+        for token in tokens:
+            if token.kind == CODE:
+                blocks += self._flush()
+                blocks.append({
+                    "type": "code",
+                    "content": token.text,
+                    "metadata": {"language": token.lang or "text"},
+                })
+                continue
+
+            line = token.raw
+            if _is_table_row(line):
+                if self._table and not self._table_confirmed:
+                    if _TABLE_DELIMITER.fullmatch(line.strip()):
+                        self._table_confirmed = True
+                        blocks += self._flush_text()
+                    else:
+                        # Header without a delimiter row: not a table
+                        self._text += self._table
+                        self._table = []
+                self._table.append(line)
+                continue
+            blocks += self._flush_table()
+
+            image = _IMAGE_LINE.fullmatch(line.strip())
+            if image:
+                blocks += self._flush_text()
+                blocks.append({
+                    "type": "image",
+                    "content": image.group(2),
+                    "metadata": {"alt": image.group(1) or "Image"},
+                })
+                continue
+
+            self._text.append(line)
+        return blocks
+
+    def _flush(self) -> list[dict[str, Any]]:
+        return self._flush_table() + self._flush_text()
+
+    def _flush_table(self) -> list[dict[str, Any]]:
+        rows, confirmed = self._table, self._table_confirmed
+        self._table = []
+        self._table_confirmed = False
+        if not rows:
+            return []
+        if not confirmed:
+            self._text += rows
+            return []
+        return [{"type": "text", "content": "\n".join(rows).strip(), "metadata": {"table": True}}]
+
+    def _flush_text(self) -> list[dict[str, Any]]:
+        content = "\n".join(self._text).strip()
+        self._text = []
+        if not content:
+            return []
+        return [{"type": "text", "content": content, "metadata": {}}]
+
+
 def parse_response_blocks(response_text: str) -> list[dict[str, Any]]:
     """
     Parse AI response into content blocks.
 
-    Detects code blocks (```language) and separates them from text.
+    Detects fenced code blocks (```language), standalone images and pipe
+    tables and separates them from text. Streaming handlers can get the
+    same blocks incrementally from ResponseBlockParser.
 
     Args:
         response_text: Raw AI response
@@ -730,42 +1033,8 @@ def parse_response_blocks(response_text: str) -> list[dict[str, Any]]:
     Returns:
         List of block dicts with 'type', 'content', and 'metadata'
     """
-    import re
-
-    blocks = []
-    # Pattern for fenced code blocks - handles with or without newline after fence
-    pattern = r"```(\w*)\s*(.*?)```"
-
-    last_end = 0
-    for match in re.finditer(pattern, response_text, re.DOTALL):
-        # Text before code block
-        before_text = response_text[last_end:match.start()].strip()
-        if before_text:
-            blocks.append({
-                "type": "text",
-                "content": before_text,
-                "metadata": {},
-            })
-
-        # Code block
-        language = match.group(1) or "text"
-        code = match.group(2)
-        blocks.append({
-            "type": "code",
-            "content": code,
-            "metadata": {"language": language},
-        })
-
-        last_end = match.end()
-
-    # Remaining text after last code block
-    remaining = response_text[last_end:].strip()
-    if remaining:
-        blocks.append({
-            "type": "text",
-            "content": remaining,
-            "metadata": {},
-        })
+    parser = ResponseBlockParser()
+    blocks = parser.feed(response_text) + parser.close()
 
     # If no blocks found, treat entire response as text
     if not blocks:
@@ -778,6 +1047,17 @@ def parse_response_blocks(response_text: str) -> list[dict[str, Any]]:
     return blocks
 
 
+def image_link_block(block: dict[str, Any]) -> dict[str, Any]:
+    """
+    Text block linking to an image block's URL.
+
+    Used where a reply goes out as text only, so the image is not lost
+    when it cannot be shown inline.
+    """
+    alt = block["metadata"].get("alt") or "Image"
+    return {"type": "text", "content": f"[{alt}]({block['content']})", "metadata": {}}
+
+
 def format_blocks_for_channel(
     blocks: list[dict[str, Any]],
     channel: str,
@@ -789,6 +1069,7 @@ def format_blocks_for_channel(
     - Telegram: HTML <pre><code> tags
     - Discord: Markdown code fences
     - Slack: Triple backticks
+    - Images: kept as a markdown link
 
     Args:
         blocks: Content blocks from parse_response_blocks
@@ -827,6 +1108,9 @@ def format_blocks_for_channel(
                 # Default markdown
                 formatted_parts.append(f"```{language}\n{code}\n```")
 
+        elif block["type"] == "image":
+            formatted_parts.append(image_link_block(block)["content"])
+
         else:
             # Regular text
             formatted_parts.append(block["content"])
@@ -51,6 +51,10 @@ class SlackRenderer(ChannelRenderer):
     def __init__(self) -> None:
         self._converter = MarkdownConverter()
         self._splitter = ContentSplitter()
+        # Section text has its own limit, below the message limit
+        self._mrkdwn_splitter = ContentSplitter(
+            {"channel_limits": {"slack": MAX_MRKDWN_LENGTH}}
+        )
 
     @property
     def channel_name(self) -> str:
@@ -256,7 +260,7 @@ class SlackRenderer(ChannelRenderer):
         self, block: ContentBlock
     ) -> tuple[list[dict[str, Any]], str]:
         """Render a CODE block wrapped in triple backticks."""
-        code_text = f"```{block.content}```"
+        code_text = f"```\n{block.content}\n```"
         sections = self._split_mrkdwn(code_text)
 
         slack_blocks = [
@@ -348,54 +352,10 @@ class SlackRenderer(ChannelRenderer):
         """
         Split mrkdwn text into chunks respecting the 3000-char limit.
 
-        Uses ContentSplitter logic to find natural split points
-        (paragraphs, sentences, words) within the mrkdwn limit.
+        Uses ContentSplitter to find natural split points (paragraphs,
+        sentences, words) without breaking code blocks.
         """
-        if len(text) <= MAX_MRKDWN_LENGTH:
-            return [text]
-
-        chunks: list[str] = []
-        remaining = text
-
-        while remaining:
-            if len(remaining) <= MAX_MRKDWN_LENGTH:
-                chunks.append(remaining)
-                break
-
-            split_point = self._find_split_point(remaining, MAX_MRKDWN_LENGTH)
-            chunks.append(remaining[:split_point].rstrip())
-            remaining = remaining[split_point:].lstrip()
-
-        return chunks if chunks else [text]
-
-    @staticmethod
-    def _find_split_point(text: str, limit: int) -> int:
-        """Find the best point to split text within the limit."""
-        if len(text) <= limit:
-            return len(text)
-
-        # Try paragraph boundary
-        paragraph_break = text[:limit].rfind("\n\n")
-        if paragraph_break > limit // 3:
-            return paragraph_break + 2
-
-        # Try line boundary
-        line_break = text[:limit].rfind("\n")
-        if line_break > limit // 3:
-            return line_break + 1
-
-        # Try sentence boundary
-        sentence_end = text[:limit].rfind(". ")
-        if sentence_end > limit // 3:
-            return sentence_end + 2
-
-        # Try word boundary
-        word_break = text[:limit].rfind(" ")
-        if word_break > limit // 3:
-            return word_break + 1
-
-        # Hard split at limit
-        return limit
+        return self._mrkdwn_splitter.split_text(text, "slack") or [text]
 
     def _render_button_element(self, button: Button) -> dict[str, Any]:
         """Convert a Button model into a Slack button element."""
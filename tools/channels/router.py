@@ -27,7 +27,7 @@ import sys
 import time
 import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -108,6 +108,10 @@ def _update_dex_state(
         pass  # Never let state updates break message flow
 
 
+# Chunk size adapters request when streaming attachments
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
 class ChannelAdapter(ABC):
     """
     Abstract base class for channel adapters.
@@ -214,6 +218,22 @@ class ChannelAdapter(ABC):
         )
         return await self.send_message(message)
 
+    async def iter_attachment(self, attachment: Any) -> AsyncIterator[bytes]:
+        """
+        Stream attachment content in chunks.
+
+        Override in subclasses that can stream from the platform. Default
+        implementation yields the whole download_attachment() result as a
+        single chunk.
+
+        Args:
+            attachment: Attachment to download
+
+        Yields:
+            Byte chunks in order
+        """
+        yield await self.download_attachment(attachment)
+
     async def upload_file(
         self, file_path: str, channel_id: str, caption: str | None = None
     ) -> dict[str, Any]:
@@ -611,12 +611,17 @@ def _format_response_for_channel(response: str, channel: str) -> str:
     # Try Phase 15c renderer pipeline first
     try:
         from tools.channels.renderers import get_renderer
-        from tools.channels.media_processor import parse_response_blocks
+        from tools.channels.media_processor import image_link_block, parse_response_blocks
         from tools.channels.models import ContentBlock, RenderContext
 
         renderer = get_renderer(channel)
         if renderer:
-            raw_blocks = parse_response_blocks(response)
+            # Only text is sent from here: image blocks would be dropped
+            # (or reduced to their alt text), so keep them as links
+            raw_blocks = [
+                image_link_block(b) if b["type"] == "image" else b
+                for b in parse_response_blocks(response)
+            ]
             if raw_blocks:
                 # Convert dicts to ContentBlock objects
                 content_blocks = [
@@ -882,7 +887,7 @@ async def sdk_handler_streaming(
 
 from tools.channels.handlers.slack_streaming import sdk_handler_slack_streaming
 from tools.channels.handlers.discord_streaming import sdk_handler_discord_streaming
-from tools.channels.handlers.telegram_streaming import sdk_handler_telegram_fallback
+from tools.channels.handlers.telegram_streaming import sdk_handler_telegram_streaming
 
 
 # =============================================================================
@@ -899,7 +904,7 @@ async def sdk_handler_with_streaming(
 
     - Slack: Uses message editing for progressive display
     - Discord: Uses message editing for progressive display (2000 char limit)
-    - Telegram: Sends acknowledgment, then full response
+    - Telegram: Uses message editing for progressive display
     - Other channels: Uses standard non-streaming handler
 
     Args:
@@ -916,7 +921,7 @@ async def sdk_handler_with_streaming(
     elif channel == "discord":
         return await sdk_handler_discord_streaming(message, context)
     elif channel == "telegram":
-        return await sdk_handler_telegram_fallback(message, context)
+        return await sdk_handler_telegram_streaming(message, context)
     else:
         # Default to standard non-streaming handler
         return await sdk_handler(message, context)
@@ -27,13 +27,16 @@ from __future__ import annotations
 import asyncio
 import logging
 import json
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, AsyncIterator, Optional, Callable, AsyncGenerator, Union
+from typing import Any, AsyncIterator, Optional, Callable, AsyncGenerator, Union, TYPE_CHECKING
 
+from tools import db_connections
 from tools.agent import PROJECT_ROOT
 
+if TYPE_CHECKING:
+    import sqlite3
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,11 +51,11 @@ _DB_PATH = PROJECT_ROOT / "data" / "sessions.db"
 
 
 def get_connection() -> sqlite3.Connection:
-    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(_DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    return db_connections.get_connection(_DB_PATH, _init_schema, foreign_keys=True)
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
         session_key TEXT PRIMARY KEY,
         channel TEXT NOT NULL,
@@ -66,7 +69,6 @@ def get_connection() -> sqlite3.Connection:
         is_active INTEGER DEFAULT 1
     )""")
     conn.commit()
-    return conn
 
 
 def _migrate_json_to_sqlite() -> None:
@@ -378,6 +380,19 @@ class Session:
         """
         await self._cleanup_client()
 
+        # Destroy the session's sandbox (container isolation)
+        if self.sdk_session_id:
+            try:
+                from tools.security.container_executor import (
+                    CONTAINER_ISOLATION_ENABLED,
+                    release_executor,
+                )
+
+                if CONTAINER_ISOLATION_ENABLED:
+                    await asyncio.to_thread(release_executor, self.sdk_session_id)
+            except Exception as e:
+                logger.debug(f"Failed to release session sandbox: {e}")
+
         # Mark workspace session end (for SESSION scoped workspaces)
         if self.workspace_path:
             try:
@@ -26,6 +26,7 @@ import logging
 import sys
 import uuid
 from datetime import datetime
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
@@ -39,7 +40,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from tools.channels.models import Attachment, UnifiedMessage
-from tools.channels.router import ChannelAdapter, get_router
+from tools.channels.router import DOWNLOAD_CHUNK_BYTES, ChannelAdapter, get_router
 
 
 class SlackAdapter(ChannelAdapter):
@@ -361,7 +362,10 @@ class SlackAdapter(ChannelAdapter):
             return {"success": True, "ts": result["ts"]}
 
         except SlackApiError as e:
-            return {"success": False, "error": str(e)}
+            error = {"success": False, "error": str(e)}
+            if e.response is not None and e.response.status_code == 429:
+                error["retry_after"] = float(e.response.headers.get("Retry-After", 1))
+            return error
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -477,6 +481,35 @@ class SlackAdapter(ChannelAdapter):
             response.raise_for_status()
             return response.content
 
+    async def iter_attachment(self, attachment: Attachment) -> AsyncIterator[bytes]:
+        """
+        Stream attachment content from Slack in chunks.
+
+        Args:
+            attachment: Attachment with Slack url_private
+
+        Yields:
+            Byte chunks in order
+
+        Raises:
+            ValueError: If no URL available
+            Exception: On download failure
+        """
+        if not attachment.url:
+            raise ValueError("No URL in Slack attachment")
+
+        import httpx
+
+        headers = {"Authorization": f"Bearer {self.bot_token}"}
+
+        async with (
+            httpx.AsyncClient(timeout=30.0) as client,
+            client.stream("GET", attachment.url, headers=headers) as response,
+        ):
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                yield chunk
+
     # =========================================================================
     # Message Handlers
     # =========================================================================
@@ -23,6 +23,7 @@ import json
 import logging
 import sys
 import uuid
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 
@@ -33,7 +34,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from tools.channels.models import Attachment, UnifiedMessage
-from tools.channels.router import ChannelAdapter, get_router
+from tools.channels.router import DOWNLOAD_CHUNK_BYTES, ChannelAdapter, get_router
 
 
 class TelegramAdapter(ChannelAdapter):
@@ -218,6 +219,43 @@ class TelegramAdapter(ChannelAdapter):
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    async def update_message(
+        self,
+        chat_id: str | int,
+        message_id: str | int,
+        content: str,
+    ) -> dict[str, Any]:
+        """
+        Edit an existing Telegram message in place.
+
+        Used for streaming responses by progressively updating the message.
+
+        Args:
+            chat_id: Telegram chat ID
+            message_id: Message ID to edit
+            content: New message content
+
+        Returns:
+            Dict with success status (and retry_after when rate limited)
+        """
+        if not self.bot:
+            return {"success": False, "error": "bot_not_connected"}
+
+        try:
+            await self.bot.edit_message_text(
+                chat_id=chat_id, message_id=int(message_id), text=content
+            )
+            return {"success": True}
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+            # telegram.error.RetryAfter (int seconds or timedelta by version)
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None:
+                if hasattr(retry_after, "total_seconds"):
+                    retry_after = retry_after.total_seconds()
+                result["retry_after"] = float(retry_after)
+            return result
+
     async def send_image(
         self,
         chat_id: str | int,
@@ -453,6 +491,56 @@ class TelegramAdapter(ChannelAdapter):
 
         return bytes(file_bytes)
 
+    async def iter_attachment(self, attachment: Attachment) -> AsyncIterator[bytes]:
+        """
+        Stream attachment content from Telegram in chunks.
+
+        Resolves the file_id to its download URL and streams it; falls back
+        to a buffered download when the Bot API returns a local path.
+
+        Args:
+            attachment: Attachment with Telegram file_id
+
+        Yields:
+            Byte chunks in order
+
+        Raises:
+            ValueError: If no file_id available
+            Exception: On download failure
+        """
+        if not self.bot:
+            raise RuntimeError("Bot not connected")
+
+        file_id = attachment.id
+        if not file_id:
+            raise ValueError("No file_id in Telegram attachment")
+
+        file_info = await self.bot.get_file(file_id)
+
+        file_url = file_info.file_path or ""
+        if not file_url.startswith(("http://", "https://")):
+            # Local Bot API server: file_path is on disk
+            yield bytes(await file_info.download_as_bytearray())
+            return
+
+        import httpx
+
+        try:
+            async with (
+                httpx.AsyncClient(timeout=30.0) as client,
+                client.stream("GET", file_url) as response,
+            ):
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                    yield chunk
+        except httpx.HTTPStatusError as e:
+            # The download URL contains the bot token: keep it out of the error
+            raise RuntimeError(
+                f"Telegram file download failed (HTTP {e.response.status_code})"
+            ) from None
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Telegram file download failed ({type(e).__name__})") from None
+
     # =========================================================================
     # Command Handlers
     # =========================================================================
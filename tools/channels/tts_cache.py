@@ -0,0 +1,213 @@
+"""
+TTS Synthesis Cache
+
+Recurring phrases (reminder templates, heartbeat summaries, voice command
+confirmations like "Focus mode ended. Notifications resumed.") used to be
+synthesized again for every reply. AudioProcessor.generate_speech looks
+them up here first.
+
+Features:
+- Keys: normalized text + provider + voice + model + format + speed
+- One audio file per entry under data/tts_cache/
+- LRU eviction by bytes (hits refresh mtime)
+- Latency and cost savings in get_stats(); lookups reported to
+  tools/ops/cost_tracker as cache "tts"
+
+Usage:
+    from tools.channels.tts_cache import TTSCache
+
+    cache = TTSCache.from_config(config["generation"]["tts"].get("cache"))
+    key = cache.key(text, provider="openai", voice="alloy", model="tts-1",
+                    output_format="opus", speed=1.0)
+    audio = await asyncio.to_thread(cache.get, key, "opus")
+    if audio is None:
+        audio = await synthesize(...)
+        await asyncio.to_thread(cache.put, key, "opus", audio)
+
+    # The process-wide instance is AudioProcessor's:
+    get_audio_processor().tts_cache.get_stats()
+
+Config (args/multimodal.yaml, generation.tts.cache):
+    enabled: true
+    max_size_mb: 100
+    prewarm: true               # Synthesize voice command confirmations at startup
+
+Dependencies:
+    - hashlib, unicodedata (stdlib)
+    - tools/channels/media/disk_lru.py (storage and eviction)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any
+
+from tools.channels.media.disk_lru import DiskLRU
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "tts_cache"
+
+DEFAULT_MAX_SIZE_MB = 100
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for cache keys: NFC, trimmed, single spaces."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TTSCache:
+    """
+    On-disk cache of synthesized speech with LRU eviction by bytes.
+
+    Args:
+        directory: Cache directory (default: data/tts_cache)
+        max_size_mb: Total size before least recently used entries are evicted
+        enabled: When False every lookup misses and nothing is stored
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self._store = DiskLRU(self.directory, self.max_bytes, label="TTS cache")
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "saved_usd": 0.0,
+            "hit_seconds": 0.0,
+            "synthesis_seconds": 0.0,
+        }
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> TTSCache:
+        """Build a cache from the generation.tts.cache config section."""
+        config = config or {}
+        return cls(
+            directory=config.get("directory"),
+            max_size_mb=config.get("max_size_mb", DEFAULT_MAX_SIZE_MB),
+            enabled=config.get("enabled", True),
+        )
+
+    @staticmethod
+    def key(
+        text: str,
+        *,
+        provider: str,
+        voice: str,
+        model: str,
+        output_format: str,
+        speed: float,
+    ) -> str:
+        """Cache key for a synthesis request."""
+        parts = (normalize_text(text), provider, voice, model, output_format, f"{float(speed):g}")
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _path(self, key: str, output_format: str) -> Path:
+        return self.directory / key[:2] / f"{key}.{output_format}"
+
+    # -------------------------------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str, output_format: str) -> bytes | None:
+        """Cached audio for ``key`` or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key, output_format)
+        try:
+            audio = path.read_bytes()
+        except OSError:
+            return None
+        self._store.touch(path)  # LRU: a hit makes the entry recent
+        return audio
+
+    def put(self, key: str, output_format: str, audio: bytes) -> None:
+        """Store synthesized audio under ``key``."""
+        if not self.enabled or not audio:
+            return
+        try:
+            self._store.write(self._path(key, output_format), audio)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    async def record_lookup(
+        self,
+        hit: bool,
+        seconds: float,
+        saved_usd: float = 0.0,
+    ) -> None:
+        """
+        Count a lookup here and in the cost tracker (written off the event loop).
+
+        Args:
+            hit: Served from cache
+            seconds: Time to serve the request (lookup or synthesis)
+            saved_usd: API cost avoided (hits only)
+        """
+        if not self.enabled:
+            return
+        if hit:
+            self.stats["hits"] += 1
+            self.stats["hit_seconds"] += seconds
+            self.stats["saved_usd"] += saved_usd
+        else:
+            self.stats["misses"] += 1
+            self.stats["synthesis_seconds"] += seconds
+        try:
+            from tools.ops.cost_tracker import record_cache_lookup
+
+            await asyncio.to_thread(record_cache_lookup, "tts", hit, saved_usd=saved_usd)
+        except Exception as e:
+            logger.debug(f"TTS cache lookup not recorded: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Disk usage, hit rate, and latency/cost saved by this process."""
+        files, total = self._store.scan()
+        hits, misses = self.stats["hits"], self.stats["misses"]
+        avg_hit = self.stats["hit_seconds"] / hits if hits else 0.0
+        avg_synthesis = self.stats["synthesis_seconds"] / misses if misses else 0.0
+        return {
+            "entries": len(files),
+            "total_mb": round(total / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "saved_usd": round(self.stats["saved_usd"], 6),
+            "avg_hit_ms": round(avg_hit * 1000, 2),
+            "avg_synthesis_ms": round(avg_synthesis * 1000, 2),
+            # Estimated from the average synthesis time of misses
+            "time_saved_seconds": round(max(0.0, avg_synthesis - avg_hit) * hits, 3),
+        }
+
+    # -------------------------------------------------------------------------
+    # Eviction
+    # -------------------------------------------------------------------------
+
+    def evict(self) -> dict[str, Any]:
+        """
+        Drop least recently used entries until under the low-water mark.
+
+        Returns:
+            Dict with keys: success, files_removed, bytes_freed, size_bytes
+        """
+        return self._store.evict()
@@ -6,22 +6,26 @@ Generates voice responses using Text-to-Speech:
 - Voice selection
 - Output format handling (Opus for voice notes)
 - Cost tracking
+- Cached synthesis of recurring phrases, pre-warmed with the fixed voice
+  command confirmations at startup
 
 Usage:
     from tools.channels.tts_generator import TTSGenerator
 
     generator = TTSGenerator()
     result = await generator.generate(text, voice="alloy")
+    await generator.prewarm()  # Synthesize fixed confirmations ahead of time
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 # Ensure project root is in path
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 import yaml
 
@@ -75,6 +79,17 @@ class TTSGenerator:
         "flac": "Lossless (large files)",
     }
 
+    # Channel-specific format preferences
+    CHANNEL_FORMATS: ClassVar[dict[str, str]] = {
+        "telegram": "opus",   # Native voice note format
+        "discord": "opus",    # Supported for voice messages
+        "slack": "mp3",       # General compatibility
+        "web": "mp3",         # Browser compatibility
+    }
+
+    # Concurrent synthesis requests while pre-warming
+    PREWARM_CONCURRENCY = 4
+
     def __init__(self, config: dict[str, Any] | None = None):
         """
         Initialize TTS generator.
@@ -94,6 +109,7 @@ class TTSGenerator:
         voice: str | None = None,
         format: str | None = None,
         speed: float | None = None,
+        count_lookup: bool = True,
     ) -> TTSResult:
         """
         Generate speech audio from text.
@@ -103,6 +119,7 @@ class TTSGenerator:
             voice: Voice ID (alloy, echo, fable, onyx, nova, shimmer)
             format: Output format (opus, mp3, aac, flac)
             speed: Speech speed (0.25 to 4.0)
+            count_lookup: Report the TTS cache lookup (False when pre-warming)
 
         Returns:
             TTSResult with audio bytes and metadata
@@ -147,6 +164,8 @@ class TTSGenerator:
             text,
             voice=voice,
             output_format=format,
+            speed=speed,
+            count_lookup=count_lookup,
         )
 
     async def generate_for_channel(
@@ -166,16 +185,61 @@ class TTSGenerator:
         Returns:
             TTSResult with channel-optimized audio
         """
-        # Channel-specific format preferences
-        channel_formats = {
-            "telegram": "opus",   # Native voice note format
-            "discord": "opus",    # Supported for voice messages
-            "slack": "mp3",       # General compatibility
-            "web": "mp3",         # Browser compatibility
+        format = self.CHANNEL_FORMATS.get(channel, "mp3")
+        return await self.generate(text, voice=voice, format=format)
+
+    async def prewarm(
+        self,
+        phrases: list[str] | tuple[str, ...] | None = None,
+        formats: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Synthesize recurring phrases into the TTS cache ahead of time.
+
+        Phrases already cached are hits and cost nothing, so this is cheap
+        after the first run. Warm-up lookups are not reported as cache hits
+        or savings.
+
+        Args:
+            phrases: Phrases to synthesize (default: fixed voice command confirmations)
+            formats: Output formats (default: every channel format)
+
+        Returns:
+            Dict with keys: success, synthesized, cached, failed, cost_usd
+        """
+        if not self.is_enabled():
+            return {"success": False, "error": "TTS generation is disabled"}
+
+        if phrases is None:
+            from tools.voice.commands import STATIC_CONFIRMATIONS
+
+            phrases = STATIC_CONFIRMATIONS
+        formats = formats or sorted(set(self.CHANNEL_FORMATS.values()))
+        semaphore = asyncio.Semaphore(self.PREWARM_CONCURRENCY)
+
+        async def warm(text: str, format: str) -> TTSResult:
+            async with semaphore:
+                return await self.generate(text, format=format, count_lookup=False)
+
+        results = await asyncio.gather(
+            *(warm(text, format) for text in phrases for format in formats)
+        )
+        failed = [r.error for r in results if not r.success]
+        if failed:
+            logger.warning(f"TTS prewarm: {len(failed)} phrases failed ({failed[0]})")
+        return {
+            "success": not failed,
+            "synthesized": sum(1 for r in results if r.success and not r.cached),
+            "cached": sum(1 for r in results if r.cached),
+            "failed": len(failed),
+            "cost_usd": round(sum(r.cost_usd for r in results), 6),
         }
 
-        format = channel_formats.get(channel, "mp3")
-        return await self.generate(text, voice=voice, format=format)
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Hit rate and latency/cost savings of the TTS cache."""
+        from tools.channels.audio_processor import get_audio_processor
+
+        return get_audio_processor().tts_cache.get_stats()
 
     def get_available_voices(self) -> dict[str, str]:
         """Get available voices with descriptions."""
@@ -4,6 +4,8 @@ Video Processor for Multi-Modal Messaging (Phase 15b)
 Handles video processing:
 - Frame extraction for visual analysis
 - Audio track extraction and transcription
+- Single async FFmpeg decode pass per video (frames + audio), input piped
+  through stdin, per-job temp directories, cancellable
 - Duration limits and cost controls
 - Thumbnail generation
 
@@ -16,13 +18,16 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import re
+import struct
 import subprocess
 
 # Ensure project root is in path
 import sys
 import tempfile
-import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -38,6 +43,15 @@ logger = logging.getLogger(__name__)
 # Config path
 CONFIG_PATH = PROJECT_ROOT / "args" / "multimodal.yaml"
 
+PROBE_TIMEOUT_SECONDS = 30
+FFMPEG_TIMEOUT_SECONDS = 120
+
+# A keyframe this far before a requested timestamp is close enough to use
+KEYFRAME_TOLERANCE_SECONDS = 2.0
+
+# MP4-family containers can only be piped when the index (moov) comes first
+SEEKABLE_FORMATS = {"mp4", "mov", "m4v", "3gp"}
+
 
 def load_config() -> dict[str, Any]:
     """Load multimodal configuration."""
@@ -47,6 +61,160 @@ def load_config() -> dict[str, Any]:
     return {}
 
 
+# =============================================================================
+# FFmpeg Helpers
+# =============================================================================
+
+
+@dataclass
+class FFmpegResult:
+    """Completed FFmpeg invocation."""
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+
+
+async def run_ffmpeg(
+    args: list[str],
+    input_bytes: bytes | None = None,
+    timeout: float = FFMPEG_TIMEOUT_SECONDS,
+) -> FFmpegResult:
+    """
+    Run FFmpeg as an asyncio subprocess.
+
+    The process is killed if the timeout expires or the awaiting task is
+    cancelled, so abandoned jobs never leave FFmpeg running.
+
+    Args:
+        args: Arguments after the ffmpeg executable
+        input_bytes: Data to stream to stdin (for "-i pipe:0")
+        timeout: Seconds before the process is killed
+
+    Returns:
+        FFmpegResult (non-zero returncode is not raised)
+
+    Raises:
+        asyncio.TimeoutError: Timeout expired
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        *args,
+        stdin=asyncio.subprocess.PIPE if input_bytes is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        # communicate() tolerates FFmpeg closing stdin early (header-only reads)
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input_bytes), timeout)
+    except BaseException:
+        if proc.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await proc.wait()
+        raise
+    return FFmpegResult(proc.returncode, stdout, stderr)
+
+
+def mp4_index_first(data: bytes) -> bool:
+    """True when an MP4/MOV file's moov box precedes its mdat box."""
+    pos = 0
+    while pos + 8 <= len(data):
+        size, box = struct.unpack(">I4s", data[pos:pos + 8])
+        if box == b"moov":
+            return True
+        if box == b"mdat":
+            return False
+        if size == 1 and pos + 16 <= len(data):
+            size = struct.unpack(">Q", data[pos + 8:pos + 16])[0]
+        if size < 8:
+            break
+        pos += size
+    return False
+
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(r"Stream #\S+.*?: Video: (.*)")
+_SIZE_RE = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+_FPS_RE = re.compile(r"([\d.]+) (?:fps|tbr)")
+
+
+def parse_stream_info(stderr: str) -> dict[str, Any] | None:
+    """
+    Parse FFmpeg's input summary.
+
+    Returns:
+        Dict with duration, width, height, fps, has_audio, or None when no
+        video stream was found
+    """
+    video = _VIDEO_RE.search(stderr)
+    if not video:
+        return None
+
+    duration = 0.0
+    match = _DURATION_RE.search(stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    size = _SIZE_RE.search(video.group(1))
+    fps = _FPS_RE.search(video.group(1))
+
+    return {
+        "duration": duration,
+        "width": int(size.group(1)) if size else None,
+        "height": int(size.group(2)) if size else None,
+        "fps": float(fps.group(1)) if fps else 0.0,
+        "has_audio": ": Audio: " in stderr,
+    }
+
+
+def frame_timestamps(duration: float, max_frames: int) -> list[float]:
+    """Key frame timestamps (seconds) for a video of the given duration."""
+    if duration <= 5:
+        # Short video: just get one frame from middle
+        timestamps = [duration / 2]
+    elif duration <= 30:
+        # Medium video: start, middle, end
+        timestamps = [1, duration / 2, duration - 1]
+    else:
+        # Long video: sample evenly
+        step = duration / (max_frames + 1)
+        timestamps = [step * (i + 1) for i in range(max_frames)]
+    return timestamps[:max_frames]
+
+
+def select_expression(timestamps: list[float]) -> str:
+    """
+    FFmpeg select filter picking the first frame at or after each timestamp.
+
+    All frames come out of one decode pass instead of one seek per frame.
+    """
+    return "+".join(
+        f"gte(t,{ts:.3f})*(isnan(prev_selected_t)+lt(prev_selected_t,{ts:.3f}))"
+        for ts in timestamps
+    )
+
+
+def keyframe_select_expression(timestamps: list[float], tolerance: float) -> str:
+    """
+    FFmpeg select filter picking one frame from the ``tolerance`` seconds
+    up to and including each timestamp.
+
+    Windows start no earlier than the previous timestamp, so no frame
+    answers two of them; a window without a frame yields fewer frames.
+    """
+    parts = []
+    previous = None
+    for ts in timestamps:
+        start = ts - tolerance if previous is None else max(ts - tolerance, previous)
+        parts.append(
+            f"gt(t,{start:.3f})*lte(t,{ts:.3f})"
+            f"*(isnan(prev_selected_t)+lte(prev_selected_t,{start:.3f}))"
+        )
+        previous = ts
+    return "+".join(parts)
+
+
 @dataclass
 class VideoProcessingResult:
     """Result from video processing."""
@@ -134,6 +302,7 @@ class VideoProcessor:
         self.config = config or load_config()
         self._temp_dir = Path(tempfile.mkdtemp(prefix="dexai_video_"))
         self._ffmpeg_available = self._check_ffmpeg()
+        self._media_processor = None
 
     def _check_ffmpeg(self) -> bool:
         """Check if FFmpeg is available."""
@@ -149,7 +318,7 @@ class VideoProcessor:
 
     async def process_video(
         self,
-        video_bytes: bytes,
+        video_bytes: bytes | Path,
         filename: str = "video.mp4",
         mime_type: str = "video/mp4",
     ) -> VideoProcessingResult:
@@ -159,7 +328,8 @@ class VideoProcessor:
         Extracts frames and audio, transcribes audio track.
 
         Args:
-            video_bytes: Raw video data
+            video_bytes: Raw video data, or the path of a downloaded file
+                (read by FFmpeg in place, never loaded into memory)
             filename: Original filename
             mime_type: MIME type of video
 
@@ -176,7 +346,8 @@ class VideoProcessor:
 
         # Check file size limit
         max_size_mb = video_config.get("max_file_size_mb", 100)
-        if len(video_bytes) > max_size_mb * 1024 * 1024:
+        size = video_bytes.stat().st_size if isinstance(video_bytes, Path) else len(video_bytes)
+        if size > max_size_mb * 1024 * 1024:
             return VideoProcessingResult(
                 success=False,
                 error=f"Video too large (>{max_size_mb}MB)",
@@ -190,61 +361,65 @@ class VideoProcessor:
             )
 
         try:
-            # Save video to temp file
             ext = self._get_extension(filename, mime_type)
-            video_path = self._temp_dir / f"{uuid.uuid4()}.{ext}"
-            video_path.write_bytes(video_bytes)
 
-            # Get video metadata
-            metadata = await self._get_video_metadata(video_path)
-            if not metadata:
-                return VideoProcessingResult(
-                    success=False,
-                    error="Failed to read video metadata",
+            # Per-job directory: concurrent videos never share frame/audio files
+            with tempfile.TemporaryDirectory(prefix="job_", dir=self._temp_dir) as job:
+                job_dir = Path(job)
+                input_arg, input_bytes = self._input_source(video_bytes, ext, job_dir)
+
+                # Get video metadata
+                metadata = await self._probe(input_arg, input_bytes)
+                if not metadata:
+                    return VideoProcessingResult(
+                        success=False,
+                        error="Failed to read video metadata",
+                    )
+
+                # Check duration limit
+                max_duration = video_config.get("max_duration_seconds", 300)
+                if metadata.get("duration", 0) > max_duration:
+                    return VideoProcessingResult(
+                        success=False,
+                        error=f"Video too long ({metadata['duration']:.0f}s > {max_duration}s limit)",
+                        duration_seconds=metadata.get("duration"),
+                    )
+
+                result = VideoProcessingResult(
+                    success=True,
+                    duration_seconds=metadata.get("duration"),
+                    width=metadata.get("width"),
+                    height=metadata.get("height"),
+                    fps=metadata.get("fps"),
                 )
 
-            # Check duration limit
-            max_duration = video_config.get("max_duration_seconds", 300)
-            if metadata.get("duration", 0) > max_duration:
-                return VideoProcessingResult(
-                    success=False,
-                    error=f"Video too long ({metadata['duration']:.0f}s > {max_duration}s limit)",
-                    duration_seconds=metadata.get("duration"),
+                # One decode pass for key frames and the audio track
+                timestamps = []
+                if video_config.get("extract_frames", True):
+                    timestamps = frame_timestamps(
+                        metadata.get("duration", 0), video_config.get("max_frames", 3)
+                    )
+                with_audio = video_config.get("transcribe_audio", True) and metadata["has_audio"]
+
+                frames, audio_bytes = await self._extract_streams(
+                    input_arg, input_bytes, job_dir, timestamps, with_audio
                 )
 
-            result = VideoProcessingResult(
-                success=True,
-                duration_seconds=metadata.get("duration"),
-                width=metadata.get("width"),
-                height=metadata.get("height"),
-                fps=metadata.get("fps"),
+            # Transcription and frame analysis are independent API calls
+            audio_result, frame_result = await asyncio.gather(
+                self._transcribe_audio(audio_bytes),
+                self._analyze_frames(frames, video_config),
             )
 
-            # Extract and transcribe audio
-            if video_config.get("transcribe_audio", True):
-                audio_result = await self._extract_and_transcribe_audio(
-                    video_path, video_config
-                )
-                if audio_result:
-                    result.transcription = audio_result.get("text")
-                    result.audio_language = audio_result.get("language")
-                    result.transcription_cost_usd = audio_result.get("cost", 0.0)
-
-            # Extract key frames
-            if video_config.get("extract_frames", True):
-                frame_result = await self._extract_and_analyze_frames(
-                    video_path, metadata, video_config
-                )
-                if frame_result:
-                    result.frame_descriptions = frame_result.get("descriptions", [])
-                    result.thumbnail_bytes = frame_result.get("thumbnail")
-                    result.vision_cost_usd = frame_result.get("cost", 0.0)
+            if audio_result:
+                result.transcription = audio_result.get("text")
+                result.audio_language = audio_result.get("language")
+                result.transcription_cost_usd = audio_result.get("cost", 0.0)
 
-            # Cleanup temp video file
-            try:
-                video_path.unlink()
-            except Exception:
-                pass
+            if frame_result:
+                result.frame_descriptions = frame_result.get("descriptions", [])
+                result.thumbnail_bytes = frame_result.get("thumbnail")
+                result.vision_cost_usd = frame_result.get("cost", 0.0)
 
             return result
 
@@ -255,132 +430,183 @@ class VideoProcessor:
                 error=f"Video processing failed: {str(e)[:100]}",
             )
 
-    async def _get_video_metadata(self, video_path: Path) -> dict[str, Any] | None:
+    def _input_source(
+        self, video_bytes: bytes | Path, ext: str, job_dir: Path
+    ) -> tuple[str, bytes | None]:
         """
-        Get video metadata using FFprobe.
+        Decide how FFmpeg reads the video.
 
-        Args:
-            video_path: Path to video file
+        Files on disk are read in place. Bytes stream through stdin when the
+        container can be read front to back; MP4-family files with the index
+        (moov) after the media data need seeking, so those are written to
+        the job directory instead.
 
         Returns:
-            Dict with duration, width, height, fps or None on error
+            Tuple of (ffmpeg input argument, bytes to pipe or None)
         """
-        try:
-            import json as json_module
-
-            cmd = [
-                "ffprobe",
-                "-v", "quiet",
-                "-print_format", "json",
-                "-show_format",
-                "-show_streams",
-                str(video_path),
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=30,
-            )
-
-            if result.returncode != 0:
-                return None
-
-            data = json_module.loads(result.stdout)
-
-            # Find video stream
-            video_stream = None
-            for stream in data.get("streams", []):
-                if stream.get("codec_type") == "video":
-                    video_stream = stream
-                    break
-
-            if not video_stream:
-                return None
+        if isinstance(video_bytes, Path):
+            return str(video_bytes), None
+        if ext in SEEKABLE_FORMATS and not mp4_index_first(video_bytes):
+            video_path = job_dir / f"input.{ext}"
+            video_path.write_bytes(video_bytes)
+            return str(video_path), None
+        return "pipe:0", video_bytes
 
-            # Extract metadata
-            duration = float(data.get("format", {}).get("duration", 0))
+    async def _probe(self, input_arg: str, input_bytes: bytes | None) -> dict[str, Any] | None:
+        """
+        Read video metadata from FFmpeg's stream summary (header only).
 
-            # Parse frame rate (can be "24/1" or "23.976")
-            fps_str = video_stream.get("r_frame_rate", "0/1")
-            if "/" in fps_str:
-                num, den = fps_str.split("/")
-                fps = float(num) / float(den) if float(den) > 0 else 0
-            else:
-                fps = float(fps_str)
+        Args:
+            input_arg: FFmpeg input (path or pipe:0)
+            input_bytes: Bytes to pipe when input_arg is pipe:0
 
-            return {
-                "duration": duration,
-                "width": video_stream.get("width"),
-                "height": video_stream.get("height"),
-                "fps": fps,
-            }
+        Returns:
+            Dict with duration, width, height, fps, has_audio or None on error
+        """
+        try:
+            # No output file: FFmpeg prints the input summary and exits
+            result = await run_ffmpeg(
+                ["-hide_banner", "-i", input_arg],
+                input_bytes=input_bytes,
+                timeout=PROBE_TIMEOUT_SECONDS,
+            )
+            return parse_stream_info(result.stderr.decode("utf-8", errors="replace"))
 
         except Exception as e:
             logger.error(f"Failed to get video metadata: {e}")
             return None
 
-    async def _extract_and_transcribe_audio(
+    async def _extract_streams(
         self,
-        video_path: Path,
-        config: dict[str, Any],
-    ) -> dict[str, Any] | None:
+        input_arg: str,
+        input_bytes: bytes | None,
+        job_dir: Path,
+        timestamps: list[float],
+        with_audio: bool,
+    ) -> tuple[list[dict[str, Any]], bytes | None]:
         """
-        Extract audio track and transcribe using Whisper.
+        Extract key frames and the audio track in a single pass.
+
+        A keyframe at most KEYFRAME_TOLERANCE_SECONDS before a timestamp
+        stands in for it; when any timestamp has none, a second full-decode
+        pass extracts the exact frames instead.
 
         Args:
-            video_path: Path to video file
-            config: Video processing config
+            input_arg: FFmpeg input (path or pipe:0)
+            input_bytes: Bytes to pipe when input_arg is pipe:0
+            job_dir: Per-job output directory
+            timestamps: Seconds at which to grab frames
+            with_audio: Also extract 16kHz mono MP3 for Whisper
 
         Returns:
-            Dict with text, language, cost or None on error
+            Tuple of (frames [{"bytes", "timestamp"}], audio bytes or None);
+            the timestamp is None when fewer frames than requested came out
         """
-        try:
-            # Extract audio to temp file
-            audio_path = self._temp_dir / f"{uuid.uuid4()}.mp3"
-
-            cmd = [
-                "ffmpeg",
-                "-i", str(video_path),
+        if not timestamps and not with_audio:
+            return [], None
+
+        audio_path = job_dir / "audio.mp3"
+        args = []
+        if timestamps:
+            # Decode keyframes only: the whole stream is read once but only
+            # a handful of frames are decoded
+            select = keyframe_select_expression(timestamps, KEYFRAME_TOLERANCE_SECONDS)
+            args += ["-skip_frame", "nokey", "-i", input_arg]
+            args += self._frame_output_args(select, len(timestamps), job_dir / "key_%02d.jpg")
+        else:
+            args += ["-i", input_arg]
+        if with_audio:
+            args += [
+                "-map", "0:a:0",
                 "-vn",  # No video
                 "-acodec", "libmp3lame",
                 "-ar", "16000",  # 16kHz for Whisper
                 "-ac", "1",  # Mono
                 "-q:a", "4",  # Quality
                 str(audio_path),
-                "-y",  # Overwrite
             ]
+        await self._run_extraction(args, input_bytes)
+
+        frames = self._collect_frames(job_dir, "key_*.jpg", timestamps)
+        if len(frames) < len(timestamps):
+            # Sparse keyframes (short clips): decode every frame instead
+            args = ["-i", input_arg]
+            select = select_expression(timestamps)
+            args += self._frame_output_args(select, len(timestamps), job_dir / "frame_%02d.jpg")
+            await self._run_extraction(args, input_bytes)
+            frames = self._collect_frames(job_dir, "frame_*.jpg", timestamps)
+
+        audio_bytes = None
+        # Less than 1KB = likely no (or silent) audio
+        if with_audio and audio_path.exists() and audio_path.stat().st_size >= 1000:
+            audio_bytes = audio_path.read_bytes()
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=60,
+        return frames, audio_bytes
+
+    @staticmethod
+    def _frame_output_args(select: str, count: int, pattern: Path) -> list[str]:
+        return [
+            "-map", "0:v:0",
+            "-vf", f"select='{select}'",
+            "-vsync", "vfr",
+            "-frames:v", str(count),
+            "-q:v", "2",  # High quality JPEG
+            str(pattern),
+        ]
+
+    @staticmethod
+    def _collect_frames(
+        job_dir: Path, glob: str, timestamps: list[float]
+    ) -> list[dict[str, Any]]:
+        paths = sorted(job_dir.glob(glob))
+        if len(paths) != len(timestamps):
+            # A timestamp past the end of the stream (or two sharing one
+            # frame) yields fewer frames, and which one is missing is
+            # unknown: leave them unlabelled instead of shifting the labels
+            return [{"bytes": path.read_bytes(), "timestamp": None} for path in paths]
+        return [
+            {"bytes": path.read_bytes(), "timestamp": ts}
+            for path, ts in zip(paths, timestamps, strict=True)
+        ]
+
+    async def _run_extraction(self, args: list[str], input_bytes: bytes | None) -> None:
+        timeout = self.config.get("processing", {}).get("video", {}).get(
+            "ffmpeg_timeout_seconds", FFMPEG_TIMEOUT_SECONDS
+        )
+        try:
+            result = await run_ffmpeg(
+                ["-hide_banner", "-loglevel", "error", *args, "-y"],
+                input_bytes=input_bytes,
+                timeout=timeout,
             )
+            if result.returncode != 0:
+                logger.warning(f"FFmpeg extraction failed: {result.stderr[:200]}")
+        except TimeoutError:
+            logger.warning(f"FFmpeg extraction timed out after {timeout}s")
 
-            if result.returncode != 0 or not audio_path.exists():
-                logger.warning(f"Audio extraction failed: {result.stderr[:200]}")
-                return None
+    async def _transcribe_audio(self, audio_bytes: bytes | None) -> dict[str, Any] | None:
+        """
+        Transcribe the extracted audio track using Whisper.
 
-            # Check if audio was actually extracted (not silent)
-            if audio_path.stat().st_size < 1000:  # Less than 1KB = likely no audio
-                audio_path.unlink()
-                return None
+        Args:
+            audio_bytes: 16kHz mono MP3 data (None when there is no audio)
+
+        Returns:
+            Dict with text, language, cost or None on error
+        """
+        if not audio_bytes:
+            return None
 
-            # Transcribe using AudioProcessor
+        try:
             from tools.channels.audio_processor import get_audio_processor
 
             processor = get_audio_processor()
-            audio_bytes = audio_path.read_bytes()
-
             transcription = await processor.transcribe(
                 audio_bytes,
                 "audio.mp3",
                 "audio/mpeg",
             )
 
-            # Cleanup
-            audio_path.unlink()
-
             if transcription.success:
                 return {
                     "text": transcription.text,
@@ -391,113 +617,67 @@ class VideoProcessor:
                 return None
 
         except Exception as e:
-            logger.error(f"Audio extraction/transcription failed: {e}")
+            logger.error(f"Audio transcription failed: {e}")
             return None
 
-    async def _extract_and_analyze_frames(
+    async def _analyze_frames(
         self,
-        video_path: Path,
-        metadata: dict[str, Any],
+        frames: list[dict[str, Any]],
         config: dict[str, Any],
     ) -> dict[str, Any] | None:
         """
-        Extract key frames and analyze with Vision API.
+        Analyze extracted key frames with the Vision API.
 
         Args:
-            video_path: Path to video file
-            metadata: Video metadata
+            frames: Frames from _extract_streams
             config: Video processing config
 
         Returns:
             Dict with descriptions, thumbnail, cost or None on error
         """
-        try:
-            duration = metadata.get("duration", 0)
-            max_frames = config.get("max_frames", 3)
-
-            # Calculate frame extraction points (start, middle, end)
-            if duration <= 5:
-                # Short video: just get one frame from middle
-                timestamps = [duration / 2]
-            elif duration <= 30:
-                # Medium video: start, middle, end
-                timestamps = [1, duration / 2, duration - 1]
-            else:
-                # Long video: sample evenly
-                step = duration / (max_frames + 1)
-                timestamps = [step * (i + 1) for i in range(max_frames)]
-
-            # Extract frames
-            frames = []
-            for i, ts in enumerate(timestamps[:max_frames]):
-                frame_path = self._temp_dir / f"frame_{i}.jpg"
-
-                cmd = [
-                    "ffmpeg",
-                    "-ss", str(ts),
-                    "-i", str(video_path),
-                    "-vframes", "1",
-                    "-q:v", "2",  # High quality JPEG
-                    str(frame_path),
-                    "-y",
-                ]
-
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    timeout=30,
-                )
-
-                if result.returncode == 0 and frame_path.exists():
-                    frames.append({
-                        "path": frame_path,
-                        "timestamp": ts,
-                    })
-
-            if not frames:
-                return None
-
-            # Use first frame as thumbnail
-            thumbnail_bytes = frames[0]["path"].read_bytes()
-
-            # Analyze frames with Vision API
-            descriptions = []
-            total_vision_cost = 0.0
-
-            if config.get("analyze_frames", True):
-                from tools.channels.media_processor import MediaProcessor
+        if not frames:
+            return None
 
-                processor = MediaProcessor(self.config)
+        # Use first frame as thumbnail
+        thumbnail_bytes = frames[0]["bytes"]
 
-                for frame in frames:
-                    frame_bytes = frame["path"].read_bytes()
+        descriptions = []
+        total_vision_cost = 0.0
 
-                    # Prepare for vision
-                    prepared = await processor._prepare_image_for_vision(frame_bytes)
-                    if prepared:
-                        try:
-                            desc, cost = await processor._call_vision_api(prepared)
-                            descriptions.append(f"[{frame['timestamp']:.1f}s] {desc}")
-                            total_vision_cost += cost
-                        except Exception as e:
-                            logger.warning(f"Frame analysis failed: {e}")
+        if config.get("analyze_frames", True):
+            processor = self._get_media_processor()
 
-            # Cleanup frame files
-            for frame in frames:
+            async def describe(frame: dict[str, Any]) -> tuple[str, float] | None:
+                prepared = await processor._prepare_image_for_vision(frame["bytes"])
+                if not prepared:
+                    return None
                 try:
-                    frame["path"].unlink()
-                except Exception:
-                    pass
+                    desc, cost = await processor._call_vision_api(prepared)
+                    if frame["timestamp"] is None:
+                        return desc, cost
+                    return f"[{frame['timestamp']:.1f}s] {desc}", cost
+                except Exception as e:
+                    logger.warning(f"Frame analysis failed: {e}")
+                    return None
+
+            for described in await asyncio.gather(*(describe(f) for f in frames)):
+                if described:
+                    descriptions.append(described[0])
+                    total_vision_cost += described[1]
 
-            return {
-                "descriptions": descriptions,
-                "thumbnail": thumbnail_bytes,
-                "cost": total_vision_cost,
-            }
+        return {
+            "descriptions": descriptions,
+            "thumbnail": thumbnail_bytes,
+            "cost": total_vision_cost,
+        }
 
-        except Exception as e:
-            logger.error(f"Frame extraction/analysis failed: {e}")
-            return None
+    def _get_media_processor(self):
+        """MediaProcessor used for frame analysis (shares one worker pool)."""
+        if self._media_processor is None:
+            from tools.channels.media_processor import MediaProcessor
+
+            self._media_processor = MediaProcessor(self.config)
+        return self._media_processor
 
     def _get_extension(self, filename: str, mime_type: str) -> str:
         """Get file extension from filename or MIME type."""
@@ -511,6 +691,9 @@ class VideoProcessor:
         """Remove temporary files."""
         import shutil
 
+        if self._media_processor is not None:
+            self._media_processor.cleanup()
+
         try:
             shutil.rmtree(self._temp_dir, ignore_errors=True)
         except Exception:
@@ -570,9 +753,8 @@ def main():
                 print(f"File not found: {file_path}")
                 return
 
-            video_bytes = file_path.read_bytes()
             result = await processor.process_video(
-                video_bytes,
+                file_path,
                 file_path.name,
                 f"video/{file_path.suffix.lstrip('.')}"
             )
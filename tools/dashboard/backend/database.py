@@ -2,19 +2,33 @@
 Dashboard Database Module
 
 Handles SQLite database operations for dashboard-specific tables:
-- dashboard_events: Activity and event logging
-- dashboard_metrics: Time-series metrics storage
+- dashboard_events: Activity and event logging (keyset-paginated by
+  timestamp and id, with composite indexes per filter)
+- dashboard_metrics: Time-series metrics storage (raw rows, aged out after
+  RAW_METRIC_RETENTION_DAYS)
+- dashboard_metric_rollups / dashboard_metric_histograms: per-minute, hour
+  and day buckets (count/sum/min/max, log-bucketed histogram for latency
+  metrics) maintained at write time; charts read only these
+- dashboard_event_rollups: per-bucket event counts by type, severity and
+  channel, used by the quick stats cards
 - dex_state: Current Dex avatar state
 - dashboard_preferences: User UI preferences
 """
 
+import base64
+import binascii
 import json
 import logging
 import os
 import sqlite3
-from datetime import datetime
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from tools import db_connections
+from tools.ops.sketch import LatencySketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,13 +39,73 @@ DB_PATH = PROJECT_ROOT / "data" / "dashboard.db"
 # Seeding control via environment variable
 SEED_DATA_ON_INIT = os.getenv("DEXAI_SEED_DATA", "false").lower() in ("true", "1", "yes")
 
+# Rollup buckets, keyed by the start of the bucket in local time
+BUCKET_FORMATS = {
+    "minute": "%Y-%m-%d %H:%M:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+}
+
+# Metrics that also keep a histogram per bucket (for percentiles)
+SKETCHED_METRICS = frozenset({"response_time_ms"})
+PERCENTILE_AGGREGATIONS = {"p50": 0.50, "p90": 0.90, "p95": 0.95, "p99": 0.99}
+
+# Retention: raw metric rows and fine-grained buckets are aged out;
+# None keeps buckets forever
+RAW_METRIC_RETENTION_DAYS = 7
+ROLLUP_RETENTION_DAYS: dict[str, int | None] = {"minute": 2, "hour": 90, "day": None}
+RETENTION_INTERVAL_SECONDS = 3600.0
+
+# Events per query when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Histogram layout shared by every bucket (only bucket_index() is used)
+_HISTOGRAM = LatencySketch()
+_last_retention = 0.0
+
+
+def _init_rollups(conn: sqlite3.Connection) -> None:
+    """Create the rollup tables (writers may run before init_db)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_metric_rollups (
+            metric_name TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            min_value REAL NOT NULL,
+            max_value REAL NOT NULL,
+            PRIMARY KEY (metric_name, resolution, bucket)
+        ) WITHOUT ROWID
+    """)
+    # Positive histogram bins only: the zero bucket is count - SUM(bins)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_metric_histograms (
+            metric_name TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            bin INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (metric_name, resolution, bucket, bin)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_event_rollups (
+            resolution TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (resolution, bucket, event_type, severity, channel)
+        ) WITHOUT ROWID
+    """)
+    conn.commit()
+
 
 def get_db_connection() -> sqlite3.Connection:
     """Get database connection with row factory."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_connections.get_connection(DB_PATH, init_schema=_init_rollups)
 
 
 def init_db():
@@ -130,18 +204,25 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_routing_decisions_model
         ON routing_decisions(model)
     """)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_dashboard_events_timestamp
-        ON dashboard_events(timestamp DESC)
-    """)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_dashboard_events_type
-        ON dashboard_events(event_type)
-    """)
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_dashboard_events_severity
-        ON dashboard_events(severity)
-    """)
+    # Activity feed pages seek on (timestamp, id) after the equality
+    # filters, so every filter gets an index ending in (timestamp, id)
+    for old_index in (
+        "idx_dashboard_events_timestamp",
+        "idx_dashboard_events_type",
+        "idx_dashboard_events_severity",
+    ):
+        cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+    for name, columns in (
+        ("time", "timestamp, id"),
+        ("type_time", "event_type, timestamp, id"),
+        ("severity_time", "severity, timestamp, id"),
+        ("channel_time", "channel, timestamp, id"),
+        ("filters_time", "event_type, severity, channel, timestamp, id"),
+    ):
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_dashboard_events_{name}
+            ON dashboard_events({columns})
+        """)
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_dashboard_metrics_name_time
         ON dashboard_metrics(metric_name, timestamp DESC)
@@ -182,6 +263,12 @@ def init_db():
         except Exception as e:
             print(f"[Database] Seed error (non-fatal): {e}")
 
+    # Databases created before rollups existed have raw rows only: build
+    # their buckets once (seed_database() rebuilds after seeding itself)
+    if (events_count or metrics_count) and not _has_rollups():
+        rebuild_rollups()
+    apply_retention()
+
 
 # =============================================================================
 # Event Operations
@@ -213,18 +300,10 @@ def log_event(
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    details_json = json.dumps(details) if details else None
-
-    cursor.execute(
-        """
-        INSERT INTO dashboard_events
-        (event_type, timestamp, channel, user_id, summary, details, severity)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """,
-        (event_type, datetime.now().isoformat(), channel, user_id, summary, details_json, severity),
+    event_id = _insert_event(
+        cursor, event_type, summary, channel=channel, user_id=user_id,
+        details=details or None, severity=severity,
     )
-
-    event_id = cursor.lastrowid
     conn.commit()
     conn.close()
 
@@ -242,26 +321,22 @@ def record_tool_use(
     """Record a tool use event for dashboard analytics."""
     conn = get_db_connection()
     try:
-        cursor = conn.execute(
-            """INSERT INTO dashboard_events (event_type, timestamp, user_id, summary, details, severity)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                "tool_use",
-                datetime.now().isoformat(),
-                user_id or "system",
-                f"Tool: {tool_name} ({'ok' if success else 'fail'})",
-                json.dumps({
-                    "tool_name": tool_name,
-                    "tool_use_id": tool_use_id,
-                    "success": success,
-                    "duration_ms": duration_ms,
-                    **(details or {}),
-                }),
-                "info" if success else "warning",
-            ),
+        event_id = _insert_event(
+            conn.cursor(),
+            "tool_use",
+            f"Tool: {tool_name} ({'ok' if success else 'fail'})",
+            user_id=user_id or "system",
+            details={
+                "tool_name": tool_name,
+                "tool_use_id": tool_use_id,
+                "success": success,
+                "duration_ms": duration_ms,
+                **(details or {}),
+            },
+            severity="info" if success else "warning",
         )
         conn.commit()
-        return cursor.lastrowid or 0
+        return event_id
     finally:
         conn.close()
 
@@ -280,69 +355,153 @@ def log_audit(
     """
     conn = get_db_connection()
     try:
-        cursor = conn.execute(
-            """INSERT INTO dashboard_events (event_type, timestamp, user_id, summary, details, severity)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                event_type,
-                datetime.now().isoformat(),
-                actor or "system",
-                f"{event_type}: {target or 'n/a'}",
-                json.dumps({
-                    "severity": severity,
-                    "target": target,
-                    **(details or {}),
-                }),
-                severity,
-            ),
+        event_id = _insert_event(
+            conn.cursor(),
+            event_type,
+            f"{event_type}: {target or 'n/a'}",
+            user_id=actor or "system",
+            details={
+                "severity": severity,
+                "target": target,
+                **(details or {}),
+            },
+            severity=severity,
         )
         conn.commit()
-        return cursor.lastrowid or 0
+        return event_id
     finally:
         conn.close()
 
 
-def get_events(
-    event_type: str | None = None,
-    severity: str | None = None,
+def _insert_event(
+    cursor: sqlite3.Cursor,
+    event_type: str,
+    summary: str,
     channel: str | None = None,
-    limit: int = 100,
-    offset: int = 0,
-    start_date: datetime | None = None,
-    end_date: datetime | None = None,
-) -> list[dict]:
+    user_id: str | None = None,
+    details: dict | None = None,
+    severity: str = "info",
+) -> int:
     """
-    Get dashboard events with optional filters.
+    Insert one dashboard event and count it in the rollups (caller commits).
 
-    Returns list of event dictionaries.
+    Every writer of dashboard_events goes through here so the event
+    buckets read by get_quick_stats() and aggregate_metrics() stay exact.
+
+    Returns:
+        Event ID
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    now = datetime.now()
+    cursor.execute(
+        """
+        INSERT INTO dashboard_events
+        (event_type, timestamp, channel, user_id, summary, details, severity)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+        (
+            event_type,
+            now.isoformat(),
+            channel,
+            user_id,
+            summary,
+            json.dumps(details) if details is not None else None,
+            severity,
+        ),
+    )
+    event_id = cursor.lastrowid or 0
+    _rollup_event(cursor, event_type, severity, channel, now)
+    return event_id
 
-    query = "SELECT * FROM dashboard_events WHERE 1=1"
-    params = []
+
+def _rollup_event(
+    cursor: sqlite3.Cursor,
+    event_type: str,
+    severity: str | None,
+    channel: str | None,
+    ts: datetime,
+) -> None:
+    """Count one event in its minute, hour and day buckets (same transaction)."""
+    cursor.executemany(
+        """
+        INSERT INTO dashboard_event_rollups
+        (resolution, bucket, event_type, severity, channel, count)
+        VALUES (?, ?, ?, ?, ?, 1)
+        ON CONFLICT (resolution, bucket, event_type, severity, channel)
+        DO UPDATE SET count = count + 1
+    """,
+        [
+            (resolution, ts.strftime(fmt), event_type, severity or "", channel or "")
+            for resolution, fmt in BUCKET_FORMATS.items()
+        ],
+    )
+
+
+def _event_filters(
+    event_type: str | None,
+    severity: str | None,
+    channel: str | None,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> tuple[str, list]:
+    """WHERE clause and parameters shared by the event queries."""
+    where = "1=1"
+    params: list = []
 
     if event_type:
-        query += " AND event_type = ?"
+        where += " AND event_type = ?"
         params.append(event_type)
 
     if severity:
-        query += " AND severity = ?"
+        where += " AND severity = ?"
         params.append(severity)
 
     if channel:
-        query += " AND channel = ?"
+        where += " AND channel = ?"
         params.append(channel)
 
     if start_date:
-        query += " AND timestamp >= ?"
+        where += " AND timestamp >= ?"
         params.append(start_date.isoformat())
 
     if end_date:
-        query += " AND timestamp <= ?"
+        where += " AND timestamp <= ?"
         params.append(end_date.isoformat())
 
-    query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
+    return where, params
+
+
+def get_events(
+    event_type: str | None = None,
+    severity: str | None = None,
+    channel: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    before: tuple[str, int] | None = None,
+) -> list[dict]:
+    """
+    Get dashboard events with optional filters, newest first.
+
+    Args:
+        before: Keyset position (timestamp, id) of the last event of the
+            previous page; only older events are returned. Unlike offset,
+            the cost does not grow with the page depth.
+
+    Returns list of event dictionaries.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    where, params = _event_filters(event_type, severity, channel, start_date, end_date)
+    if before:
+        where += " AND (timestamp, id) < (?, ?)"
+        params.extend(before)
+
+    query = f"""
+        SELECT * FROM dashboard_events WHERE {where}
+        ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?
+    """
     params.extend([limit, offset])
 
     cursor.execute(query, params)
@@ -362,6 +521,31 @@ def get_events(
     return events
 
 
+def iter_events(
+    event_type: str | None = None,
+    severity: str | None = None,
+    channel: str | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """
+    Yield every matching event, newest first, one keyset page at a time.
+
+    Each batch is a separate short query, so no connection or read
+    transaction is held while the caller consumes (e.g. streams) events.
+    """
+    before = None
+    while True:
+        batch = get_events(
+            event_type, severity, channel, batch_size, 0, start_date, end_date, before
+        )
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        before = (batch[-1]["timestamp"], batch[-1]["id"])
+
+
 def count_events(
     event_type: str | None = None,
     severity: str | None = None,
@@ -369,38 +553,44 @@ def count_events(
     start_date: datetime | None = None,
     end_date: datetime | None = None,
 ) -> int:
-    """Count events matching filters."""
+    """
+    Count events matching filters.
+
+    Every filter combination has a covering index, so the count reads
+    index pages only (and is always exact).
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    query = "SELECT COUNT(*) as count FROM dashboard_events WHERE 1=1"
-    params = []
-
-    if event_type:
-        query += " AND event_type = ?"
-        params.append(event_type)
-
-    if severity:
-        query += " AND severity = ?"
-        params.append(severity)
+    where, params = _event_filters(event_type, severity, channel, start_date, end_date)
+    cursor.execute(f"SELECT COUNT(*) as count FROM dashboard_events WHERE {where}", params)
+    count = cursor.fetchone()["count"]
+    conn.close()
 
-    if channel:
-        query += " AND channel = ?"
-        params.append(channel)
+    return count
 
-    if start_date:
-        query += " AND timestamp >= ?"
-        params.append(start_date.isoformat())
 
-    if end_date:
-        query += " AND timestamp <= ?"
-        params.append(end_date.isoformat())
+def encode_event_cursor(event: dict, total: int) -> str:
+    """
+    Opaque activity feed cursor: keyset position of ``event`` plus the
+    total computed for the first page, so later pages skip the count.
+    """
+    payload = json.dumps([event["timestamp"], event["id"], total])
+    return base64.urlsafe_b64encode(payload.encode()).decode("ascii").rstrip("=")
 
-    cursor.execute(query, params)
-    count = cursor.fetchone()["count"]
-    conn.close()
 
-    return count
+def decode_event_cursor(cursor: str) -> tuple[tuple[str, int], int] | None:
+    """Inverse of encode_event_cursor(); None if the cursor is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, event_id, total = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if not isinstance(timestamp, str) or not isinstance(event_id, int):
+        return None
+    if not isinstance(total, int):
+        return None
+    return (timestamp, event_id), total
 
 
 # =============================================================================
@@ -430,7 +620,7 @@ def record_metric(
     cursor = conn.cursor()
 
     labels_json = json.dumps(labels) if labels else None
-    ts = (timestamp or datetime.now()).isoformat()
+    ts = timestamp or datetime.now()
 
     cursor.execute(
         """
@@ -438,16 +628,54 @@ def record_metric(
         (metric_name, metric_value, timestamp, labels)
         VALUES (?, ?, ?, ?)
     """,
-        (metric_name, metric_value, ts, labels_json),
+        (metric_name, metric_value, ts.isoformat(), labels_json),
     )
 
     metric_id = cursor.lastrowid
+    _rollup_metric(cursor, metric_name, metric_value, ts)
     conn.commit()
     conn.close()
 
+    if time.monotonic() - _last_retention >= RETENTION_INTERVAL_SECONDS:
+        apply_retention()
+
     return metric_id
 
 
+def _rollup_metric(
+    cursor: sqlite3.Cursor, metric_name: str, value: float, ts: datetime
+) -> None:
+    """Fold one value into its minute, hour and day buckets (same transaction)."""
+    buckets = [(resolution, ts.strftime(fmt)) for resolution, fmt in BUCKET_FORMATS.items()]
+    cursor.executemany(
+        """
+        INSERT INTO dashboard_metric_rollups
+        (metric_name, resolution, bucket, count, total, min_value, max_value)
+        VALUES (?, ?, ?, 1, ?, ?, ?)
+        ON CONFLICT (metric_name, resolution, bucket) DO UPDATE SET
+            count = count + 1,
+            total = total + excluded.total,
+            min_value = MIN(min_value, excluded.min_value),
+            max_value = MAX(max_value, excluded.max_value)
+    """,
+        [(metric_name, resolution, bucket, value, value, value) for resolution, bucket in buckets],
+    )
+    if metric_name not in SKETCHED_METRICS:
+        return
+    index = _HISTOGRAM.bucket_index(value)
+    if index is None:
+        return
+    cursor.executemany(
+        """
+        INSERT INTO dashboard_metric_histograms
+        (metric_name, resolution, bucket, bin, count)
+        VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT (metric_name, resolution, bucket, bin) DO UPDATE SET count = count + 1
+    """,
+        [(metric_name, resolution, bucket, index) for resolution, bucket in buckets],
+    )
+
+
 def get_metrics(
     metric_name: str,
     start_date: datetime | None = None,
@@ -506,55 +734,278 @@ def aggregate_metrics(
 
     Args:
         metric_name: Metric to aggregate
-        aggregation: sum, avg, max, min, count
+        aggregation: sum, avg, max, min, count (or p50/p90/p95/p99 for
+            SKETCHED_METRICS)
         start_date: Start of range
         end_date: End of range
-        group_by_interval: 1h, 1d, 1w
+        group_by_interval: 1m, 1h, 1d, 1w
 
     Returns:
         List of {timestamp, value} dicts
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return aggregate_metrics_many(
+        [metric_name], aggregation, start_date, end_date, group_by_interval
+    )[metric_name]
+
+
+def aggregate_metrics_many(
+    metric_names: list[str],
+    aggregation: str = "sum",
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    group_by_interval: str = "1h",
+) -> dict[str, list[dict]]:
+    """
+    Aggregate several metrics by time interval in one query.
+
+    Reads the rollup buckets, never the raw rows. The range is widened to
+    whole buckets: a bucket is included if it starts in [start, end]
+    after both ends are rounded down to the bucket size.
 
-    # SQLite date formatting for grouping
-    if group_by_interval == "1h":
-        date_format = "%Y-%m-%d %H:00:00"
+    Returns:
+        Dict of metric name -> list of {timestamp, value} dicts
+    """
+    if group_by_interval == "1m":
+        resolution, period = "minute", "bucket"
     elif group_by_interval == "1d":
-        date_format = "%Y-%m-%d 00:00:00"
+        resolution, period = "day", "bucket"
     elif group_by_interval == "1w":
-        date_format = "%Y-%W"
+        resolution, period = "day", "strftime('%Y-%W', bucket)"
     else:
-        date_format = "%Y-%m-%d %H:00:00"
+        resolution, period = "hour", "bucket"
 
-    agg_func = {"sum": "SUM", "avg": "AVG", "max": "MAX", "min": "MIN", "count": "COUNT"}.get(
-        aggregation, "SUM"
+    where = "resolution = ? AND metric_name IN (SELECT value FROM json_each(?))"
+    params: list = [resolution, json.dumps(list(metric_names))]
+    if start_date:
+        where += " AND bucket >= ?"
+        params.append(start_date.strftime(BUCKET_FORMATS[resolution]))
+    if end_date:
+        where += " AND bucket <= ?"
+        params.append(end_date.strftime(BUCKET_FORMATS[resolution]))
+
+    series: dict[str, list[dict]] = {name: [] for name in metric_names}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    if aggregation in PERCENTILE_AGGREGATIONS:
+        sketches = _bucket_sketches(cursor, period, where, params)
+        conn.close()
+        q = PERCENTILE_AGGREGATIONS[aggregation]
+        for (name, timestamp), sketch in sketches.items():
+            series[name].append({"timestamp": timestamp, "value": sketch.quantile(q)})
+        return series
+
+    value = {
+        "sum": "SUM(total)",
+        "avg": "SUM(total) / SUM(count)",
+        "max": "MAX(max_value)",
+        "min": "MIN(min_value)",
+        "count": "SUM(count)",
+    }.get(aggregation, "SUM(total)")
+    cursor.execute(
+        f"""
+        SELECT metric_name, {period} as period, {value} as value
+        FROM dashboard_metric_rollups
+        WHERE {where}
+        GROUP BY metric_name, period
+        ORDER BY metric_name, period
+    """,
+        params,
     )
+    rows = cursor.fetchall()
+    conn.close()
 
-    query = f"""
-        SELECT
-            strftime('{date_format}', timestamp) as period,
-            {agg_func}(metric_value) as value
-        FROM dashboard_metrics
-        WHERE metric_name = ?
+    for row in rows:
+        series[row["metric_name"]].append({"timestamp": row["period"], "value": row["value"]})
+    return series
+
+
+def _bucket_sketches(
+    cursor: sqlite3.Cursor, period: str, where: str, params: list
+) -> dict[tuple[str, str], LatencySketch]:
+    """Merge histogram buckets into one sketch per (metric, period)."""
+    where += " AND metric_name IN (SELECT value FROM json_each(?))"
+    params = [*params, json.dumps(sorted(SKETCHED_METRICS))]
+    cursor.execute(
+        f"""
+        SELECT metric_name, {period} as period, SUM(count) as count, SUM(total) as total,
+               MIN(min_value) as min_value, MAX(max_value) as max_value
+        FROM dashboard_metric_rollups
+        WHERE {where}
+        GROUP BY metric_name, period
+        ORDER BY metric_name, period
+    """,
+        params,
+    )
+    totals = cursor.fetchall()
+    cursor.execute(
+        f"""
+        SELECT metric_name, {period} as period, bin, SUM(count) as count
+        FROM dashboard_metric_histograms
+        WHERE {where}
+        GROUP BY metric_name, period, bin
+    """,
+        params,
+    )
+    bins: dict[tuple[str, str], dict[int, int]] = {}
+    for row in cursor.fetchall():
+        bins.setdefault((row["metric_name"], row["period"]), {})[row["bin"]] = row["count"]
+
+    sketches = {}
+    for row in totals:
+        key = (row["metric_name"], row["period"])
+        buckets = bins.get(key, {})
+        sketches[key] = LatencySketch.from_dict({
+            "buckets": buckets,
+            "zero_count": row["count"] - sum(buckets.values()),
+            "count": row["count"],
+            "total": row["total"],
+            "min": row["min_value"],
+            "max": row["max_value"],
+        })
+    return sketches
+
+
+# =============================================================================
+# Rollup Maintenance
+# =============================================================================
+
+
+def _has_rollups() -> bool:
+    conn = get_db_connection()
+    row = conn.execute(
+        """
+        SELECT EXISTS(SELECT 1 FROM dashboard_metric_rollups)
+            OR EXISTS(SELECT 1 FROM dashboard_event_rollups) as present
     """
-    params = [metric_name]
+    ).fetchone()
+    conn.close()
+    return bool(row["present"])
 
-    if start_date:
-        query += " AND timestamp >= ?"
-        params.append(start_date.isoformat())
 
-    if end_date:
-        query += " AND timestamp <= ?"
-        params.append(end_date.isoformat())
+def rebuild_rollups() -> dict:
+    """
+    Recompute every rollup bucket from the raw tables.
 
-    query += " GROUP BY period ORDER BY period"
+    For rows written without record_metric()/log_event() (seed data,
+    databases created before rollups). Buckets whose raw rows were already
+    aged out are lost, so this is not part of normal operation.
 
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
+    Returns:
+        Dict with metric and event bucket counts
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM dashboard_metric_rollups")
+    cursor.execute("DELETE FROM dashboard_metric_histograms")
+    cursor.execute("DELETE FROM dashboard_event_rollups")
+
+    for resolution, fmt in BUCKET_FORMATS.items():
+        cursor.execute(
+            """
+            INSERT INTO dashboard_metric_rollups
+            (metric_name, resolution, bucket, count, total, min_value, max_value)
+            SELECT metric_name, ?, strftime(?, timestamp), COUNT(*), SUM(metric_value),
+                   MIN(metric_value), MAX(metric_value)
+            FROM dashboard_metrics
+            WHERE timestamp IS NOT NULL
+            GROUP BY metric_name, strftime(?, timestamp)
+        """,
+            (resolution, fmt, fmt),
+        )
+        cursor.execute(
+            """
+            INSERT INTO dashboard_event_rollups
+            (resolution, bucket, event_type, severity, channel, count)
+            SELECT ?, strftime(?, timestamp), event_type, COALESCE(severity, ''),
+                   COALESCE(channel, ''), COUNT(*)
+            FROM dashboard_events
+            WHERE timestamp IS NOT NULL
+            GROUP BY 2, 3, 4, 5
+        """,
+            (resolution, fmt),
+        )
+
+    # Histogram bins need the sketch's log bucketing, done here per value
+    bins: dict[tuple[str, str, str, int], int] = {}
+    cursor.execute(
+        """
+        SELECT metric_name, strftime(?, timestamp) as minute, metric_value
+        FROM dashboard_metrics
+        WHERE timestamp IS NOT NULL AND metric_name IN (SELECT value FROM json_each(?))
+    """,
+        (BUCKET_FORMATS["minute"], json.dumps(sorted(SKETCHED_METRICS))),
+    )
+    for name, minute, value in cursor:
+        index = _HISTOGRAM.bucket_index(value)
+        if index is None:
+            continue
+        for key in (
+            (name, "minute", minute, index),
+            (name, "hour", minute[:13] + ":00:00", index),
+            (name, "day", minute[:10] + " 00:00:00", index),
+        ):
+            bins[key] = bins.get(key, 0) + 1
+    cursor.executemany(
+        """
+        INSERT INTO dashboard_metric_histograms
+        (metric_name, resolution, bucket, bin, count)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        [(*key, n) for key, n in bins.items()],
+    )
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*) as count FROM dashboard_metric_rollups")
+    metric_buckets = cursor.fetchone()["count"]
+    cursor.execute("SELECT COUNT(*) as count FROM dashboard_event_rollups")
+    event_buckets = cursor.fetchone()["count"]
     conn.close()
+    return {"metric_buckets": metric_buckets, "event_buckets": event_buckets}
+
+
+def apply_retention(now: datetime | None = None) -> dict:
+    """
+    Age out raw metric rows and fine-grained buckets.
+
+    Raw rows older than RAW_METRIC_RETENTION_DAYS are deleted (their values
+    live on in the buckets), as are buckets older than the retention of
+    their resolution. Runs from init_db() and at most once per
+    RETENTION_INTERVAL_SECONDS from record_metric(). Events are kept: the
+    activity feed reads them.
 
-    return [{"timestamp": row["period"], "value": row["value"]} for row in rows]
+    Returns:
+        Dict of rows deleted per table/resolution
+    """
+    global _last_retention
+    _last_retention = time.monotonic()
+    now = now or datetime.now()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "DELETE FROM dashboard_metrics WHERE timestamp < ?",
+        ((now - timedelta(days=RAW_METRIC_RETENTION_DAYS)).isoformat(),),
+    )
+    deleted = {"raw_metrics": cursor.rowcount}
+    for resolution, days in ROLLUP_RETENTION_DAYS.items():
+        if days is None:
+            continue
+        cutoff = (now - timedelta(days=days)).strftime(BUCKET_FORMATS[resolution])
+        deleted[resolution] = 0
+        for table in (
+            "dashboard_metric_rollups",
+            "dashboard_metric_histograms",
+            "dashboard_event_rollups",
+        ):
+            cursor.execute(
+                f"DELETE FROM {table} WHERE resolution = ? AND bucket < ?",
+                (resolution, cutoff),
+            )
+            deleted[resolution] += cursor.rowcount
+    conn.commit()
+    conn.close()
+    return deleted
 
 
 # =============================================================================
@@ -603,23 +1054,19 @@ def get_dex_state() -> dict:
                 )
                 # Log to dashboard_events for UI visibility
                 try:
-                    cursor.execute(
-                        """INSERT INTO dashboard_events
-                           (event_type, summary, channel, severity, details)
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (
-                            "system",
-                            f"Auto-expired stale '{stale_state}' state after {int(age_seconds)}s"
-                            + (f" (task: {stale_task})" if stale_task else ""),
-                            "system",
-                            "warning",
-                            json.dumps({
-                                "expired_state": stale_state,
-                                "expired_task": stale_task,
-                                "age_seconds": int(age_seconds),
-                                "timeout_seconds": STALE_TIMEOUT_SECONDS,
-                            }),
-                        ),
+                    _insert_event(
+                        cursor,
+                        "system",
+                        f"Auto-expired stale '{stale_state}' state after {int(age_seconds)}s"
+                        + (f" (task: {stale_task})" if stale_task else ""),
+                        channel="system",
+                        details={
+                            "expired_state": stale_state,
+                            "expired_task": stale_task,
+                            "age_seconds": int(age_seconds),
+                            "timeout_seconds": STALE_TIMEOUT_SECONDS,
+                        },
+                        severity="warning",
                     )
                 except Exception:
                     pass  # Event logging is best-effort
@@ -792,76 +1239,46 @@ def set_preferences(user_id: str, preferences: dict) -> dict:
 
 
 def get_quick_stats() -> dict:
-    """Get quick stats for dashboard cards."""
+    """Get quick stats for dashboard cards (from today's day buckets)."""
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    # Tasks today
-    cursor.execute(
-        """
-        SELECT COUNT(*) as count FROM dashboard_events
-        WHERE event_type = 'task' AND timestamp >= ?
-    """,
-        (today_start.isoformat(),),
-    )
-    tasks_today = cursor.fetchone()["count"]
+    today = datetime.now().strftime(BUCKET_FORMATS["day"])
 
-    # Messages today
     cursor.execute(
         """
-        SELECT COUNT(*) as count FROM dashboard_events
-        WHERE event_type = 'message' AND timestamp >= ?
-    """,
-        (today_start.isoformat(),),
-    )
-    messages_today = cursor.fetchone()["count"]
-
-    # Errors today
-    cursor.execute(
-        """
-        SELECT COUNT(*) as count FROM dashboard_events
-        WHERE severity = 'error' AND timestamp >= ?
-    """,
-        (today_start.isoformat(),),
-    )
-    errors_today = cursor.fetchone()["count"]
-
-    # Cost today (if tracked)
-    cursor.execute(
-        """
-        SELECT SUM(metric_value) as total FROM dashboard_metrics
-        WHERE metric_name = 'api_cost_usd' AND timestamp >= ?
+        SELECT
+            COALESCE(SUM(CASE WHEN event_type = 'task' THEN count END), 0) as tasks,
+            COALESCE(SUM(CASE WHEN event_type = 'message' THEN count END), 0) as messages,
+            COALESCE(SUM(CASE WHEN severity = 'error' THEN count END), 0) as errors,
+            COUNT(DISTINCT NULLIF(channel, '')) as channels
+        FROM dashboard_event_rollups
+        WHERE resolution = 'day' AND bucket = ?
     """,
-        (today_start.isoformat(),),
+        (today,),
     )
     row = cursor.fetchone()
-    cost_today = row["total"] if row["total"] else 0.0
-
-    # Unique channels
-    cursor.execute(
-        """
-        SELECT COUNT(DISTINCT channel) as count FROM dashboard_events
-        WHERE channel IS NOT NULL AND timestamp >= ?
-    """,
-        (today_start.isoformat(),),
-    )
-    active_channels = cursor.fetchone()["count"]
+    tasks_today = row["tasks"]
+    messages_today = row["messages"]
+    errors_today = row["errors"]
+    active_channels = row["channels"]
 
-    # Average response time from metrics
+    # Cost and average response time from metric buckets
     cursor.execute(
         """
-        SELECT AVG(metric_value) as avg_time FROM dashboard_metrics
-        WHERE metric_name = 'response_time_ms' AND timestamp >= ?
+        SELECT metric_name, total, count FROM dashboard_metric_rollups
+        WHERE metric_name IN ('api_cost_usd', 'response_time_ms')
+          AND resolution = 'day' AND bucket = ?
     """,
-        (today_start.isoformat(),),
+        (today,),
     )
-    row = cursor.fetchone()
-    avg_response_time = row["avg_time"] if row["avg_time"] else 0.0
-
+    metrics = {row["metric_name"]: row for row in cursor.fetchall()}
     conn.close()
 
+    cost_today = metrics["api_cost_usd"]["total"] if "api_cost_usd" in metrics else 0.0
+    response = metrics.get("response_time_ms")
+    avg_response_time = response["total"] / response["count"] if response else 0.0
+
     # Calculate error rate
     total_events = tasks_today + messages_today
     error_rate = (errors_today / total_events * 100) if total_events > 0 else 0.0
@@ -904,19 +1321,13 @@ def create_task(
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        INSERT INTO dashboard_events
-        (event_type, timestamp, channel, user_id, summary, details, severity)
-        VALUES ('task', ?, ?, ?, ?, ?, 'info')
-    """,
-        (
-            datetime.now().isoformat(),
-            source.split(":")[0] if ":" in source else source,
-            source.split(":")[1] if ":" in source else None,
-            f"Task created: {request[:50]}...",
-            json.dumps({"task_id": task_id, "request": request, "status": status}),
-        ),
+    _insert_event(
+        cursor,
+        "task",
+        f"Task created: {request[:50]}...",
+        channel=source.split(":")[0] if ":" in source else source,
+        user_id=source.split(":")[1] if ":" in source else None,
+        details={"task_id": task_id, "request": request, "status": status},
     )
 
     conn.commit()
@@ -945,17 +1356,11 @@ def update_task(
     cursor = conn.cursor()
 
     # Log task update as event
-    cursor.execute(
-        """
-        INSERT INTO dashboard_events
-        (event_type, timestamp, summary, details, severity)
-        VALUES ('task', ?, ?, ?, 'info')
-    """,
-        (
-            datetime.now().isoformat(),
-            f"Task {status or 'updated'}: {summary[:50] if summary else task_id}",
-            json.dumps({"task_id": task_id, "status": status, "summary": summary}),
-        ),
+    _insert_event(
+        cursor,
+        "task",
+        f"Task {status or 'updated'}: {summary[:50] if summary else task_id}",
+        details={"task_id": task_id, "status": status, "summary": summary},
     )
 
     conn.commit()
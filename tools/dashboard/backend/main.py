@@ -11,6 +11,7 @@ Usage:
     python -m tools.dashboard.backend.main
 """
 
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -97,6 +98,36 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.debug(f"Hook metrics flush not started: {e}")
 
+    # Pre-synthesize fixed voice command confirmations into the TTS cache
+    try:
+        from tools.channels.tts_generator import get_tts_generator
+
+        generator = get_tts_generator()
+        tts_cache_config = generator.config.get("generation", {}).get("tts", {}).get("cache", {})
+        if generator.is_enabled() and tts_cache_config.get("prewarm", True):
+            # Keep a reference so the task is not garbage collected
+            app.state.tts_prewarm_task = asyncio.create_task(generator.prewarm())
+            logger.info("TTS cache prewarm started")
+    except Exception as e:
+        logger.debug(f"TTS cache prewarm not started: {e}")
+
+    # Multi-process gateway: adapters and handlers run in supervised workers
+    gateway_supervisor = None
+    try:
+        from tools.channels.gateway import load_config as load_gateway_config
+
+        workers_config = load_gateway_config().get("workers") or {}
+        if workers_config.get("enabled"):
+            from tools.channels.cluster import GatewaySupervisor
+
+            gateway_supervisor = GatewaySupervisor.from_config(workers_config)
+            await gateway_supervisor.start()
+            app.state.gateway_supervisor = gateway_supervisor
+            logger.info("Gateway supervisor started; channel adapters run in worker processes")
+    except Exception as e:
+        logger.warning(f"Gateway supervisor not started, using in-process adapters: {e}")
+        gateway_supervisor = None
+
     # Initialize channel router and adapters
     adapters_started = []
     try:
@@ -105,6 +136,11 @@ async def lifespan(app: FastAPI):
         router = get_router()
         logger.info("Channel router initialized")
 
+        # Supervised gateway: the adapters run in worker processes; proxies
+        # forward calls such as broadcast() and health checks to them
+        if gateway_supervisor is not None:
+            gateway_supervisor.attach_router(router)
+
         # Register SDK message handler for processing messages with Claude
         # Uses streaming handler which routes to channel-specific implementations
         try:
@@ -136,7 +172,7 @@ async def lifespan(app: FastAPI):
 
         # Register Telegram adapter if configured
         telegram_token = get_env_var("TELEGRAM_BOT_TOKEN")
-        if telegram_token:
+        if telegram_token and gateway_supervisor is None:
             try:
                 from tools.channels.telegram_adapter import TelegramAdapter
 
@@ -150,7 +186,7 @@ async def lifespan(app: FastAPI):
 
         # Register Discord adapter if configured
         discord_token = get_env_var("DISCORD_BOT_TOKEN")
-        if discord_token:
+        if discord_token and gateway_supervisor is None:
             try:
                 from tools.channels.discord import DiscordAdapter
 
@@ -184,6 +220,10 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Error disconnecting {name} adapter: {e}")
 
+    if gateway_supervisor is not None:
+        await gateway_supervisor.stop()
+        logger.info("Gateway supervisor stopped")
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -398,11 +438,41 @@ async def health_check():
 
     # Check channel adapters
     channels = {}
+    workers = {}
+    supervisor = getattr(app.state, "gateway_supervisor", None)
     try:
         from tools.channels.router import get_router
 
         router = get_router()
-        if router.adapters:
+        if supervisor is not None:
+            # Adapters run in worker processes: report the workers themselves
+            stats = supervisor.stats()
+            workers = stats["workers"]
+            for name, worker in workers.items():
+                if worker["role"] != "adapter" or worker["idle"]:
+                    continue
+                channel = name.removeprefix("adapter-")
+                channels[channel] = {
+                    "connected": worker["alive"] and channel in stats["adapters"],
+                    "pid": worker["pid"],
+                    "restarts": worker["restarts"],
+                }
+
+            connected_count = sum(1 for c in channels.values() if c["connected"])
+            if not channels:
+                services["channels"] = "no_adapters"
+            elif connected_count == len(channels):
+                services["channels"] = "healthy"
+            elif connected_count > 0:
+                services["channels"] = "degraded"
+            else:
+                services["channels"] = "unhealthy"
+
+            alive_count = sum(1 for w in workers.values() if w["alive"] or w["idle"])
+            services["gateway_workers"] = (
+                "healthy" if alive_count == len(workers) else "unhealthy"
+            )
+        elif router.adapters:
             # Get async status with health checks
             router_status = await router.get_status_async()
             channels = router_status.get("adapters", {})
@@ -429,7 +499,8 @@ async def health_check():
     # Overall status
     core_healthy = services.get("database") == "healthy"
     channels_ok = services.get("channels") in ("healthy", "degraded", "no_adapters", "unavailable")
-    overall = "healthy" if core_healthy and channels_ok else "degraded"
+    workers_ok = services.get("gateway_workers", "healthy") == "healthy"
+    overall = "healthy" if core_healthy and channels_ok and workers_ok else "degraded"
 
     # Build extended response with channel details
     response = HealthCheck(
@@ -442,6 +513,8 @@ async def health_check():
     # Add channel details to response if available
     if channels:
         response.services["channel_details"] = channels
+    if workers:
+        response.services["worker_details"] = workers
 
     return response
 
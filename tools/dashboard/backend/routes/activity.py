@@ -2,16 +2,26 @@
 Activity Route - Real-time Activity Feed
 
 Provides endpoints for the activity feed:
-- GET activity events with pagination and filters
+- GET activity events with keyset pagination and filters
+- GET streaming NDJSON export of activity events
 - POST new activity events
 """
 
+import json
 from datetime import datetime
 
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from tools.dashboard.backend.database import count_events, get_events, log_event
+from tools.dashboard.backend.database import (
+    count_events,
+    decode_event_cursor,
+    encode_event_cursor,
+    get_events,
+    iter_events,
+    log_event,
+)
 from tools.dashboard.backend.models import (
     ActivityEvent,
     ActivityFeed,
@@ -32,6 +42,16 @@ class ActivityCreatedResponse(BaseModel):
     message: str
 
 
+def _parse_date(value: str | None) -> datetime | None:
+    """Parse an ISO date query parameter, ignoring invalid values."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 @router.get("", response_model=ActivityFeed)
 async def get_activity(
     event_type: str | None = Query(None, description="Filter by event type"),
@@ -46,29 +66,26 @@ async def get_activity(
     Get activity feed with optional filters.
 
     Supports cursor-based pagination for efficient infinite scroll.
-    The cursor is an event ID - events older than this ID are returned.
+    The cursor is opaque: it holds the (timestamp, id) of the last event
+    returned, so each page is an index seek regardless of depth, and the
+    total counted for the first page. Numeric cursors from older clients
+    are still treated as offsets.
     """
-    # Parse cursor (event ID for offset-based pagination)
+    # Parse cursor (keyset position, or legacy offset)
     offset = 0
+    before = None
+    total = None
     if cursor:
-        try:
+        if cursor.isdigit():
             offset = int(cursor)
-        except ValueError:
-            offset = 0
+        else:
+            position = decode_event_cursor(cursor)
+            if position:
+                before, total = position
 
     # Parse dates
-    start_dt = None
-    end_dt = None
-    if start_date:
-        try:
-            start_dt = datetime.fromisoformat(start_date)
-        except ValueError:
-            pass
-    if end_date:
-        try:
-            end_dt = datetime.fromisoformat(end_date)
-        except ValueError:
-            pass
+    start_dt = _parse_date(start_date)
+    end_dt = _parse_date(end_date)
 
     # Get events
     events_data = get_events(
@@ -79,6 +96,7 @@ async def get_activity(
         offset=offset,
         start_date=start_dt,
         end_date=end_dt,
+        before=before,
     )
 
     # Check if there are more events
@@ -86,14 +104,15 @@ async def get_activity(
     if has_more:
         events_data = events_data[:limit]
 
-    # Get total count
-    total = count_events(
-        event_type=event_type,
-        severity=severity,
-        channel=channel,
-        start_date=start_dt,
-        end_date=end_dt,
-    )
+    # Total is counted once per scroll and carried in the cursor
+    if total is None:
+        total = count_events(
+            event_type=event_type,
+            severity=severity,
+            channel=channel,
+            start_date=start_dt,
+            end_date=end_dt,
+        )
 
     # Convert to ActivityEvent objects
     events = []
@@ -131,12 +150,46 @@ async def get_activity(
 
     # Next cursor
     next_cursor = None
-    if has_more and events:
-        next_cursor = str(offset + limit)
+    if has_more and events_data:
+        next_cursor = encode_event_cursor(events_data[-1], total)
 
     return ActivityFeed(events=events, total=total, cursor=next_cursor, has_more=has_more)
 
 
+@router.get("/export")
+async def export_activity(
+    event_type: str | None = Query(None, description="Filter by event type"),
+    severity: str | None = Query(None, description="Filter by severity"),
+    channel: str | None = Query(None, description="Filter by channel"),
+    start_date: str | None = Query(None, description="Start date (ISO format)"),
+    end_date: str | None = Query(None, description="End date (ISO format)"),
+):
+    """
+    Export activity events as newline-delimited JSON, newest first.
+
+    Streams one keyset batch at a time, so large ranges are never held
+    in memory.
+    """
+    events = iter_events(
+        event_type=event_type,
+        severity=severity,
+        channel=channel,
+        start_date=_parse_date(start_date),
+        end_date=_parse_date(end_date),
+    )
+    filename = f"activity_export_{datetime.now().strftime('%Y%m%d')}.ndjson"
+
+    def ndjson_lines():
+        for event in events:
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @router.post("", response_model=ActivityCreatedResponse)
 async def create_activity(event: NewActivityEvent):
     """
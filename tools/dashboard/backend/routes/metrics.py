@@ -17,7 +17,7 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 
 from tools.dashboard.backend.database import (
-    aggregate_metrics,
+    aggregate_metrics_many,
     get_quick_stats,
     get_routing_decisions,
     get_routing_stats,
@@ -117,7 +117,9 @@ async def get_summary(period: str = Query("24h", description="Summary period: 24
 async def get_timeseries(
     metrics: str = Query("tasks,messages,cost", description="Comma-separated metric names"),
     period: str = Query("7d", description="Time period: 24h, 7d, 30d, 90d"),
-    aggregation: str = Query("sum", description="Aggregation: sum, avg, max, min"),
+    aggregation: str = Query(
+        "sum", description="Aggregation: sum, avg, max, min, count, p50/p90/p95/p99 (response_time)"
+    ),
     granularity: str | None = Query(None, description="Data granularity: 1h, 1d"),
 ):
     """
@@ -147,19 +149,18 @@ async def get_timeseries(
         "tokens_out": "tokens_output",
     }
 
-    # Fetch data for each metric
+    # Fetch aggregated data for all metrics in one rollup query
+    aggregated = aggregate_metrics_many(
+        [metric_map.get(name, name) for name in metric_names],
+        aggregation=aggregation,
+        start_date=start_date,
+        end_date=end_date,
+        group_by_interval=granularity,
+    )
+
     series_list = []
     for metric_name in metric_names:
-        db_metric = metric_map.get(metric_name, metric_name)
-
-        # Get aggregated data
-        data_points = aggregate_metrics(
-            metric_name=db_metric,
-            aggregation=aggregation,
-            start_date=start_date,
-            end_date=end_date,
-            group_by_interval=granularity,
-        )
+        data_points = aggregated[metric_map.get(metric_name, metric_name)]
 
         # Convert to TimeSeriesPoint objects
         points = []
@@ -283,13 +284,24 @@ async def get_system_metrics():
 
 
 @router.get("/hooks")
-async def get_hook_metrics():
+async def get_hook_metrics(
+    minutes: int | None = Query(
+        None, description="Also merge windows persisted in the last N minutes", ge=1, le=43200
+    ),
+):
     """
     Get hook performance metrics (in-memory + persisted).
     """
     try:
+        from tools.agent.hooks import get_hook_metrics as _get_hook_metrics
         from tools.agent.hooks import get_hook_performance_summary
-        return get_hook_performance_summary()
+
+        summary = get_hook_performance_summary()
+        if minutes is not None:
+            since = datetime.utcnow() - timedelta(minutes=minutes)
+            summary["rollup"] = _get_hook_metrics().rollup(since=since)
+            summary["rollup_minutes"] = minutes
+        return summary
     except ImportError:
         return {"hooks": {}, "total_calls": 0}
 
@@ -6,6 +6,7 @@ Provides endpoints for voice interface:
 - POST /api/voice/command      - Submit transcript, parse intent, execute
 - POST /api/voice/transcribe   - Server-side audio transcription (Phase 11b)
 - POST /api/voice/tts          - Text-to-speech generation (Phase 11c)
+- GET  /api/voice/tts/cache    - TTS cache hit rate and savings
 - GET  /api/voice/preferences  - Get user voice preferences
 - PUT  /api/voice/preferences  - Update voice preferences
 - GET  /api/voice/history      - Get voice command history
@@ -287,9 +288,18 @@ async def generate_tts(
         "format": result.format,
         "duration_seconds": result.duration_seconds,
         "cost_usd": result.cost_usd,
+        "cached": result.cached,
     }
 
 
+@router.get("/tts/cache")
+async def get_tts_cache_stats() -> dict[str, Any]:
+    """TTS cache usage plus latency and cost saved by cache hits."""
+    from tools.channels.tts_generator import get_tts_generator
+
+    return {"success": True, "data": get_tts_generator().get_cache_stats()}
+
+
 @router.get("/preferences")
 async def get_voice_preferences(
     user_id: str = Query(default="default"),
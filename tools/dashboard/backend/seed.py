@@ -14,9 +14,11 @@ Usage:
 """
 
 import argparse
+import contextlib
 import json
 import random
 import sqlite3
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -24,6 +26,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 DASHBOARD_DB_PATH = PROJECT_ROOT / "data" / "dashboard.db"
 ACTIVITY_DB_PATH = PROJECT_ROOT / "data" / "activity.db"
+sys.path.insert(0, str(PROJECT_ROOT))
 
 
 def get_db_connection(db_path: Path) -> sqlite3.Connection:
@@ -54,6 +57,15 @@ def clear_data(conn: sqlite3.Connection) -> None:
     cursor = conn.cursor()
     cursor.execute("DELETE FROM dashboard_events")
     cursor.execute("DELETE FROM dashboard_metrics")
+    # Rollups are rebuilt from the new seed rows by database.init_db()
+    for table in (
+        "dashboard_metric_rollups",
+        "dashboard_metric_histograms",
+        "dashboard_event_rollups",
+    ):
+        with contextlib.suppress(sqlite3.OperationalError):
+            # Created on first dashboard connection
+            cursor.execute(f"DELETE FROM {table}")
     cursor.execute("UPDATE dex_state SET state = 'idle', current_task = NULL")
     conn.commit()
     print("  Cleared existing dashboard data")
@@ -476,6 +488,12 @@ def seed_database(force: bool = False) -> dict:
         print("  Seeding activity database...")
         results["tasks"] = seed_activity_db()
 
+        # Seed rows bypass record_metric()/log_event(): build their buckets
+        print("  Rebuilding rollups...")
+        from tools.dashboard.backend import database
+
+        database.rebuild_rollups()
+
         results["message"] = (
             f"Seeded {results['events']} events, "
             f"{results['metrics']} metrics, "
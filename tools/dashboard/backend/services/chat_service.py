@@ -14,6 +14,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import AsyncIterator
 
+from tools import db_connections
+
 logger = logging.getLogger(__name__)
 
 # Database path (same as dashboard.db)
@@ -23,10 +25,7 @@ DB_PATH = PROJECT_ROOT / "data" / "dashboard.db"
 
 def get_db_connection() -> sqlite3.Connection:
     """Get database connection with row factory."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_connections.get_connection(DB_PATH)
 
 
 def init_chat_tables():
@@ -0,0 +1,417 @@
+"""
+Process-wide SQLite connection registry.
+
+Every tool module used to open a fresh ``sqlite3.connect`` per call, re-run
+its ``CREATE TABLE IF NOT EXISTS`` DDL and close the connection after a
+single statement. This registry keeps long-lived connections per thread and
+per database path instead:
+
+- Connections are checked out from a per-thread idle pool and handed back
+  when the caller invokes ``conn.close()``, so existing call sites keep
+  working unchanged while reusing the connection (and its prepared-statement
+  cache) across calls.
+- WAL journaling, ``synchronous=NORMAL``, ``cache_size``, ``mmap_size`` and
+  ``busy_timeout`` are applied once per connection.
+- Schema initializers run once per process per database file. If the file
+  is replaced or deleted (restore from backup, test fixtures), the stale
+  connections are dropped and the schema is initialized again.
+- ``DataVersionWatcher`` tells in-process caches when another connection
+  (another process, or another thread's pooled connection) has committed.
+
+Usage:
+    from tools.db_connections import get_connection
+
+    def _init_schema(conn: sqlite3.Connection) -> None:
+        conn.execute("CREATE TABLE IF NOT EXISTS things (id INTEGER PRIMARY KEY)")
+        conn.commit()
+
+    conn = get_connection(DB_PATH, init_schema=_init_schema)
+    try:
+        conn.execute("INSERT INTO things DEFAULT VALUES")
+        conn.commit()
+    finally:
+        conn.close()  # returns the connection to the pool
+
+    get_stats()  # {"connects": ..., "checkouts": ..., "reuses": ..., ...}
+
+    watcher = DataVersionWatcher()
+    if watcher.poll(DB_PATH, lambda: get_connection(DB_PATH), interval=1.0):
+        cache.clear()  # someone else committed since the last poll
+
+Dependencies:
+    - sqlite3 (stdlib)
+    - threading (stdlib)
+    - weakref (stdlib)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Per-connection pragmas applied on connect
+CACHE_SIZE_KIB = 8192  # negative cache_size => KiB
+MMAP_SIZE_BYTES = 64 * 1024 * 1024
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+
+# Idle connections kept per (thread, database) beyond which close() really closes
+MAX_IDLE_PER_DB = 4
+
+SchemaInit = Callable[[sqlite3.Connection], None]
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose ``close()`` returns it to the registry pool.
+
+    Uncommitted work is rolled back on ``close()``, matching the semantics of
+    closing a plain connection. ``release()`` is an alias; ``force_close()``
+    closes the underlying handle.
+    """
+
+    _registry_key: tuple[str, bool] | None = None
+    _file_id: tuple[int, int] | None = None
+    _checked_out: bool = False
+    _owner_thread: int = 0
+
+    def close(self) -> None:  # type: ignore[override]
+        _release(self)
+
+    release = close
+
+    def force_close(self) -> None:
+        """Close the underlying SQLite handle."""
+        self._checked_out = False
+        super().close()
+
+
+class _Stats:
+    """Registry counters, guarded by the registry lock."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.closes = 0
+        self.checkouts = 0
+        self.reuses = 0
+        self.schema_inits = 0
+        self.stale_drops = 0
+        self.registry_lock_waits = 0
+        self.registry_lock_wait_seconds = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "closes": self.closes,
+            "open_connections": self.connects - self.closes,
+            "checkouts": self.checkouts,
+            "reuses": self.reuses,
+            "reuse_ratio": round(self.reuses / self.checkouts, 4) if self.checkouts else 0.0,
+            "schema_inits": self.schema_inits,
+            "stale_drops": self.stale_drops,
+            "registry_lock_waits": self.registry_lock_waits,
+            "registry_lock_wait_ms": round(self.registry_lock_wait_seconds * 1000, 3),
+        }
+
+
+_lock = threading.Lock()
+_stats = _Stats()
+_local = threading.local()
+# (db_path, schema initializer) -> (st_dev, st_ino, schema_version) after init
+_initialized: dict[tuple[str, SchemaInit], tuple[int, int, int]] = {}
+
+
+def _acquire_lock() -> None:
+    """Take the registry lock, recording contention (not SQLite busy waits)."""
+    if _lock.acquire(blocking=False):
+        return
+    start = time.perf_counter()
+    _lock.acquire()
+    _stats.registry_lock_waits += 1
+    _stats.registry_lock_wait_seconds += time.perf_counter() - start
+
+
+def _file_identity(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _idle_pool(key: tuple[str, bool]) -> list[PooledConnection]:
+    pools: dict[tuple[str, bool], list[PooledConnection]] | None = getattr(_local, "pools", None)
+    if pools is None:
+        pools = {}
+        _local.pools = pools
+    return pools.setdefault(key, [])
+
+
+def _open(path: str, foreign_keys: bool) -> PooledConnection:
+    conn = sqlite3.connect(
+        path,
+        factory=PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.OperationalError as e:
+        # Read-only media or a concurrent writer holding the lock; the
+        # connection still works with the existing journal mode.
+        logger.debug(f"Could not enable WAL for {path}: {e}")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys=ON")
+    conn._registry_key = (path, foreign_keys)
+    conn._file_id = _file_identity(path)
+    conn._owner_thread = threading.get_ident()
+
+    _acquire_lock()
+    try:
+        _stats.connects += 1
+    finally:
+        _lock.release()
+    return conn
+
+
+def _discard(conn: PooledConnection) -> None:
+    with contextlib.suppress(sqlite3.Error):
+        conn.force_close()
+    _acquire_lock()
+    try:
+        _stats.closes += 1
+    finally:
+        _lock.release()
+
+
+def _release(conn: PooledConnection) -> None:
+    if not conn._checked_out:
+        return
+    conn._checked_out = False
+
+    key = conn._registry_key
+    if key is None or conn._owner_thread != threading.get_ident():
+        _discard(conn)
+        return
+
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = sqlite3.Row
+        conn.isolation_level = ""
+    except sqlite3.Error:
+        _discard(conn)
+        return
+
+    pool = _idle_pool(key)
+    if len(pool) >= MAX_IDLE_PER_DB:
+        _discard(conn)
+    else:
+        pool.append(conn)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _ensure_schema(
+    path: str, conn: PooledConnection, init_schema: SchemaInit, fresh: bool
+) -> None:
+    key = (path, init_schema)
+    _acquire_lock()
+    try:
+        recorded = _initialized.get(key)
+    finally:
+        _lock.release()
+
+    # A pooled connection keeps the inode alive, so identity alone is
+    # enough. A fresh connection may see a recreated file that reuses
+    # the inode number, so the schema cookie is compared as well.
+    if (
+        recorded is not None
+        and recorded[:2] == conn._file_id
+        and (not fresh or recorded[2] == _schema_version(conn))
+    ):
+        return
+
+    init_schema(conn)
+    if conn.in_transaction:
+        conn.commit()
+
+    file_id = conn._file_id or _file_identity(path) or (0, 0)
+    _acquire_lock()
+    try:
+        _initialized[key] = (*file_id, _schema_version(conn))
+        _stats.schema_inits += 1
+    finally:
+        _lock.release()
+
+
+def get_connection(
+    db_path: str | Path,
+    init_schema: SchemaInit | None = None,
+    *,
+    foreign_keys: bool = False,
+) -> sqlite3.Connection:
+    """Check out a long-lived connection for ``db_path`` on the current thread.
+
+    Args:
+        db_path: Path to the SQLite database file (parent dirs are created).
+        init_schema: Optional DDL callback, run once per process per file.
+        foreign_keys: Enable ``PRAGMA foreign_keys`` on the connection.
+
+    Returns:
+        A connection with ``row_factory = sqlite3.Row``. Call ``close()`` to
+        hand it back to the pool.
+    """
+    path = str(db_path)
+    if path == ":memory:" or path.startswith("file:"):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        if foreign_keys:
+            conn.execute("PRAGMA foreign_keys=ON")
+        if init_schema is not None:
+            init_schema(conn)
+        return conn
+
+    key = (path, foreign_keys)
+    pool = _idle_pool(key)
+    current_id = _file_identity(path)
+
+    conn: PooledConnection | None = None
+    while pool:
+        candidate = pool.pop()
+        if current_id is not None and candidate._file_id == current_id:
+            conn = candidate
+            break
+        # Database file was deleted or replaced underneath us
+        _discard(candidate)
+        _acquire_lock()
+        try:
+            _stats.stale_drops += 1
+        finally:
+            _lock.release()
+
+    reused = conn is not None
+    if conn is None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = _open(path, foreign_keys)
+
+    conn._checked_out = True
+    _acquire_lock()
+    try:
+        _stats.checkouts += 1
+        if reused:
+            _stats.reuses += 1
+    finally:
+        _lock.release()
+
+    if init_schema is not None:
+        try:
+            _ensure_schema(path, conn, init_schema, fresh=not reused)
+        except Exception:
+            _release(conn)
+            raise
+    return conn
+
+
+class DataVersionWatcher:
+    """Detects commits made through other connections, via ``PRAGMA data_version``.
+
+    ``data_version`` only changes when a *different* connection commits, and
+    each pooled connection has its own counter, so the last value is kept per
+    connection. A connection seen for the first time counts as a change.
+    Polls are throttled per database path so a hot cache pays for the
+    PRAGMA at most once per ``interval``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._polled_at: dict[str, float] = {}
+        self._versions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def poll(
+        self,
+        db_path: str | Path,
+        connect: Callable[[], sqlite3.Connection],
+        interval: float = 0.0,
+    ) -> bool:
+        """Return True if another connection committed since the last poll.
+
+        Args:
+            db_path: Database the caller's cache is keyed on.
+            connect: Checks out a connection to that database.
+            interval: Minimum seconds between polls of the same database;
+                calls inside the window return False without querying.
+        """
+        db = str(db_path)
+        now = time.monotonic()
+        with self._lock:
+            if now - self._polled_at.get(db, float("-inf")) < interval:
+                return False
+            self._polled_at[db] = now
+
+        conn = connect()
+        try:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            with self._lock:
+                changed = self._versions.get(conn) != version
+                self._versions[conn] = version
+        finally:
+            conn.close()
+        return changed
+
+
+def get_stats() -> dict[str, Any]:
+    """Return registry counters (connects, reuses, registry lock waits, ...)."""
+    _acquire_lock()
+    try:
+        stats = _stats.snapshot()
+    finally:
+        _lock.release()
+    stats["idle_on_thread"] = sum(len(p) for p in getattr(_local, "pools", {}).values())
+    return stats
+
+
+def close_all() -> None:
+    """Close every idle connection on this thread and forget schema state.
+
+    Connections checked out elsewhere stay usable; the next checkout after
+    this call re-runs schema initializers.
+    """
+    pools: dict[tuple[str, bool], list[PooledConnection]] = getattr(_local, "pools", {})
+    for pool in pools.values():
+        while pool:
+            _discard(pool.pop())
+    _acquire_lock()
+    try:
+        _initialized.clear()
+    finally:
+        _lock.release()
+
+
+def reset_stats() -> None:
+    """Zero the registry counters (used by benchmarks and tests)."""
+    global _stats
+    _acquire_lock()
+    try:
+        open_now = _stats.connects - _stats.closes
+        _stats = _Stats()
+        _stats.connects = open_now
+    finally:
+        _lock.release()
@@ -26,7 +26,8 @@ Usage:
     # Get peak hours for a specific day
     python tools/learning/energy_tracker.py --action peak-hours --user alice --day monday
 
-    # Rebuild aggregated profiles from observations
+    # Rebuild aggregated profiles from observations (backfill only; profiles
+    # are updated incrementally as observations are recorded)
     python tools/learning/energy_tracker.py --action rebuild --user alice
 
 Dependencies:
@@ -44,11 +45,12 @@ import sys
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from statistics import mean
 from typing import Any
 
 import yaml
 
+from tools import db_connections
+
 
 # Path constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -89,10 +91,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Energy observations table
@@ -118,6 +121,7 @@ def get_connection() -> sqlite3.Connection:
             hour INTEGER NOT NULL,
             avg_energy_score REAL DEFAULT 0.5,
             sample_count INTEGER DEFAULT 0,
+            decayed_weight REAL DEFAULT 0,
             last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY(user_id, day_of_week, hour)
         )
@@ -138,17 +142,27 @@ def get_connection() -> sqlite3.Connection:
         )
     """)
 
+    # Migrate existing profiles - decayed weight backs the running mean
+    try:
+        cursor.execute("ALTER TABLE energy_profiles ADD COLUMN decayed_weight REAL DEFAULT 0")
+        cursor.execute("UPDATE energy_profiles SET decayed_weight = sample_count")
+    except sqlite3.OperationalError:
+        pass  # Column already exists
+
     # Indexes
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_energy_obs_user ON energy_observations(user_id)")
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_energy_obs_time ON energy_observations(observed_at)"
     )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_energy_obs_user_time "
+        "ON energy_observations(user_id, observed_at)"
+    )
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_energy_profiles_user ON energy_profiles(user_id)"
     )
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -283,12 +297,143 @@ def score_to_level(score: float, thresholds: dict[str, float]) -> str:
         return "low"
 
 
+def decay_weight(age_days: float, decay_factor: float) -> float:
+    """
+    Weight of an observation that is ``age_days`` older than the newest one.
+
+    The configured ``decay_factor`` is applied per day, so an observation from
+    the same hour last week counts ``decay_factor ** 7`` as much as today's.
+    """
+    if age_days <= 0:
+        return 1.0
+    return decay_factor**age_days
+
+
+def _update_profile(
+    cursor: sqlite3.Cursor,
+    user_id: str,
+    day_of_week: int,
+    hour: int,
+    energy_score: float,
+    ts: datetime,
+    config: dict[str, Any],
+) -> float:
+    """
+    Fold one observation into the (user, day, hour) profile in O(1).
+
+    The profile keeps an exponentially-decayed running mean: ``decayed_weight``
+    is the sum of decayed observation weights and ``last_updated`` the time of
+    the newest observation folded in. Out-of-order observations are decayed
+    themselves instead of decaying the history.
+
+    Returns:
+        The updated average energy score for the bucket.
+    """
+    decay_factor = config.get("decay_factor", 0.95)
+
+    cursor.execute(
+        """
+        SELECT avg_energy_score, sample_count, decayed_weight, last_updated
+        FROM energy_profiles
+        WHERE user_id = ? AND day_of_week = ? AND hour = ?
+    """,
+        (user_id, day_of_week, hour),
+    )
+    row = cursor.fetchone()
+
+    if row is None or not row["decayed_weight"]:
+        avg_score, weight = energy_score, 1.0
+        sample_count = (row["sample_count"] if row else 0) + 1
+        last_updated = ts
+    else:
+        try:
+            last_updated = datetime.fromisoformat(row["last_updated"])
+        except (TypeError, ValueError):
+            last_updated = ts
+        age_days = (ts - last_updated).total_seconds() / 86400
+
+        if age_days >= 0:
+            history = row["decayed_weight"] * decay_weight(age_days, decay_factor)
+            weight = history + 1.0
+            avg_score = (row["avg_energy_score"] * history + energy_score) / weight
+            last_updated = ts
+        else:
+            new_weight = decay_weight(-age_days, decay_factor)
+            weight = row["decayed_weight"] + new_weight
+            avg_score = (
+                row["avg_energy_score"] * row["decayed_weight"] + energy_score * new_weight
+            ) / weight
+        sample_count = row["sample_count"] + 1
+
+    cursor.execute(
+        """
+        INSERT INTO energy_profiles
+        (user_id, day_of_week, hour, avg_energy_score, sample_count, decayed_weight, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, day_of_week, hour) DO UPDATE SET
+            avg_energy_score = excluded.avg_energy_score,
+            sample_count = excluded.sample_count,
+            decayed_weight = excluded.decayed_weight,
+            last_updated = excluded.last_updated
+    """,
+        (
+            user_id,
+            day_of_week,
+            hour,
+            avg_score,
+            sample_count,
+            weight,
+            last_updated.isoformat(),
+        ),
+    )
+    return avg_score
+
+
+def _update_peak_hour(
+    cursor: sqlite3.Cursor, user_id: str, day_of_week: int, hour: int, is_peak: bool
+) -> None:
+    """Add or remove one hour from the user's peak hours, writing only on change."""
+    day_name = DAY_NAMES[day_of_week]
+    cursor.execute(f"SELECT {day_name} FROM peak_hours WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+
+    hours: list[int] = []
+    if row and row[0]:
+        try:
+            hours = json.loads(row[0])
+        except json.JSONDecodeError:
+            hours = []
+
+    if (hour in hours) == is_peak:
+        return
+
+    if is_peak:
+        hours = sorted([*hours, hour])
+    else:
+        hours = [h for h in hours if h != hour]
+
+    now = datetime.now().isoformat()
+    cursor.execute(
+        f"""
+        INSERT INTO peak_hours (user_id, {day_name}, updated_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            {day_name} = excluded.{day_name},
+            updated_at = excluded.updated_at
+    """,
+        (user_id, json.dumps(hours), now),
+    )
+
+
 def record_observation(
     user_id: str, signals: dict[str, Any], timestamp: datetime | None = None
 ) -> dict[str, Any]:
     """
     Record an energy observation from activity signals.
 
+    The matching (day, hour) profile and the user's peak hours are updated
+    in the same transaction, so readers never need a rebuild.
+
     Args:
         user_id: User identifier
         signals: Activity signals (response_time_ms, message_length, etc.)
@@ -337,6 +482,10 @@ def record_observation(
         ),
     )
 
+    avg_score = _update_profile(cursor, user_id, day_of_week, hour, energy_score, ts, config)
+    high_threshold = config.get("thresholds", {}).get("high", 0.6)
+    _update_peak_hour(cursor, user_id, day_of_week, hour, avg_score >= high_threshold)
+
     conn.commit()
     conn.close()
 
@@ -563,6 +712,11 @@ def rebuild_profiles(user_id: str, lookback_days: int = 30) -> dict[str, Any]:
     """
     Rebuild energy profiles from observations.
 
+    Profiles are maintained incrementally by record_observation(); this is a
+    backfill for imported history or config changes. It recomputes every
+    (day, hour) bucket with one SQL aggregate, weighting each observation by
+    ``decay_factor`` per day of age relative to the newest one in its bucket.
+
     Args:
         user_id: User identifier
         lookback_days: How many days back to analyze
@@ -575,24 +729,54 @@ def rebuild_profiles(user_id: str, lookback_days: int = 30) -> dict[str, Any]:
     thresholds = config.get("thresholds", {"peak": 0.8})
 
     conn = get_connection()
+    conn.create_function(
+        "energy_decay_weight",
+        1,
+        lambda age_days: decay_weight(age_days or 0.0, decay_factor),
+        deterministic=True,
+    )
     cursor = conn.cursor()
 
     cutoff = (datetime.now() - timedelta(days=lookback_days)).isoformat()
 
-    # Get all observations for user
     cursor.execute(
         """
-        SELECT day_of_week, hour, energy_score, observed_at
-        FROM energy_observations
-        WHERE user_id = ? AND observed_at >= ?
-        ORDER BY observed_at
+        INSERT INTO energy_profiles
+        (user_id, day_of_week, hour, avg_energy_score, sample_count, decayed_weight, last_updated)
+        SELECT
+            user_id,
+            day_of_week,
+            hour,
+            SUM(weight * energy_score) / SUM(weight),
+            COUNT(*),
+            SUM(weight),
+            MAX(observed_at)
+        FROM (
+            SELECT
+                user_id,
+                day_of_week,
+                hour,
+                energy_score,
+                observed_at,
+                energy_decay_weight(
+                    julianday(MAX(observed_at) OVER (PARTITION BY day_of_week, hour))
+                    - julianday(observed_at)
+                ) AS weight
+            FROM energy_observations
+            WHERE user_id = ? AND observed_at >= ?
+        )
+        GROUP BY day_of_week, hour
+        ON CONFLICT(user_id, day_of_week, hour) DO UPDATE SET
+            avg_energy_score = excluded.avg_energy_score,
+            sample_count = excluded.sample_count,
+            decayed_weight = excluded.decayed_weight,
+            last_updated = excluded.last_updated
     """,
         (user_id, cutoff),
     )
+    profiles_updated = cursor.rowcount
 
-    rows = cursor.fetchall()
-
-    if not rows:
+    if profiles_updated <= 0:
         conn.close()
         return {
             "success": True,
@@ -601,89 +785,38 @@ def rebuild_profiles(user_id: str, lookback_days: int = 30) -> dict[str, Any]:
             "message": "No observations to build profiles from.",
         }
 
-    # Aggregate by day/hour
-    aggregates = {}
-    for row in rows:
-        key = (row["day_of_week"], row["hour"])
-        if key not in aggregates:
-            aggregates[key] = []
-        aggregates[key].append(row["energy_score"])
-
-    # Update profiles
-    profiles_updated = 0
-    for (day_of_week, hour), scores in aggregates.items():
-        avg_score = mean(scores)
-        sample_count = len(scores)
-
-        cursor.execute(
-            """
-            INSERT INTO energy_profiles (user_id, day_of_week, hour, avg_energy_score, sample_count, last_updated)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(user_id, day_of_week, hour) DO UPDATE SET
-                avg_energy_score = ?,
-                sample_count = ?,
-                last_updated = ?
-        """,
-            (
-                user_id,
-                day_of_week,
-                hour,
-                avg_score,
-                sample_count,
-                datetime.now().isoformat(),
-                avg_score,
-                sample_count,
-                datetime.now().isoformat(),
-            ),
-        )
-        profiles_updated += 1
+    cursor.execute(
+        "SELECT COUNT(*) FROM energy_observations WHERE user_id = ? AND observed_at >= ?",
+        (user_id, cutoff),
+    )
+    observations_analyzed = cursor.fetchone()[0]
 
-    # Calculate peak hours for each day
-    peak_threshold = thresholds.get("peak", 0.8)
+    # Peak hours: buckets whose average is in the high/peak range
     high_threshold = thresholds.get("high", 0.6)
+    cursor.execute(
+        """
+        SELECT day_of_week, hour FROM energy_profiles
+        WHERE user_id = ? AND avg_energy_score >= ?
+        ORDER BY day_of_week, hour
+    """,
+        (user_id, high_threshold),
+    )
+    peak_hours_data: dict[str, list[int]] = {day: [] for day in DAY_NAMES}
+    for row in cursor.fetchall():
+        peak_hours_data[DAY_NAMES[row["day_of_week"]]].append(row["hour"])
 
-    peak_hours_data = {day: [] for day in DAY_NAMES}
-
-    for (day_of_week, hour), scores in aggregates.items():
-        avg_score = mean(scores)
-        # Consider it a peak hour if average score is in the high/peak range
-        if avg_score >= high_threshold:
-            day_name = DAY_NAMES[day_of_week]
-            peak_hours_data[day_name].append(hour)
-
-    # Sort peak hours
-    for day in DAY_NAMES:
-        peak_hours_data[day].sort()
-
-    # Upsert peak hours
+    now = datetime.now().isoformat()
     cursor.execute(
         """
         INSERT INTO peak_hours (user_id, monday, tuesday, wednesday, thursday, friday, saturday, sunday, updated_at)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(user_id) DO UPDATE SET
-            monday = ?, tuesday = ?, wednesday = ?, thursday = ?, friday = ?, saturday = ?, sunday = ?,
-            updated_at = ?
+            monday = excluded.monday, tuesday = excluded.tuesday,
+            wednesday = excluded.wednesday, thursday = excluded.thursday,
+            friday = excluded.friday, saturday = excluded.saturday,
+            sunday = excluded.sunday, updated_at = excluded.updated_at
     """,
-        (
-            user_id,
-            json.dumps(peak_hours_data["monday"]),
-            json.dumps(peak_hours_data["tuesday"]),
-            json.dumps(peak_hours_data["wednesday"]),
-            json.dumps(peak_hours_data["thursday"]),
-            json.dumps(peak_hours_data["friday"]),
-            json.dumps(peak_hours_data["saturday"]),
-            json.dumps(peak_hours_data["sunday"]),
-            datetime.now().isoformat(),
-            # ON CONFLICT values
-            json.dumps(peak_hours_data["monday"]),
-            json.dumps(peak_hours_data["tuesday"]),
-            json.dumps(peak_hours_data["wednesday"]),
-            json.dumps(peak_hours_data["thursday"]),
-            json.dumps(peak_hours_data["friday"]),
-            json.dumps(peak_hours_data["saturday"]),
-            json.dumps(peak_hours_data["sunday"]),
-            datetime.now().isoformat(),
-        ),
+        (user_id, *(json.dumps(peak_hours_data[day]) for day in DAY_NAMES), now),
     )
 
     conn.commit()
@@ -693,7 +826,7 @@ def rebuild_profiles(user_id: str, lookback_days: int = 30) -> dict[str, Any]:
         "success": True,
         "user_id": user_id,
         "profiles_updated": profiles_updated,
-        "observations_analyzed": len(rows),
+        "observations_analyzed": observations_analyzed,
         "peak_hours": peak_hours_data,
     }
 
@@ -49,6 +49,8 @@ from typing import Any
 
 import yaml
 
+from tools import db_connections
+
 
 # Path constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -85,10 +87,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Behavior patterns table
@@ -132,6 +135,36 @@ def get_connection() -> sqlite3.Connection:
         )
     """)
 
+    # Daily rollups of task/activity events, maintained incrementally by
+    # analyze_patterns(). One row per (day, source, kind, item, hour).
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pattern_rollups (
+            user_id TEXT NOT NULL,
+            bucket_date TEXT NOT NULL,
+            source TEXT NOT NULL CHECK(source IN ('task', 'activity')),
+            kind TEXT NOT NULL,
+            item TEXT NOT NULL DEFAULT '',
+            hour INTEGER NOT NULL,
+            day_of_week INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            first_seen TEXT,
+            last_seen TEXT,
+            label TEXT,
+            PRIMARY KEY(user_id, bucket_date, source, kind, item, hour)
+        )
+    """)
+
+    # Per-user checkpoint: last event rowids folded into the rollups
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pattern_analysis_state (
+            user_id TEXT PRIMARY KEY,
+            task_rowid INTEGER DEFAULT 0,
+            activity_rowid INTEGER DEFAULT 0,
+            rollup_from TEXT NOT NULL,
+            last_run_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
     # Indexes
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_patterns_user ON behavior_patterns(user_id)")
     cursor.execute(
@@ -142,9 +175,17 @@ def get_connection() -> sqlite3.Connection:
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_activity_events_user ON activity_events(user_id)"
     )
+    # Covering indexes for the lookback-window backfill scan
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_task_events_user_time ON task_events"
+        "(user_id, event_time, event_type, task_id, task_name)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activity_events_user_time ON activity_events"
+        "(user_id, activity_time, activity_type, hour, day_of_week)"
+    )
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -274,218 +315,382 @@ def record_activity(
     return {"success": True, "event_id": event_id, "activity_type": activity_type}
 
 
-def detect_avoidance_patterns(user_id: str, config: dict[str, Any]) -> list[dict]:
-    """Detect tasks that are repeatedly postponed."""
-    threshold = config.get("avoidance_threshold", 3)
-    lookback = config.get("lookback_days", 30)
-    cutoff = (datetime.now() - timedelta(days=lookback)).isoformat()
+def _fold_event(
+    acc: dict[tuple, list],
+    source: str,
+    kind: str,
+    item: str,
+    when: str,
+    label: str | None = None,
+) -> None:
+    """Add one event to the in-memory rollup accumulator."""
+    try:
+        ts = datetime.fromisoformat(when)
+    except (TypeError, ValueError):
+        return
+    key = (ts.date().isoformat(), source, kind, item or "", ts.hour)
+    entry = acc.get(key)
+    if entry is None:
+        acc[key] = [ts.weekday(), 1, when, when, label]
+    else:
+        entry[1] += 1
+        entry[2] = min(entry[2], when)
+        entry[3] = max(entry[3], when)
+        if label:
+            entry[4] = label
 
-    conn = get_connection()
+
+def _sync_rollups(
+    conn: sqlite3.Connection, user_id: str, cutoff_date: str, full: bool = False
+) -> int:
+    """
+    Fold events recorded since the user's last run into ``pattern_rollups``.
+
+    Events are tracked by rowid, so late-arriving events with old timestamps
+    are picked up too, and days that fall out of the window are pruned. The
+    rollups are rebuilt from the lookback window when there is no checkpoint
+    yet, when ``full`` is set, or when the requested window starts before
+    what the rollups cover.
+
+    Returns:
+        Number of events folded in.
+    """
     cursor = conn.cursor()
+    cursor.execute("SELECT * FROM pattern_analysis_state WHERE user_id = ?", (user_id,))
+    state = cursor.fetchone()
 
-    # Find tasks with multiple postponements
-    cursor.execute(
-        """
-        SELECT task_id, task_name, COUNT(*) as postpone_count,
-               MIN(event_time) as first_postponed,
-               MAX(event_time) as last_postponed
-        FROM task_events
-        WHERE user_id = ? AND event_type = 'postponed' AND event_time >= ?
-        GROUP BY task_id
-        HAVING COUNT(*) >= ?
-        ORDER BY postpone_count DESC
-    """,
-        (user_id, cutoff, threshold),
-    )
+    rebuild = full or state is None or state["rollup_from"] > cutoff_date
+    acc: dict[tuple, list] = {}
+
+    if rebuild:
+        cursor.execute("DELETE FROM pattern_rollups WHERE user_id = ?", (user_id,))
+        cursor.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM task_events WHERE user_id = ?", (user_id,)
+        )
+        task_rowid = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM activity_events WHERE user_id = ?", (user_id,)
+        )
+        activity_rowid = cursor.fetchone()[0]
 
-    patterns = []
-    for row in cursor.fetchall():
-        # Check if task was eventually completed
         cursor.execute(
             """
-            SELECT COUNT(*) as completed
-            FROM task_events
-            WHERE user_id = ? AND task_id = ? AND event_type = 'completed'
+            SELECT event_type, task_id, task_name, event_time FROM task_events
+            WHERE user_id = ? AND event_time >= ? AND rowid <= ?
         """,
-            (user_id, row["task_id"]),
+            (user_id, cutoff_date, task_rowid),
         )
+        for event_type, task_id, task_name, event_time in cursor:
+            _fold_event(acc, "task", event_type, task_id, event_time, task_name)
 
-        completed = cursor.fetchone()["completed"] > 0
-
-        patterns.append(
-            {
-                "task_id": row["task_id"],
-                "task_name": row["task_name"],
-                "postpone_count": row["postpone_count"],
-                "first_postponed": row["first_postponed"],
-                "last_postponed": row["last_postponed"],
-                "eventually_completed": completed,
-                "confidence": min(
-                    config.get("max_confidence", 0.95),
-                    0.5
-                    + row["postpone_count"] * config.get("confidence_boost_per_occurrence", 0.1),
-                ),
-            }
+        cursor.execute(
+            """
+            SELECT activity_type, activity_time FROM activity_events
+            WHERE user_id = ? AND activity_time >= ? AND rowid <= ?
+        """,
+            (user_id, cutoff_date, activity_rowid),
         )
+        for activity_type, activity_time in cursor:
+            _fold_event(acc, "activity", activity_type, "", activity_time)
+        rollup_from = cutoff_date
+    else:
+        task_rowid = state["task_rowid"]
+        activity_rowid = state["activity_rowid"]
+        rollup_from = max(state["rollup_from"], cutoff_date)
 
-    conn.close()
-    return patterns
+        # Days that slid out of the window are no longer needed
+        cursor.execute(
+            "DELETE FROM pattern_rollups WHERE user_id = ? AND bucket_date < ?",
+            (user_id, rollup_from),
+        )
 
+        cursor.execute(
+            """
+            SELECT rowid, event_type, task_id, task_name, event_time FROM task_events
+            WHERE user_id = ? AND rowid > ?
+        """,
+            (user_id, task_rowid),
+        )
+        for rowid, event_type, task_id, task_name, event_time in cursor:
+            _fold_event(acc, "task", event_type, task_id, event_time, task_name)
+            task_rowid = max(task_rowid, rowid)
 
-def detect_daily_routines(user_id: str, config: dict[str, Any]) -> list[dict]:
-    """Detect same-time daily activities."""
-    min_occurrences = config.get("min_occurrences", 3)
-    time_tolerance = config.get("routine_time_tolerance", 30)  # minutes
-    lookback = config.get("lookback_days", 30)
-    cutoff = (datetime.now() - timedelta(days=lookback)).isoformat()
+        cursor.execute(
+            """
+            SELECT rowid, activity_type, activity_time FROM activity_events
+            WHERE user_id = ? AND rowid > ?
+        """,
+            (user_id, activity_rowid),
+        )
+        for rowid, activity_type, activity_time in cursor:
+            _fold_event(acc, "activity", activity_type, "", activity_time)
+            activity_rowid = max(activity_rowid, rowid)
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    cursor.executemany(
+        """
+        INSERT INTO pattern_rollups
+        (user_id, bucket_date, source, kind, item, hour, day_of_week, count, first_seen, last_seen, label)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, bucket_date, source, kind, item, hour) DO UPDATE SET
+            count = count + excluded.count,
+            first_seen = MIN(first_seen, excluded.first_seen),
+            last_seen = MAX(last_seen, excluded.last_seen),
+            label = COALESCE(excluded.label, label)
+    """,
+        [
+            (user_id, day, source, kind, item, hour, dow, count, first, last, label)
+            for (day, source, kind, item, hour), (dow, count, first, last, label) in acc.items()
+        ],
+    )
 
-    # Group activities by type and approximate hour
     cursor.execute(
         """
-        SELECT activity_type, hour, COUNT(*) as count,
-               GROUP_CONCAT(DISTINCT day_of_week) as days
-        FROM activity_events
-        WHERE user_id = ? AND activity_time >= ?
-        GROUP BY activity_type, hour
-        HAVING COUNT(*) >= ?
-        ORDER BY count DESC
+        INSERT INTO pattern_analysis_state
+        (user_id, task_rowid, activity_rowid, rollup_from, last_run_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            task_rowid = excluded.task_rowid,
+            activity_rowid = excluded.activity_rowid,
+            rollup_from = excluded.rollup_from,
+            last_run_at = excluded.last_run_at
     """,
-        (user_id, cutoff, min_occurrences),
+        (user_id, task_rowid, activity_rowid, rollup_from, datetime.now().isoformat()),
     )
+    conn.commit()
 
-    patterns = []
-    for row in cursor.fetchall():
-        days = [int(d) for d in row["days"].split(",")]
-        patterns.append(
-            {
-                "activity_type": row["activity_type"],
-                "typical_hour": row["hour"],
-                "occurrence_count": row["count"],
-                "days_observed": [DAY_NAMES[d] for d in days],
-                "confidence": min(config.get("max_confidence", 0.95), 0.4 + row["count"] * 0.05),
-            }
-        )
+    return sum(entry[1] for entry in acc.values())
 
-    conn.close()
-    return patterns
 
+def scan_patterns(user_id: str, config: dict[str, Any], full: bool = False) -> dict[str, Any]:
+    """
+    Detect every pattern family in one pass over the lookback window.
 
-def detect_weekly_cycles(user_id: str, config: dict[str, Any]) -> list[dict]:
-    """Detect day-of-week patterns."""
-    min_occurrences = config.get("min_occurrences", 3)
+    New events are first folded into the daily rollups (see _sync_rollups),
+    then a single scan of the window's rollup rows produces avoidance,
+    daily-routine, weekly-cycle and productive-burst patterns together. The
+    window is hour-granular: it starts at the top of the cutoff hour.
+
+    Args:
+        user_id: User identifier
+        config: Pattern detection configuration
+        full: Rebuild the rollups from raw events instead of syncing
+
+    Returns:
+        dict with avoidance, daily_routines, weekly_cycles, productive_bursts
+        and events_processed
+    """
     lookback = config.get("lookback_days", 30)
-    cutoff = (datetime.now() - timedelta(days=lookback)).isoformat()
+    cutoff = datetime.now() - timedelta(days=lookback)
+    cutoff_date = cutoff.date().isoformat()
+    max_confidence = config.get("max_confidence", 0.95)
+    min_occurrences = config.get("min_occurrences", 3)
 
     conn = get_connection()
-    cursor = conn.cursor()
+    events_processed = _sync_rollups(conn, user_id, cutoff_date, full=full)
 
-    # Count activities per day of week
+    # Collapse the window's rollups to what each family needs: activity by
+    # (type, hour, weekday), postponements by task, completions by (day, hour).
+    cursor = conn.cursor()
+    cursor.row_factory = None
     cursor.execute(
         """
-        SELECT day_of_week, activity_type, COUNT(*) as count
-        FROM activity_events
-        WHERE user_id = ? AND activity_time >= ?
-        GROUP BY day_of_week, activity_type
-        ORDER BY day_of_week, count DESC
+        SELECT source, kind,
+               CASE WHEN kind = 'postponed' THEN item ELSE '' END AS task_id,
+               CASE WHEN source = 'task' THEN bucket_date ELSE '' END AS day,
+               hour, day_of_week,
+               SUM(count), MIN(first_seen), MAX(last_seen), MAX(label)
+        FROM pattern_rollups
+        WHERE user_id = ?
+          AND (bucket_date > ? OR (bucket_date = ? AND hour >= ?))
+          AND (source = 'activity' OR kind IN ('postponed', 'completed'))
+        GROUP BY source, kind, task_id, day, hour, day_of_week
     """,
-        (user_id, cutoff),
+        (user_id, cutoff_date, cutoff_date, cutoff.hour),
     )
 
-    # Organize by day
-    day_activities = defaultdict(list)
-    for row in cursor.fetchall():
-        day_activities[row["day_of_week"]].append(
-            {"activity_type": row["activity_type"], "count": row["count"]}
+    postponed: dict[str, dict[str, Any]] = {}
+    routines: dict[tuple[str, int], list] = {}
+    day_activities: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    completions_by_day: dict[int, int] = defaultdict(int)
+    completions_by_slot: dict[tuple[str, int], int] = defaultdict(int)
+
+    for source, kind, task_id, day, hour, dow, count, first, last, label in cursor:
+        if source == "activity":
+            routine = routines.setdefault((kind, hour), [0, set()])
+            routine[0] += count
+            routine[1].add(dow)
+            day_activities[dow][kind] += count
+        elif kind == "postponed":
+            task = postponed.setdefault(
+                task_id, {"count": 0, "first": first, "last": last, "name": None}
+            )
+            task["count"] += count
+            task["first"] = min(task["first"], first)
+            task["last"] = max(task["last"], last)
+            task["name"] = label or task["name"]
+        else:
+            completions_by_day[dow] += count
+            completions_by_slot[(day, hour)] += count
+
+    # Avoidance: one lookup for "eventually completed" across all candidates
+    threshold = config.get("avoidance_threshold", 3)
+    candidates = {task_id: t for task_id, t in postponed.items() if t["count"] >= threshold}
+    completed_ids: set[str] = set()
+    if candidates:
+        placeholders = ",".join("?" * len(candidates))
+        cursor.execute(
+            f"""
+            SELECT DISTINCT task_id FROM task_events
+            WHERE user_id = ? AND event_type = 'completed' AND task_id IN ({placeholders})
+        """,
+            (user_id, *candidates),
         )
+        completed_ids = {row[0] for row in cursor.fetchall()}
+    conn.close()
 
-    # Also check task completions per day
-    cursor.execute(
-        """
-        SELECT
-            CAST(strftime('%w', event_time) AS INTEGER) as dow,
-            COUNT(*) as completions
-        FROM task_events
-        WHERE user_id = ? AND event_type = 'completed' AND event_time >= ?
-        GROUP BY dow
-    """,
-        (user_id, cutoff),
-    )
-
-    completions_by_day = {row["dow"]: row["completions"] for row in cursor.fetchall()}
+    boost = config.get("confidence_boost_per_occurrence", 0.1)
+    avoidance = [
+        {
+            "task_id": task_id,
+            "task_name": task["name"],
+            "postpone_count": task["count"],
+            "first_postponed": task["first"],
+            "last_postponed": task["last"],
+            "eventually_completed": task_id in completed_ids,
+            "confidence": min(max_confidence, 0.5 + task["count"] * boost),
+        }
+        for task_id, task in candidates.items()
+    ]
+    avoidance.sort(key=lambda p: p["postpone_count"], reverse=True)
 
-    conn.close()
+    daily_routines = [
+        {
+            "activity_type": activity_type,
+            "typical_hour": hour,
+            "occurrence_count": count,
+            "days_observed": [DAY_NAMES[d] for d in sorted(days)],
+            "confidence": min(max_confidence, 0.4 + count * 0.05),
+        }
+        for (activity_type, hour), (count, days) in routines.items()
+        if count >= min_occurrences
+    ]
+    daily_routines.sort(key=lambda p: p["occurrence_count"], reverse=True)
 
-    patterns = []
+    weekly_cycles = []
     for dow, activities in day_activities.items():
-        day_name = DAY_NAMES[dow]
-        total_activity = sum(a["count"] for a in activities)
-
-        patterns.append(
+        ranked = sorted(activities.items(), key=lambda a: a[1], reverse=True)
+        total_activity = sum(activities.values())
+        weekly_cycles.append(
             {
-                "day": day_name,
+                "day": DAY_NAMES[dow],
                 "total_activities": total_activity,
-                "top_activities": activities[:3],
+                "top_activities": [
+                    {"activity_type": activity_type, "count": count}
+                    for activity_type, count in ranked[:3]
+                ],
                 "task_completions": completions_by_day.get(dow, 0),
                 "confidence": min(0.8, 0.3 + total_activity * 0.02),
             }
         )
+    weekly_cycles.sort(key=lambda x: x["total_activities"], reverse=True)
+
+    bursts = [
+        {"date": date, "hour": hour, "completions": completions}
+        for (date, hour), completions in completions_by_slot.items()
+        if completions >= 2
+    ]
+    bursts.sort(key=lambda b: b["completions"], reverse=True)
+
+    productive_bursts = []
+    if bursts:
+        hour_counts: dict[int, int] = defaultdict(int)
+        for burst in bursts:
+            hour_counts[burst["hour"]] += 1
+        recurring_hours = [h for h, c in hour_counts.items() if c >= min_occurrences]
+        productive_bursts.append(
+            {
+                "burst_hours": sorted(recurring_hours),
+                "total_bursts": len(bursts),
+                "sample_bursts": bursts[:5],
+                "confidence": min(0.8, 0.3 + len(bursts) * 0.05),
+            }
+        )
 
-    return sorted(patterns, key=lambda x: x["total_activities"], reverse=True)
+    return {
+        "avoidance": avoidance,
+        "daily_routines": daily_routines,
+        "weekly_cycles": weekly_cycles,
+        "productive_bursts": productive_bursts,
+        "events_processed": events_processed,
+    }
 
 
-def detect_productive_bursts(user_id: str, config: dict[str, Any]) -> list[dict]:
-    """Detect clusters of task completions."""
-    lookback = config.get("lookback_days", 30)
-    cutoff = (datetime.now() - timedelta(days=lookback)).isoformat()
+def detect_avoidance_patterns(user_id: str, config: dict[str, Any]) -> list[dict]:
+    """Detect tasks that are repeatedly postponed."""
+    return scan_patterns(user_id, config)["avoidance"]
 
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    # Find hours with multiple completions
-    cursor.execute(
-        """
-        SELECT
-            date(event_time) as completion_date,
-            CAST(strftime('%H', event_time) AS INTEGER) as hour,
-            COUNT(*) as completions
-        FROM task_events
-        WHERE user_id = ? AND event_type = 'completed' AND event_time >= ?
-        GROUP BY completion_date, hour
-        HAVING COUNT(*) >= 2
-        ORDER BY completions DESC
-    """,
-        (user_id, cutoff),
-    )
+def detect_daily_routines(user_id: str, config: dict[str, Any]) -> list[dict]:
+    """Detect same-time daily activities."""
+    return scan_patterns(user_id, config)["daily_routines"]
 
-    bursts = []
-    for row in cursor.fetchall():
-        bursts.append(
-            {"date": row["completion_date"], "hour": row["hour"], "completions": row["completions"]}
-        )
 
-    conn.close()
+def detect_weekly_cycles(user_id: str, config: dict[str, Any]) -> list[dict]:
+    """Detect day-of-week patterns."""
+    return scan_patterns(user_id, config)["weekly_cycles"]
+
 
-    if not bursts:
-        return []
+def detect_productive_bursts(user_id: str, config: dict[str, Any]) -> list[dict]:
+    """Detect clusters of task completions."""
+    return scan_patterns(user_id, config)["productive_bursts"]
 
-    # Identify recurring burst hours
-    hour_counts = defaultdict(int)
-    for burst in bursts:
-        hour_counts[burst["hour"]] += 1
 
-    recurring_hours = [h for h, c in hour_counts.items() if c >= config.get("min_occurrences", 3)]
+def _save_patterns(
+    conn: sqlite3.Connection,
+    user_id: str,
+    patterns: list[tuple[str, dict[str, Any], float, int]],
+) -> list[str]:
+    """Upsert (pattern_type, pattern_data, confidence, sample_count) tuples."""
+    cursor = conn.cursor()
+    now = datetime.now().isoformat()
+    pattern_ids = []
 
-    return [
-        {
-            "burst_hours": sorted(recurring_hours),
-            "total_bursts": len(bursts),
-            "sample_bursts": bursts[:5],
-            "confidence": min(0.8, 0.3 + len(bursts) * 0.05),
-        }
-    ]
+    for pattern_type, pattern_data, confidence, sample_count in patterns:
+        # Check if similar pattern exists
+        pattern_key = json.dumps(pattern_data, sort_keys=True)
+        cursor.execute(
+            """
+            SELECT id FROM behavior_patterns
+            WHERE user_id = ? AND pattern_type = ? AND pattern_data = ?
+        """,
+            (user_id, pattern_type, pattern_key),
+        )
+        existing = cursor.fetchone()
+
+        if existing:
+            cursor.execute(
+                """
+                UPDATE behavior_patterns
+                SET confidence = ?, sample_count = ?, last_observed = ?, is_active = 1
+                WHERE id = ?
+            """,
+                (confidence, sample_count, now, existing["id"]),
+            )
+            pattern_ids.append(existing["id"])
+        else:
+            pattern_id = str(uuid.uuid4())[:8]
+            cursor.execute(
+                """
+                INSERT INTO behavior_patterns
+                (id, user_id, pattern_type, pattern_data, confidence, sample_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (pattern_id, user_id, pattern_type, pattern_key, confidence, sample_count),
+            )
+            pattern_ids.append(pattern_id)
+
+    conn.commit()
+    return pattern_ids
 
 
 def save_pattern(
@@ -497,56 +702,24 @@ def save_pattern(
 ) -> str:
     """Save or update a detected pattern."""
     conn = get_connection()
-    cursor = conn.cursor()
-
-    # Check if similar pattern exists
-    pattern_key = json.dumps(pattern_data, sort_keys=True)
-    cursor.execute(
-        """
-        SELECT id, sample_count FROM behavior_patterns
-        WHERE user_id = ? AND pattern_type = ? AND pattern_data = ?
-    """,
-        (user_id, pattern_type, pattern_key),
-    )
-
-    existing = cursor.fetchone()
-
-    if existing:
-        # Update existing pattern
-        cursor.execute(
-            """
-            UPDATE behavior_patterns
-            SET confidence = ?, sample_count = ?, last_observed = ?, is_active = 1
-            WHERE id = ?
-        """,
-            (confidence, sample_count, datetime.now().isoformat(), existing["id"]),
-        )
-        pattern_id = existing["id"]
-    else:
-        # Create new pattern
-        pattern_id = str(uuid.uuid4())[:8]
-        cursor.execute(
-            """
-            INSERT INTO behavior_patterns
-            (id, user_id, pattern_type, pattern_data, confidence, sample_count)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (pattern_id, user_id, pattern_type, pattern_key, confidence, sample_count),
-        )
-
-    conn.commit()
+    pattern_id = _save_patterns(
+        conn, user_id, [(pattern_type, pattern_data, confidence, sample_count)]
+    )[0]
     conn.close()
-
     return pattern_id
 
 
-def analyze_patterns(user_id: str, since: str | None = None) -> dict[str, Any]:
+def analyze_patterns(user_id: str, since: str | None = None, full: bool = False) -> dict[str, Any]:
     """
     Run full pattern analysis for a user.
 
+    Only events recorded since the previous run are read from the event
+    tables; all pattern families come from one pass over the rollups.
+
     Args:
         user_id: User identifier
         since: Duration to look back (e.g., '30d')
+        full: Rebuild the rollups from raw events (force re-detection)
 
     Returns:
         dict with all detected patterns
@@ -561,46 +734,50 @@ def analyze_patterns(user_id: str, since: str | None = None) -> dict[str, Any]:
         if duration:
             config["lookback_days"] = duration.days
 
-    # Detect all pattern types
-    avoidance = detect_avoidance_patterns(user_id, config)
-    routines = detect_daily_routines(user_id, config)
-    weekly = detect_weekly_cycles(user_id, config)
-    bursts = detect_productive_bursts(user_id, config)
+    detected = scan_patterns(user_id, config, full=full)
+    avoidance = detected["avoidance"]
+    routines = detected["daily_routines"]
+    bursts = detected["productive_bursts"]
 
-    # Save significant patterns
-    patterns_saved = 0
+    # Save significant patterns in one transaction
+    to_save: list[tuple[str, dict[str, Any], float, int]] = []
 
     for pattern in avoidance:
         if pattern["confidence"] >= 0.5:
-            save_pattern(
-                user_id,
-                "avoidance",
-                {"task_id": pattern["task_id"], "task_name": pattern["task_name"]},
-                pattern["confidence"],
-                pattern["postpone_count"],
+            to_save.append(
+                (
+                    "avoidance",
+                    {"task_id": pattern["task_id"], "task_name": pattern["task_name"]},
+                    pattern["confidence"],
+                    pattern["postpone_count"],
+                )
             )
-            patterns_saved += 1
 
     for pattern in routines:
         if pattern["confidence"] >= 0.5:
-            save_pattern(
-                user_id,
-                "daily_routine",
-                {"activity_type": pattern["activity_type"], "hour": pattern["typical_hour"]},
-                pattern["confidence"],
-                pattern["occurrence_count"],
+            to_save.append(
+                (
+                    "daily_routine",
+                    {"activity_type": pattern["activity_type"], "hour": pattern["typical_hour"]},
+                    pattern["confidence"],
+                    pattern["occurrence_count"],
+                )
             )
-            patterns_saved += 1
 
     if bursts and bursts[0]["confidence"] >= 0.5:
-        save_pattern(
-            user_id,
-            "productive_burst",
-            {"hours": bursts[0]["burst_hours"]},
-            bursts[0]["confidence"],
-            bursts[0]["total_bursts"],
+        to_save.append(
+            (
+                "productive_burst",
+                {"hours": bursts[0]["burst_hours"]},
+                bursts[0]["confidence"],
+                bursts[0]["total_bursts"],
+            )
         )
-        patterns_saved += 1
+
+    if to_save:
+        conn = get_connection()
+        _save_patterns(conn, user_id, to_save)
+        conn.close()
 
     return {
         "success": True,
@@ -608,10 +785,11 @@ def analyze_patterns(user_id: str, since: str | None = None) -> dict[str, Any]:
         "patterns": {
             "avoidance": avoidance,
             "daily_routines": routines,
-            "weekly_cycles": weekly,
+            "weekly_cycles": detected["weekly_cycles"],
             "productive_bursts": bursts,
         },
-        "patterns_saved": patterns_saved,
+        "patterns_saved": len(to_save),
+        "events_processed": detected["events_processed"],
         "lookback_days": config.get("lookback_days", 30),
     }
 
@@ -792,9 +970,12 @@ Examples:
     args = parser.parse_args()
     result = None
 
-    if args.action == "analyze" or args.action == "detect":
+    if args.action == "analyze":
         result = analyze_patterns(args.user, args.since)
 
+    elif args.action == "detect":
+        result = analyze_patterns(args.user, args.since, full=True)
+
     elif args.action == "habits":
         result = get_habits(args.user)
 
@@ -53,6 +53,7 @@ from typing import Any
 
 import yaml
 
+from tools import db_connections
 from tools.agent.constants import OWNER_USER_ID
 
 # Paths
@@ -75,10 +76,11 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Commitments table
@@ -111,7 +113,6 @@ def get_connection() -> sqlite3.Connection:
     )
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -41,6 +41,7 @@ from typing import Any
 
 import yaml
 
+from tools import db_connections
 from tools.agent.constants import OWNER_USER_ID
 
 # Paths
@@ -60,10 +61,7 @@ def load_config() -> dict[str, Any]:
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_connections.get_connection(DB_PATH)
 
 
 def row_to_dict(row) -> dict | None:
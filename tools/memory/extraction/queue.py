@@ -26,26 +26,31 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import sqlite3
 import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
+from tools import db_connections
 from tools.agent import PROJECT_ROOT
 from tools.memory.extraction.gate import should_extract, has_commitment_language
 from tools.memory.extraction.extractor import extract_session_notes
 
+if TYPE_CHECKING:
+    import sqlite3
+
 logger = logging.getLogger(__name__)
 
 _DB_PATH = PROJECT_ROOT / "data" / "extraction_queue.db"
 
 
 def _get_connection() -> sqlite3.Connection:
-    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(_DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(_DB_PATH, _init_schema)
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     conn.execute("""CREATE TABLE IF NOT EXISTS queue_items (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         item_data TEXT NOT NULL,
@@ -54,7 +59,6 @@ def _get_connection() -> sqlite3.Connection:
         updated_at TEXT DEFAULT CURRENT_TIMESTAMP
     )""")
     conn.commit()
-    return conn
 
 
 @dataclass
@@ -35,6 +35,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
 
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "memory.db"
@@ -48,10 +50,11 @@ VALID_SOURCES = ["user", "inferred", "session", "external", "system"]
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Main memory entries table
@@ -113,7 +116,6 @@ def get_connection():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_logs_date ON daily_logs(date)")
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -29,6 +29,8 @@ Database: data/mobile.db
 import sqlite3
 from pathlib import Path
 
+from tools import db_connections
+
 
 # Path constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -36,6 +38,9 @@ CONFIG_PATH = PROJECT_ROOT / "args"
 DATA_PATH = PROJECT_ROOT / "data"
 DB_PATH = DATA_PATH / "mobile.db"
 
+# Maximum IDs per IN (...) clause in bulk lookups
+BULK_QUERY_CHUNK = 500
+
 
 def get_connection() -> sqlite3.Connection:
     """
@@ -44,10 +49,11 @@ def get_connection() -> sqlite3.Connection:
     Returns:
         SQLite connection with row_factory set
     """
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Push subscriptions (Web Push endpoints)
@@ -173,7 +179,6 @@ def get_connection() -> sqlite3.Connection:
     )
 
     conn.commit()
-    return conn
 
 
 def ensure_default_categories() -> None:
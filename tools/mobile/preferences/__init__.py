@@ -2,6 +2,7 @@
 
 from tools.mobile.preferences.user_preferences import (
     get_preferences,
+    get_preferences_bulk,
     update_preferences,
     set_quiet_hours,
     set_category_preference,
@@ -16,6 +17,7 @@ from tools.mobile.preferences.category_manager import (
 
 __all__ = [
     "get_preferences",
+    "get_preferences_bulk",
     "update_preferences",
     "set_quiet_hours",
     "set_category_preference",
@@ -5,6 +5,7 @@ Purpose: Manage per-user notification settings
 Usage:
     from tools.mobile.preferences.user_preferences import (
         get_preferences,
+        get_preferences_bulk,
         update_preferences,
         set_quiet_hours,
         set_category_preference,
@@ -21,7 +22,7 @@ import json
 from datetime import datetime
 from typing import Any
 
-from tools.mobile import get_connection
+from tools.mobile import BULK_QUERY_CHUNK, get_connection
 from tools.mobile.models import UserPreferences
 
 
@@ -61,6 +62,39 @@ async def get_preferences(user_id: str) -> dict:
     row = cursor.fetchone()
     conn.close()
 
+    return _row_to_preferences(user_id, row)
+
+
+async def get_preferences_bulk(user_ids: list[str]) -> dict[str, dict]:
+    """
+    Get notification preferences for many users in one query.
+
+    Args:
+        user_ids: The user IDs
+
+    Returns:
+        Dict mapping user_id to a preferences dict (defaults when unset)
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    rows = {}
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    for start in range(0, len(unique_ids), BULK_QUERY_CHUNK):
+        chunk = unique_ids[start : start + BULK_QUERY_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"SELECT * FROM notification_preferences WHERE user_id IN ({placeholders})",
+            chunk,
+        )
+        rows.update({row["user_id"]: row for row in cursor.fetchall()})
+    conn.close()
+
+    return {user_id: _row_to_preferences(user_id, rows.get(user_id)) for user_id in unique_ids}
+
+
+def _row_to_preferences(user_id: str, row) -> dict:
+    """Build a preferences dict from a stored row, filling in defaults."""
     if not row:
         # Return defaults
         return {**DEFAULT_PREFERENCES, "user_id": user_id}
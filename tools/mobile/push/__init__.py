@@ -10,6 +10,7 @@ from tools.mobile.push.subscription_manager import (
     register_subscription,
     unregister_subscription,
     get_user_subscriptions,
+    get_subscriptions_for_users,
     prune_stale_subscriptions,
 )
 from tools.mobile.push.delivery import (
@@ -25,6 +26,7 @@ __all__ = [
     "register_subscription",
     "unregister_subscription",
     "get_user_subscriptions",
+    "get_subscriptions_for_users",
     "prune_stale_subscriptions",
     "deliver",
     "deliver_batch",
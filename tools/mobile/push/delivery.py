@@ -4,14 +4,20 @@ Purpose: Send notifications with retry logic and delivery tracking
 
 Usage:
     from tools.mobile.push.delivery import deliver, deliver_batch
+
+    # Share one limiter across concurrent deliveries to cap in-flight sends
+    # per provider (web push, Expo, FCM, APNs)
+    limiter = ProviderLimiter(load_provider_limits())
+    await asyncio.gather(*(deliver(n, limiter=limiter) for n in notifications))
 """
 
 import asyncio
+import contextlib
 import uuid
 from datetime import datetime
 from typing import Any
 
-from tools.mobile import get_connection
+from tools.mobile import CONFIG_PATH, get_connection
 from tools.mobile.models import Notification, DeliveryResult, DeliveryStatus
 from tools.mobile.push.web_push import send_push, send_batch
 from tools.mobile.push.subscription_manager import (
@@ -20,18 +26,167 @@ from tools.mobile.push.subscription_manager import (
 )
 
 
+# Push providers, keyed by the token a subscription carries
+PROVIDER_WEB_PUSH = "web_push"
+PROVIDER_EXPO = "expo"
+PROVIDER_FCM = "fcm"
+PROVIDER_APNS = "apns"
+
+# Concurrent sends per provider (override via queue.provider_concurrency
+# in args/mobile_push.yaml)
+DEFAULT_PROVIDER_CONCURRENCY = {
+    PROVIDER_WEB_PUSH: 32,
+    PROVIDER_EXPO: 16,
+    PROVIDER_FCM: 16,
+    PROVIDER_APNS: 8,
+}
+
+
+class ProviderLimiter:
+    """
+    Caps in-flight sends per push provider.
+
+    One limiter is shared by all deliveries running concurrently so a burst
+    for many users cannot flood a single push service.
+    """
+
+    def __init__(self, limits: dict[str, int] | None = None):
+        self.limits = {**DEFAULT_PROVIDER_CONCURRENCY, **(limits or {})}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, provider: str) -> asyncio.Semaphore:
+        """Return the semaphore guarding sends to ``provider``."""
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            limit = self.limits.get(provider, DEFAULT_PROVIDER_CONCURRENCY[PROVIDER_APNS])
+            semaphore = asyncio.Semaphore(max(1, int(limit)))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+
+def load_provider_limits() -> dict[str, int]:
+    """Load per-provider concurrency limits from mobile_push.yaml."""
+    config_file = CONFIG_PATH / "mobile_push.yaml"
+    if not config_file.exists():
+        return dict(DEFAULT_PROVIDER_CONCURRENCY)
+
+    try:
+        import yaml
+
+        with open(config_file) as f:
+            config = yaml.safe_load(f) or {}
+        limits = config.get("queue", {}).get("provider_concurrency") or {}
+        return {**DEFAULT_PROVIDER_CONCURRENCY, **limits}
+    except Exception:
+        return dict(DEFAULT_PROVIDER_CONCURRENCY)
+
+
+def subscription_provider(subscription: dict) -> str:
+    """Identify which push provider serves a subscription."""
+    if subscription.get("expo_token"):
+        return PROVIDER_EXPO
+    if subscription.get("fcm_token"):
+        return PROVIDER_FCM
+    if subscription.get("apns_token"):
+        return PROVIDER_APNS
+    return PROVIDER_WEB_PUSH
+
+
+class DeliveryRecorder:
+    """
+    Buffers delivery-log rows and queue status updates for bulk writes.
+
+    Concurrent deliveries in a processing cycle record through one recorder
+    instead of committing two rows per notification; rows are written with
+    executemany whenever ``flush_every`` accumulate and on flush().
+    """
+
+    def __init__(self, flush_every: int = 500):
+        self.flush_every = flush_every
+        self.log_rows: list[tuple] = []
+        self.status_rows: list[tuple] = []
+
+    def log(
+        self,
+        notification_id: str,
+        subscription_id: str,
+        status: DeliveryStatus,
+        delivery_id: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.log_rows.append(
+            (
+                delivery_id or f"log_{uuid.uuid4().hex[:12]}",
+                notification_id,
+                subscription_id,
+                status.value if isinstance(status, DeliveryStatus) else status,
+                error,
+                datetime.now().isoformat(),
+            )
+        )
+        self._maybe_flush()
+
+    def status(self, notification_id: str, status: DeliveryStatus) -> None:
+        self.status_rows.append(
+            (
+                status.value if isinstance(status, DeliveryStatus) else status,
+                datetime.now().isoformat(),
+                notification_id,
+            )
+        )
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self.log_rows) + len(self.status_rows) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows in one transaction."""
+        if not self.log_rows and not self.status_rows:
+            return
+
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO notification_delivery_log
+            (id, notification_id, subscription_id, status, error_message, sent_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            self.log_rows,
+        )
+        cursor.executemany(
+            "UPDATE notification_queue SET status = ?, sent_at = ? WHERE id = ?",
+            self.status_rows,
+        )
+        conn.commit()
+        conn.close()
+
+        self.log_rows = []
+        self.status_rows = []
+
+
 async def deliver(
     notification: Notification,
     max_retries: int = 3,
     retry_delay: float = 1.0,
+    subscriptions: list[dict] | None = None,
+    limiter: ProviderLimiter | None = None,
+    recorder: DeliveryRecorder | None = None,
 ) -> dict:
     """
     Deliver a notification to all user's subscriptions with retry logic.
 
+    Subscriptions are sent to concurrently; pass a shared limiter to bound
+    concurrency per provider across many deliveries.
+
     Args:
         notification: The notification to deliver
         max_retries: Maximum retry attempts per subscription
         retry_delay: Initial delay between retries (exponential backoff)
+        subscriptions: Preloaded active subscriptions (looked up if None)
+        limiter: Per-provider concurrency limiter
+        recorder: Buffer for log/status writes (written immediately if None)
 
     Returns:
         {
@@ -43,7 +198,8 @@ async def deliver(
         }
     """
     # Get all active subscriptions for user
-    subscriptions = await get_user_subscriptions(notification.user_id, active_only=True)
+    if subscriptions is None:
+        subscriptions = await get_user_subscriptions(notification.user_id, active_only=True)
 
     if not subscriptions:
         return {
@@ -64,14 +220,22 @@ async def deliver(
     }
 
     # Send to each subscription
-    for sub in subscriptions:
-        delivery_result = await _deliver_to_subscription(
-            notification=notification,
-            subscription_id=sub["id"],
-            max_retries=max_retries,
-            retry_delay=retry_delay,
+    delivery_results = await asyncio.gather(
+        *(
+            _deliver_to_subscription(
+                notification=notification,
+                subscription_id=sub["id"],
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                subscription=sub,
+                limiter=limiter,
+                recorder=recorder,
+            )
+            for sub in subscriptions
         )
+    )
 
+    for sub, delivery_result in zip(subscriptions, delivery_results, strict=True):
         if delivery_result.success:
             results["successful"] += 1
             if delivery_result.delivery_id:
@@ -85,7 +249,7 @@ async def deliver(
 
     # Update notification status
     final_status = DeliveryStatus.SENT if results["successful"] > 0 else DeliveryStatus.FAILED
-    await _update_notification_status(notification.id, final_status)
+    await _update_notification_status(notification.id, final_status, recorder)
 
     return results
 
@@ -95,22 +259,31 @@ async def _deliver_to_subscription(
     subscription_id: str,
     max_retries: int = 3,
     retry_delay: float = 1.0,
+    subscription: dict | None = None,
+    limiter: ProviderLimiter | None = None,
+    recorder: DeliveryRecorder | None = None,
 ) -> DeliveryResult:
     """Deliver notification to a single subscription with retries."""
     last_error = None
+    provider = subscription_provider(subscription) if subscription else PROVIDER_WEB_PUSH
 
     for attempt in range(max_retries):
-        result = await send_push(
-            subscription_id=subscription_id,
-            title=notification.title,
-            body=notification.body,
-            data=notification.data,
-            icon_url=notification.icon_url,
-            action_url=notification.action_url,
-            tag=notification.batch_key or notification.id,
-            require_interaction=notification.priority >= 8,
-            silent=notification.priority < 3,
-        )
+        slot = limiter.slot(provider) if limiter else contextlib.nullcontext()
+        async with slot:
+            if provider == PROVIDER_WEB_PUSH:
+                result = await send_push(
+                    subscription_id=subscription_id,
+                    title=notification.title,
+                    body=notification.body,
+                    data=notification.data,
+                    icon_url=notification.icon_url,
+                    action_url=notification.action_url,
+                    tag=notification.batch_key or notification.id,
+                    require_interaction=notification.priority >= 8,
+                    silent=notification.priority < 3,
+                )
+            else:
+                result = await _send_native(notification, subscription, provider)
 
         if result["success"]:
             # Log successful delivery
@@ -120,6 +293,7 @@ async def _deliver_to_subscription(
                 subscription_id=subscription_id,
                 status=DeliveryStatus.SENT,
                 delivery_id=delivery_id,
+                recorder=recorder,
             )
 
             return DeliveryResult(
@@ -137,6 +311,7 @@ async def _deliver_to_subscription(
                 subscription_id=subscription_id,
                 status=DeliveryStatus.FAILED,
                 error=result.get("error", "Endpoint invalid"),
+                recorder=recorder,
             )
             return DeliveryResult(
                 success=False,
@@ -164,6 +339,7 @@ async def _deliver_to_subscription(
         subscription_id=subscription_id,
         status=DeliveryStatus.FAILED,
         error=last_error,
+        recorder=recorder,
     )
 
     return DeliveryResult(
@@ -174,6 +350,27 @@ async def _deliver_to_subscription(
     )
 
 
+async def _send_native(notification: Notification, subscription: dict, provider: str) -> dict:
+    """Send via Expo/FCM/APNs, normalised to the send_push() result shape."""
+    # Imported lazily: native_tokens needs aiohttp and migrates columns on import
+    from tools.mobile.push.native_tokens import send_native_push
+
+    result = await send_native_push(
+        subscription[f"{provider}_token"],
+        provider,
+        {
+            "title": notification.title,
+            "body": notification.body or "",
+            "data": {**(notification.data or {}), "action_url": notification.action_url or "/"},
+            "priority": notification.priority,
+        },
+    )
+    result["should_unsubscribe"] = result.get("should_unregister", False)
+    if result.get("success"):
+        result["delivery_id"] = result.get("receipt_id")
+    return result
+
+
 async def deliver_batch(
     notifications: list[Notification],
     user_id: str,
@@ -267,8 +464,13 @@ async def _log_delivery(
     status: DeliveryStatus,
     delivery_id: str | None = None,
     error: str | None = None,
+    recorder: DeliveryRecorder | None = None,
 ) -> None:
     """Log a delivery attempt."""
+    if recorder is not None:
+        recorder.log(notification_id, subscription_id, status, delivery_id, error)
+        return
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -296,8 +498,13 @@ async def _log_delivery(
 async def _update_notification_status(
     notification_id: str,
     status: DeliveryStatus,
+    recorder: DeliveryRecorder | None = None,
 ) -> None:
     """Update notification status in queue."""
+    if recorder is not None:
+        recorder.status(notification_id, status)
+        return
+
     conn = get_connection()
     cursor = conn.cursor()
 
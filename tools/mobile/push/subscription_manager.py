@@ -7,6 +7,7 @@ Usage:
         register_subscription,
         unregister_subscription,
         get_user_subscriptions,
+        get_subscriptions_for_users,
         prune_stale_subscriptions,
     )
 """
@@ -15,7 +16,7 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Any
 
-from tools.mobile import get_connection
+from tools.mobile import BULK_QUERY_CHUNK, get_connection
 from tools.mobile.models import PushSubscription
 
 
@@ -229,6 +230,39 @@ async def get_user_subscriptions(
     return [dict(row) for row in rows]
 
 
+async def get_subscriptions_for_users(
+    user_ids: list[str],
+    active_only: bool = True,
+) -> dict[str, list[dict]]:
+    """
+    Get subscriptions for many users in one query per chunk.
+
+    Args:
+        user_ids: The user IDs
+        active_only: If True, only return active subscriptions
+
+    Returns:
+        Dict mapping every requested user_id to its subscription dicts
+    """
+    unique_ids = list(dict.fromkeys(user_ids))
+    by_user: dict[str, list[dict]] = {user_id: [] for user_id in unique_ids}
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    for start in range(0, len(unique_ids), BULK_QUERY_CHUNK):
+        chunk = unique_ids[start : start + BULK_QUERY_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        query = f"SELECT * FROM push_subscriptions WHERE user_id IN ({placeholders})"
+        if active_only:
+            query += " AND is_active = TRUE"
+        cursor.execute(query + " ORDER BY created_at DESC", chunk)
+        for row in cursor.fetchall():
+            by_user[row["user_id"]].append(dict(row))
+    conn.close()
+
+    return by_user
+
+
 async def get_subscription(subscription_id: str) -> dict | None:
     """
     Get a single subscription by ID.
@@ -230,8 +230,9 @@ async def send_push(
     delivery_id = f"del_{uuid.uuid4().hex[:12]}"
 
     try:
-        # Send push notification
-        response = webpush(
+        # Send push notification (blocking HTTP call, kept off the event loop)
+        response = await asyncio.to_thread(
+            webpush,
             subscription_info=subscription.get_subscription_info(),
             data=json.dumps(payload),
             vapid_private_key=vapid_config["private_key"],
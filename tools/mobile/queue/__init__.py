@@ -14,6 +14,7 @@ from tools.mobile.queue.batcher import (
 )
 from tools.mobile.queue.scheduler import (
     can_send_now,
+    evaluate_send_eligibility,
     get_next_send_window,
     is_in_quiet_hours,
     check_rate_limit,
@@ -29,6 +30,7 @@ __all__ = [
     "create_batch_summary",
     "process_expired_batches",
     "can_send_now",
+    "evaluate_send_eligibility",
     "get_next_send_window",
     "is_in_quiet_hours",
     "check_rate_limit",
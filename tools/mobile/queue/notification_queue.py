@@ -12,13 +12,21 @@ Usage:
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
 from tools.mobile import get_connection
 from tools.mobile.models import Notification, DeliveryStatus
-from tools.mobile.push.delivery import deliver, deliver_batch
-from tools.mobile.queue.scheduler import can_send_now
+from tools.mobile.push.delivery import (
+    DeliveryRecorder,
+    ProviderLimiter,
+    deliver,
+    deliver_batch,
+    load_provider_limits,
+)
+from tools.mobile.push.subscription_manager import get_subscriptions_for_users
+from tools.mobile.queue.scheduler import evaluate_send_eligibility
 from tools.mobile.queue.batcher import (
     should_batch,
     get_batch,
@@ -26,6 +34,10 @@ from tools.mobile.queue.batcher import (
 )
 
 
+# Notifications delivered concurrently per processing cycle
+MAX_CONCURRENT_DELIVERIES = 64
+
+
 async def enqueue(
     user_id: str,
     category: str,
@@ -144,14 +156,28 @@ async def enqueue(
         return {"success": False, "error": str(e)}
 
 
-async def process_queue(limit: int = 100) -> dict:
+async def process_queue(
+    limit: int = 100,
+    max_concurrency: int = MAX_CONCURRENT_DELIVERIES,
+) -> dict:
     """
     Process pending notifications, respecting flow state and batching.
 
     This is the main processing loop that should be called periodically.
+    Each cycle runs as a pipeline over all due notifications rather than
+    one notification at a time:
+
+    1. fetch: load up to ``limit`` due notifications
+    2. triage: set aside expired and batch-bound notifications
+    3. eligibility: quiet hours, flow state and rate limits for every user
+       in the cycle at once (see evaluate_send_eligibility)
+    4. writes: expirations and reschedules in a single transaction
+    5. delivery: concurrent sends, bounded per push provider, with delivery
+       logs and status updates written in batches
 
     Args:
         limit: Maximum notifications to process per run
+        max_concurrency: Maximum notifications being delivered at once
 
     Returns:
         {
@@ -160,6 +186,8 @@ async def process_queue(limit: int = 100) -> dict:
             "batched": int,
             "suppressed": int,
             "expired": int,
+            "errors": int,
+            "timings_ms": {stage: float},
         }
     """
     results = {
@@ -170,10 +198,19 @@ async def process_queue(limit: int = 100) -> dict:
         "expired": 0,
         "errors": 0,
     }
+    timings: dict[str, float] = {}
+    started = clock = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal clock
+        now = time.perf_counter()
+        timings[stage] = round((now - clock) * 1000, 3)
+        clock = now
 
     # First, process expired batches
     batch_results = await process_expired_batches()
     results["batched"] = batch_results.get("sent", 0)
+    lap("batches")
 
     # Get pending notifications (not scheduled for future, not batched)
     conn = get_connection()
@@ -196,55 +233,81 @@ async def process_queue(limit: int = 100) -> dict:
 
     rows = cursor.fetchall()
     conn.close()
+    lap("fetch")
 
+    candidates: list[Notification] = []
+    expired_ids: list[str] = []
     for row in rows:
         notification = Notification.from_dict(dict(row))
         results["processed"] += 1
 
         # Check if expired
         if notification.is_expired():
-            await _mark_expired(notification.id)
+            expired_ids.append(notification.id)
             results["expired"] += 1
             continue
 
-        # Check if should batch
-        if await should_batch(notification):
-            # Will be processed when batch window expires
+        # Check if should batch (will be processed when batch window expires)
+        if notification.batch_key and await should_batch(notification):
             continue
 
-        # Check if can send now (flow state, quiet hours, rate limits)
-        send_check = await can_send_now(notification.user_id, notification.priority)
-
-        if not send_check["can_send"]:
-            # Suppress or reschedule
-            reason = send_check.get("reason", "unknown")
-
-            if reason == "quiet_hours" and send_check.get("retry_at"):
-                # Reschedule for after quiet hours
-                await _reschedule(notification.id, send_check["retry_at"])
-                results["suppressed"] += 1
-            elif reason == "flow_state" and notification.respect_flow_state:
-                # Suppress (will retry on next process)
-                results["suppressed"] += 1
-            elif reason == "rate_limit":
-                # Reschedule for after cooldown
-                if send_check.get("retry_at"):
-                    await _reschedule(notification.id, send_check["retry_at"])
-                results["suppressed"] += 1
-            else:
-                results["suppressed"] += 1
+        candidates.append(notification)
+    lap("triage")
+
+    # Check if can send now (flow state, quiet hours, rate limits), per user
+    subscriptions = await get_subscriptions_for_users([n.user_id for n in candidates])
+    decisions = await evaluate_send_eligibility(
+        [(n.user_id, n.priority) for n in candidates],
+        subscription_counts={user_id: len(subs) for user_id, subs in subscriptions.items()},
+    )
+
+    to_deliver: list[Notification] = []
+    reschedules: list[tuple[str, str]] = []
+    for notification, send_check in zip(candidates, decisions, strict=True):
+        if send_check["can_send"]:
+            to_deliver.append(notification)
             continue
 
-        # Send notification
-        try:
-            delivery_result = await deliver(notification)
-            if delivery_result.get("successful", 0) > 0:
-                results["sent"] += 1
-            else:
-                results["errors"] += 1
-        except Exception as e:
+        # Quiet hours and rate limits reschedule for later; flow state and
+        # anything else stay pending and are retried on the next run
+        reason = send_check.get("reason", "unknown")
+        if reason in ("quiet_hours", "rate_limit") and send_check.get("retry_at"):
+            reschedules.append((send_check["retry_at"].isoformat(), notification.id))
+        results["suppressed"] += 1
+    lap("eligibility")
+
+    await _apply_queue_updates(expired_ids, reschedules)
+    lap("writes")
+
+    # Send notifications
+    limiter = ProviderLimiter(load_provider_limits())
+    recorder = DeliveryRecorder()
+    gate = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def send(notification: Notification) -> dict:
+        async with gate:
+            return await deliver(
+                notification,
+                subscriptions=subscriptions.get(notification.user_id, []),
+                limiter=limiter,
+                recorder=recorder,
+            )
+
+    try:
+        outcomes = await asyncio.gather(
+            *(send(notification) for notification in to_deliver), return_exceptions=True
+        )
+    finally:
+        recorder.flush()
+    for outcome in outcomes:
+        if isinstance(outcome, Exception) or outcome.get("successful", 0) == 0:
             results["errors"] += 1
+        else:
+            results["sent"] += 1
+    lap("delivery")
 
+    timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+    results["timings_ms"] = timings
     return results
 
 
@@ -328,27 +391,24 @@ async def cancel(notification_id: str) -> dict:
         return {"success": False, "error": str(e)}
 
 
-async def _mark_expired(notification_id: str) -> None:
-    """Mark a notification as expired."""
+async def _apply_queue_updates(
+    expired_ids: list[str],
+    reschedules: list[tuple[str, str]],
+) -> None:
+    """Mark notifications expired and reschedule others in one transaction."""
+    if not expired_ids and not reschedules:
+        return
+
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
+    cursor.executemany(
         "UPDATE notification_queue SET status = 'expired' WHERE id = ?",
-        (notification_id,),
+        [(notification_id,) for notification_id in expired_ids],
     )
-    conn.commit()
-    conn.close()
-
-
-async def _reschedule(notification_id: str, scheduled_for: datetime) -> None:
-    """Reschedule a notification for later."""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
+    cursor.executemany(
         "UPDATE notification_queue SET scheduled_for = ? WHERE id = ?",
-        (scheduled_for.isoformat(), notification_id),
+        reschedules,
     )
     conn.commit()
     conn.close()
@@ -430,6 +490,9 @@ if __name__ == "__main__":
         print(f"  Suppressed: {results['suppressed']}")
         print(f"  Expired: {results['expired']}")
         print(f"  Errors: {results['errors']}")
+        print("Timings (ms):")
+        for stage, ms in results["timings_ms"].items():
+            print(f"  {stage}: {ms}")
 
     elif args.command == "stats":
         stats = asyncio.run(get_queue_stats(args.user_id))
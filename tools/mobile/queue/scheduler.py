@@ -5,6 +5,7 @@ Purpose: Schedule notifications respecting user preferences and flow state
 Usage:
     from tools.mobile.queue.scheduler import (
         can_send_now,
+        evaluate_send_eligibility,
         get_next_send_window,
         is_in_quiet_hours,
         check_rate_limit,
@@ -22,8 +23,8 @@ from datetime import datetime, timedelta, time
 from typing import Any
 from zoneinfo import ZoneInfo
 
-from tools.mobile import get_connection
-from tools.mobile.preferences.user_preferences import get_preferences
+from tools.mobile import BULK_QUERY_CHUNK, get_connection
+from tools.mobile.preferences.user_preferences import get_preferences, get_preferences_bulk
 
 
 async def can_send_now(user_id: str, priority: int) -> dict:
@@ -47,53 +48,99 @@ async def can_send_now(user_id: str, priority: int) -> dict:
             "retry_at": datetime | None,
         }
     """
-    # Get user preferences
-    prefs = await get_preferences(user_id)
+    decisions = await evaluate_send_eligibility([(user_id, priority)])
+    return decisions[0]
 
-    # Check if notifications are enabled
-    if not prefs.get("enabled", True):
-        return {
-            "can_send": False,
-            "reason": "notifications_disabled",
-            "retry_at": None,
-        }
 
-    # Check quiet hours (high priority can bypass)
-    if priority < 9:  # Only priority 9+ can bypass quiet hours
-        quiet_check = await is_in_quiet_hours(user_id)
-        if quiet_check["in_quiet_hours"]:
-            return {
-                "can_send": False,
-                "reason": "quiet_hours",
-                "retry_at": quiet_check.get("ends_at"),
-            }
+async def evaluate_send_eligibility(
+    requests: list[tuple[str, int]],
+    subscription_counts: dict[str, int] | None = None,
+) -> list[dict]:
+    """
+    Check send eligibility for a whole processing cycle at once.
+
+    Applies the same checks, in the same order, as can_send_now(), but
+    preferences and rate-limit counts are loaded for all users in bulk and
+    flow state is checked at most once per user. Requests are evaluated in
+    order and every admitted request uses up part of the user's hourly
+    budget (one delivery per active subscription), so a single cycle cannot
+    overshoot the rate limit.
 
-    # Check flow state
-    if prefs.get("respect_flow_state", True):
-        flow_threshold = prefs.get("flow_interrupt_threshold", 8)
-        if priority < flow_threshold:
-            flow_check = await _check_flow_state(user_id)
-            if flow_check.get("in_flow"):
-                return {
+    Args:
+        requests: (user_id, priority) pairs in processing order
+        subscription_counts: Active subscriptions per user (default 1 each)
+
+    Returns:
+        List of can_send_now() results, aligned with requests
+    """
+    user_ids = list(dict.fromkeys(user_id for user_id, _ in requests))
+    prefs_by_user = await get_preferences_bulk(user_ids)
+    sent_counts = _count_recent_deliveries(user_ids)
+    quiet_by_user: dict[str, dict] = {}
+    flow_by_user: dict[str, dict] = {}
+    subscription_counts = subscription_counts or {}
+
+    decisions = []
+    for user_id, priority in requests:
+        prefs = prefs_by_user[user_id]
+
+        # Check if notifications are enabled
+        if not prefs.get("enabled", True):
+            decisions.append(
+                {"can_send": False, "reason": "notifications_disabled", "retry_at": None}
+            )
+            continue
+
+        # Check quiet hours (high priority can bypass)
+        if priority < 9:  # Only priority 9+ can bypass quiet hours
+            if user_id not in quiet_by_user:
+                quiet_by_user[user_id] = _quiet_hours_from_prefs(prefs)
+            quiet_check = quiet_by_user[user_id]
+            if quiet_check["in_quiet_hours"]:
+                decisions.append(
+                    {
+                        "can_send": False,
+                        "reason": "quiet_hours",
+                        "retry_at": quiet_check.get("ends_at"),
+                    }
+                )
+                continue
+
+        # Check flow state
+        if prefs.get("respect_flow_state", True):
+            flow_threshold = prefs.get("flow_interrupt_threshold", 8)
+            if priority < flow_threshold:
+                if user_id not in flow_by_user:
+                    flow_by_user[user_id] = await _check_flow_state(user_id)
+                flow_check = flow_by_user[user_id]
+                if flow_check.get("in_flow"):
+                    decisions.append(
+                        {
+                            "can_send": False,
+                            "reason": "flow_state",
+                            "retry_at": flow_check.get("expected_end"),
+                        }
+                    )
+                    continue
+
+        # Check rate limits
+        rate_check = _rate_limit_from_count(prefs, sent_counts.get(user_id, 0))
+        if not rate_check["allowed"]:
+            decisions.append(
+                {
                     "can_send": False,
-                    "reason": "flow_state",
-                    "retry_at": flow_check.get("expected_end"),
+                    "reason": "rate_limit",
+                    "retry_at": rate_check.get("reset_at"),
                 }
+            )
+            continue
 
-    # Check rate limits
-    rate_check = await check_rate_limit(user_id)
-    if not rate_check["allowed"]:
-        return {
-            "can_send": False,
-            "reason": "rate_limit",
-            "retry_at": rate_check.get("reset_at"),
-        }
+        sent_counts[user_id] = sent_counts.get(user_id, 0) + max(
+            1, subscription_counts.get(user_id, 1)
+        )
+        decisions.append({"can_send": True, "reason": None, "retry_at": None})
 
-    return {
-        "can_send": True,
-        "reason": None,
-        "retry_at": None,
-    }
+    return decisions
 
 
 async def get_next_send_window(user_id: str) -> datetime:
@@ -140,7 +187,11 @@ async def is_in_quiet_hours(user_id: str) -> dict:
         }
     """
     prefs = await get_preferences(user_id)
+    return _quiet_hours_from_prefs(prefs)
 
+
+def _quiet_hours_from_prefs(prefs: dict) -> dict:
+    """Evaluate quiet hours for already-loaded preferences."""
     quiet_start = prefs.get("quiet_hours_start")
     quiet_end = prefs.get("quiet_hours_end")
 
@@ -229,31 +280,14 @@ async def check_rate_limit(user_id: str) -> dict:
     """
     prefs = await get_preferences(user_id)
 
-    max_per_hour = prefs.get("max_notifications_per_hour", 6)
-    cooldown_minutes = prefs.get("cooldown_after_burst_minutes", 30)
-
-    # Count notifications sent in the last hour
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    one_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
+    counts = _count_recent_deliveries([user_id])
+    return _rate_limit_from_count(prefs, counts.get(user_id, 0))
 
-    cursor.execute(
-        """
-        SELECT COUNT(*) as count
-        FROM notification_delivery_log
-        WHERE subscription_id IN (
-            SELECT id FROM push_subscriptions WHERE user_id = ?
-        )
-        AND sent_at > ?
-        AND status IN ('sent', 'delivered', 'clicked', 'batched')
-        """,
-        (user_id, one_hour_ago),
-    )
 
-    row = cursor.fetchone()
-    sent_this_hour = row["count"] if row else 0
-    conn.close()
+def _rate_limit_from_count(prefs: dict, sent_this_hour: int) -> dict:
+    """Evaluate the hourly rate limit for a known sent count."""
+    max_per_hour = prefs.get("max_notifications_per_hour", 6)
+    cooldown_minutes = prefs.get("cooldown_after_burst_minutes", 30)
 
     if sent_this_hour >= max_per_hour:
         # Check if in cooldown
@@ -273,11 +307,39 @@ async def check_rate_limit(user_id: str) -> dict:
     }
 
 
+def _count_recent_deliveries(user_ids: list[str]) -> dict[str, int]:
+    """Count deliveries in the last hour per user, in one grouped query per chunk."""
+    one_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
+    counts: dict[str, int] = {}
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    for start in range(0, len(user_ids), BULK_QUERY_CHUNK):
+        chunk = user_ids[start : start + BULK_QUERY_CHUNK]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"""
+            SELECT s.user_id, COUNT(*) as count
+            FROM notification_delivery_log l
+            JOIN push_subscriptions s ON s.id = l.subscription_id
+            WHERE s.user_id IN ({placeholders})
+            AND l.sent_at > ?
+            AND l.status IN ('sent', 'delivered', 'clicked', 'batched')
+            GROUP BY s.user_id
+            """,
+            (*chunk, one_hour_ago),
+        )
+        counts.update({row["user_id"]: row["count"] for row in cursor.fetchall()})
+    conn.close()
+
+    return counts
+
+
 async def _check_flow_state(user_id: str) -> dict:
     """
     Check if user is currently in a flow state.
 
-    Integrates with the ADHD flow detector if available.
+    Integrates with the automation flow detector if available.
 
     Args:
         user_id: The user ID
@@ -289,8 +351,7 @@ async def _check_flow_state(user_id: str) -> dict:
         }
     """
     try:
-        # Try to import flow detector from ADHD tools
-        from tools.adhd.flow_detector import get_flow_state
+        from tools.automation.flow_detector import get_flow_state
 
         flow_state = await get_flow_state(user_id)
 
@@ -33,6 +33,8 @@ Components:
 import sqlite3
 from pathlib import Path
 
+from tools import db_connections
+
 
 # Path constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -48,10 +50,11 @@ def get_connection() -> sqlite3.Connection:
     Returns:
         SQLite connection with row_factory set
     """
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Office accounts (linked OAuth connections)
@@ -242,4 +245,4 @@ def get_connection() -> sqlite3.Connection:
     )
 
     conn.commit()
-    return conn
+
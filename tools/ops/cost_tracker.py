@@ -9,18 +9,26 @@ Usage:
 
     record_cost(user_id="owner", model="claude-sonnet-4-5", cost_usd=0.012)
     total = get_daily_cost()
+
+    # Result caches (media analysis, TTS) report lookups and avoided spend
+    record_cache_lookup("media", hit=True, saved_usd=0.004)
+    get_cache_savings(days=7)  # {"lookups", "hits", "hit_rate", "saved_usd", "by_cache"}
 """
 
 from __future__ import annotations
 
 import logging
-import sqlite3
 from datetime import datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from tools import db_connections
 from tools.ops import DATA_DIR
 
 
+if TYPE_CHECKING:
+    import sqlite3
+
+
 try:
     from tools.logging_config import get_logger
     logger = get_logger(__name__)
@@ -32,9 +40,11 @@ DB_PATH = DATA_DIR / "audit.db"
 
 
 def get_connection() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     conn.execute("""CREATE TABLE IF NOT EXISTS cost_tracking (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -47,8 +57,16 @@ def get_connection() -> sqlite3.Connection:
         session_key TEXT,
         complexity TEXT
     )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS cache_savings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        cache TEXT NOT NULL,
+        hit INTEGER NOT NULL,
+        saved_usd REAL DEFAULT 0,
+        channel TEXT
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_savings_ts ON cache_savings(timestamp)")
     conn.commit()
-    return conn
 
 
 def record_cost(
@@ -107,6 +125,57 @@ def get_session_cost(session_key: str) -> float:
         conn.close()
 
 
+def record_cache_lookup(
+    cache: str,
+    hit: bool,
+    saved_usd: float = 0.0,
+    channel: str | None = None,
+) -> int:
+    conn = get_connection()
+    try:
+        cursor = conn.execute(
+            "INSERT INTO cache_savings (cache, hit, saved_usd, channel) VALUES (?, ?, ?, ?)",
+            (cache, int(hit), saved_usd if hit else 0.0, channel),
+        )
+        row_id = cursor.lastrowid
+        conn.commit()
+        return row_id
+    finally:
+        conn.close()
+
+
+def get_cache_savings(days: int = 7) -> dict[str, Any]:
+    conn = get_connection()
+    try:
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        rows = conn.execute(
+            "SELECT cache, COUNT(*) as lookups, COALESCE(SUM(hit), 0) as hits, COALESCE(SUM(saved_usd), 0) as saved FROM cache_savings WHERE timestamp >= ? GROUP BY cache",
+            (since,),
+        ).fetchall()
+
+        by_cache = {
+            r["cache"]: {
+                "lookups": r["lookups"],
+                "hits": r["hits"],
+                "hit_rate": round(r["hits"] / r["lookups"], 4),
+                "saved_usd": round(r["saved"], 6),
+            }
+            for r in rows
+        }
+        lookups = sum(c["lookups"] for c in by_cache.values())
+        hits = sum(c["hits"] for c in by_cache.values())
+        return {
+            "period_days": days,
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "saved_usd": round(sum(c["saved_usd"] for c in by_cache.values()), 6),
+            "by_cache": by_cache,
+        }
+    finally:
+        conn.close()
+
+
 def get_cost_summary(days: int = 7) -> dict[str, Any]:
     conn = get_connection()
     try:
@@ -133,9 +202,17 @@ def get_cost_summary(days: int = 7) -> dict[str, Any]:
             "total_calls": total_row["calls"],
             "by_model": {r["model"]: {"cost": round(r["total"], 6), "calls": r["calls"]} for r in by_model_rows},
             "by_day": [{"day": r["day"], "cost": round(r["total"], 6)} for r in by_day_rows],
+            "cache_savings": get_cache_savings(days),
         }
     finally:
         conn.close()
 
 
-__all__ = ["get_cost_summary", "get_daily_cost", "get_session_cost", "record_cost"]
+__all__ = [
+    "get_cache_savings",
+    "get_cost_summary",
+    "get_daily_cost",
+    "get_session_cost",
+    "record_cache_lookup",
+    "record_cost",
+]
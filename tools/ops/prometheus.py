@@ -14,6 +14,9 @@ Usage:
     # Get Prometheus-format text
     output = metrics.format_openmetrics()
 
+    # Aggregate another process's metrics (e.g. a gateway worker)
+    metrics.merge_snapshot(worker_snapshot, labels={"worker": "handler-0"})
+
 Dependencies:
     - threading (stdlib)
     - time (stdlib)
@@ -154,6 +157,100 @@ class MetricsCollector:
             if name not in self._metric_types:
                 self._metric_types[name] = "histogram"
 
+    def set_histogram(
+        self,
+        name: str,
+        buckets: dict[float, int],
+        total: float,
+        count: int,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        """Set a histogram aggregated elsewhere (e.g. hook timing sketches).
+
+        Args:
+            name: Histogram metric name.
+            buckets: Cumulative count per upper bound, including float("inf").
+            total: Sum of all observations.
+            count: Number of observations.
+            labels: Optional label key-value pairs.
+        """
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._histogram_buckets[key] = dict(buckets)
+            self._histogram_sums[key] = total
+            self._histogram_counts[key] = count
+            self._histogram_labels[key] = labels
+            if name not in self._metric_types:
+                self._metric_types[name] = "histogram"
+
+    def snapshot(self) -> dict[str, Any]:
+        """Picklable copy of every metric, for merge_snapshot() in another process.
+
+        Returns:
+            Dict of counters, gauges and histograms as (name, labels, ...) rows.
+        """
+        with self._lock:
+            return {
+                "counters": [
+                    (name, self._counter_labels.get((name, lk)), value)
+                    for (name, lk), value in self._counters.items()
+                ],
+                "gauges": [
+                    (name, self._gauge_labels.get((name, lk)), value)
+                    for (name, lk), value in self._gauges.items()
+                ],
+                "histograms": [
+                    (
+                        name,
+                        self._histogram_labels.get((name, lk)),
+                        dict(buckets),
+                        self._histogram_sums[(name, lk)],
+                        self._histogram_counts[(name, lk)],
+                    )
+                    for (name, lk), buckets in self._histogram_buckets.items()
+                ],
+                "help": dict(self._metric_help),
+            }
+
+    def merge_snapshot(
+        self,
+        snapshot: dict[str, Any],
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        """Import a snapshot() from another process under extra labels.
+
+        Values replace those of the previous merge (snapshots are cumulative),
+        so a restarted process shows up as a counter reset.
+
+        Args:
+            snapshot: Result of snapshot() in the other process.
+            labels: Labels added to every series (e.g. {"worker": "handler-0"}).
+        """
+        extra = labels or {}
+        with self._lock:
+            for name, help_text in snapshot.get("help", {}).items():
+                self._metric_help.setdefault(name, help_text)
+            for name, series_labels, value in snapshot.get("counters", []):
+                merged = {**(series_labels or {}), **extra}
+                key = (name, _labels_key(merged))
+                self._counters[key] = value
+                self._counter_labels[key] = merged
+                self._metric_types.setdefault(name, "counter")
+            for name, series_labels, value in snapshot.get("gauges", []):
+                merged = {**(series_labels or {}), **extra}
+                key = (name, _labels_key(merged))
+                self._gauges[key] = value
+                self._gauge_labels[key] = merged
+                self._metric_types.setdefault(name, "gauge")
+            for name, series_labels, buckets, total, count in snapshot.get("histograms", []):
+                merged = {**(series_labels or {}), **extra}
+                key = (name, _labels_key(merged))
+                self._histogram_buckets[key] = dict(buckets)
+                self._histogram_sums[key] = total
+                self._histogram_counts[key] = count
+                self._histogram_labels[key] = merged
+                self._metric_types.setdefault(name, "histogram")
+
     def format_openmetrics(self) -> str:
         """Format all metrics in Prometheus text exposition format.
 
@@ -197,11 +294,11 @@ class MetricsCollector:
                 labels = self._histogram_labels.get((name, lk))
                 base_labels = dict(labels) if labels else {}
 
-                for bucket_bound in DEFAULT_BUCKETS:
+                for bucket_bound in sorted(b for b in buckets if b != float("inf")):
                     bucket_labels = dict(base_labels)
                     bucket_labels["le"] = str(bucket_bound)
                     lines.append(
-                        f"{name}_bucket{_labels_suffix(bucket_labels)} {buckets.get(bucket_bound, 0)}"
+                        f"{name}_bucket{_labels_suffix(bucket_labels)} {buckets[bucket_bound]}"
                     )
 
                 # +Inf bucket
@@ -283,6 +380,14 @@ class MetricsCollector:
                     stats.get("avg_ms", 0.0),
                     labels={"hook": hook_name},
                 )
+
+            from tools.agent.hooks import get_hook_metrics
+
+            for hook_name, (buckets, total, count) in get_hook_metrics().histograms().items():
+                self.set_histogram(
+                    "dexai_hook_duration_seconds", buckets, total, count,
+                    labels={"hook": hook_name},
+                )
         except ImportError:
             pass
         except Exception as e:
@@ -301,3 +406,4 @@ metrics.set_help("dexai_circuit_breaker_state", "Circuit breaker state (0=closed
 metrics.set_help("dexai_circuit_breaker_failures", "Circuit breaker failure count per service")
 metrics.set_help("dexai_hook_calls_total", "Total hook invocations")
 metrics.set_help("dexai_hook_avg_duration_ms", "Average hook execution time in milliseconds")
+metrics.set_help("dexai_hook_duration_seconds", "Hook execution time in seconds")
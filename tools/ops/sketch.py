@@ -0,0 +1,194 @@
+"""
+Streaming Quantile Sketch
+
+Fixed-memory latency distribution with relative-error quantiles, used where
+keeping every observation would grow without bound (e.g. hook timings in a
+long-running gateway).
+
+Features:
+- Logarithmic buckets (DDSketch-style): every quantile estimate is within
+  ``relative_accuracy`` of a value that was actually observed
+- Memory bounded by the value range, not the number of observations
+  (about 1,200 buckets at 1% between 1 microsecond and 3 hours, in ms)
+- Exact count, sum, min and max
+- Mergeable: the sketch of two windows is the sketch of their union, so
+  per-minute windows roll up into hours or days
+- Serializable with to_dict()/from_dict() for persistence
+
+Usage:
+    from tools.ops.sketch import LatencySketch
+
+    sketch = LatencySketch()
+    sketch.add(12.5)
+    sketch.quantile(0.95)
+
+    minute = LatencySketch.from_dict(row)
+    hour.merge(minute)
+
+Dependencies:
+    - math (stdlib)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MIN_VALUE = 1e-3
+DEFAULT_MAX_VALUE = 1e7
+
+
+class LatencySketch:
+    """
+    Log-bucketed histogram answering quantile queries.
+
+    Values at or below ``min_value`` share one zero bucket and values above
+    ``max_value`` are clamped into the last bucket; min and max stay exact.
+
+    Args:
+        relative_accuracy: Maximum relative error of quantile estimates
+        min_value: Smallest value resolved (same unit as the observations)
+        max_value: Largest value resolved
+    """
+
+    __slots__ = (
+        "_gamma",
+        "_inv_log_gamma",
+        "_max_index",
+        "_sorted",
+        "buckets",
+        "count",
+        "max",
+        "max_value",
+        "min",
+        "min_value",
+        "relative_accuracy",
+        "total",
+        "zero_count",
+    )
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        min_value: float = DEFAULT_MIN_VALUE,
+        max_value: float = DEFAULT_MAX_VALUE,
+    ):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1 / math.log(self._gamma)
+        self._max_index = math.ceil(math.log(max_value) * self._inv_log_gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._sorted: list[int] | None = []
+
+    def add(self, value: float) -> None:
+        """Record one observation."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        index = self.bucket_index(value)
+        if index is None:
+            self.zero_count += 1
+            return
+        buckets = self.buckets
+        if index in buckets:
+            buckets[index] += 1
+        else:
+            buckets[index] = 1
+            self._sorted = None
+
+    def bucket_index(self, value: float) -> int | None:
+        """Index of the bucket holding ``value``; None for the zero bucket."""
+        if value <= self.min_value:
+            return None
+        index = math.ceil(math.log(value) * self._inv_log_gamma)
+        return index if index <= self._max_index else self._max_index
+
+    def merge(self, other: LatencySketch) -> None:
+        """Add another sketch's observations (same accuracy and range)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, n in other.buckets.items():
+            if index not in self.buckets:
+                self._sorted = None
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated q-quantile (0 <= q <= 1); 0.0 when empty.
+
+        Walks the occupied buckets, so the cost depends on the spread of
+        the values but not on how many were recorded.
+        """
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        if self._sorted is None:
+            self._sorted = sorted(self.buckets)
+        for index in self._sorted:
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain-data form (JSON-serializable) for persistence."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "buckets": {str(index): n for index, n in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencySketch:
+        sketch = cls(
+            relative_accuracy=data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY),
+            min_value=data.get("min_value", DEFAULT_MIN_VALUE),
+            max_value=data.get("max_value", DEFAULT_MAX_VALUE),
+        )
+        sketch.buckets = {int(index): n for index, n in data.get("buckets", {}).items()}
+        sketch._sorted = None
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    def __len__(self) -> int:
+        return self.count
@@ -5,34 +5,75 @@ Supplements the static MALICIOUS_PACKAGES blocklist with live queries
 to the OSV.dev API for known vulnerabilities.
 
 Features:
+- Bulk checks: a whole dependency list costs one cache SELECT, one OSV
+  querybatch request per 1000 packages and one cache write
 - Query OSV.dev for known vulnerabilities by package name and version
 - SQLite cache with 24-hour TTL to reduce API calls
-- Graceful fallback when OSV API is unreachable
+- Offline OSV dump (PyPI/all.zip) ingested into an indexed local table of
+  affected versions and ranges, so checks work without network access
+- Graceful fallback when OSV API is unreachable (stale dump, then no data)
 
 Usage:
-    from tools.security.advisory_feed import is_package_vulnerable
+    from tools.security.advisory_feed import check_packages_vulnerable, is_package_vulnerable
 
     result = is_package_vulnerable("requests", "2.31.0")
     if result["vulnerable"]:
         print(f"Advisories: {result['advisories']}")
+
+    results = check_packages_vulnerable([("requests", "2.31.0"), ("jinja2", "2.10")])
+
+    # Download and ingest the OSV PyPI dump
+    python -m tools.security.advisory_feed --download
+    python -m tools.security.advisory_feed --ingest all.zip
+    python -m tools.security.advisory_feed requests==2.31.0 jinja2==2.10
+
+Dependencies:
+    - httpx (OSV API, dump download)
+    - packaging (version ranges in the dump)
 """
 
 import json
 import logging
+import re
 import sqlite3
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import httpx
+from packaging.version import InvalidVersion, Version
+
+from tools import db_connections
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "advisory_cache.db"
 
 OSV_API_URL = "https://api.osv.dev/v1/query"
+OSV_BATCH_URL = "https://api.osv.dev/v1/querybatch"
+OSV_VULN_URL = "https://api.osv.dev/v1/vulns/{id}"
+OSV_DUMP_URL = "https://osv-vulnerabilities.storage.googleapis.com/PyPI/all.zip"
+ECOSYSTEM = "PyPI"
 CACHE_TTL_HOURS = 24
 
+# Queries per querybatch request (OSV API limit)
+OSV_BATCH_SIZE = 1000
+
+# Concurrent /v1/vulns requests for advisory details
+OSV_DETAIL_WORKERS = 8
+
+# An ingested dump answers on its own while younger than this; older dumps
+# are only used when OSV is unreachable
+DUMP_TTL_HOURS = 24 * 7
+
+_SEPARATORS = re.compile(r"[-_.]+")
+
+PackageKey = tuple[str, str]
+
 
 # =============================================================================
 # Database
@@ -41,10 +82,11 @@ CACHE_TTL_HOURS = 24
 
 def _get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     conn.execute("""
         CREATE TABLE IF NOT EXISTS advisory_cache (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -59,8 +101,45 @@ def _get_connection() -> sqlite3.Connection:
         CREATE INDEX IF NOT EXISTS idx_advisory_cache_pkg
         ON advisory_cache(package_name, version)
     """)
+    # Advisory details by OSV id (from the dump or /v1/vulns)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS osv_vulns (
+            id TEXT PRIMARY KEY,
+            modified TEXT,
+            advisory_json TEXT NOT NULL
+        )
+    """)
+    # One row per explicitly listed affected version (version set) or per
+    # affected range (introduced/fixed/last_affected set)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS osv_affected (
+            ecosystem TEXT NOT NULL,
+            package_name TEXT NOT NULL,
+            vuln_id TEXT NOT NULL,
+            version TEXT,
+            introduced TEXT,
+            fixed TEXT,
+            last_affected TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_osv_affected_pkg
+        ON osv_affected(ecosystem, package_name)
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS osv_dumps (
+            ecosystem TEXT PRIMARY KEY,
+            source TEXT,
+            vuln_count INTEGER NOT NULL,
+            ingested_at DATETIME NOT NULL
+        )
+    """)
     conn.commit()
-    return conn
+
+
+def _normalize_name(package_name: str) -> str:
+    """PEP 503 normalized name (how PyPI and the local tables key packages)."""
+    return _SEPARATORS.sub("-", package_name).lower()
 
 
 # =============================================================================
@@ -81,22 +160,45 @@ def check_advisory_cache(
     Returns:
         List of advisory dicts if cache hit and within TTL, else None.
     """
+    return check_advisory_cache_many([(package_name, version)]).get(
+        (_normalize_name(package_name), version)
+    )
+
+
+def check_advisory_cache_many(
+    packages: Iterable[PackageKey],
+) -> dict[PackageKey, list[dict]]:
+    """Look up many (package, version) pairs in one SELECT.
+
+    Args:
+        packages: (package_name, version) pairs.
+
+    Returns:
+        Advisory lists for the pairs with a cache hit within TTL, keyed by
+        (normalized name, version).
+    """
+    keys = list(dict.fromkeys((_normalize_name(name), version) for name, version in packages))
+    if not keys:
+        return {}
     try:
         conn = _get_connection()
         cutoff = (datetime.utcnow() - timedelta(hours=CACHE_TTL_HOURS)).isoformat()
-        row = conn.execute(
-            "SELECT advisories_json, fetched_at FROM advisory_cache "
-            "WHERE package_name = ? AND version = ? AND fetched_at > ?",
-            (package_name.lower(), version, cutoff),
-        ).fetchone()
+        rows = conn.execute(
+            "SELECT c.package_name, c.version, c.advisories_json "
+            "FROM json_each(?) AS q JOIN advisory_cache AS c "
+            "ON c.package_name = json_extract(q.value, '$[0]') "
+            "AND c.version = json_extract(q.value, '$[1]') "
+            "WHERE c.fetched_at > ?",
+            (json.dumps(keys), cutoff),
+        ).fetchall()
         conn.close()
-
-        if row:
-            return json.loads(row["advisories_json"])
-        return None
+        return {
+            (row["package_name"], row["version"]): json.loads(row["advisories_json"])
+            for row in rows
+        }
     except Exception as e:
         logger.warning(f"Advisory cache read error: {e}")
-        return None
+        return {}
 
 
 def update_advisory_cache(
@@ -111,18 +213,28 @@ def update_advisory_cache(
         version: Package version string.
         advisories: List of advisory dicts to cache.
     """
+    update_advisory_cache_many({(package_name, version): advisories})
+
+
+def update_advisory_cache_many(results: dict[PackageKey, list[dict]]) -> None:
+    """Write advisory data for many (package, version) pairs in one transaction.
+
+    Args:
+        results: Advisory lists keyed by (package_name, version).
+    """
+    if not results:
+        return
+    fetched_at = datetime.utcnow().isoformat()
     try:
         conn = _get_connection()
-        conn.execute(
+        conn.executemany(
             "INSERT OR REPLACE INTO advisory_cache "
             "(package_name, version, advisories_json, fetched_at) "
             "VALUES (?, ?, ?, ?)",
-            (
-                package_name.lower(),
-                version,
-                json.dumps(advisories),
-                datetime.utcnow().isoformat(),
-            ),
+            [
+                (_normalize_name(name), version, json.dumps(advisories), fetched_at)
+                for (name, version), advisories in results.items()
+            ],
         )
         conn.commit()
         conn.close()
@@ -154,7 +266,7 @@ def query_osv(
     payload = {
         "package": {
             "name": package_name,
-            "ecosystem": "PyPI",
+            "ecosystem": ECOSYSTEM,
         },
         "version": version,
     }
@@ -166,19 +278,137 @@ def query_osv(
     data = response.json()
     vulns = data.get("vulns", [])
 
-    advisories = []
-    for vuln in vulns:
-        advisories.append({
-            "id": vuln.get("id", "unknown"),
-            "summary": vuln.get("summary", ""),
-            "details": vuln.get("details", ""),
-            "aliases": vuln.get("aliases", []),
-            "severity": _extract_severity(vuln),
-        })
+    return [_advisory(vuln) for vuln in vulns]
+
+
+def query_osv_batch(
+    packages: Iterable[PackageKey],
+) -> dict[PackageKey, list[dict]]:
+    """Query OSV.dev for many packages with the querybatch API.
+
+    querybatch returns only vulnerability ids; details are read from the
+    local osv_vulns table and fetched from /v1/vulns only when missing or
+    modified since. An advisory whose details could not be fetched (and
+    were never stored) carries only its id and ``"incomplete": True``.
+
+    Args:
+        packages: (package_name, version) pairs.
+
+    Returns:
+        Advisory lists keyed by (normalized name, version), one entry per
+        distinct pair (empty list when not vulnerable).
 
+    Raises:
+        httpx.HTTPError: On network or API errors (caller should handle).
+    """
+    keys = list(dict.fromkeys((_normalize_name(name), version) for name, version in packages))
+    vuln_ids: dict[PackageKey, list[str]] = {key: [] for key in keys}
+    modified: dict[str, str | None] = {}
+
+    with httpx.Client(timeout=30.0) as client:
+        for start in range(0, len(keys), OSV_BATCH_SIZE):
+            chunk = keys[start:start + OSV_BATCH_SIZE]
+            # Queries still to send -> page token (None for the first page)
+            pending: dict[PackageKey, str | None] = dict.fromkeys(chunk)
+            while pending:
+                queries = []
+                for (name, version), page_token in pending.items():
+                    query: dict[str, Any] = {
+                        "package": {"name": name, "ecosystem": ECOSYSTEM},
+                        "version": version,
+                    }
+                    if page_token:
+                        query["page_token"] = page_token
+                    queries.append(query)
+                response = client.post(OSV_BATCH_URL, json={"queries": queries})
+                response.raise_for_status()
+                results = response.json().get("results", [])
+
+                next_pending = {}
+                for key, result in zip(pending, results, strict=True):
+                    for vuln in result.get("vulns") or []:
+                        vuln_ids[key].append(vuln["id"])
+                        modified[vuln["id"]] = vuln.get("modified")
+                    if result.get("next_page_token"):
+                        next_pending[key] = result["next_page_token"]
+                pending = next_pending
+
+        details = _vuln_details(client, modified)
+
+    return {key: [details[vuln_id] for vuln_id in ids] for key, ids in vuln_ids.items()}
+
+
+def _vuln_details(client: httpx.Client, modified: dict[str, str | None]) -> dict[str, dict]:
+    """Advisory dicts for OSV ids, fetching the ones not stored (or outdated) locally."""
+    if not modified:
+        return {}
+    details = _stored_advisories(modified)
+    stale = [
+        vuln_id for vuln_id, stamp in modified.items()
+        if vuln_id not in details or (stamp and details[vuln_id][0] != stamp)
+    ]
+    advisories = {vuln_id: advisory for vuln_id, (_, advisory) in details.items()}
+
+    def fetch(vuln_id: str) -> dict | None:
+        try:
+            response = client.get(OSV_VULN_URL.format(id=vuln_id))
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.warning(f"OSV details unavailable for {vuln_id}: {e}")
+            return None
+
+    fetched = []
+    with ThreadPoolExecutor(max_workers=OSV_DETAIL_WORKERS) as pool:
+        for vuln_id, vuln in zip(stale, pool.map(fetch, stale), strict=True):
+            if vuln is None:
+                # Id only; marked so the package result is not cached
+                advisories.setdefault(vuln_id, {**_advisory({"id": vuln_id}), "incomplete": True})
+                continue
+            advisories[vuln_id] = _advisory(vuln)
+            fetched.append((vuln_id, vuln.get("modified"), json.dumps(advisories[vuln_id])))
+
+    if fetched:
+        try:
+            conn = _get_connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO osv_vulns (id, modified, advisory_json) VALUES (?, ?, ?)",
+                fetched,
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Advisory cache write error: {e}")
     return advisories
 
 
+def _stored_advisories(vuln_ids: Iterable[str]) -> dict[str, tuple[str | None, dict]]:
+    """(modified, advisory) for the ids present in osv_vulns, in one SELECT."""
+    try:
+        conn = _get_connection()
+        rows = conn.execute(
+            "SELECT v.id, v.modified, v.advisory_json "
+            "FROM json_each(?) AS q JOIN osv_vulns AS v ON v.id = q.value",
+            (json.dumps(list(vuln_ids)),),
+        ).fetchall()
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Advisory cache read error: {e}")
+        return {}
+    return {row["id"]: (row["modified"], json.loads(row["advisory_json"])) for row in rows}
+
+
+def _advisory(vuln: dict) -> dict:
+    """The advisory fields kept from an OSV vulnerability entry."""
+    return {
+        "id": vuln.get("id", "unknown"),
+        "summary": vuln.get("summary", ""),
+        "details": vuln.get("details", ""),
+        "aliases": vuln.get("aliases", []),
+        "severity": _extract_severity(vuln),
+    }
+
+
 def _extract_severity(vuln: dict) -> str | None:
     """Extract severity string from an OSV vulnerability entry."""
     severity_list = vuln.get("severity", [])
@@ -190,19 +420,288 @@ def _extract_severity(vuln: dict) -> str | None:
     return db_specific.get("severity", None)
 
 
+# =============================================================================
+# Offline Dump
+# =============================================================================
+
+
+def _dump_records(source: Path) -> Iterator[dict]:
+    """OSV entries from all.zip or a directory of JSON files."""
+    if source.is_dir():
+        for path in sorted(source.rglob("*.json")):
+            yield json.loads(path.read_text(encoding="utf-8"))
+        return
+    with zipfile.ZipFile(source) as archive:
+        for name in archive.namelist():
+            if name.endswith(".json"):
+                yield json.loads(archive.read(name))
+
+
+def _affected_rows(vuln: dict, ecosystem: str) -> Iterator[tuple]:
+    """osv_affected rows for one OSV entry."""
+    for affected in vuln.get("affected", []):
+        package = affected.get("package", {})
+        if package.get("ecosystem") != ecosystem or not package.get("name"):
+            continue
+        name = _normalize_name(package["name"])
+        for version in affected.get("versions", []):
+            yield (ecosystem, name, vuln["id"], version, None, None, None)
+        for affected_range in affected.get("ranges", []):
+            # GIT ranges are commit hashes, not release versions
+            if affected_range.get("type") not in ("ECOSYSTEM", "SEMVER"):
+                continue
+            introduced = None
+            for event in affected_range.get("events", []):
+                if "introduced" in event:
+                    introduced = event["introduced"]
+                elif introduced is not None and ("fixed" in event or "last_affected" in event):
+                    yield (ecosystem, name, vuln["id"], None, introduced,
+                           event.get("fixed"), event.get("last_affected"))
+                    introduced = None
+            if introduced is not None:
+                yield (ecosystem, name, vuln["id"], None, introduced, None, None)
+
+
+def ingest_osv_dump(source: Path | str, ecosystem: str = ECOSYSTEM) -> int:
+    """Replace the local advisory index with an OSV dump.
+
+    Args:
+        source: OSV all.zip for the ecosystem, or a directory of OSV JSON files.
+        ecosystem: OSV ecosystem to index.
+
+    Returns:
+        Number of advisories ingested.
+    """
+    source = Path(source)
+    vulns = []
+    affected = []
+    for vuln in _dump_records(source):
+        if "id" not in vuln or vuln.get("withdrawn"):
+            continue
+        rows = list(_affected_rows(vuln, ecosystem))
+        if not rows:
+            continue
+        affected.extend(rows)
+        vulns.append((vuln["id"], vuln.get("modified"), json.dumps(_advisory(vuln))))
+
+    conn = _get_connection()
+    try:
+        conn.execute("DELETE FROM osv_affected WHERE ecosystem = ?", (ecosystem,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO osv_vulns (id, modified, advisory_json) VALUES (?, ?, ?)",
+            vulns,
+        )
+        conn.executemany(
+            "INSERT INTO osv_affected "
+            "(ecosystem, package_name, vuln_id, version, introduced, fixed, last_affected) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            affected,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO osv_dumps (ecosystem, source, vuln_count, ingested_at) "
+            "VALUES (?, ?, ?, ?)",
+            (ecosystem, str(source), len(vulns), datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info(f"Ingested {len(vulns)} {ecosystem} advisories ({len(affected)} rows) from {source}")
+    return len(vulns)
+
+
+def download_osv_dump(path: Path | None = None, url: str = OSV_DUMP_URL) -> Path:
+    """Download the OSV dump for the ecosystem (next to the database by default).
+
+    Returns:
+        Path of the downloaded zip.
+    """
+    path = path or DB_PATH.parent / f"osv-{ECOSYSTEM}-all.zip"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with httpx.stream("GET", url, timeout=120.0, follow_redirects=True) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+    return path
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(version: str) -> Version | None:
+    """Comparable version, or None when the version is not PEP 440."""
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
+
+
+def _in_range(
+    version: str, introduced: str, fixed: str | None, last_affected: str | None
+) -> bool | None:
+    """Whether ``version`` falls in an OSV ECOSYSTEM range (None if it cannot be compared)."""
+    current = _parse_version(version)
+    if current is None:
+        return None
+    if introduced != "0":
+        start = _parse_version(introduced)
+        if start is None:
+            return None
+        if current < start:
+            return False
+    bound = fixed if fixed is not None else last_affected
+    if bound is None:
+        return True
+    end = _parse_version(bound)
+    if end is None:
+        return None
+    return current < end if fixed is not None else current <= end
+
+
+def _check_dump(
+    keys: list[PackageKey],
+    max_age_hours: float | None,
+) -> dict[PackageKey, list[dict]] | None:
+    """Answer (normalized name, version) pairs from the ingested dump.
+
+    Returns:
+        Advisory lists for the keys the dump can decide, or None when no
+        dump (younger than ``max_age_hours``, unless None) has been
+        ingested. A key with a range that cannot be compared (version not
+        PEP 440) and no other match is left out, so it is answered by the
+        cache or OSV instead of being reported as not vulnerable.
+    """
+    try:
+        conn = _get_connection()
+        dump = conn.execute(
+            "SELECT ingested_at FROM osv_dumps WHERE ecosystem = ?", (ECOSYSTEM,)
+        ).fetchone()
+        if dump is None or (
+            max_age_hours is not None
+            and dump["ingested_at"]
+            < (datetime.utcnow() - timedelta(hours=max_age_hours)).isoformat()
+        ):
+            conn.close()
+            return None
+        rows = conn.execute(
+            "SELECT a.package_name, a.vuln_id, a.version, a.introduced, a.fixed, a.last_affected "
+            "FROM json_each(?) AS q JOIN osv_affected AS a "
+            "ON a.ecosystem = ? AND a.package_name = q.value",
+            (json.dumps(list({name for name, _ in keys})), ECOSYSTEM),
+        ).fetchall()
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Advisory dump read error: {e}")
+        return None
+
+    by_package: dict[str, list[sqlite3.Row]] = {}
+    for row in rows:
+        by_package.setdefault(row["package_name"], []).append(row)
+
+    matched: dict[PackageKey, list[str]] = {}
+    for name, version in keys:
+        ids: list[str] = []
+        undecided = False
+        for row in by_package.get(name, []):
+            if row["vuln_id"] in ids:
+                continue
+            if row["version"] is not None:
+                hit = row["version"] == version
+            else:
+                hit = _in_range(version, row["introduced"], row["fixed"], row["last_affected"])
+            if hit:
+                ids.append(row["vuln_id"])
+            elif hit is None:
+                undecided = True
+        if ids or not undecided:
+            matched[(name, version)] = ids
+
+    details = _stored_advisories({vuln_id for ids in matched.values() for vuln_id in ids})
+    return {
+        key: [details[vuln_id][1] if vuln_id in details else _advisory({"id": vuln_id})
+              for vuln_id in ids]
+        for key, ids in matched.items()
+    }
+
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
 
+def check_packages_vulnerable(
+    packages: Iterable[PackageKey],
+    offline: bool = False,
+) -> dict[PackageKey, dict[str, Any]]:
+    """Check many package versions for known vulnerabilities at once.
+
+    Sources, in order: a dump ingested within DUMP_TTL_HOURS, the cache
+    (24h TTL), one OSV querybatch for the remaining packages, then an older
+    dump if OSV is unreachable.
+
+    Args:
+        packages: (package_name, version) pairs.
+        offline: Never contact OSV (cache and dump only).
+
+    Returns:
+        Results keyed by the given (package_name, version) pairs, each as
+        returned by is_package_vulnerable().
+    """
+    requested = {pkg: (_normalize_name(pkg[0]), pkg[1]) for pkg in packages}
+    keys = list(dict.fromkeys(requested.values()))
+    found: dict[PackageKey, tuple[list[dict], str]] = {}
+
+    def record(results: dict[PackageKey, list[dict]] | None, source: str) -> None:
+        for key, advisories in (results or {}).items():
+            found.setdefault(key, (advisories, source))
+
+    record(_check_dump(keys, DUMP_TTL_HOURS), "osv_dump")
+    if len(found) < len(keys):
+        record(check_advisory_cache_many(k for k in keys if k not in found), "cache")
+
+    missing = [key for key in keys if key not in found]
+    error = None
+    if missing and not offline:
+        try:
+            fetched = query_osv_batch(missing)
+            # Results with placeholder advisories are retried on the next check
+            update_advisory_cache_many({
+                key: advisories for key, advisories in fetched.items()
+                if not any(advisory.get("incomplete") for advisory in advisories)
+            })
+            record(fetched, "osv")
+        except Exception as e:
+            logger.warning(f"OSV API unreachable for {len(missing)} packages: {e}")
+    missing = [key for key in keys if key not in found]
+    if missing:
+        record(_check_dump(missing, max_age_hours=None), "osv_dump")
+        error = "osv_offline" if offline else "osv_unreachable"
+
+    results = {}
+    for pkg, key in requested.items():
+        if key in found:
+            advisories, source = found[key]
+            results[pkg] = {
+                "vulnerable": len(advisories) > 0,
+                "advisories": advisories,
+                "source": source,
+            }
+        else:
+            results[pkg] = {
+                "vulnerable": False,
+                "advisories": [],
+                "source": "osv",
+                "error": error,
+            }
+    return results
+
+
 def is_package_vulnerable(
     package_name: str,
     version: str,
 ) -> dict[str, Any]:
     """Check if a package version has known vulnerabilities.
 
-    Checks the local cache first (24h TTL), then queries OSV.dev.
-    Gracefully degrades if the API is unreachable.
+    Checks a fresh offline dump or the local cache (24h TTL) first, then
+    queries OSV.dev. Gracefully degrades if the API is unreachable.
 
     Args:
         package_name: PyPI package name.
@@ -212,33 +711,34 @@ def is_package_vulnerable(
         {
             "vulnerable": bool,
             "advisories": list[dict],
-            "source": "osv" | "cache",
+            "source": "osv" | "cache" | "osv_dump",
             "error": str | None,
         }
     """
-    # Check cache first
-    cached = check_advisory_cache(package_name, version)
-    if cached is not None:
-        return {
-            "vulnerable": len(cached) > 0,
-            "advisories": cached,
-            "source": "cache",
-        }
+    return check_packages_vulnerable([(package_name, version)])[(package_name, version)]
 
-    # Query OSV API
-    try:
-        advisories = query_osv(package_name, version)
-        update_advisory_cache(package_name, version, advisories)
-        return {
-            "vulnerable": len(advisories) > 0,
-            "advisories": advisories,
-            "source": "osv",
-        }
-    except Exception as e:
-        logger.warning(f"OSV API unreachable for {package_name}=={version}: {e}")
-        return {
-            "vulnerable": False,
-            "advisories": [],
-            "source": "osv",
-            "error": "osv_unreachable",
-        }
+
+def main():
+    """CLI: ingest an OSV dump or check name==version pairs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OSV Advisory Feed")
+    parser.add_argument("packages", nargs="*", help="Packages to check (name==version)")
+    parser.add_argument("--download", action="store_true", help="Download and ingest the OSV dump")
+    parser.add_argument("--ingest", help="Ingest an OSV dump (all.zip or directory of JSON)")
+    parser.add_argument("--offline", action="store_true", help="Do not contact OSV")
+    args = parser.parse_args()
+
+    if args.download:
+        args.ingest = download_osv_dump()
+    if args.ingest:
+        print(f"Ingested {ingest_osv_dump(args.ingest)} advisories from {args.ingest}")
+
+    pairs = [tuple(spec.split("==", 1)) for spec in args.packages if "==" in spec]
+    for (name, version), result in check_packages_vulnerable(pairs, args.offline).items():
+        ids = ", ".join(a["id"] for a in result["advisories"]) or "no known advisories"
+        print(f"{name}=={version} [{result['source']}]: {ids}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,10 +88,11 @@ def _compute_entry_hash(
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Audit log table - append only, no updates or deletes
@@ -118,7 +121,6 @@ def get_connection():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_session ON audit_log(session_id)")
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row) -> dict | None:
@@ -6,20 +6,37 @@ Opt-in via DEXAI_CONTAINER_ISOLATION=true environment variable.
 Each session gets a dedicated, resource-limited container with a mounted
 workspace directory.  Network access is disabled by default.
 
+Containers come from a warm pool: ``DEXAI_CONTAINER_POOL_SIZE`` sandboxes
+are created (and paused) ahead of time, one is handed to a session on its
+first command, and it is destroyed when the session closes while the pool
+refills in the background.  A used sandbox is never given to another
+session.  Commands run through one persistent shell per container instead
+of a Docker exec per command.  Sandboxes are labelled with their owning
+process, and a pool's first fill removes labelled sandboxes left behind by
+processes on this host that no longer exist (e.g. after a crash).
+
 Usage:
-    from tools.security.container_executor import get_executor
+    from tools.security.container_executor import get_executor, release_executor
 
     executor = get_executor(session_id, workspace_dir)
     if executor:
         executor.start()
         result = executor.execute("python myscript.py")
-        executor.stop()
+        release_executor(session_id)
 """
 
+import atexit
 import logging
 import os
+import shlex
+import socket
+import struct
+import threading
+import uuid
+from collections import deque
 from pathlib import Path
 from typing import Any
+import contextlib
 
 logger = logging.getLogger(__name__)
 
@@ -33,24 +50,215 @@ _MEM_LIMIT = os.getenv("DEXAI_CONTAINER_MEM_LIMIT", "512m")
 _CPU_QUOTA = int(os.getenv("DEXAI_CONTAINER_CPU_QUOTA", "50000"))  # 50% of one core
 _NETWORK_DISABLED = os.getenv("DEXAI_CONTAINER_NETWORK", "false").lower() != "true"
 
+# Warm pool defaults
+_POOL_SIZE = int(os.getenv("DEXAI_CONTAINER_POOL_SIZE", "2"))
+_POOL_PAUSE = os.getenv("DEXAI_CONTAINER_POOL_PAUSE", "true").lower() == "true"
+
+# Label marking pooled sandboxes (value: owning process, "<hostname>-<pid>")
+POOL_LABEL = "dexai.sandbox"
+
+# Extra seconds the shell may take beyond a command's own timeout
+SHELL_GRACE_SECONDS = 10
+
+
+def _run_options(workspace_dir: Path) -> dict[str, Any]:
+    """Keyword arguments for ``containers.run`` shared by all sandboxes."""
+    return {
+        "image": _IMAGE,
+        "command": "sleep infinity",
+        "detach": True,
+        "mem_limit": _MEM_LIMIT,
+        "cpu_quota": _CPU_QUOTA,
+        "network_disabled": _NETWORK_DISABLED,
+        "volumes": {
+            str(workspace_dir.resolve()): {
+                "bind": "/workspace",
+                "mode": "rw",
+            }
+        },
+        "working_dir": "/workspace",
+        # Drop all capabilities except minimal set
+        "cap_drop": ["ALL"],
+        "security_opt": ["no-new-privileges"],
+    }
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but owned by another user
+    return True
+
+
+def _docker_client() -> Any:
+    """``docker.from_env()``; raises ImportError without docker-py."""
+    import docker
+
+    return docker.from_env()
+
+
+class ShellError(Exception):
+    """The persistent shell's exec stream failed; the shell is unusable.
+
+    Attributes:
+        dispatched: The command had been sent, so it may have run (in part).
+        timed_out: No reply within the command timeout plus the grace period.
+    """
+
+    def __init__(self, message: str, dispatched: bool = False, timed_out: bool = False) -> None:
+        super().__init__(message)
+        self.dispatched = dispatched
+        self.timed_out = timed_out
+
+
+class PersistentShell:
+    """One long-lived ``bash`` inside a container, fed over an exec socket.
+
+    Each command still runs in its own ``bash -c`` (working directory and
+    environment do not leak between commands, as with ``exec_run``), but
+    only the first command pays for the Docker exec setup.  Output arrives
+    in Docker's multiplexed stream format and ends at a per-command marker
+    carrying the exit code.
+
+    Args:
+        api: Low-level Docker API client (``DockerClient.api``).
+        container_id: Container to run the shell in.
+        workdir: Directory commands start in.
+    """
+
+    def __init__(self, api: Any, container_id: str, workdir: str = "/workspace") -> None:
+        exec_id = api.exec_create(
+            container_id,
+            ["bash", "--noprofile", "--norc"],
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            tty=False,
+            workdir=workdir,
+        )["Id"]
+        stream = api.exec_start(exec_id, socket=True)
+        # docker-py wraps the socket in a SocketIO; the raw socket is inside
+        self._sock = getattr(stream, "_sock", stream)
+        self._pending = b""
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def run(self, command: str, timeout: int) -> tuple[int, str, str]:
+        """Run ``command``; returns (exit_code, stdout, stderr).
+
+        Raises:
+            ShellError: The stream closed or stalled; the shell is closed.
+                ``dispatched`` tells whether the command was already sent.
+        """
+        marker = f"__dexai_{uuid.uuid4().hex}__"
+        script = (
+            f"timeout {int(timeout)} bash -c {shlex.quote(command)} </dev/null; "
+            f"printf '\\n{marker} %d\\n' $?; printf '\\n{marker}\\n' >&2\n"
+        )
+        out_end = f"\n{marker} ".encode()
+        err_end = f"\n{marker}\n".encode()
+        stdout, stderr = bytearray(), bytearray()
+        exit_code: int | None = None
+        err_done = False
+        dispatched = False
+
+        with self._lock:
+            if self.closed:
+                raise ShellError("Shell is closed")
+            try:
+                self._sock.settimeout(timeout + SHELL_GRACE_SECONDS)
+                self._sock.sendall(script.encode())
+                dispatched = True
+                while exit_code is None or not err_done:
+                    stream, payload = self._read_frame()
+                    if stream == 1 and exit_code is None:
+                        searched = max(0, len(stdout) - len(out_end) - 12)
+                        stdout += payload
+                        at = stdout.find(out_end, searched)
+                        newline = stdout.find(b"\n", at + len(out_end)) if at >= 0 else -1
+                        if newline >= 0:
+                            exit_code = int(stdout[at + len(out_end):newline])
+                            del stdout[at:]
+                    elif stream == 2 and not err_done:
+                        searched = max(0, len(stderr) - len(err_end))
+                        stderr += payload
+                        at = stderr.find(err_end, searched)
+                        if at >= 0:
+                            err_done = True
+                            del stderr[at:]
+            except (OSError, ValueError) as exc:
+                self.close()
+                raise ShellError(
+                    str(exc) or type(exc).__name__,
+                    dispatched=dispatched,
+                    timed_out=isinstance(exc.__cause__, socket.timeout),
+                ) from exc
+
+        return (
+            exit_code,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    def _read_frame(self) -> tuple[int, bytes]:
+        header = self._recv_exact(8)
+        stream, size = struct.unpack(">BxxxL", header)
+        return stream, self._recv_exact(size)
+
+    def _recv_exact(self, size: int) -> bytes:
+        while len(self._pending) < size:
+            try:
+                data = self._sock.recv(max(65536, size - len(self._pending)))
+            except TimeoutError as exc:
+                raise OSError("Shell timed out") from exc
+            if not data:
+                raise OSError("Exec stream closed")
+            self._pending += data
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self) -> None:
+        self.closed = True
+        with contextlib.suppress(Exception):
+            self._sock.close()
+
 
 class ContainerExecutor:
     """Execute commands inside an ephemeral Docker container.
 
-    The container is created on ``start()`` and destroyed on ``stop()``.
-    Between those calls, ``execute()`` runs commands inside the container.
+    The container is created on ``start()`` (or handed over by a
+    ``ContainerPool``) and destroyed on ``stop()``.  Between those calls,
+    ``execute()`` runs commands inside the container.
 
     Args:
         session_id: Unique session identifier (used for container naming).
         workspace_dir: Host directory mounted as /workspace inside the container.
+        client: Docker client to use (default: ``docker.from_env()`` on start).
+        container: Already running container to use instead of creating one.
+        persistent_shell: Run commands through a ``PersistentShell``.
+        labels: Labels for a container created on ``start()``.
     """
 
-    def __init__(self, session_id: str, workspace_dir: str | Path) -> None:
+    def __init__(
+        self,
+        session_id: str,
+        workspace_dir: str | Path,
+        client: Any = None,
+        container: Any = None,
+        persistent_shell: bool = True,
+        labels: dict[str, str] | None = None,
+    ) -> None:
         self.session_id = session_id
         self.workspace_dir = Path(workspace_dir)
-        self.container_name = f"dexai-session-{session_id[:12]}"
-        self._container: Any = None  # docker.models.containers.Container
-        self._client: Any = None     # docker.DockerClient
+        self.container_name = getattr(container, "name", None) or f"dexai-session-{session_id[:12]}"
+        self._container: Any = container  # docker.models.containers.Container
+        self._client: Any = client        # docker.DockerClient
+        self._persistent_shell = persistent_shell
+        self._labels = labels
+        self._shell: PersistentShell | None = None
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -59,46 +267,40 @@ class ContainerExecutor:
     def start(self) -> dict[str, Any]:
         """Start an ephemeral container for this session.
 
+        A no-op when the executor already has a container.
+
         Returns:
             dict with ``success``, ``container_name``, and optional ``error``.
         """
+        if self._container is not None:
+            return {"success": True, "container_name": self.container_name}
+
         try:
-            import docker
+            from docker.errors import NotFound
         except ImportError:
-            return {
-                "success": False,
-                "error": "docker-py not installed. Run: uv pip install docker",
-            }
+            if self._client is None:
+                return {
+                    "success": False,
+                    "error": "docker-py not installed. Run: uv pip install docker",
+                }
+            NotFound = LookupError  # noqa: N806 - client supplied without docker-py
 
         try:
-            self._client = docker.from_env()
+            if self._client is None:
+                self._client = _docker_client()
 
             # Remove any stale container with the same name
             try:
                 stale = self._client.containers.get(self.container_name)
                 stale.remove(force=True)
                 logger.info("Removed stale container %s", self.container_name)
-            except docker.errors.NotFound:
+            except NotFound:
                 pass
 
             self._container = self._client.containers.run(
-                image=_IMAGE,
                 name=self.container_name,
-                command="sleep infinity",
-                detach=True,
-                mem_limit=_MEM_LIMIT,
-                cpu_quota=_CPU_QUOTA,
-                network_disabled=_NETWORK_DISABLED,
-                volumes={
-                    str(self.workspace_dir.resolve()): {
-                        "bind": "/workspace",
-                        "mode": "rw",
-                    }
-                },
-                working_dir="/workspace",
-                # Drop all capabilities except minimal set
-                cap_drop=["ALL"],
-                security_opt=["no-new-privileges"],
+                labels=self._labels,
+                **_run_options(self.workspace_dir),
             )
             logger.info(
                 "Started container %s (image=%s)", self.container_name, _IMAGE
@@ -118,6 +320,10 @@ class ContainerExecutor:
         Returns:
             dict with ``success`` and optional ``error``.
         """
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+
         if self._container is None:
             return {"success": True, "message": "No container to stop"}
 
@@ -137,6 +343,11 @@ class ContainerExecutor:
     def execute(self, command: str, timeout: int = 120) -> dict[str, Any]:
         """Execute a command inside the session container.
 
+        Uses the persistent shell when available and falls back to a
+        one-off ``exec_run`` if the shell cannot be opened or breaks before
+        the command is sent.  A shell that breaks after that is discarded
+        and the command is reported as failed (or timed out), never re-run.
+
         Args:
             command: Shell command string to execute.
             timeout: Maximum seconds before the command is killed.
@@ -153,31 +364,42 @@ class ContainerExecutor:
             }
 
         try:
+            shell = self._get_shell()
+            if shell is not None:
+                try:
+                    exit_code, stdout, stderr = shell.run(command, timeout)
+                    return self._result(exit_code, stdout, stderr, timeout)
+                except ShellError as exc:
+                    self._shell = None
+                    if exc.dispatched:
+                        # The command may have run: running it again could repeat side effects
+                        logger.warning(
+                            "Persistent shell in %s failed during a command: %s",
+                            self.container_name, exc,
+                        )
+                        if exc.timed_out:
+                            return self._result(124, "", "", timeout)
+                        return {
+                            "success": False,
+                            "stdout": "",
+                            "stderr": f"Shell failed while running the command: {exc}",
+                            "exit_code": -1,
+                        }
+                    logger.warning(
+                        "Persistent shell in %s failed (%s); using exec_run",
+                        self.container_name, exc,
+                    )
+
             exec_result = self._container.exec_run(
                 cmd=["timeout", str(timeout), "bash", "-c", command],
                 workdir="/workspace",
                 demux=True,
             )
-            exit_code = exec_result.exit_code
             stdout_bytes, stderr_bytes = exec_result.output or (b"", b"")
 
             stdout = (stdout_bytes or b"").decode("utf-8", errors="replace")
             stderr = (stderr_bytes or b"").decode("utf-8", errors="replace")
-
-            if exit_code == 124:
-                return {
-                    "success": False,
-                    "stdout": stdout,
-                    "stderr": f"Command timed out after {timeout} seconds",
-                    "exit_code": 124,
-                }
-
-            return {
-                "success": exit_code == 0,
-                "stdout": stdout,
-                "stderr": stderr,
-                "exit_code": exit_code,
-            }
+            return self._result(exec_result.exit_code, stdout, stderr, timeout)
 
         except Exception as exc:
             logger.error("Container exec failed: %s", exc)
@@ -188,6 +410,37 @@ class ContainerExecutor:
                 "exit_code": -1,
             }
 
+    def _get_shell(self) -> PersistentShell | None:
+        """The container's persistent shell, opened on first use."""
+        if not self._persistent_shell:
+            return None
+        if self._shell is None:
+            api = getattr(self._client, "api", None) or getattr(self._container.client, "api", None)
+            try:
+                self._shell = PersistentShell(api, self._container.id)
+            except Exception as exc:
+                logger.warning("Could not open persistent shell in %s: %s", self.container_name, exc)
+                self._persistent_shell = False
+                return None
+        return self._shell
+
+    @staticmethod
+    def _result(exit_code: int, stdout: str, stderr: str, timeout: int) -> dict[str, Any]:
+        if exit_code == 124:
+            return {
+                "success": False,
+                "stdout": stdout,
+                "stderr": f"Command timed out after {timeout} seconds",
+                "exit_code": 124,
+            }
+
+        return {
+            "success": exit_code == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": exit_code,
+        }
+
     # ------------------------------------------------------------------
     # Status
     # ------------------------------------------------------------------
@@ -204,15 +457,270 @@ class ContainerExecutor:
 
 
 # ======================================================================
-# Module-level helper
+# Warm pool
+# ======================================================================
+
+
+class ContainerPool:
+    """Pre-started sandboxes assigned to sessions on demand.
+
+    Keeps ``size`` idle containers (paused when ``pause`` is set, so they
+    use no CPU) for one workspace.  ``acquire()`` hands a session its
+    executor, bound to a warm container when one is ready and to a
+    cold-started one otherwise; ``release()`` destroys the session's
+    container.  The pool is refilled on a background thread after either.
+    The first fill reaps orphaned sandboxes (see ``reap_orphans()``).
+
+    Args:
+        workspace_dir: Host directory mounted in every sandbox.
+        size: Number of idle sandboxes to keep ready.
+        client: Docker client (default: ``docker.from_env()`` on first use).
+        pause: Pause idle sandboxes until they are assigned.
+    """
+
+    def __init__(
+        self,
+        workspace_dir: str | Path,
+        size: int = _POOL_SIZE,
+        client: Any = None,
+        pause: bool = _POOL_PAUSE,
+    ) -> None:
+        self.workspace_dir = Path(workspace_dir)
+        self.size = size
+        self.pause = pause
+        self._client = client
+        self._idle: deque[Any] = deque()
+        self._sessions: dict[str, ContainerExecutor] = {}
+        self._lock = threading.Lock()
+        self._refill_thread: threading.Thread | None = None
+        self._closed = False
+        self._reaped = False
+        self._owner = f"{socket.gethostname()}-{os.getpid()}"
+        self.stats = {"warm_hits": 0, "cold_starts": 0, "created": 0, "destroyed": 0}
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            self._client = _docker_client()
+        return self._client
+
+    def _create(self) -> Any:
+        """Start one idle sandbox (paused if configured)."""
+        container = self._get_client().containers.run(
+            name=f"dexai-sandbox-{uuid.uuid4().hex[:12]}",
+            labels={POOL_LABEL: self._owner},
+            **_run_options(self.workspace_dir),
+        )
+        if self.pause:
+            container.pause()
+        with self._lock:
+            self.stats["created"] += 1
+        return container
+
+    def _destroy(self, container: Any) -> None:
+        try:
+            container.remove(force=True)
+        except Exception as exc:
+            logger.warning("Failed to remove sandbox %s: %s", getattr(container, "name", "?"), exc)
+        with self._lock:
+            self.stats["destroyed"] += 1
+
+    def reap_orphans(self) -> int:
+        """Remove labelled sandboxes whose owning process has exited.
+
+        Only owners on this host can be checked; sandboxes of other hosts
+        sharing the Docker daemon are left alone.
+
+        Returns:
+            Number of sandboxes removed.
+        """
+        hostname = socket.gethostname()
+        try:
+            containers = self._get_client().containers.list(
+                all=True, filters={"label": POOL_LABEL}
+            )
+        except Exception as exc:
+            logger.warning("Could not list sandboxes to reap: %s", exc)
+            return 0
+
+        reaped = 0
+        for container in containers:
+            owner = (getattr(container, "labels", None) or {}).get(POOL_LABEL, "")
+            host, _, pid = owner.rpartition("-")
+            if host != hostname or not pid.isdigit() or owner == self._owner:
+                continue
+            if _process_exists(int(pid)):
+                continue
+            try:
+                container.remove(force=True)
+            except Exception as exc:
+                logger.warning("Failed to reap sandbox %s: %s", getattr(container, "name", "?"), exc)
+                continue
+            reaped += 1
+        if reaped:
+            logger.info("Reaped %d orphaned sandbox(es)", reaped)
+        return reaped
+
+    # ------------------------------------------------------------------
+    # Filling
+    # ------------------------------------------------------------------
+
+    def fill(self) -> int:
+        """Create sandboxes until ``size`` are idle.
+
+        Returns:
+            Number of sandboxes created.
+        """
+        with self._lock:
+            reap, self._reaped = not self._reaped, True
+        if reap:
+            self.reap_orphans()
+        created = 0
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    return created
+            try:
+                container = self._create()
+            except Exception as exc:
+                logger.warning("Could not pre-start sandbox: %s", exc)
+                return created
+            with self._lock:
+                if self._closed:
+                    closed = True
+                else:
+                    closed = False
+                    self._idle.append(container)
+            if closed:
+                self._destroy(container)
+                return created
+            created += 1
+
+    def fill_async(self) -> None:
+        """Refill on a background thread (no-op if one is already running)."""
+        with self._lock:
+            if self._closed or self.size <= 0:
+                return
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(
+                target=self.fill, name="dexai-sandbox-pool", daemon=True
+            )
+            self._refill_thread.start()
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    def acquire(self, session_id: str) -> ContainerExecutor:
+        """The session's executor, assigning a sandbox on first use.
+
+        A warm sandbox comes with its container running; otherwise the
+        returned executor creates one on ``start()``.
+        """
+        with self._lock:
+            executor = self._sessions.get(session_id)
+            if executor is not None:
+                return executor
+            container = self._idle.popleft() if self._idle else None
+
+        if container is not None and self.pause:
+            try:
+                container.unpause()
+            except Exception as exc:
+                logger.warning("Could not resume sandbox %s: %s", container.name, exc)
+                self._destroy(container)
+                container = None
+
+        executor = ContainerExecutor(
+            session_id,
+            self.workspace_dir,
+            client=self._client,
+            container=container,
+            labels={POOL_LABEL: self._owner},
+        )
+        with self._lock:
+            existing = self._sessions.setdefault(session_id, executor)
+            self.stats["warm_hits" if container is not None else "cold_starts"] += 1
+        if existing is not executor and container is not None:
+            self._destroy(container)  # Another thread assigned one first
+        self.fill_async()
+        return existing
+
+    def release(self, session_id: str) -> dict[str, Any]:
+        """Destroy the session's sandbox and top the pool back up.
+
+        Returns:
+            dict with ``success`` and optional ``error``.
+        """
+        with self._lock:
+            executor = self._sessions.pop(session_id, None)
+        if executor is None:
+            return {"success": True, "message": "No sandbox for session"}
+        result = executor.stop()
+        with self._lock:
+            self.stats["destroyed"] += 1
+        self.fill_async()
+        return result
+
+    def shutdown(self) -> None:
+        """Destroy idle and assigned sandboxes; the pool stops refilling."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for container in idle:
+            self._destroy(container)
+        for executor in sessions:
+            executor.stop()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "assigned": len(self._sessions),
+                "size": self.size,
+                **self.stats,
+            }
+
+
+# ======================================================================
+# Module-level helpers
 # ======================================================================
 
+_pools: dict[Path, ContainerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_container_pool(workspace_dir: str | Path) -> ContainerPool:
+    """Get the process-wide pool for a workspace, starting its warm-up."""
+    key = Path(workspace_dir).resolve()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ContainerPool(key)
+            if len(_pools) == 1:
+                atexit.register(shutdown_container_pools)
+    pool.fill_async()
+    return pool
+
+
+def shutdown_container_pools() -> None:
+    """Destroy every pooled sandbox (registered with atexit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
 
 def get_executor(
     session_id: str, workspace_dir: str | Path
 ) -> ContainerExecutor | None:
     """Get a container executor if isolation is enabled, else None.
 
+    Repeated calls for a session return the same executor, bound to a
+    sandbox from the workspace's warm pool.
+
     Args:
         session_id: Unique session identifier.
         workspace_dir: Host directory to mount inside the container.
@@ -222,4 +730,12 @@ def get_executor(
     """
     if not CONTAINER_ISOLATION_ENABLED:
         return None
-    return ContainerExecutor(session_id, workspace_dir)
+    return get_container_pool(workspace_dir).acquire(session_id)
+
+
+def release_executor(session_id: str) -> None:
+    """Destroy a closed session's sandbox in whichever pool holds it."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.release(session_id)
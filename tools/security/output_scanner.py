@@ -0,0 +1,297 @@
+"""
+Tool: Output Scanner
+Purpose: Redact secrets and detect prompt injection in tool output
+
+Features:
+- Redacts every secret kind (API keys, GitHub/Slack tokens, AWS keys) in one
+  left-to-right scan; output without secrets is returned as-is, uncopied
+- Literal-prefix prefiltering: the text is scanned in chunks for the
+  secrets' literal prefixes (sk-, ghp_, AKIA, ...) and the regex only runs
+  where one occurs, so chunks without a candidate prefix cost a substring
+  search
+- Injection detection equivalent to sanitizer.check_injection_patterns():
+  the text is lowercased once, patterns starting with a literal use the
+  regex engine's literal search and patterns starting with alternatives or
+  a word boundary (e.g. "(show|tell|...)", r"\bdan\b") are only tried where
+  one of their leading words occurs
+- One ScanResult per output with redaction counts per kind, detections and
+  risk level, so callers emit a single security event
+
+Usage:
+    from tools.security.output_scanner import get_output_scanner
+
+    result = get_output_scanner().scan(tool_output, injections=True)
+    result.text          # redacted output
+    result.redactions    # {"github_token": 1}
+    result.risk_level    # "none" .. "critical"
+
+Dependencies:
+    - re (stdlib)
+    - tools.security.sanitizer (injection patterns)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from tools.security.sanitizer import INJECTION_PATTERNS, calculate_risk_level
+
+
+# Patterns matching secrets/tokens that should be redacted from tool output.
+# Earlier entries win when several match at the same position.
+SECRET_PATTERNS = [
+    (r'sk-ant-[a-zA-Z0-9_-]{20,}', '[REDACTED_ANTHROPIC_KEY]'),
+    (r'sk-proj-[a-zA-Z0-9_-]{20,}', '[REDACTED_OPENAI_KEY]'),
+    (r'sk-[a-zA-Z0-9_-]{40,}', '[REDACTED_API_KEY]'),
+    (r'ghp_[a-zA-Z0-9]{36,}', '[REDACTED_GITHUB_TOKEN]'),
+    (r'gho_[a-zA-Z0-9]{36,}', '[REDACTED_GITHUB_TOKEN]'),
+    (r'xoxb-[a-zA-Z0-9-]+', '[REDACTED_SLACK_TOKEN]'),
+    (r'xoxp-[a-zA-Z0-9-]+', '[REDACTED_SLACK_TOKEN]'),
+    (r'AKIA[0-9A-Z]{16}', '[REDACTED_AWS_KEY]'),
+]
+
+# Characters per prefilter chunk
+CHUNK_CHARS = 64 * 1024
+
+# Characters IGNORECASE equates with an ASCII letter but str.lower() keeps
+_CASEFOLD_EXTRA = (("ı", "i"), ("ſ", "s"))  # noqa: RUF001
+
+_QUANTIFIERS = "?*+{"
+_LITERAL_ESCAPES = "$()[].|*+?{}^\\-/'`"
+
+
+def _leading_literals(pattern: str) -> tuple[bool, tuple[str, ...]]:
+    """
+    Literal strings every match of ``pattern`` starts with.
+
+    Understands what the patterns here start with: zero-width ``^``/``\\b``,
+    a plain group of alternatives or a run of literal characters.
+
+    Returns:
+        (anchored at the start of the text, leading literals or () if unknown)
+    """
+    i = 0
+    anchored = False
+    while True:
+        if pattern.startswith("^", i):
+            anchored, i = True, i + 1
+        elif pattern.startswith("\\b", i):
+            i += 2
+        else:
+            break
+
+    if pattern.startswith("(", i):
+        close = pattern.find(")", i)
+        alternatives = pattern[i + 1:close].split("|")
+        quantified = close + 1 < len(pattern) and pattern[close + 1] in _QUANTIFIERS
+        if close < 0 or quantified or not all(a.isalnum() for a in alternatives):
+            return anchored, ()
+        return anchored, tuple(alternatives)
+
+    literal = []
+    while i < len(pattern):
+        if pattern[i] == "\\" and i + 1 < len(pattern) and pattern[i + 1] in _LITERAL_ESCAPES:
+            char, step = pattern[i + 1], 2
+        elif pattern[i].isalnum() or pattern[i] in "-_'`;%<:/ ,=!@#&~\"":
+            char, step = pattern[i], 1
+        else:
+            break
+        following = pattern[i + step] if i + step < len(pattern) else ""
+        if following in "?*{" and following:
+            break  # Optional: not guaranteed to be present
+        literal.append(char)
+        i += step
+        if following == "+":
+            break
+    return anchored, ("".join(literal),) if literal else ()
+
+
+def _fold_pattern(pattern: str) -> str:
+    """Lowercase a pattern's literal characters, leaving escapes alone."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return "".join(out)
+
+
+def _find_all(text: str, literals: tuple[str, ...], start: int = 0, end: int | None = None) -> list[int]:
+    """Sorted positions in [start, end) where any of ``literals`` begins."""
+    end = len(text) if end is None else end
+    positions: list[int] = []
+    for literal in literals:
+        # An occurrence starting before ``end`` may run past it
+        stop = end + len(literal) - 1
+        pos = text.find(literal, start, stop)
+        while pos >= 0:
+            positions.append(pos)
+            pos = text.find(literal, pos + 1, stop)
+    if len(literals) > 1:
+        positions.sort()
+    return positions
+
+
+@dataclass
+class ScanResult:
+    """Outcome of scanning one tool output."""
+
+    text: str
+    redactions: dict[str, int] = field(default_factory=dict)
+    detections: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def redacted(self) -> bool:
+        return bool(self.redactions)
+
+    @property
+    def risk_level(self) -> str:
+        return calculate_risk_level(self.detections)
+
+
+class _InjectionPattern:
+    __slots__ = ("anchored", "category", "description", "regex", "severity", "triggers")
+
+    def __init__(self, pattern: str, category: str, severity: str, description: str):
+        self.regex = re.compile(_fold_pattern(pattern))
+        self.category = category
+        self.severity = severity
+        self.description = description
+        self.anchored, literals = _leading_literals(_fold_pattern(pattern))
+        # A single leading literal is found fastest by the regex engine itself
+        self.triggers = literals if len(literals) > 1 or pattern.startswith("\\b") else ()
+
+    def finditer(self, lowered: str):
+        if self.anchored:
+            match = self.regex.match(lowered)
+            if match:
+                yield match
+        elif not self.triggers:
+            yield from self.regex.finditer(lowered)
+        else:
+            last_end = 0
+            for pos in _find_all(lowered, self.triggers):
+                if pos < last_end:
+                    continue
+                match = self.regex.match(lowered, pos)
+                if match:
+                    last_end = match.end()
+                    yield match
+
+
+class OutputScanner:
+    """
+    Secret redaction and injection detection for tool output.
+
+    Args:
+        secret_patterns: (regex, replacement) pairs; each regex must start
+            with a literal prefix
+        injection_patterns: (regex, category, severity, description) tuples
+        chunk_chars: Prefilter chunk size
+    """
+
+    def __init__(
+        self,
+        secret_patterns: list[tuple[str, str]] | None = None,
+        injection_patterns: list[tuple[str, str, str, str]] | None = None,
+        chunk_chars: int = CHUNK_CHARS,
+    ):
+        secret_patterns = SECRET_PATTERNS if secret_patterns is None else secret_patterns
+        injection_patterns = INJECTION_PATTERNS if injection_patterns is None else injection_patterns
+        self.chunk_chars = chunk_chars
+
+        self._replacements: dict[str, tuple[str, str]] = {}
+        prefixes: set[str] = set()
+        groups = []
+        for n, (pattern, replacement) in enumerate(secret_patterns):
+            _, literals = _leading_literals(pattern)
+            if len(literals) != 1:
+                raise ValueError(f"Secret pattern needs a literal prefix: {pattern}")
+            prefixes.add(literals[0])
+            kind = replacement.strip("[]").removeprefix("REDACTED_").lower()
+            self._replacements[f"s{n}"] = (kind, replacement)
+            groups.append(f"(?P<s{n}>{pattern})")
+        self._secrets = re.compile("|".join(groups)) if groups else None
+        # Drop prefixes that extend a shorter one (sk-ant- is found via sk-)
+        self._prefixes = tuple(
+            p for p in sorted(prefixes) if not any(p != q and p.startswith(q) for q in prefixes)
+        )
+        self._injections = [_InjectionPattern(*p) for p in injection_patterns]
+
+    def scan(self, text: str, injections: bool = True) -> ScanResult:
+        """
+        Redact secrets, then (optionally) detect injection patterns.
+
+        Detections are made on the redacted text, with the same shape as
+        sanitizer.check_injection_patterns().
+        """
+        counts: dict[str, int] = {}
+        result = ScanResult(text=self.redact_text(text, counts), redactions=counts)
+        if injections:
+            result.detections = self.detect_injections(result.text)
+        return result
+
+    def redact_text(self, text: str, counts: dict[str, int] | None = None) -> str:
+        """Replace every secret; the input object itself if there were none."""
+        if self._secrets is None:
+            return text
+        pieces: list[str] = []
+        copied = 0  # text[:copied] is already in pieces
+        length = len(text)
+        for chunk_start in range(0, length, self.chunk_chars):
+            chunk_end = min(chunk_start + self.chunk_chars, length)
+            if copied >= chunk_end:
+                continue  # Inside a secret that started in an earlier chunk
+            for pos in _find_all(text, self._prefixes, max(chunk_start, copied), chunk_end):
+                if pos < copied:
+                    continue
+                match = self._secrets.match(text, pos)
+                if match is None:
+                    continue
+                kind, replacement = self._replacements[match.lastgroup]
+                pieces.append(text[copied:pos])
+                pieces.append(replacement)
+                copied = match.end()
+                if counts is not None:
+                    counts[kind] = counts.get(kind, 0) + 1
+        if not pieces:
+            return text
+        pieces.append(text[copied:])
+        return "".join(pieces)
+
+    def detect_injections(self, text: str) -> list[dict[str, Any]]:
+        """Same detections as sanitizer.check_injection_patterns(text)."""
+        lowered = text.lower()
+        if not lowered.isascii():
+            for char, folded in _CASEFOLD_EXTRA:
+                if char in lowered:
+                    lowered = lowered.replace(char, folded)
+        detected = []
+        for pattern in self._injections:
+            for match in pattern.finditer(lowered):
+                detected.append(
+                    {
+                        "category": pattern.category,
+                        "severity": pattern.severity,
+                        "pattern": pattern.description,
+                        "snippet": text[max(0, match.start() - 10) : min(len(text), match.end() + 10)],
+                        "position": match.start(),
+                    }
+                )
+        return detected
+
+
+_scanner: OutputScanner | None = None
+
+
+def get_output_scanner() -> OutputScanner:
+    """Get the shared OutputScanner (patterns compiled once)."""
+    global _scanner
+    if _scanner is None:
+        _scanner = OutputScanner()
+    return _scanner
@@ -6,7 +6,7 @@ Provides security checks before installing Python packages for skills.
 Security Checks:
 1. Package exists on PyPI
 2. Not in known malicious packages blocklist
-3. Typosquatting detection (similar to popular packages)
+3. Typosquatting detection (edit distance / look-alikes of popular packages)
 4. Download count validation (>1000 monthly downloads)
 5. Risk assessment based on multiple factors
 
@@ -21,16 +21,18 @@ Usage:
 """
 
 import asyncio
-import difflib
 import hashlib
 import json as _json
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+from tools.security.typosquat import canonical_name, get_typosquat_index
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -73,7 +75,8 @@ MALICIOUS_PACKAGES = {
     "importantpackage": "Malicious test package",
 }
 
-# Popular packages to check typosquatting against
+# Popular packages to check typosquatting against, in addition to the bundled
+# corpus of the most downloaded PyPI projects (data/popular_pypi_packages.txt)
 POPULAR_PACKAGES = {
     "requests",
     "numpy",
@@ -118,6 +121,9 @@ POPULAR_PACKAGES = {
 # Minimum download count to consider a package established
 MIN_DOWNLOAD_COUNT = 1000
 
+# Concurrent PyPI lookups in verify_packages_batch
+BATCH_CONCURRENCY = 8
+
 
 # =============================================================================
 # Security Verification
@@ -127,6 +133,7 @@ MIN_DOWNLOAD_COUNT = 1000
 async def verify_package_security(
     package_name: str,
     skip_pypi_check: bool = False,
+    check_advisories: bool = True,
 ) -> dict[str, Any]:
     """
     Verify a package is safe to install.
@@ -140,6 +147,8 @@ async def verify_package_security(
     Args:
         package_name: Name of the package to verify
         skip_pypi_check: Skip PyPI API check (for offline testing)
+        check_advisories: Check OSV advisories for the current version
+            (verify_packages_batch checks them for all packages at once)
 
     Returns:
         {
@@ -173,8 +182,8 @@ async def verify_package_security(
             "blocked_reason": MALICIOUS_PACKAGES[normalized_name],
         }
 
-    # Check 2: Typosquatting detection
-    typosquat_target = _detect_typosquatting(normalized_name)
+    # Check 2: Typosquatting detection (raw name: case matters for look-alikes)
+    typosquat_target = _detect_typosquatting(package_name)
     if typosquat_target:
         warnings.append(
             f"Potential typosquat: '{package_name}' is very similar to '{typosquat_target}'"
@@ -198,24 +207,13 @@ async def verify_package_security(
 
         # Check 4: OSV advisory feed using version already fetched from PyPI
         version_for_osv = package_info.get("version")
-        if version_for_osv:
+        if version_for_osv and check_advisories:
             try:
                 from tools.security.advisory_feed import is_package_vulnerable
 
                 vuln_result = is_package_vulnerable(package_name, version_for_osv)
                 if vuln_result.get("vulnerable"):
-                    advisory_ids = [a.get("id", "unknown") for a in vuln_result.get("advisories", [])]
-                    return {
-                        "safe": False,
-                        "risk_level": "blocked",
-                        "warnings": [
-                            f"BLOCKED: Known vulnerabilities found: {', '.join(advisory_ids)}"
-                        ],
-                        "recommendation": "skip",
-                        "package_info": None,
-                        "blocked_reason": f"OSV advisories: {', '.join(advisory_ids)}",
-                        "advisories": vuln_result.get("advisories", []),
-                    }
+                    return _advisory_block(vuln_result.get("advisories", []))
             except ImportError:
                 logger.debug("advisory_feed module not available, skipping OSV check")
             except Exception as e:
@@ -263,6 +261,20 @@ async def verify_package_security(
     }
 
 
+def _advisory_block(advisories: list[dict]) -> dict[str, Any]:
+    """Verification result for a package version with known vulnerabilities."""
+    advisory_ids = [a.get("id", "unknown") for a in advisories]
+    return {
+        "safe": False,
+        "risk_level": "blocked",
+        "warnings": [f"BLOCKED: Known vulnerabilities found: {', '.join(advisory_ids)}"],
+        "recommendation": "skip",
+        "package_info": None,
+        "blocked_reason": f"OSV advisories: {', '.join(advisory_ids)}",
+        "advisories": advisories,
+    }
+
+
 def _normalize_package_name(name: str) -> str:
     """
     Normalize package name for comparison.
@@ -276,43 +288,14 @@ def _detect_typosquatting(package_name: str) -> str | None:
     """
     Detect if a package name is suspiciously similar to a popular package.
 
-    Uses string similarity (Levenshtein distance via difflib) to find
-    potential typosquats.
+    Looks the name up in the typosquat index (edit distance 1-2 depending
+    on length, transpositions and look-alike characters included).
 
     Returns:
-        Name of the similar popular package, or None if no match.
+        Name of the closest, most popular similar package, or None if no match.
     """
-    normalized = _normalize_package_name(package_name)
-
-    for popular in POPULAR_PACKAGES:
-        popular_normalized = _normalize_package_name(popular)
-
-        # Skip if it's exactly the same (legitimate)
-        if normalized == popular_normalized:
-            return None
-
-        # Check similarity ratio
-        ratio = difflib.SequenceMatcher(None, normalized, popular_normalized).ratio()
-
-        # High similarity (>0.85) is suspicious for different packages
-        if ratio > 0.85:
-            return popular
-
-        # Check for common typosquatting patterns
-        # Adding/removing single character
-        if abs(len(normalized) - len(popular_normalized)) == 1:
-            if ratio > 0.8:
-                return popular
-
-        # Character substitution (homoglyphs like l/1, 0/O)
-        if len(normalized) == len(popular_normalized):
-            differences = sum(
-                1 for a, b in zip(normalized, popular_normalized) if a != b
-            )
-            if differences == 1:
-                return popular
-
-    return None
+    matches = get_typosquat_index(POPULAR_PACKAGES).nearest(package_name)
+    return matches[0][0] if matches else None
 
 
 async def _check_pypi(package_name: str) -> dict[str, Any]:
@@ -594,23 +577,94 @@ def verify_package_security_sync(
 # =============================================================================
 
 
+async def _apply_advisories(results: dict[str, Any]) -> None:
+    """Block the verified packages whose resolved version has OSV advisories."""
+    versions = {
+        name: result["package_info"]["version"]
+        for name, result in results.items()
+        if isinstance(result, dict) and (result.get("package_info") or {}).get("version")
+    }
+    if not versions:
+        return
+    try:
+        from tools.security.advisory_feed import check_packages_vulnerable
+
+        vulnerable = await asyncio.to_thread(check_packages_vulnerable, versions.items())
+    except ImportError:
+        logger.debug("advisory_feed module not available, skipping OSV check")
+        return
+    except Exception as e:
+        logger.warning(f"OSV advisory batch check failed: {e}")
+        return
+    for name, version in versions.items():
+        vuln_result = vulnerable[(name, version)]
+        if vuln_result.get("vulnerable"):
+            results[name] = _advisory_block(vuln_result.get("advisories", []))
+
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def _requirement_name(requirement: str) -> str | None:
+    """
+    Project name from a requirement line ("requests[socks]>=2.31; python_version>'3.8'").
+
+    Returns None for blank lines, comments, pip options (-r, -e, --hash) and URLs.
+    """
+    line = requirement.split("#", 1)[0].strip()
+    if not line or line.startswith("-") or "://" in line.split(";", 1)[0].split("@", 1)[0]:
+        return None
+    match = _REQUIREMENT_NAME.match(line)
+    return match.group(1) if match else None
+
+
 async def verify_packages_batch(
     package_names: list[str],
+    skip_pypi_check: bool = False,
+    max_concurrency: int = BATCH_CONCURRENCY,
 ) -> dict[str, dict[str, Any]]:
     """
-    Verify multiple packages in parallel.
+    Verify a list of packages or requirement lines in bulk.
+
+    Names are extracted from requirement specifiers and deduplicated
+    (PEP 503), the offline checks (blocklist, typosquat index) run for every
+    entry, PyPI lookups run concurrently with a bounded number in flight, and
+    the OSV advisories of all resolved versions are checked in one batch.
 
     Args:
-        package_names: List of package names to verify
+        package_names: Package names or requirement lines (e.g. the lines of
+            requirements.txt); blank lines, comments and pip options are skipped
+        skip_pypi_check: Skip PyPI API checks (offline)
+        max_concurrency: Maximum simultaneous PyPI lookups
 
     Returns:
-        Dict mapping package name to verification result
+        Dict mapping each given name/requirement to its verification result
     """
-    tasks = [verify_package_security(name) for name in package_names]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    return {
-        name: result if not isinstance(result, Exception) else {
+    requirements = {
+        spec: name
+        for spec in package_names
+        if (name := _requirement_name(spec)) is not None
+    }
+    unique: dict[str, str] = {}
+    for name in requirements.values():
+        unique.setdefault(canonical_name(name), name)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def verify(name: str) -> dict[str, Any]:
+        async with semaphore:
+            return await verify_package_security(name, skip_pypi_check, check_advisories=False)
+
+    results = await asyncio.gather(
+        *(verify(name) for name in unique.values()), return_exceptions=True
+    )
+    by_name = dict(zip(unique, results, strict=True))
+    await _apply_advisories(by_name)
+
+    verified = {}
+    for spec, name in requirements.items():
+        result = by_name[canonical_name(name)]
+        verified[spec] = result if not isinstance(result, Exception) else {
             "safe": False,
             "risk_level": "high",
             "warnings": [f"Verification error: {result}"],
@@ -618,8 +672,7 @@ async def verify_packages_batch(
             "package_info": None,
             "blocked_reason": str(result),
         }
-        for name, result in zip(package_names, results)
-    }
+    return verified
 
 
 # =============================================================================
@@ -8,6 +8,9 @@ Features:
 - Elevation prompts for sensitive ops
 - Custom role creation
 - Permission inheritance through role priority
+- Compiled per-user matchers with a decision cache (invalidated on role
+  changes, commits from other processes and role expiry)
+- Repeated allow decisions audited once per window with a count
 
 Usage:
     python tools/security/permissions.py --check --user alice --permission "memory:write"
@@ -24,17 +27,26 @@ Permission Format:
 Dependencies:
     - sqlite3 (stdlib)
     - fnmatch (stdlib) for wildcard matching
+    - re (stdlib) for compiled wildcard patterns
 """
 
 import argparse
+import atexit
 import fnmatch
 import json
+import re
 import sqlite3
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
 
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "permissions.db"
@@ -106,13 +118,24 @@ DEFAULT_ROLES = {
 # Actions that require elevation (re-authentication or confirmation)
 ELEVATED_ACTIONS = ["users:delete", "secrets:*", "admin:*", "settings:write", "audit:delete"]
 
+# Decision cache: commits from other processes (CLI, dashboard, gateway
+# workers) are noticed within REVALIDATE_SECONDS
+REVALIDATE_SECONDS = 1.0
+MAX_CACHED_USERS = 4096
+MAX_MEMOIZED_DECISIONS = 1024
+
+# Repeated allow decisions for the same user and permission are audited once
+# per window; the next audited allow carries the number of suppressed ones
+ALLOW_AUDIT_WINDOW_SECONDS = 60.0
+
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
 
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and default roles. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Roles table
@@ -151,8 +174,6 @@ def get_connection():
     # Initialize default roles if not present
     _init_default_roles(conn)
 
-    return conn
-
 
 def _init_default_roles(conn):
     """Initialize default roles if they don't exist."""
@@ -215,15 +236,129 @@ def permission_matches(user_perm: str, required_perm: str) -> bool:
     return resource_match and action_match
 
 
-def get_user_permissions(user_id: str) -> list[str]:
-    """Get all permissions for a user based on their roles."""
+def _part_matcher(pattern: str) -> Callable[[str], bool] | None:
+    """Compiled resource or action pattern (None matches anything)."""
+    if pattern == "*":
+        return None
+    match = re.compile(fnmatch.translate(pattern)).match
+    return lambda value: value == pattern or match(value) is not None
+
+
+class PermissionMatcher:
+    """
+    A set of permissions compiled for repeated checks.
+
+    Answers "does any of these permissions match?" exactly like looping
+    permission_matches() over them, but exact permissions are a set lookup
+    and wildcard permissions are indexed by resource, then action, with
+    their fnmatch patterns compiled once. Decisions are memoized per
+    required permission.
+
+    Args:
+        permissions: Permission strings (duplicates ignored, order kept)
+    """
+
+    def __init__(self, permissions: Iterable[str]):
+        self.permissions = tuple(dict.fromkeys(permissions))
+        self.superuser = "*:*" in self.permissions
+        self._exact = frozenset(self.permissions)
+        # resource -> action matchers, for permissions with a literal resource
+        self._by_resource: dict[str, list[Callable[[str], bool] | None]] = {}
+        # (resource matcher, action matcher) for wildcard resources
+        self._wildcards: list[tuple[Callable[[str], bool] | None, ...]] = []
+        self._decisions: dict[str, bool] = {}
+
+        for perm in self.permissions:
+            parts = perm.split(":")
+            if len(parts) != 2:
+                continue  # Only ever matches exactly
+            resource, action = parts
+            resource_glob = resource == "*" or _has_glob(resource)
+            if not resource_glob and not _has_glob(action):
+                continue  # Covered by the exact set
+            if resource_glob:
+                self._wildcards.append((_part_matcher(resource), _part_matcher(action)))
+            else:
+                self._by_resource.setdefault(resource, []).append(_part_matcher(action))
+
+    def matches(self, required: str) -> bool:
+        """True if any permission grants ``required``."""
+        decision = self._decisions.get(required)
+        if decision is None:
+            decision = self._match(required)
+            if len(self._decisions) >= MAX_MEMOIZED_DECISIONS:
+                self._decisions.clear()
+            self._decisions[required] = decision
+        return decision
+
+    def _match(self, required: str) -> bool:
+        if self.superuser or required in self._exact:
+            return True
+        parts = required.split(":")
+        if len(parts) != 2:
+            return False
+        resource, action = parts
+        for action_match in self._by_resource.get(resource, ()):
+            if action_match is None or action_match(action):
+                return True
+        for resource_match, action_match in self._wildcards:
+            if (resource_match is None or resource_match(resource)) and (
+                action_match is None or action_match(action)
+            ):
+                return True
+        return False
+
+
+def _has_glob(pattern: str) -> bool:
+    return "*" in pattern or "?" in pattern or "[" in pattern
+
+
+_ELEVATED = PermissionMatcher(ELEVATED_ACTIONS)
+
+
+# =============================================================================
+# Decision Cache
+# =============================================================================
+
+
+class _CachedUser:
+    __slots__ = ("expires_at", "generation", "matcher")
+
+    def __init__(self, matcher: PermissionMatcher, generation: int, expires_at: str | None):
+        self.matcher = matcher
+        self.generation = generation
+        # Earliest expiry among the user's active roles (SQLite datetime text)
+        self.expires_at = expires_at
+
+
+_cache_lock = threading.Lock()
+_generation = 0
+_users: OrderedDict[tuple[str, str], _CachedUser] = OrderedDict()
+_commits = db_connections.DataVersionWatcher()
+
+
+def invalidate_permission_cache() -> None:
+    """Drop all compiled user permissions (called after every role change)."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _users.clear()
+
+
+def _sqlite_now() -> str:
+    """Current time formatted like SQLite's datetime('now')."""
+    return datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _load_user_permissions(user_id: str) -> tuple[list[str], str | None]:
+    """Permissions from the user's active roles and the earliest expiry among them."""
     conn = get_connection()
     cursor = conn.cursor()
 
     # Get all active roles for user
     cursor.execute(
         """
-        SELECT r.permissions, r.priority
+        SELECT r.permissions, ur.expires_at
         FROM user_roles ur
         JOIN roles r ON ur.role_name = r.name
         WHERE ur.user_id = ?
@@ -233,38 +368,114 @@ def get_user_permissions(user_id: str) -> list[str]:
         (user_id,),
     )
 
-    all_permissions = set()
+    all_permissions: list[str] = []
+    expires_at = None
     for row in cursor.fetchall():
-        perms = json.loads(row["permissions"])
-        all_permissions.update(perms)
+        all_permissions.extend(json.loads(row["permissions"]))
+        if row["expires_at"] is not None and (expires_at is None or row["expires_at"] < expires_at):
+            expires_at = row["expires_at"]
 
     conn.close()
-    return list(all_permissions)
+    return all_permissions, expires_at
 
 
-def check_permission(
-    user_id: str, permission: str, session_id: str | None = None
-) -> dict[str, Any]:
+def get_permission_matcher(user_id: str) -> PermissionMatcher:
     """
-    Check if a user has a specific permission.
+    Compiled permissions for a user, from the decision cache.
 
-    Args:
-        user_id: User identifier
-        permission: Permission string (e.g., "memory:write")
-        session_id: Optional session for audit logging
+    A cached matcher is reused until a role is granted, revoked, created
+    or deleted (here or, within REVALIDATE_SECONDS, by another process) or
+    one of the user's roles expires.
+    """
+    db = str(DB_PATH)
+    if _commits.poll(db, get_connection, REVALIDATE_SECONDS):
+        invalidate_permission_cache()
+
+    key = (db, user_id)
+    with _cache_lock:
+        cached = _users.get(key)
+        generation = _generation
+        if (
+            cached is not None
+            and cached.generation == generation
+            and (cached.expires_at is None or cached.expires_at > _sqlite_now())
+        ):
+            _users.move_to_end(key)
+            return cached.matcher
+
+    permissions, expires_at = _load_user_permissions(user_id)
+    matcher = PermissionMatcher(permissions)
+    with _cache_lock:
+        # A role change while loading leaves this entry stale for the next call
+        _users[key] = _CachedUser(matcher, generation, expires_at)
+        _users.move_to_end(key)
+        while len(_users) > MAX_CACHED_USERS:
+            _users.popitem(last=False)
+    return matcher
+
+
+def get_user_permissions(user_id: str) -> list[str]:
+    """Get all permissions for a user based on their roles."""
+    return list(get_permission_matcher(user_id).permissions)
+
+
+# =============================================================================
+# Audit Sampling
+# =============================================================================
+
+# (db, user_id, permission) -> [window start, allows suppressed in the window]
+_allow_windows: dict[tuple[str, str, str], list] = {}
+
+
+def _audit_allow(user_id: str, permission: str, session_id: str | None) -> None:
+    """Audit an allow decision unless the same one was audited this window."""
+    key = (str(DB_PATH), user_id, permission)
+    now = time.monotonic()
+    overflow: list = []
+    with _cache_lock:
+        window = _allow_windows.get(key)
+        if window is not None and now - window[0] < ALLOW_AUDIT_WINDOW_SECONDS:
+            window[1] += 1
+            return
+        repeated = window[1] if window is not None else 0
+        if len(_allow_windows) >= MAX_CACHED_USERS:
+            overflow = _drain_windows()
+        _allow_windows[key] = [now, 0]
+    _log_repeats(overflow)
+    _log_check(user_id, permission, session_id, True, repeated)
+
+
+def _drain_windows() -> list:
+    """Close all audit windows (call with _cache_lock held)."""
+    pending = [(key, window[1]) for key, window in _allow_windows.items() if window[1]]
+    _allow_windows.clear()
+    return pending
+
+
+def _log_repeats(pending: list) -> None:
+    for (_, user_id, permission), repeated in pending:
+        _log_check(user_id, permission, None, True, repeated)
+
+
+def flush_permission_audit() -> int:
+    """
+    Write the counts of allow decisions suppressed in open audit windows.
 
     Returns:
-        dict with allowed status and details
+        Number of aggregated audit events written
     """
-    user_permissions = get_user_permissions(user_id)
+    with _cache_lock:
+        pending = _drain_windows()
+    _log_repeats(pending)
+    return len(pending)
 
-    # Check if any user permission matches
-    has_permission = any(permission_matches(up, permission) for up in user_permissions)
 
-    # Check if this is an elevated action
-    requires_elevation = any(permission_matches(ea, permission) for ea in ELEVATED_ACTIONS)
+atexit.register(flush_permission_audit)
 
-    # Log the check
+
+def _log_check(
+    user_id: str, permission: str, session_id: str | None, allowed: bool, repeated: int = 0
+) -> None:
     try:
         from . import audit
 
@@ -274,11 +485,44 @@ def check_permission(
             user_id=user_id,
             session_id=session_id,
             resource=permission,
-            status="success" if has_permission else "failure",
+            status="success" if allowed else "failure",
+            details={"repeated": repeated, "window_seconds": ALLOW_AUDIT_WINDOW_SECONDS}
+            if repeated
+            else None,
         )
     except Exception:
         pass
 
+
+def check_permission(
+    user_id: str, permission: str, session_id: str | None = None
+) -> dict[str, Any]:
+    """
+    Check if a user has a specific permission.
+
+    Args:
+        user_id: User identifier
+        permission: Permission string (e.g., "memory:write")
+        session_id: Optional session for audit logging
+
+    Returns:
+        dict with allowed status and details
+    """
+    matcher = get_permission_matcher(user_id)
+    user_permissions = list(matcher.permissions)
+
+    # Check if any user permission matches
+    has_permission = matcher.matches(permission)
+
+    # Check if this is an elevated action
+    requires_elevation = _ELEVATED.matches(permission)
+
+    # Log the check (denials always, repeated allows aggregated per window)
+    if has_permission:
+        _audit_allow(user_id, permission, session_id)
+    else:
+        _log_check(user_id, permission, session_id, False)
+
     # Log to dashboard audit if permission denied
     if not has_permission:
         try:
@@ -343,6 +587,7 @@ def grant_role(
 
     conn.commit()
     conn.close()
+    invalidate_permission_cache()
 
     # Log the grant
     try:
@@ -381,6 +626,7 @@ def revoke_role(user_id: str, role_name: str, revoked_by: str | None = None) ->
 
     conn.commit()
     conn.close()
+    invalidate_permission_cache()
 
     # Log the revoke
     try:
@@ -518,6 +764,7 @@ def create_role(
 
     conn.commit()
     conn.close()
+    invalidate_permission_cache()
 
     return {
         "success": True,
@@ -551,6 +798,7 @@ def delete_role(name: str) -> dict[str, Any]:
 
     conn.commit()
     conn.close()
+    invalidate_permission_cache()
 
     return {"success": True, "role": name, "message": f"Role '{name}' deleted"}
 
@@ -32,6 +32,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
 
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "ratelimit.db"
@@ -77,10 +79,11 @@ def load_config() -> dict:
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -107,7 +110,6 @@ def get_connection():
     )
 
     conn.commit()
-    return conn
 
 
 def get_limits(entity_type: str, entity_id: str = None) -> dict:
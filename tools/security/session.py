@@ -8,6 +8,9 @@ Features:
 - Channel/device binding
 - Activity tracking with idle timeout
 - Force logout capability
+- Validated-session cache keyed by token hash: valid until expiry or idle
+  timeout, dropped on revoke/refresh and on commits from other processes
+- Activity timestamps written back in coalesced batches
 
 Usage:
     python tools/security/session.py --action create --user alice --channel discord
@@ -30,15 +33,24 @@ Security Notes:
 """
 
 import argparse
+import atexit
 import hashlib
 import json
+import logging
 import secrets
 import sqlite3
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
+
+logger = logging.getLogger(__name__)
 
 # Database path
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "sessions.db"
@@ -49,13 +61,22 @@ MAX_TTL_HOURS = 168  # 7 days
 IDLE_TIMEOUT_HOURS = 4
 TOKEN_BYTES = 32  # 256 bits
 
+# Validation cache: commits from other processes (CLI revoke, other
+# dashboard workers) are noticed within REVALIDATE_SECONDS
+REVALIDATE_SECONDS = 1.0
+MAX_CACHED_SESSIONS = 10000
+
+# last_activity updates are buffered and written at most this often
+ACTIVITY_FLUSH_SECONDS = 30.0
+
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -80,7 +101,6 @@ def get_connection():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)")
 
     conn.commit()
-    return conn
 
 
 def generate_token() -> str:
@@ -192,6 +212,8 @@ def create_session(
     session_id = cursor.lastrowid
     conn.commit()
     conn.close()
+    if active_count >= max_concurrent:
+        invalidate_session_cache()
 
     log_session_event("create", user_id, "success", str(session_id))
 
@@ -206,25 +228,97 @@ def create_session(
     }
 
 
-def validate_session(
-    token: str,
-    channel: str | None = None,
-    device_id: str | None = None,
-    update_activity: bool = True,
-) -> dict[str, Any]:
-    """
-    Validate a session token.
+# =============================================================================
+# Validation Cache
+# =============================================================================
+
+
+class _CachedSession:
+    __slots__ = ("expires_at", "generation", "last_activity", "row")
+
+    def __init__(self, row: dict, generation: int):
+        self.row = row
+        self.expires_at = datetime.fromisoformat(row["expires_at"])
+        # Latest activity, including updates not yet written back
+        self.last_activity = row["last_activity"]
+        self.generation = generation
+
+    def live(self, now: datetime) -> bool:
+        """Not expired and not idle (the checks validate_session makes)."""
+        if now > self.expires_at:
+            return False
+        if self.last_activity:
+            idle = now - datetime.fromisoformat(self.last_activity)
+            return idle.total_seconds() <= IDLE_TIMEOUT_HOURS * 3600
+        return True
+
+
+_cache_lock = threading.Lock()
+_generation = 0
+_sessions: OrderedDict[tuple[str, str], _CachedSession] = OrderedDict()
+_commits = db_connections.DataVersionWatcher()
+# (db, session id) -> last_activity not yet written back
+_pending_activity: dict[tuple[str, int], str] = {}
+_flushed_at = time.monotonic()
+
+
+def invalidate_session_cache() -> None:
+    """Drop all cached validations (called after every revoke/refresh)."""
+    global _generation
+    with _cache_lock:
+        _generation += 1
+        _sessions.clear()
 
-    Args:
-        token: Session token to validate
-        channel: Expected channel (for binding check)
-        device_id: Expected device (for binding check)
-        update_activity: Update last activity timestamp
+
+def flush_session_activity() -> int:
+    """
+    Write buffered last_activity timestamps in one transaction per database.
 
     Returns:
-        dict with validation result and session info
+        Number of sessions updated
     """
-    token_hash = hash_token(token)
+    global _flushed_at
+    with _cache_lock:
+        pending = dict(_pending_activity)
+        _pending_activity.clear()
+        _flushed_at = time.monotonic()
+
+    by_db: dict[str, list[tuple[str, int]]] = {}
+    for (db, session_id), last_activity in pending.items():
+        by_db.setdefault(db, []).append((last_activity, session_id))
+    for db, rows in by_db.items():
+        try:
+            conn = db_connections.get_connection(Path(db), _init_schema)
+            try:
+                conn.executemany("UPDATE sessions SET last_activity = ? WHERE id = ?", rows)
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Session activity write-back failed: {e}")
+            with _cache_lock:
+                for last_activity, session_id in rows:
+                    _pending_activity.setdefault((db, session_id), last_activity)
+    return len(pending)
+
+
+atexit.register(flush_session_activity)
+
+
+def _touch(db: str, cached: _CachedSession, now: datetime) -> None:
+    """Record activity; written back with the next batch."""
+    with _cache_lock:
+        cached.last_activity = now.isoformat()
+        _pending_activity[(db, cached.row["id"])] = cached.last_activity
+        due = time.monotonic() - _flushed_at >= ACTIVITY_FLUSH_SECONDS
+    if due:
+        flush_session_activity()
+
+
+def _load_session(db: str, token_hash: str, now: datetime) -> _CachedSession | dict[str, Any]:
+    """Session row checked for revocation/expiry/idle, or the invalid result."""
+    with _cache_lock:
+        generation = _generation
 
     conn = get_connection()
     cursor = conn.cursor()
@@ -249,44 +343,97 @@ def validate_session(
 
     # Check expiry
     expires_at = datetime.fromisoformat(row["expires_at"])
-    if datetime.now() > expires_at:
+    if now > expires_at:
         # Mark as inactive
         cursor.execute("UPDATE sessions SET is_active = 0 WHERE id = ?", (row["id"],))
         conn.commit()
         conn.close()
         return {"success": True, "valid": False, "reason": "session_expired"}
 
-    # Check idle timeout
+    # Check idle timeout (against activity not yet written back, too)
+    row = dict(row)
+    with _cache_lock:
+        pending = _pending_activity.get((db, row["id"]))
+    if pending is not None:
+        row["last_activity"] = pending
     if row["last_activity"]:
         last_activity = datetime.fromisoformat(row["last_activity"])
-        idle_seconds = (datetime.now() - last_activity).total_seconds()
+        idle_seconds = (now - last_activity).total_seconds()
         if idle_seconds > IDLE_TIMEOUT_HOURS * 3600:
             cursor.execute("UPDATE sessions SET is_active = 0 WHERE id = ?", (row["id"],))
             conn.commit()
             conn.close()
             return {"success": True, "valid": False, "reason": "idle_timeout"}
 
+    conn.close()
+
+    cached = _CachedSession(row, generation)
+    with _cache_lock:
+        # A revoke while loading leaves this entry stale for the next call
+        key = (db, token_hash)
+        _sessions[key] = cached
+        _sessions.move_to_end(key)
+        while len(_sessions) > MAX_CACHED_SESSIONS:
+            _sessions.popitem(last=False)
+    return cached
+
+
+def validate_session(
+    token: str,
+    channel: str | None = None,
+    device_id: str | None = None,
+    update_activity: bool = True,
+) -> dict[str, Any]:
+    """
+    Validate a session token.
+
+    Args:
+        token: Session token to validate
+        channel: Expected channel (for binding check)
+        device_id: Expected device (for binding check)
+        update_activity: Update last activity timestamp
+
+    Returns:
+        dict with validation result and session info
+    """
+    token_hash = hash_token(token)
+    db = str(DB_PATH)
+    now = datetime.now()
+
+    if _commits.poll(db, get_connection, REVALIDATE_SECONDS):
+        invalidate_session_cache()
+
+    key = (db, token_hash)
+    with _cache_lock:
+        cached = _sessions.get(key)
+        if cached is not None:
+            if cached.generation == _generation and cached.live(now):
+                _sessions.move_to_end(key)
+            else:
+                # Expired/idle entries are re-checked (and marked) in the DB
+                del _sessions[key]
+                cached = None
+
+    if cached is None:
+        loaded = _load_session(db, token_hash, now)
+        if isinstance(loaded, dict):
+            return loaded
+        cached = loaded
+    row = cached.row
+
     # Check channel binding
     if channel and row["channel"] and row["channel"] != channel:
-        conn.close()
         log_session_event("validate", row["user_id"], "failure", str(row["id"]))
         return {"success": True, "valid": False, "reason": "channel_mismatch"}
 
     # Check device binding
     if device_id and row["device_id"] and row["device_id"] != device_id:
-        conn.close()
         log_session_event("validate", row["user_id"], "failure", str(row["id"]))
         return {"success": True, "valid": False, "reason": "device_mismatch"}
 
-    # Update last activity
+    last_activity = cached.last_activity
     if update_activity:
-        cursor.execute(
-            "UPDATE sessions SET last_activity = ? WHERE id = ?",
-            (datetime.now().isoformat(), row["id"]),
-        )
-        conn.commit()
-
-    conn.close()
+        _touch(db, cached, now)
 
     # Parse metadata
     metadata = None
@@ -304,7 +451,7 @@ def validate_session(
         "channel": row["channel"],
         "created_at": row["created_at"],
         "expires_at": row["expires_at"],
-        "last_activity": row["last_activity"],
+        "last_activity": last_activity,
         "metadata": metadata,
     }
 
@@ -344,6 +491,7 @@ def refresh_session(token: str, extend_hours: int = DEFAULT_TTL_HOURS) -> dict[s
 
     conn.commit()
     conn.close()
+    invalidate_session_cache()
 
     return {
         "success": True,
@@ -371,6 +519,7 @@ def revoke_session(token: str) -> dict[str, Any]:
     cursor.execute("UPDATE sessions SET is_active = 0 WHERE token_hash = ?", (token_hash,))
     conn.commit()
     conn.close()
+    invalidate_session_cache()
 
     log_session_event("revoke", row["user_id"], "success", str(row["id"]))
 
@@ -392,6 +541,7 @@ def revoke_all_sessions(user_id: str) -> dict[str, Any]:
     )
     conn.commit()
     conn.close()
+    invalidate_session_cache()
 
     log_session_event("revoke_all", user_id, "success")
 
@@ -405,6 +555,7 @@ def revoke_all_sessions(user_id: str) -> dict[str, Any]:
 
 def list_sessions(user_id: str | None = None, active_only: bool = True) -> dict[str, Any]:
     """List sessions, optionally filtered by user."""
+    flush_session_activity()
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -0,0 +1,306 @@
+"""
+Tool: Typosquat Index
+Purpose: Find popular package names a candidate name imitates
+
+Features:
+- Edit-distance index over a bundled corpus of popular PyPI projects
+  (data/popular_pypi_packages.txt), built once per process
+- SymSpell-style deletion index: every popular name is stored under the
+  strings left after deleting up to k characters from its first and from
+  its last few characters. A lookup generates the candidate's deletions,
+  keeps the names hit at both ends (package names share long prefixes
+  such as "google-cloud-" and suffixes such as "-client") and verifies
+  only those, instead of comparing against the whole corpus
+- Damerau (optimal string alignment) distance: swapped neighbours count as
+  one edit ("reqeusts")
+- Homoglyph normalization before comparison: I/l/1, 0/O, rn/m, vv/w and
+  Cyrillic/Greek look-alikes map to one skeleton, so a pure look-alike is
+  found at distance 0
+- Allowed distance grows with name length (short names have too many
+  legitimate neighbours)
+
+Usage:
+    from tools.security.typosquat import get_typosquat_index
+
+    get_typosquat_index().nearest("reqeusts")   # [("requests", 1)]
+
+    # Regenerate the bundled corpus (network access required)
+    python -m tools.security.typosquat --refresh --limit 10000
+
+Dependencies:
+    - httpx (only for --refresh)
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+CORPUS_PATH = Path(__file__).parent / "data" / "popular_pypi_packages.txt"
+TOP_PYPI_URL = "https://hugovk.github.io/top-pypi-packages/top-pypi-packages-30-days.min.json"
+
+# Characters indexed at each end of a name (bounds the index size)
+AFFIX_LENGTH = 7
+
+# Look-alikes mapped before lowercasing (case matters: I vs l)
+_HOMOGLYPHS = str.maketrans({
+    "I": "l", "1": "l", "|": "l", "0": "o",
+    # Cyrillic
+    "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y", "х": "x",  # noqa: RUF001
+    "і": "i", "ј": "j", "ѕ": "s", "һ": "h", "ԁ": "d", "ԛ": "q", "ԝ": "w",  # noqa: RUF001
+    # Greek
+    "α": "a", "ο": "o", "ρ": "p", "ν": "v", "τ": "t", "κ": "k", "ι": "i",  # noqa: RUF001
+})
+_MULTI_HOMOGLYPHS = (("rn", "m"), ("vv", "w"))
+_SEPARATORS = re.compile(r"[-_.]+")
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized name (how PyPI identifies a project)."""
+    return _SEPARATORS.sub("-", name).lower()
+
+
+def skeleton(name: str) -> str:
+    """Name with look-alike characters folded together, for comparison."""
+    folded = unicodedata.normalize("NFKC", name).translate(_HOMOGLYPHS).lower()
+    for sequence, replacement in _MULTI_HOMOGLYPHS:
+        folded = folded.replace(sequence, replacement)
+    return _SEPARATORS.sub("-", folded)
+
+
+def _max_distance(length: int) -> int:
+    """Edits allowed between a name of this length and a popular name."""
+    if length < 4:
+        return 0
+    if length < 10:
+        return 1
+    return 2
+
+
+def _deletes(word: str, distance: int) -> set[str]:
+    """``word`` and every string left after deleting up to ``distance`` characters."""
+    result = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def osa_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``.
+
+    Like Levenshtein, plus transposition of two adjacent characters.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Shared prefixes/suffixes never need edits ("mkdocs-...-plugin")
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return max(len(a), len(b))
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _add(index: dict[str, int | list[int]], keys: set[str], rank: int) -> None:
+    for key in keys:
+        entry = index.get(key)
+        if entry is None:
+            index[key] = rank
+        elif isinstance(entry, int):
+            index[key] = [entry, rank]
+        else:
+            entry.append(rank)
+
+
+def _lookup(index: dict[str, int | list[int]], keys: set[str]) -> set[int]:
+    ranks: set[int] = set()
+    for key in keys:
+        entry = index.get(key)
+        if entry is None:
+            continue
+        if isinstance(entry, int):
+            ranks.add(entry)
+        else:
+            ranks.update(entry)
+    return ranks
+
+
+class TyposquatIndex:
+    """
+    Deletion index answering "popular names within distance k".
+
+    Args:
+        names: Popular names, most popular first (rank breaks distance ties)
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = []
+        self._canonical: set[str] = set()
+        self._skeletons: list[str] = []
+        # Deletions of the first / last AFFIX_LENGTH characters -> ranks
+        self._prefixes: dict[str, int | list[int]] = {}
+        self._suffixes: dict[str, int | list[int]] = {}
+        for name in names:
+            canonical = canonical_name(name)
+            if canonical in self._canonical:
+                continue
+            self._canonical.add(canonical)
+            rank = len(self.names)
+            self.names.append(canonical)
+            key = skeleton(name)
+            self._skeletons.append(key)
+            # Deep enough for the longest names that can still match
+            depth = _max_distance(len(key) + 2)
+            _add(self._prefixes, _deletes(key[:AFFIX_LENGTH], depth), rank)
+            if len(key) > AFFIX_LENGTH:
+                _add(self._suffixes, _deletes(key[-AFFIX_LENGTH:], depth), rank)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return canonical_name(name) in self._canonical
+
+    def nearest(self, name: str) -> list[tuple[str, int]]:
+        """
+        Popular names ``name`` may imitate, closest and most popular first.
+
+        A name that is itself popular imitates nothing. Distance 0 means the
+        names differ only by look-alike characters.
+
+        Args:
+            name: Candidate package name
+
+        Returns:
+            [(popular_name, distance), ...]
+        """
+        if canonical_name(name) in self._canonical:
+            return []
+        key = skeleton(name)
+        limit = _max_distance(len(key))
+
+        # Within ``limit`` edits, both ends are within ``limit`` deletions
+        ranks = _lookup(self._prefixes, _deletes(key[:AFFIX_LENGTH], limit))
+        if ranks:
+            suffix_ranks = _lookup(self._suffixes, _deletes(key[-AFFIX_LENGTH:], limit))
+            short = {r for r in ranks if len(self._skeletons[r]) <= AFFIX_LENGTH}
+            ranks = (ranks & suffix_ranks) | short
+
+        matches = []
+        for rank in ranks:
+            distance = osa_distance(key, self._skeletons[rank], limit)
+            if distance <= limit:
+                matches.append((distance, rank))
+        matches.sort()
+        return [(self.names[rank], distance) for distance, rank in matches]
+
+    def nearest_many(self, names: Iterable[str]) -> dict[str, list[tuple[str, int]]]:
+        """nearest() for each distinct name."""
+        return {name: self.nearest(name) for name in dict.fromkeys(names)}
+
+
+# =============================================================================
+# Corpus
+# =============================================================================
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list[str]:
+    """Names from a corpus file (one per line, '#' comments)."""
+    names = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            names.append(line)
+    return names
+
+
+def refresh_corpus(limit: int = 10000, path: Path = CORPUS_PATH, url: str = TOP_PYPI_URL) -> int:
+    """
+    Rewrite the corpus from the top-pypi-packages download ranking.
+
+    Returns:
+        Number of names written
+    """
+    import httpx
+
+    response = httpx.get(url, timeout=30.0, follow_redirects=True)
+    response.raise_for_status()
+    rows = response.json()["rows"][:limit]
+    names = [canonical_name(row["project"]) for row in rows]
+    header = [
+        line for line in path.read_text(encoding="utf-8").splitlines() if line.startswith("#")
+    ] if path.exists() else []
+    path.write_text("\n".join(header + names) + "\n", encoding="utf-8")
+    return len(names)
+
+
+_index: TyposquatIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_typosquat_index(extra_names: Iterable[str] = ()) -> TyposquatIndex:
+    """
+    Get the shared index over the bundled corpus (built on first use).
+
+    Args:
+        extra_names: Names always included (used on first call only)
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TyposquatIndex([*load_corpus(), *extra_names])
+    return _index
+
+
+def main():
+    """CLI: look up names or refresh the corpus."""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Typosquat index")
+    parser.add_argument("names", nargs="*", help="Package names to look up")
+    parser.add_argument("--refresh", action="store_true", help="Download a new corpus")
+    parser.add_argument("--limit", type=int, default=10000, help="Corpus size for --refresh")
+    args = parser.parse_args()
+
+    if args.refresh:
+        print(f"Wrote {refresh_corpus(args.limit)} names to {CORPUS_PATH}")
+
+    start = time.perf_counter()
+    index = get_typosquat_index()
+    print(f"Indexed {len(index)} names in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for name in args.names:
+        print(f"{name}: {index.nearest(name) or 'no similar popular names'}")
+
+
+if __name__ == "__main__":
+    main()
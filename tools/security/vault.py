@@ -8,6 +8,10 @@ Features:
 - Namespace support for multi-tenant/skill isolation
 - Environment variable injection
 - Access audit logging
+- Vault session: key derived once per process, held in a locked (mlock),
+  zeroizable buffer that is wiped after an idle timeout
+- Bulk get_secrets(): one query, one access-count update and one audit
+  event for a whole set of keys
 
 Usage:
     python tools/security/vault.py --action set --key OPENAI_API_KEY --value "sk-..."
@@ -26,18 +30,29 @@ Security Notes:
     - Fails closed: no master key = no access
     - Never logs decrypted values
     - All access is audit logged
+    - The derived key is zeroized after KEY_IDLE_TIMEOUT_SECONDS unused and
+      re-derived on the next access (mlock is best effort)
 """
 
 import argparse
+import ctypes
+import ctypes.util
+import hashlib
 import json
 import logging
 import os
 import sqlite3
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from tools import db_connections
+
 
 try:
     from cryptography.hazmat.primitives import hashes
@@ -66,6 +81,9 @@ MASTER_KEY_ENV = "DEXAI_MASTER_KEY"
 # KDF iterations (from args/security.yaml default)
 KDF_ITERATIONS = 100000
 
+# Derived key is wiped after this long unused (re-derived on next access)
+KEY_IDLE_TIMEOUT_SECONDS = 900.0
+
 
 def _derive_salt(master_key: str) -> bytes:
     """Derive a deterministic salt from the master key using HKDF."""
@@ -180,19 +198,284 @@ def decrypt_value(encrypted: bytes, key: bytes) -> str:
 
 
 def get_master_key() -> bytes | None:
-    """Get the derived encryption key from master password."""
-    master_password = os.environ.get(MASTER_KEY_ENV)
-    if not master_password:
+    """
+    Get the derived encryption key from master password.
+
+    Returns a copy of the vault session's key (derived once per process and
+    master password). The vault itself only uses the key inside
+    VaultSession.use_key(), so the session buffer can be zeroized safely.
+    """
+    with get_vault_session().use_key() as key:
+        return bytes(key) if key is not None else None
+
+
+# =============================================================================
+# Vault Session
+# =============================================================================
+
+
+def _libc():
+    try:
+        return ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:
         return None
-    return derive_key(master_password)
+
+
+class VaultSession:
+    """
+    Derived vault key held for the life of the process.
+
+    The key is derived (salt migration check + PBKDF2) on first use and
+    whenever the master password in the environment changes, kept in a
+    bytearray locked into RAM where mlock is permitted, and overwritten
+    with zeros after ``idle_timeout`` seconds without use or on close().
+    The buffer is only handed out inside use_key(), which holds the
+    session lock, so it is never zeroized or replaced while in use.
+
+    Args:
+        idle_timeout: Seconds unused after which the key is zeroized
+    """
+
+    def __init__(self, idle_timeout: float = KEY_IDLE_TIMEOUT_SECONDS):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._key: bytearray | None = None
+        self._view = None  # ctypes view of _key (pins it for mlock/munlock)
+        self._locked = False
+        self._fingerprint: bytes | None = None
+        self._last_used = 0.0
+        self._timer: threading.Timer | None = None
+        self.derivations = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether a derived key is currently held."""
+        return self._key is not None
+
+    @property
+    def memory_locked(self) -> bool:
+        """Whether the key buffer is mlock'ed (not swappable)."""
+        return self._locked
+
+    @contextmanager
+    def use_key(self) -> Iterator[bytearray | None]:
+        """
+        The derived key for the duration of the block (None if the master key is not set).
+
+        Holds the session lock, so idle expiry, close() and a master key
+        change wait until the block exits. Do not keep the buffer past it.
+        """
+        with self._lock:
+            yield self._current_key()
+
+    def available(self) -> bool:
+        """Whether a key can be derived (derives it if needed)."""
+        with self.use_key() as key:
+            return key is not None
+
+    def encrypt(self, plaintext: str) -> bytes:
+        """encrypt_value() with the session key."""
+        with self.use_key() as key:
+            if key is None:
+                raise RuntimeError(f"Master key not set. Set {MASTER_KEY_ENV} environment variable.")
+            return encrypt_value(plaintext, key)
+
+    def decrypt(self, encrypted: bytes) -> str:
+        """decrypt_value() with the session key."""
+        with self.use_key() as key:
+            if key is None:
+                raise RuntimeError(f"Master key not set. Set {MASTER_KEY_ENV} environment variable.")
+            return decrypt_value(encrypted, key)
+
+    def _current_key(self) -> bytearray | None:
+        """Derive or reuse the key (call with _lock held)."""
+        master_password = os.environ.get(MASTER_KEY_ENV)
+        if not master_password:
+            return None
+        fingerprint = hashlib.sha256(master_password.encode()).digest()
+        self._last_used = time.monotonic()
+        if self._key is not None and self._fingerprint == fingerprint:
+            return self._key
+        self._zeroize()
+        self._store(derive_key(master_password))
+        self._fingerprint = fingerprint
+        self.derivations += 1
+        self._schedule_expiry(self.idle_timeout)
+        return self._key
+
+    def _store(self, key: bytes) -> None:
+        self._key = bytearray(key)
+        self._view = (ctypes.c_char * len(self._key)).from_buffer(self._key)
+        libc = _libc()
+        try:
+            self._locked = bool(libc) and libc.mlock(
+                ctypes.addressof(self._view), ctypes.c_size_t(len(self._key))
+            ) == 0
+        except AttributeError:
+            self._locked = False
+
+    def _zeroize(self) -> None:
+        """Overwrite and release the key (call with _lock held)."""
+        if self._key is None:
+            return
+        ctypes.memset(ctypes.addressof(self._view), 0, len(self._key))
+        if self._locked:
+            _libc().munlock(ctypes.addressof(self._view), ctypes.c_size_t(len(self._key)))
+        self._view = None
+        self._key = None
+        self._locked = False
+        self._fingerprint = None
+
+    def _schedule_expiry(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._expire_if_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire_if_idle(self) -> None:
+        with self._lock:
+            if self._key is None:
+                return
+            remaining = self._last_used + self.idle_timeout - time.monotonic()
+            if remaining > 0:
+                self._schedule_expiry(remaining)
+            else:
+                self._zeroize()
+                self._timer = None
+
+    def close(self) -> None:
+        """Zeroize the key now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._zeroize()
+
+    def get_secrets(
+        self,
+        namespace: str = "default",
+        keys: list[str] | None = None,
+        user: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Retrieve and decrypt several secrets at once.
+
+        One SELECT, one access-count UPDATE and one audit event per outcome
+        (success / not found), instead of a connection and an audit write
+        per secret.
+
+        Args:
+            namespace: Namespace
+            keys: Secret identifiers (None = every secret in the namespace)
+            user: User performing the action (for audit)
+
+        Returns:
+            dict with values by key, missing keys and decryption errors
+        """
+        with self.use_key() as encryption_key:
+            if not encryption_key:
+                log_access("get", ",".join(keys or ["*"]), namespace, "failure", user)
+                return {
+                    "success": False,
+                    "error": f"Master key not set. Set {MASTER_KEY_ENV} environment variable.",
+                }
+
+            rows = _select_secrets(namespace, keys)
+            values = {}
+            errors = []
+            aesgcm = AESGCM(encryption_key)
+            for row in rows:
+                encrypted = row["encrypted_value"]
+                try:
+                    values[row["key"]] = aesgcm.decrypt(encrypted[:12], encrypted[12:], None).decode()
+                except Exception as e:
+                    errors.append({"key": row["key"], "error": str(e)})
+
+        if values:
+            conn = get_connection()
+            conn.execute(
+                """
+                UPDATE secrets
+                SET accessed_count = accessed_count + 1, last_accessed = CURRENT_TIMESTAMP
+                WHERE namespace = ? AND key IN (SELECT value FROM json_each(?))
+            """,
+                (namespace, json.dumps(list(values))),
+            )
+            conn.commit()
+            conn.close()
+            log_access("get", ",".join(values), namespace, "success", user)
+
+        missing = [key for key in keys if key not in values] if keys is not None else []
+        failed = missing + [error["key"] for error in errors]
+        if failed:
+            log_access("get", ",".join(failed), namespace, "failure", user)
+
+        return {
+            "success": not failed,
+            "namespace": namespace,
+            "values": values,
+            "missing": missing,
+            "errors": errors,
+            "count": len(values),
+        }
+
+
+def _select_secrets(namespace: str, keys: list[str] | None) -> list[sqlite3.Row]:
+    """Unexpired secrets of a namespace (optionally only ``keys``) in one query."""
+    conn = get_connection()
+    if keys is None:
+        rows = conn.execute(
+            """
+            SELECT key, encrypted_value FROM secrets
+            WHERE namespace = ?
+            AND (expires_at IS NULL OR expires_at > datetime('now'))
+        """,
+            (namespace,),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            """
+            SELECT key, encrypted_value FROM secrets
+            WHERE namespace = ? AND key IN (SELECT value FROM json_each(?))
+            AND (expires_at IS NULL OR expires_at > datetime('now'))
+        """,
+            (namespace, json.dumps(list(keys))),
+        ).fetchall()
+    conn.close()
+    return rows
+
+
+_session: VaultSession | None = None
+_session_lock = threading.Lock()
+
+
+def get_vault_session() -> VaultSession:
+    """Get the process-wide vault session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = VaultSession()
+    return _session
+
+
+def get_secrets(
+    namespace: str = "default",
+    keys: list[str] | None = None,
+    user: str | None = None,
+) -> dict[str, Any]:
+    """Retrieve and decrypt several secrets at once (see VaultSession.get_secrets)."""
+    return get_vault_session().get_secrets(namespace, keys, user)
 
 
 def get_connection():
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    return db_connections.get_connection(DB_PATH, _init_schema)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -214,7 +497,6 @@ def get_connection():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_secrets_ns_key ON secrets(namespace, key)")
 
     conn.commit()
-    return conn
 
 
 def log_access(action: str, key: str, namespace: str, status: str, user: str | None = None):
@@ -272,8 +554,8 @@ def set_secret(
     Returns:
         dict with success status
     """
-    encryption_key = get_master_key()
-    if not encryption_key:
+    session = get_vault_session()
+    if not session.available():
         log_access("set", key, namespace, "failure", user)
         return {
             "success": False,
@@ -281,7 +563,7 @@ def set_secret(
         }
 
     try:
-        encrypted = encrypt_value(value, encryption_key)
+        encrypted = session.encrypt(value)
     except Exception as e:
         log_access("set", key, namespace, "failure", user)
         return {"success": False, "error": f"Encryption failed: {e!s}"}
@@ -327,8 +609,8 @@ def get_secret(key: str, namespace: str = "default", user: str | None = None) ->
     Returns:
         dict with decrypted value (or error)
     """
-    encryption_key = get_master_key()
-    if not encryption_key:
+    session = get_vault_session()
+    if not session.available():
         log_access("get", key, namespace, "failure", user)
         return {
             "success": False,
@@ -368,7 +650,7 @@ def get_secret(key: str, namespace: str = "default", user: str | None = None) ->
     conn.close()
 
     try:
-        value = decrypt_value(encrypted, encryption_key)
+        value = session.decrypt(encrypted)
     except Exception as e:
         log_access("get", key, namespace, "failure", user)
         return {"success": False, "error": f"Decryption failed: {e!s}"}
@@ -485,8 +767,8 @@ def rotate_secret(
     user: str | None = None,
 ) -> dict[str, Any]:
     """Rotate an individual secret by re-encrypting with a new value."""
-    encryption_key = get_master_key()
-    if not encryption_key:
+    session = get_vault_session()
+    if not session.available():
         return {
             "success": False,
             "error": f"Master key not set. Set {MASTER_KEY_ENV} environment variable.",
@@ -525,7 +807,7 @@ def rotate_secret(
 
     # Encrypt and store new value
     try:
-        new_encrypted = encrypt_value(new_value, encryption_key)
+        new_encrypted = session.encrypt(new_value)
         cursor.execute(
             """
             UPDATE secrets SET encrypted_value = ?, updated_at = CURRENT_TIMESTAMP
@@ -583,45 +865,31 @@ def inject_env(
     Returns:
         dict with list of injected keys and any skipped keys
     """
-    encryption_key = get_master_key()
-    if not encryption_key:
+    session = get_vault_session()
+    if not session.available():
         return {
             "success": False,
             "error": f"Master key not set. Set {MASTER_KEY_ENV} environment variable.",
         }
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT key, encrypted_value FROM secrets
-        WHERE namespace = ?
-        AND (expires_at IS NULL OR expires_at > datetime('now'))
-    """,
-        (namespace,),
-    )
-
     injected = []
     skipped = []
     errors = []
     requested_keys = set(keys) if keys else None
 
-    for row in cursor.fetchall():
+    for row in _select_secrets(namespace, None):
         # If specific keys requested, skip any not in the list
         if requested_keys is not None and row["key"] not in requested_keys:
             skipped.append(row["key"])
             continue
 
         try:
-            value = decrypt_value(row["encrypted_value"], encryption_key)
+            value = session.decrypt(row["encrypted_value"])
             os.environ[row["key"]] = value
             injected.append(row["key"])
         except Exception as e:
             errors.append({"key": row["key"], "error": str(e)})
 
-    conn.close()
-
     return {
         "success": len(errors) == 0,
         "injected": injected,
@@ -725,6 +993,7 @@ def rotate_master_key(old_master_key: str, new_master_key: str) -> dict[str, Any
         return {"success": False, "error": f"Re-encryption failed, rolled back: {e!s}"}
 
     conn.close()
+    get_vault_session().close()
 
     # Remove legacy salt file if it existed
     if SALT_PATH.exists():
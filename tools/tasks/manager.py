@@ -33,6 +33,8 @@ import uuid
 from datetime import datetime
 from typing import Any
 
+from tools import db_connections
+
 from . import (
     DB_PATH,
     ENERGY_LEVELS,
@@ -43,11 +45,11 @@ from . import (
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    return db_connections.get_connection(DB_PATH, _init_schema, foreign_keys=True)
+
 
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes. Runs once per process per database file."""
     cursor = conn.cursor()
 
     # Main tasks table
@@ -117,7 +119,6 @@ def get_connection() -> sqlite3.Connection:
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_friction_step ON task_friction(step_id)")
 
     conn.commit()
-    return conn
 
 
 def row_to_dict(row: sqlite3.Row | None) -> dict[str, Any] | None:
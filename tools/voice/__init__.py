@@ -30,6 +30,8 @@ Usage:
 import sqlite3
 from pathlib import Path
 
+from tools import db_connections
+
 # Path constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "voice.db"
@@ -38,12 +40,7 @@ CONFIG_PATH = PROJECT_ROOT / "args" / "voice.yaml"
 
 def get_connection() -> sqlite3.Connection:
     """Get database connection, creating tables on first use."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    _ensure_tables(conn)
-    return conn
+    return db_connections.get_connection(DB_PATH, _ensure_tables)
 
 
 def _ensure_tables(conn: sqlite3.Connection) -> None:
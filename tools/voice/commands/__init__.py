@@ -1,3 +1,12 @@
 """Voice command handlers."""
 
-__all__: list[str] = []
+from tools.voice.commands.control_commands import CONFIRMATIONS as _CONTROL
+from tools.voice.commands.query_commands import CONFIRMATIONS as _QUERY
+from tools.voice.commands.reminder_commands import CONFIRMATIONS as _REMINDER
+from tools.voice.commands.task_commands import CONFIRMATIONS as _TASK
+
+
+# Replies that never vary; TTSGenerator.prewarm() synthesizes them at startup
+STATIC_CONFIRMATIONS: tuple[str, ...] = tuple(dict.fromkeys(_CONTROL + _QUERY + _REMINDER + _TASK))
+
+__all__: list[str] = ["STATIC_CONFIRMATIONS"]
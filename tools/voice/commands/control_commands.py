@@ -15,6 +15,19 @@ from tools.voice.models import (
 
 logger = logging.getLogger(__name__)
 
+# Fixed replies, pre-synthesized by the TTS cache at startup
+ALREADY_IN_FOCUS = "You're already in focus mode. Keep going!"
+FOCUS_STARTED = "Focus mode activated. Notifications paused."
+FOCUS_ENDED = "Focus mode ended. Notifications resumed."
+NOTIFICATIONS_PAUSED = "Notifications paused for 30 minutes."
+
+CONFIRMATIONS = (
+    ALREADY_IN_FOCUS,
+    FOCUS_STARTED,
+    FOCUS_ENDED,
+    NOTIFICATIONS_PAUSED,
+)
+
 
 async def handle_start_focus(command: ParsedCommand, user_id: str) -> CommandResult:
     """Enter focus mode and pause notifications."""
@@ -25,18 +38,20 @@ async def handle_start_focus(command: ParsedCommand, user_id: str) -> CommandRes
     if state.get("success") and state.get("data", {}).get("in_flow"):
         return CommandResult(
             success=True,
-            message="You're already in focus mode. Keep going!",
+            message=ALREADY_IN_FOCUS,
             data={"already_active": True},
         )
 
     # Get optional duration
     duration_entity = command.get_entity(EntityType.DURATION)
     duration_min = int(duration_entity.value) if duration_entity else None
-    time_msg = f" for {duration_entity.raw_text}" if duration_entity else ""
 
     return CommandResult(
         success=True,
-        message=f"Focus mode activated{time_msg}. Notifications paused.",
+        message=(
+            f"Focus mode activated for {duration_entity.raw_text}. Notifications paused."
+            if duration_entity else FOCUS_STARTED
+        ),
         data={
             "focus_active": True,
             "duration_minutes": duration_min,
@@ -48,7 +63,7 @@ async def handle_end_focus(command: ParsedCommand, user_id: str) -> CommandResul
     """Exit focus mode and resume notifications."""
     return CommandResult(
         success=True,
-        message="Focus mode ended. Notifications resumed.",
+        message=FOCUS_ENDED,
         data={"focus_active": False},
     )
 
@@ -57,10 +72,12 @@ async def handle_pause_notifications(command: ParsedCommand, user_id: str) -> Co
     """Temporarily pause notifications."""
     duration_entity = command.get_entity(EntityType.DURATION)
     minutes = int(duration_entity.value) if duration_entity else 30
-    time_display = duration_entity.raw_text if duration_entity else "30 minutes"
 
     return CommandResult(
         success=True,
-        message=f"Notifications paused for {time_display}.",
+        message=(
+            f"Notifications paused for {duration_entity.raw_text}."
+            if duration_entity else NOTIFICATIONS_PAUSED
+        ),
         data={"paused_minutes": minutes},
     )
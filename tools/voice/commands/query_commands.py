@@ -15,6 +15,17 @@ from tools.voice.models import (
 
 logger = logging.getLogger(__name__)
 
+# Fixed replies, pre-synthesized by the TTS cache at startup
+NO_NEXT_TASK = "No tasks right now. You're all caught up!"
+SCHEDULE_CLEAR = "Your schedule is clear! No tasks pending."
+NO_TASKS_TRACKED = "No tasks tracked yet. Say 'add task' to get started!"
+
+CONFIRMATIONS = (
+    NO_NEXT_TASK,
+    SCHEDULE_CLEAR,
+    NO_TASKS_TRACKED,
+)
+
 
 async def handle_query_next_task(command: ParsedCommand, user_id: str) -> CommandResult:
     """Return the next task based on current energy."""
@@ -36,7 +47,7 @@ async def handle_query_next_task(command: ParsedCommand, user_id: str) -> Comman
 
     return CommandResult(
         success=True,
-        message="No tasks right now. You're all caught up!",
+        message=NO_NEXT_TASK,
         data={},
     )
 
@@ -55,7 +66,7 @@ async def handle_query_schedule(command: ParsedCommand, user_id: str) -> Command
     if total == 0:
         return CommandResult(
             success=True,
-            message="Your schedule is clear! No tasks pending.",
+            message=SCHEDULE_CLEAR,
             data={"in_progress": 0, "pending": 0},
         )
 
@@ -101,7 +112,7 @@ async def handle_query_status(command: ParsedCommand, user_id: str) -> CommandRe
     if total == 0:
         return CommandResult(
             success=True,
-            message="No tasks tracked yet. Say 'add task' to get started!",
+            message=NO_TASKS_TRACKED,
         )
 
     message = f"You've completed {completed_count} tasks"
@@ -16,6 +16,17 @@ from tools.voice.models import (
 
 logger = logging.getLogger(__name__)
 
+# Fixed replies, pre-synthesized by the TTS cache at startup
+REMINDER_FAILED = "Couldn't set that reminder. Try again?"
+SNOOZED = "Snoozed for 10 minutes."
+REMINDER_CANCELLED = "Reminder cancelled."
+
+CONFIRMATIONS = (
+    REMINDER_FAILED,
+    SNOOZED,
+    REMINDER_CANCELLED,
+)
+
 
 async def handle_set_reminder(command: ParsedCommand, user_id: str) -> CommandResult:
     """Schedule a reminder from voice input."""
@@ -78,7 +89,7 @@ async def handle_set_reminder(command: ParsedCommand, user_id: str) -> CommandRe
 
     return CommandResult(
         success=False,
-        message="Couldn't set that reminder. Try again?",
+        message=REMINDER_FAILED,
         error=result.get("error"),
     )
 
@@ -88,11 +99,10 @@ async def handle_snooze_reminder(command: ParsedCommand, user_id: str) -> Comman
     # Get snooze duration (default 10 minutes)
     duration_entity = command.get_entity(EntityType.DURATION)
     minutes = int(duration_entity.value) if duration_entity else 10
-    time_display = duration_entity.raw_text if duration_entity else "10 minutes"
 
     return CommandResult(
         success=True,
-        message=f"Snoozed for {time_display}.",
+        message=f"Snoozed for {duration_entity.raw_text}." if duration_entity else SNOOZED,
         data={"snooze_minutes": minutes},
     )
 
@@ -101,6 +111,6 @@ async def handle_cancel_reminder(command: ParsedCommand, user_id: str) -> Comman
     """Cancel the current or most recent reminder."""
     return CommandResult(
         success=True,
-        message="Reminder cancelled.",
+        message=REMINDER_CANCELLED,
         data={},
     )
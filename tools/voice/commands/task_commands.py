@@ -17,6 +17,27 @@ from tools.voice.models import (
 
 logger = logging.getLogger(__name__)
 
+# Fixed replies, pre-synthesized by the TTS cache at startup
+ADD_TASK_FAILED = "Couldn't add that task. Try again?"
+NOTHING_TO_COMPLETE = "No active task to complete. You're all caught up!"
+NO_TASK_ID = "No active task to complete."
+COMPLETE_FAILED = "Couldn't mark that done. Try again?"
+NOTHING_TO_SKIP = "No active task to skip."
+SKIPPED_LAST = "Skipped. No more tasks right now!"
+NOTHING_TO_DECOMPOSE = "No active task to break down."
+DECOMPOSE_FAILED = "Couldn't break that down. Try adding more detail?"
+
+CONFIRMATIONS = (
+    ADD_TASK_FAILED,
+    NOTHING_TO_COMPLETE,
+    NO_TASK_ID,
+    COMPLETE_FAILED,
+    NOTHING_TO_SKIP,
+    SKIPPED_LAST,
+    NOTHING_TO_DECOMPOSE,
+    DECOMPOSE_FAILED,
+)
+
 
 async def handle_add_task(command: ParsedCommand, user_id: str) -> CommandResult:
     """Create a new task from voice input."""
@@ -61,7 +82,7 @@ async def handle_add_task(command: ParsedCommand, user_id: str) -> CommandResult
 
     return CommandResult(
         success=False,
-        message="Couldn't add that task. Try again?",
+        message=ADD_TASK_FAILED,
         error=result.get("error", "unknown"),
     )
 
@@ -76,14 +97,14 @@ async def handle_complete_task(command: ParsedCommand, user_id: str) -> CommandR
     if not current.get("success") or not current.get("data"):
         return CommandResult(
             success=False,
-            message="No active task to complete. You're all caught up!",
+            message=NOTHING_TO_COMPLETE,
         )
 
     task_id = current["data"].get("task_id")
     if not task_id:
         return CommandResult(
             success=False,
-            message="No active task to complete.",
+            message=NO_TASK_ID,
         )
 
     result = complete_task(task_id)
@@ -98,7 +119,7 @@ async def handle_complete_task(command: ParsedCommand, user_id: str) -> CommandR
 
     return CommandResult(
         success=False,
-        message="Couldn't mark that done. Try again?",
+        message=COMPLETE_FAILED,
         error=result.get("error"),
     )
 
@@ -112,7 +133,7 @@ async def handle_skip_task(command: ParsedCommand, user_id: str) -> CommandResul
     if not current.get("success") or not current.get("data"):
         return CommandResult(
             success=False,
-            message="No active task to skip.",
+            message=NOTHING_TO_SKIP,
         )
 
     task_id = current["data"].get("task_id")
@@ -132,7 +153,7 @@ async def handle_skip_task(command: ParsedCommand, user_id: str) -> CommandResul
 
     return CommandResult(
         success=True,
-        message="Skipped. No more tasks right now!",
+        message=SKIPPED_LAST,
     )
 
 
@@ -145,14 +166,14 @@ async def handle_decompose_task(command: ParsedCommand, user_id: str) -> Command
     if not current.get("success") or not current.get("data"):
         return CommandResult(
             success=False,
-            message="No active task to break down.",
+            message=NOTHING_TO_DECOMPOSE,
         )
 
     task_id = current["data"].get("task_id")
     if not task_id:
         return CommandResult(
             success=False,
-            message="No active task to break down.",
+            message=NOTHING_TO_DECOMPOSE,
         )
 
     result = decompose_task(task_id)
@@ -168,6 +189,6 @@ async def handle_decompose_task(command: ParsedCommand, user_id: str) -> Command
 
     return CommandResult(
         success=False,
-        message="Couldn't break that down. Try adding more detail?",
+        message=DECOMPOSE_FAILED,
         error=result.get("error"),
     )